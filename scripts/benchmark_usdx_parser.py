@@ -0,0 +1,146 @@
+# flake8: noqa: E402
+"""Benchmark USDX file loading: previous parser vs. the single-read parser.
+
+Generates a corpus of synthetic songs (cp1252 and UTF-8, a few hundred note
+lines each) in a temporary directory and loads every file with
+
+- legacy: encoding sniff read + text-mode re-read, a new TagRegistry per file,
+  linear prefix matching per line and one Note object per note line
+- current: USDXFileService.load (one binary read, shared registry,
+  first-character dispatch, NoteArray)
+- headers: USDXFileService.load(headers_only=True), as used by library scans
+
+Usage:
+    python scripts/benchmark_usdx_parser.py [--songs 2000] [--notes 600] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiofiles
+
+# Add src to path (tooling convenience)
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from model.usdx_file import Note, Tags, USDXFile
+from services.usdx.parsers import create_registry
+from services.usdx_file_service import ENCODINGS, USDXFileService
+
+SYLLABLES = ["la", "da", "Wä~", "ne", "Ich", "ü", "be", "lo", "ve", "you", "~", "heart"]
+
+
+def write_corpus(directory: str, songs: int, notes: int) -> list:
+    rng = random.Random(42)
+    paths = []
+    for index in range(songs):
+        lines = [
+            f"#TITLE:Song {index}",
+            f"#ARTIST:Artist {index % 97}",
+            "#MP3:audio.mp3",
+            "#COVER:cover.jpg",
+            "#LANGUAGE:German",
+            f"#BPM:{rng.randint(150, 400)},5",
+            f"#GAP:{rng.randint(0, 30000)}",
+        ]
+        beat = 0
+        for note in range(notes):
+            if note and note % 8 == 0:
+                lines.append(f"- {beat}")
+            note_type = rng.choice(":::::*RF")
+            length = rng.randint(1, 6)
+            lines.append(f"{note_type} {beat} {length} {rng.randint(-5, 20)} {rng.choice(SYLLABLES)}")
+            beat += length + rng.randint(0, 3)
+        lines.append("E")
+        path = os.path.join(directory, f"song{index}.txt")
+        with open(path, "w", encoding="cp1252" if index % 2 else "utf-8", newline="\r\n") as f:
+            f.write("\n".join(lines) + "\n")
+        paths.append(path)
+    return paths
+
+
+async def legacy_load(path: str) -> USDXFile:
+    """The loading path before the single-read parser (kept here as the baseline)."""
+    usdx_file = USDXFile(path)
+    async with aiofiles.open(path, "rb") as file:
+        raw = await file.read()
+    for encoding in ENCODINGS:
+        try:
+            content = raw.decode(encoding)
+            if re.search(r"#TITLE:.+", content, re.MULTILINE):
+                usdx_file.encoding = encoding
+                break
+        except Exception:
+            pass
+    async with aiofiles.open(path, "r", encoding=usdx_file.encoding) as file:
+        usdx_file.content = await file.read()
+
+    registry = create_registry()
+    tags, notes = Tags(), []
+    for line in usdx_file.content.splitlines():
+        for prefix, handler in registry._handlers.items():
+            if line.startswith(prefix):
+                handler.parse(line, tags, notes)
+                break
+        else:
+            parts = line.strip().split()
+            if not line.startswith("#") and len(parts) >= 5 and parts[0] in {":", "*", "R", "-", "F", "G"}:
+                note = Note()
+                note.NoteType = parts[0]
+                note.StartBeat = int(parts[1])
+                note.Length = int(parts[2])
+                note.Pitch = int(parts[3])
+                note.Text = " ".join(parts[4:])
+                notes.append(note)
+    usdx_file.tags, usdx_file.notes = tags, notes
+    USDXFileService.validate(usdx_file)
+    USDXFileService.calculate_note_times(usdx_file)
+    return usdx_file
+
+
+async def current_load(path: str) -> USDXFile:
+    return await USDXFileService.load(USDXFile(path))
+
+
+async def headers_load(path: str) -> USDXFile:
+    return await USDXFileService.load(USDXFile(path), headers_only=True)
+
+
+async def run(loader, paths: list) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        await loader(path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--songs", type=int, default=2000)
+    parser.add_argument("--notes", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, args.songs, args.notes)
+        megabytes = sum(os.path.getsize(path) for path in paths) / 1e6
+        print(f"Corpus: {len(paths)} songs, {args.notes} notes each, {megabytes:.1f} MB")
+
+        baseline = None
+        for name, loader in (("legacy", legacy_load), ("current", current_load), ("headers", headers_load)):
+            best = min(asyncio.run(run(loader, paths)) for _ in range(args.repeat))
+            baseline = baseline or best
+            print(
+                f"{name:>8}: {best:6.2f}s  {len(paths) / best:8.0f} songs/s  "
+                f"{megabytes / best:6.1f} MB/s  x{baseline / best:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
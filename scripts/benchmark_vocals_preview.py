@@ -0,0 +1,134 @@
+# flake8: noqa: E402
+"""Benchmark vocals preview latency: previous temp-file chain vs. the in-memory pipeline.
+
+Synthesizes a stereo song WAV and simulates moving the gap marker: each step
+builds a preview around a new gap position and the time until the preview is
+ready is recorded. Per path, the median and worst latency are reported for
+
+- legacy: ffmpeg window extract -> hpss_mono -> blend_hpss_components -> VAD
+  gate -> make_clearer_voice, every step reading and writing a temp WAV
+  (the former build_vocals_preview, kept here as the baseline)
+- current: build_vocals_preview (window decoded once, HPSS/gate/clarity as
+  array operations, only the final file written)
+- buffer: render_vocals_preview (no file at all, buffer handed to the player)
+
+The legacy path needs ffmpeg on PATH and is skipped without it.
+
+Usage:
+    python scripts/benchmark_vocals_preview.py [--seconds 240] [--moves 8] [--pre-ms 3000] [--post-ms 9000]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+# Add src to path (tooling convenience)
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from utils.audio import make_clearer_voice
+from utils.hpss import blend_hpss_components, hpss_mono
+from utils.preview import build_vocals_preview, render_vocals_preview
+
+SAMPLE_RATE = 44100
+
+
+def synth_song(path: str, seconds: int):
+    rng = np.random.default_rng(seconds)
+    t = np.arange(seconds * SAMPLE_RATE) / SAMPLE_RATE
+    voice = 0.3 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 0.25 * t) > 0)
+    beat = 0.2 * rng.normal(0, 1, t.size) * (np.mod(t, 0.5) < 0.02)
+    mono = np.clip(voice + beat + rng.normal(0, 0.01, t.size), -1, 1)
+    sf.write(path, np.stack([mono, mono * 0.9], axis=1), SAMPLE_RATE, subtype="PCM_16")
+
+
+def legacy_preview(audio_file: str, gap_ms: float, pre_ms: int, post_ms: int, vad_segments) -> str:
+    """The temp-file chain before the in-memory pipeline (kept here as the baseline)."""
+    directory = os.path.dirname(audio_file)
+    start_ms = max(0, gap_ms - pre_ms)
+    end_ms = gap_ms + post_ms
+    window_file = os.path.join(directory, "legacy_window.wav")
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-y", "-ss", str(start_ms / 1000.0), "-t", str((end_ms - start_ms) / 1000.0)]
+        + ["-i", audio_file, "-acodec", "pcm_s16le", window_file],
+        check=True,
+    )
+    harmonic_file, percussive_file = hpss_mono(window_file, output_dir=directory)
+    blended_file = blend_hpss_components(harmonic_file, percussive_file, harmonic_weight=0.8, percussive_weight=0.2)
+    for path in (window_file, harmonic_file, percussive_file):
+        os.remove(path)
+
+    y, sr = librosa.load(blended_file, sr=None, mono=True)
+    mask = np.full_like(y, 10 ** (-9.0 / 20.0))
+    for seg_start, seg_end in vad_segments:
+        rel_start, rel_end = seg_start - start_ms, seg_end - start_ms
+        if rel_end > 0 and rel_start < end_ms - start_ms:
+            mask[max(0, int(rel_start * sr / 1000)) : int(rel_end * sr / 1000)] = 1.0
+    gated_file = os.path.join(directory, "legacy_gated.wav")
+    sf.write(gated_file, y * mask, sr)
+    os.remove(blended_file)
+
+    make_clearer_voice(gated_file)
+    output_file = os.path.join(directory, "legacy_preview.wav")
+    os.replace(gated_file, output_file)
+    return output_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, default=240, help="Song length in seconds")
+    parser.add_argument("--moves", type=int, default=8, help="Gap marker positions to preview")
+    parser.add_argument("--pre-ms", type=int, default=3000)
+    parser.add_argument("--post-ms", type=int, default=9000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        audio_file = os.path.join(directory, "audio.wav")
+        synth_song(audio_file, args.seconds)
+        # Voice is on during the first half of every 4 s period
+        vad_segments = [(start, start + 2000) for start in range(0, args.seconds * 1000, 4000)]
+        # Marker moves in 250 ms steps, like dragging or nudging it around one gap
+        gaps = [args.seconds * 500 + step * 250 for step in range(args.moves)]
+
+        paths = [
+            ("current", lambda gap: build_vocals_preview(audio_file, gap, args.pre_ms, args.post_ms, vad_segments)),
+            ("buffer", lambda gap: render_vocals_preview(audio_file, gap, args.pre_ms, args.post_ms, vad_segments)),
+        ]
+        if shutil.which("ffmpeg"):
+            legacy = ("legacy", lambda gap: legacy_preview(audio_file, gap, args.pre_ms, args.post_ms, vad_segments))
+            paths.insert(0, legacy)
+        else:
+            print("ffmpeg not found, skipping the legacy path")
+
+        # Warm up librosa/scipy imports and caches outside the timed runs
+        render_vocals_preview(audio_file, gaps[0], args.pre_ms, args.post_ms, vad_segments)
+
+        print(f"{'path':>8} {'median':>9} {'worst':>9}")
+        medians = {}
+        for name, preview in paths:
+            latencies = []
+            for gap in gaps:
+                start = time.perf_counter()
+                preview(gap)
+                latencies.append(time.perf_counter() - start)
+            medians[name] = statistics.median(latencies)
+            print(f"{name:>8} {medians[name] * 1000:7.1f}ms {max(latencies) * 1000:7.1f}ms")
+        if "legacy" in medians:
+            print(
+                f"{'speedup':>8} current {medians['legacy'] / medians['current']:.1f}x, "
+                f"buffer {medians['legacy'] / medians['buffer']:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# flake8: noqa: E402
+"""Benchmark waveform data: previous JSON builder vs. vectorized peaks in the binary container.
+
+Synthesizes mono 16-bit PCM for song-length tiers and times, per tier,
+
+- legacy build: struct.unpack into a Python list, per-bin min/max loops and
+  an indented json.dump (the former build_waveform_json ffmpeg fallback,
+  minus the ffmpeg call)
+- legacy load: json.load of that file
+- current build: vectorized min/max/RMS bins + mipmap levels written to the
+  float16 waveform data container (utils.waveform_data)
+- current load: memory-mapped read plus the 2048 display columns
+
+Decoding is excluded: both paths read the same PCM bytes. The container is
+larger than the 2048-bin JSON for long songs because it keeps every level
+(down to ~12 ms bins) for zoomed views.
+
+Usage:
+    python scripts/benchmark_waveform_data.py [--tiers 60,300,600] [--bins 2048] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path (tooling convenience)
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from utils.waveform_data import read_waveform_data, write_waveform_data
+from utils.waveform_peaks import compute_peaks
+
+SAMPLE_RATE = 44100
+
+
+def synth_pcm(seconds: int) -> bytes:
+    rng = np.random.default_rng(seconds)
+    t = np.arange(seconds * SAMPLE_RATE) / SAMPLE_RATE
+    signal = np.sin(2 * np.pi * 220 * t) * (0.3 + 0.2 * np.sin(2 * np.pi * 0.1 * t)) + rng.normal(0, 0.05, t.size)
+    return (np.clip(signal, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def legacy_build(raw_data: bytes, output_file: str, bins: int):
+    """The JSON path before the binary container (kept here as the baseline)."""
+    num_samples = len(raw_data) // 2
+    samples = struct.unpack(f"{num_samples}h", raw_data)
+    samples = [s / 32768.0 for s in samples]
+    samples_per_bin = max(1, num_samples // bins)
+    waveform_data = []
+    for i in range(bins):
+        start_idx = i * samples_per_bin
+        end_idx = min(start_idx + samples_per_bin, num_samples)
+        if start_idx >= num_samples:
+            waveform_data.append({"min": 0.0, "max": 0.0})
+            continue
+        bin_samples = samples[start_idx:end_idx]
+        waveform_data.append({"min": min(bin_samples), "max": max(bin_samples)})
+    output_data = {
+        "sample_rate": SAMPLE_RATE,
+        "duration_seconds": num_samples / float(SAMPLE_RATE),
+        "bins": bins,
+        "samples_per_bin": samples_per_bin,
+        "data": waveform_data,
+    }
+    with open(output_file, "w") as f:
+        json.dump(output_data, f, indent=2)
+
+
+def legacy_load(output_file: str, bins: int):
+    with open(output_file) as f:
+        data = json.load(f)
+    return [item["min"] for item in data["data"]], [item["max"] for item in data["data"]]
+
+
+def current_build(raw_data: bytes, output_file: str, bins: int):
+    samples = np.frombuffer(raw_data, dtype="<i2").astype(np.float32) / 32768.0
+    write_waveform_data(output_file, compute_peaks(samples, SAMPLE_RATE))
+
+
+def current_load(output_file: str, bins: int):
+    return read_waveform_data(output_file).columns(bins)
+
+
+def best_of(repeat: int, function, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiers", default="60,300,600", help="Song lengths in seconds")
+    parser.add_argument("--bins", type=int, default=2048)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'tier':>6} {'path':>8} {'build':>9} {'load':>9} {'size':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for seconds in (int(value) for value in args.tiers.split(",")):
+            raw_data = synth_pcm(seconds)
+            results = {}
+            for name, build, load, extension in (
+                ("legacy", legacy_build, legacy_load, ".json"),
+                ("current", current_build, current_load, ".peaks"),
+            ):
+                path = os.path.join(directory, f"{seconds}{extension}")
+                build_time = best_of(args.repeat, build, raw_data, path, args.bins)
+                load_time = best_of(args.repeat, load, path, args.bins)
+                results[name] = (build_time, load_time)
+                print(
+                    f"{seconds:>5}s {name:>8} {build_time * 1000:7.1f}ms {load_time * 1000:7.2f}ms "
+                    f"{os.path.getsize(path) / 1e3:7.0f}kB"
+                )
+            (legacy_build_time, legacy_load_time), (build_time, load_time) = results["legacy"], results["current"]
+            print(f"{'':>6} {'speedup':>8} {legacy_build_time / build_time:8.1f}x {legacy_load_time / load_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
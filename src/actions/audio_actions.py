@@ -5,7 +5,7 @@ from actions.base_actions import BaseActions
 from actions.song_actions import SongActions
 from model.song import Song, SongStatus
 from workers.detect_audio_length import DetectAudioLengthWorker
-from workers.normalize_audio import NormalizeAudioWorker
+from workers.normalize_audio import NormalizeAudioBatchWorker, NormalizeAudioWorker
 
 logger = logging.getLogger(__name__)
 
@@ -37,9 +37,15 @@ class AudioActions(BaseActions):
         if len(selected_songs) == 1:
             # If only one song is selected, normalize it immediately
             self._normalize_song_if_valid(selected_songs[0], True)
-        else:
-            for song in selected_songs:
-                self._normalize_song_if_valid(song, False)
+            return
+
+        songs = [song for song in selected_songs if song.audio_file]
+        if len(songs) < len(selected_songs):
+            logger.warning(f"Skipping normalization for {len(selected_songs) - len(songs)} songs: No audio file.")
+        if len(songs) == 1:
+            self._normalize_song(songs[0])
+        elif songs:
+            self._normalize_songs(songs)
 
     def _normalize_song_if_valid(self, song, is_first):
         if song.audio_file:
@@ -114,6 +120,46 @@ class AudioActions(BaseActions):
                 # If QTimer unavailable, fallback to immediate add
                 self.worker_queue.add_task(worker, start_now)
 
+    def _normalize_songs(self, songs: list[Song]):
+        """Normalize a selection in one batch task that runs several ffmpeg processes at once."""
+        worker = NormalizeAudioBatchWorker(songs)
+        worker.signals.songStarted.connect(self._on_song_worker_started)
+        worker.signals.songError.connect(self._on_song_worker_error)
+        worker.signals.songFinished.connect(self._on_batch_song_normalized)
+        worker.signals.songError.connect(lambda s, e: self.data.clear_file_locks_for_song(s))
+
+        def _release_locks():
+            # Normally released per song already; covers songs the batch never reached
+            for song in songs:
+                self.data.clear_file_locks_for_song(song)
+
+        worker.signals.finished.connect(_release_locks)
+
+        for song in songs:
+            self.data.lock_file(song.audio_file)
+            song.status = SongStatus.QUEUED
+            self.data.songs.updated.emit(song)
+
+        # Same file handle release as for single songs (see _normalize_song)
+        if hasattr(self.data, "media_unload_requested"):
+            try:
+                self.data.media_unload_requested.emit()
+            except Exception:
+                pass
+        try:
+            from PySide6.QtCore import QTimer
+
+            QTimer.singleShot(800, lambda: self.worker_queue.add_task(worker))
+        except Exception:
+            self.worker_queue.add_task(worker)
+
+    def _on_batch_song_normalized(self, song: Song, changed: bool):
+        self.data.clear_file_locks_for_song(song)
+        self._on_song_worker_finished(song)
+        # Only rewritten files need a reload; songs within tolerance are unchanged on disk
+        if changed:
+            self._schedule_deferred_reload(song)
+
     def _schedule_deferred_reload(self, song: Song):
         """Schedule a deferred reload to prevent UI thread blocking."""
         from PySide6.QtCore import QTimer
@@ -4,6 +4,7 @@ from contextlib import contextmanager
 from PySide6.QtCore import QObject, QTimer
 from typing import List, Callable, Optional
 from app.app_data import AppData
+from common.database import get_cache_entry
 from model.song import Song
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,7 @@ class BaseActions(QObject):
 
         # Process the first song immediately
         first_song = songs_to_process.pop(0)
+        self._ensure_hydrated(first_song)
         callback(first_song, True)  # True = is first song
 
         # If there are more songs, queue them with a small delay
@@ -51,12 +53,17 @@ class BaseActions(QObject):
 
         # Process the next song
         next_song = remaining_songs.pop(0)
+        self._ensure_hydrated(next_song)
         callback(next_song, False)  # False = not first song
 
         # If there are more songs, queue the next one with a delay
         if remaining_songs:
             QTimer.singleShot(50, lambda: self._process_next_song(remaining_songs, callback))
 
+    def _ensure_hydrated(self, song: Song):
+        """Load the full state of a selected song still listed from the library snapshot."""
+        self.data.songs.hydrate([song], get_cache_entry)
+
     # ------------------------------------------------------------------
     # Worker queue standard-lane coordination helpers
     # ------------------------------------------------------------------
@@ -4,7 +4,13 @@ import time
 from actions.base_actions import BaseActions
 from model.song import Song, SongStatus
 from workers.load_usdx_files import LoadUsdxFilesWorker
-from common.database import clear_cache
+from common.database import clear_cache, normalize_cache_key
+from common.library_snapshot import (
+    SNAPSHOT_MAX_SEGMENTS,
+    append_library_snapshot,
+    load_library_snapshot,
+    write_library_snapshot,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +21,12 @@ class CoreActions(BaseActions):
     def __init__(self, data):
         super().__init__(data)
         self._load_started_at: float | None = None
+        self._load_worker: LoadUsdxFilesWorker | None = None
+        # Songs changed since the library snapshot was written (txt path -> song, None if removed)
+        self._snapshot_changes: dict[str, Song | None] = {}
+        self.data.songs.updated.connect(self._on_song_changed)
+        self.data.songs.deleted.connect(self._on_song_removed)
+        self.data.songs.deletedBatch.connect(self._on_songs_removed)
 
     def auto_load_last_directory(self):
         """Check and auto-load songs from the last directory if available"""
@@ -102,12 +114,82 @@ class CoreActions(BaseActions):
         self.data.is_loading_songs = True  # Set loading flag immediately
         self._load_started_at = time.perf_counter()
         worker = LoadUsdxFilesWorker(self.data.directory, self.data.tmp_path, self.data.config)
+        worker.snapshot_keys = self._show_library_snapshot()
         worker.signals.songLoaded.connect(self._on_song_loaded)
         worker.signals.songsLoadedBatch.connect(self._on_songs_batch_loaded)  # Connect batch handler
         worker.signals.error.connect(lambda e: logger.error(f"Error loading songs: {e}"))
         worker.signals.finished.connect(self._on_loading_songs_finished)
+        self._load_worker = worker
         self.worker_queue.add_task(worker, True)
 
+    def _library_snapshot_enabled(self) -> bool:
+        return getattr(self.config, "library_snapshot", False) is True and bool(self.data.directory)
+
+    def _show_library_snapshot(self) -> set[str]:
+        """Populate the empty song list from the library snapshot.
+
+        Returns:
+            Cache keys of the songs shown (the load worker skips them in its cache pass)
+        """
+        if not self._library_snapshot_enabled() or len(self.data.songs.songs):
+            return set()
+        started_at = time.perf_counter()
+        songs = load_library_snapshot(self.data.directory)
+        if not songs:
+            return set()
+        self.data.songs.add_snapshot(songs)
+        logger.info(
+            "Library snapshot: %s songs listed in %.1f ms", len(songs), (time.perf_counter() - started_at) * 1000
+        )
+        return {normalize_cache_key(song.txt_file).lower() for song in songs}
+
+    def _drop_vanished_snapshot_songs(self, worker: LoadUsdxFilesWorker):
+        """Remove snapshot songs that are neither cached nor found by the scan."""
+        vanished = [
+            song
+            for song in self.data.songs.songs
+            if not self.data.songs.is_hydrated(song)
+            and normalize_cache_key(song.txt_file).lower() not in worker.loaded_paths
+        ]
+        if vanished:
+            logger.debug("Dropping %s snapshot songs no longer in the library", len(vanished))
+            self.data.songs.remove_batch(vanished)
+
+    def write_library_snapshot(self):
+        """Rewrite the library snapshot from the current song list."""
+        if not self._library_snapshot_enabled() or self.data.is_loading_songs:
+            return
+        if write_library_snapshot(self.data.directory, self.data.songs.songs):
+            self._snapshot_changes.clear()
+
+    def save_library_snapshot(self):
+        """Persist song changes made since the snapshot was written (shutdown hook).
+
+        Changes are appended as a new segment; the file is compacted once it has
+        SNAPSHOT_MAX_SEGMENTS segments.
+        """
+        if not self._snapshot_changes or not self._library_snapshot_enabled() or self.data.is_loading_songs:
+            return
+        changed = [song for song in self._snapshot_changes.values() if song is not None]
+        removed = [txt_file for txt_file, song in self._snapshot_changes.items() if song is None]
+        segments = append_library_snapshot(self.data.directory, changed, removed)
+        if segments == 0 or segments >= SNAPSHOT_MAX_SEGMENTS:
+            self.write_library_snapshot()
+        else:
+            self._snapshot_changes.clear()
+
+    def _on_song_changed(self, song: Song):
+        if not self.data.is_loading_songs and getattr(song, "txt_file", None):
+            self._snapshot_changes[song.txt_file] = song
+
+    def _on_song_removed(self, song: Song):
+        if not self.data.is_loading_songs and getattr(song, "txt_file", None):
+            self._snapshot_changes[song.txt_file] = None
+
+    def _on_songs_removed(self, songs: list):
+        for song in songs:
+            self._on_song_removed(song)
+
     def _on_songs_batch_loaded(self, songs: list):
         """Handle batch of songs loaded - much faster than one-by-one."""
         elapsed_ms = 0.0
@@ -138,7 +220,12 @@ class CoreActions(BaseActions):
             gap_actions._detect_gap(song)
 
     def _on_loading_songs_finished(self):
+        worker, self._load_worker = self._load_worker, None
+        if worker is not None and worker.snapshot_keys and not worker.is_cancelled():
+            self._drop_vanished_snapshot_songs(worker)
         self.data.is_loading_songs = False
         logger.debug("Song loading finished")
+        if worker is not None and not worker.is_cancelled():
+            self.write_library_snapshot()
         # Signal UI to end bulk loading mode (re-enable dynamic filtering)
         self.data.songs.loadingFinished.emit()
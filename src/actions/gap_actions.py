@@ -12,7 +12,9 @@ from services.note_timing_service import NoteTimingService
 from services import song_service
 from services.song_signature_service import SongSignatureService
 from services.usdx_file_service import USDXFileService
-from workers.detect_gap import DetectGapWorker, GapDetectionResult, DetectGapWorkerOptions
+from workers.detect_gap import DETECTION_POOL_LANE, DetectGapWorker, GapDetectionResult, DetectGapWorkerOptions
+from utils.gap_detection.engine import get_detection_worker_count
+from utils.providers.mdx.model_loader import warm_up_model
 from utils.run_async import run_async
 from typing import Optional, cast
 from services.file_mutation_guard import FileMutationGuard
@@ -48,6 +50,9 @@ class GapActions(BaseActions):
             overwrite=overwrite,
         )
 
+        detection_workers = get_detection_worker_count(self.config)
+        if detection_workers > 1:
+            self.worker_queue.configure_pool_lane(DETECTION_POOL_LANE, detection_workers)
         worker = DetectGapWorker(options)
 
         # Early-bind song using default args to avoid late-binding closure bugs
@@ -70,9 +75,21 @@ class GapActions(BaseActions):
         # Save overwrite parameter for the callback
         self._overwrite_gap = overwrite
 
+        if len(selected_songs) > 1:
+            self._warm_up_detection_model()
+
         # Use async queuing to prevent UI freeze
         self._queue_tasks_non_blocking(selected_songs, self._detect_gap_if_valid)
 
+    def _warm_up_detection_model(self):
+        """Load the Demucs model in the background while a detection batch is being queued."""
+        # Detection worker processes load their own model; only in-process MDX detection shares this one
+        if self.config.method != "mdx" or get_detection_worker_count(self.config) > 1:
+            return
+        threading.Thread(
+            target=warm_up_model, args=(self.config.mdx_use_fp16,), name="ModelWarmUp", daemon=True
+        ).start()
+
     def _resolve_song(self, song: Optional[Song]) -> Optional[Song]:
         """Resolve a Song instance from an explicit arg or data.first_selected_song, calling if it's a method."""
         if song is not None:
@@ -175,7 +192,7 @@ class GapActions(BaseActions):
 
         run_async(save_gap_and_cache())
 
-        # Create waveforms first (don't emit per-waveform updates, we'll emit once at end)
+        # Prepare waveform peaks of the new vocals (don't emit per-waveform updates, we'll emit once at end)
         audio_actions = AudioActions(self.data)
         audio_actions._create_waveforms(song, overwrite=True, emit_on_finish=False)
 
@@ -252,12 +269,9 @@ class GapActions(BaseActions):
 
         run_async(update_gap_and_cache())
 
-        # Recalculate note times with new gap value
+        # Recalculate note times with new gap value (the waveform repaints its note layer on the update signal)
         self._recalculate_note_times(song_to_process)
 
-        audio_actions = AudioActions(self.data)
-        audio_actions._create_waveforms(song_to_process, overwrite=True, emit_on_finish=False)
-
         # Defer signal emission to prevent cascade
         # Extend the suspension window slightly to cover the deferred emission
         self.data.media_suspend_requested.emit(250)
@@ -301,9 +315,6 @@ class GapActions(BaseActions):
         # Recalculate note times with original gap value
         self._recalculate_note_times(song_to_process)
 
-        audio_actions = AudioActions(self.data)
-        audio_actions._create_waveforms(song_to_process, overwrite=True, emit_on_finish=False)
-
         # Defer signal emission to prevent cascade
         # Extend the suspension window slightly to cover the deferred emission
         self.data.media_suspend_requested.emit(250)
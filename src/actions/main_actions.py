@@ -36,6 +36,9 @@ class Actions(BaseActions):
     def rescan_directory(self):
         self._core_actions.rescan_directory()
 
+    def save_library_snapshot(self):
+        self._core_actions.save_library_snapshot()
+
     # Song Actions
     def set_selected_songs(self, songs):
         self._song_actions.set_selected_songs(songs)
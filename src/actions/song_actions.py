@@ -1,21 +1,30 @@
+import asyncio
 import logging
 import os
-from typing import List, Set
+from typing import List, Optional, Set
 from actions.base_actions import BaseActions
 from model.song import Song, SongStatus
 from workers.reload_song_worker import ReloadSongWorker
 from services.usdx_file_service import USDXFileService
 from services.song_service import SongService
 from services.gap_state import GapState
-from model.usdx_file import USDXFile
+from model.usdx_file import USDXFile, compute_note_times
 from utils.audio import get_audio_duration
 from utils.run_async import run_async
+from common.database import get_cache_entry
 
 logger = logging.getLogger(__name__)
 
 # Global registry of in-flight reloads across all SongActions instances to prevent duplicate reload tasks
 _GLOBAL_INFLIGHT_RELOADS: Set[str] = set()
 
+# Selected snapshot songs beyond the first are read from the cache in batches of this size
+HYDRATION_BATCH_SIZE = 250
+
+
+def _load_cache_entries(songs: List[Song]) -> List[Optional[Song]]:
+    return [get_cache_entry(song.txt_file) for song in songs]
+
 
 class SongActions(BaseActions):
     """Song selection and management actions"""
@@ -23,9 +32,18 @@ class SongActions(BaseActions):
     def __init__(self, data):
         super().__init__(data)
         # In-flight reloads are tracked globally to prevent duplicates across different action instances
+        # Bumped per selection so background hydration of a replaced selection stops
+        self._hydration_generation = 0
 
     def set_selected_songs(self, songs: List[Song]):
         logger.debug(f"Setting selected songs: {[s.title for s in songs]}")
+        # Songs listed from the library snapshot only carry the table fields: the first
+        # (shown) song is loaded now, the rest of a multi-selection off the GUI thread
+        self.data.songs.hydrate(songs[:1], get_cache_entry)
+        self._hydration_generation += 1
+        pending = self.data.songs.unhydrated(songs[1:])
+        if pending:
+            run_async(self._hydrate_in_background(pending, self._hydration_generation))
         self.data.selected_songs = songs
 
         # Track B: Create GapState for single selection
@@ -46,6 +64,16 @@ class SongActions(BaseActions):
 
         # Removed waveform creation here - will be handled by MediaPlayerComponent
 
+    async def _hydrate_in_background(self, songs: List[Song], generation: int):
+        """Read the cached state of snapshot songs in batches; each batch is applied with one update."""
+        for start in range(0, len(songs), HYDRATION_BATCH_SIZE):
+            if generation != self._hydration_generation:
+                # Selection changed; songs left over are hydrated when selected or processed
+                return
+            batch = songs[start : start + HYDRATION_BATCH_SIZE]
+            loaded = await asyncio.to_thread(_load_cache_entries, batch)
+            self.data.songs.hydrationLoaded.emit(list(zip(batch, loaded)))
+
     def _mark_reload_started(self, song_path: str):
         """Mark a song path as having an in-flight reload to prevent duplicate tasks."""
         _GLOBAL_INFLIGHT_RELOADS.add(song_path)
@@ -242,19 +270,7 @@ class SongActions(BaseActions):
             # Compute note timing (ms) required by waveform drawing if we have BPM information
             if song.notes and song.bpm and song.bpm > 0:
                 try:
-                    beats_per_ms = (song.bpm / 60 / 1000) * 4
-                    for note in song.notes:
-                        # Guard against missing fields
-                        if note.StartBeat is None or note.Length is None:
-                            # Skip malformed notes
-                            continue
-                        if song.is_relative:
-                            note.start_ms = note.StartBeat / beats_per_ms
-                            note.end_ms = (note.StartBeat + note.Length) / beats_per_ms
-                        else:
-                            note.start_ms = song.gap + (note.StartBeat / beats_per_ms)
-                            note.end_ms = song.gap + ((note.StartBeat + note.Length) / beats_per_ms)
-                        note.duration_ms = note.end_ms - note.start_ms
+                    compute_note_times(song.notes, song.bpm, song.gap, song.is_relative)
                     logger.debug(
                         "Computed note timings for %s using bpm=%s, gap=%s, relative=%s",
                         song.title,
@@ -282,15 +298,7 @@ class SongActions(BaseActions):
                 # This avoids 'Songs' object does not support item assignment error
                 self._update_song_attributes(song, reloaded_song)
 
-                # Regenerate waveforms after reload
-                # This ensures waveforms reflect the current song data
-                from actions.audio_actions import AudioActions
-
-                audio_actions = AudioActions(self.data)
-                audio_actions._create_waveforms(song, overwrite=False, use_queue=True, emit_on_finish=False)
-                logger.debug("Queued waveform regeneration after reload for %s", song.title)
-
-                # Notify update after successful reload
+                # Notify update after successful reload (the waveform repaints its overlays from the song data)
                 self.data.songs.updated.emit(song)
 
                 # If this was a selected song, update the selection
@@ -418,13 +426,8 @@ class SongActions(BaseActions):
                     self.data.songs.updated.emit(song)  # Signal via data model
                     logger.error(f"Exception deleting song {song.path}: {e}")
 
-            # Only remove successfully deleted songs from the list
-            for song in successfully_deleted:
-                try:
-                    self.data.songs.remove(song)
-                except ValueError:
-                    # Song was already removed somehow
-                    pass
+            # Only remove successfully deleted songs from the list (songs already gone are skipped)
+            self.data.songs.remove_batch(successfully_deleted)
 
             # After attempting deletion, clear the selection
             self.set_selected_songs([])
@@ -97,6 +97,7 @@ class WatchModeActions(BaseActions):
                 songs_add=self.data.songs.add,
                 songs_remove_by_txt_file=self.data.songs.remove_by_txt_file,
                 reload_song=self._reload_song,
+                songs_remove_by_txt_files=self.data.songs.remove_by_txt_files,
             )
 
             # Connect error signal
@@ -1,4 +1,9 @@
-"""Cache entry schema helpers for the SQLite song cache."""
+"""Cache entry schema helpers for the SQLite song cache.
+
+Songs are stored as compact binary records (see common.song_record); any
+other payload, or a Song that does not fit the record schema, is pickled
+inside a CacheEnvelope.
+"""
 
 from __future__ import annotations
 
@@ -7,6 +12,9 @@ import pickle
 from dataclasses import dataclass
 from typing import Any, Callable
 
+from common.song_record import RecordEncodeError, decode_song, encode_song, is_song_record
+from model.song import Song
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +28,9 @@ class CacheEnvelope:
 
 
 # Per-entry payload schema (independent from SQLite layout)
-CACHE_ENTRY_VERSION = 1
+# Version 1: Pickled CacheEnvelope
+# Version 2: Songs stored as compact records (pickled v1 songs are rewritten on read)
+CACHE_ENTRY_VERSION = 2
 PAYLOAD_TYPE_SONG = "song"
 
 
@@ -35,6 +45,7 @@ def _legacy_payload_migration(payload: Any) -> Any:
 
 _CACHE_ENTRY_MIGRATIONS: dict[int, Callable[[Any], Any]] = {
     0: _legacy_payload_migration,  # Legacy blobs -> envelope v1
+    1: lambda payload: payload,  # Envelope v1 -> v2 (re-serialized as a compact record)
 }
 
 
@@ -60,7 +71,13 @@ def _run_entry_migrations(payload: Any, version: int) -> Any | None:
 
 
 def serialize_payload(payload: Any, payload_type: str = PAYLOAD_TYPE_SONG) -> bytes:
-    """Serialize a payload into an envelope blob."""
+    """Serialize a payload into a compact song record or an envelope blob."""
+
+    if payload_type == PAYLOAD_TYPE_SONG and isinstance(payload, Song):
+        try:
+            return encode_song(payload)
+        except RecordEncodeError as exc:
+            logger.debug("Song %s stored as pickle envelope: %s", getattr(payload, "txt_file", "?"), exc)
 
     envelope = CacheEnvelope(schema_version=CACHE_ENTRY_VERSION, payload_type=payload_type, payload=payload)
     return pickle.dumps(envelope)
@@ -69,6 +86,13 @@ def serialize_payload(payload: Any, payload_type: str = PAYLOAD_TYPE_SONG) -> by
 def deserialize_payload(file_path: str, data_blob: bytes) -> tuple[Any | None, bool]:
     """Return (payload, migrated) from raw cache bytes."""
 
+    if is_song_record(data_blob):
+        try:
+            return decode_song(data_blob), False
+        except ValueError as exc:
+            logger.error("Failed to decode cached song record for %s: %s", file_path, exc)
+            return None, False
+
     try:
         obj = pickle.loads(data_blob)
     except Exception as exc:
@@ -66,6 +66,7 @@ class Config(QObject):
         # The mdx package __init__.py now uses lazy imports via __getattr__ to avoid
         # importing torch-dependent modules (separator.py, model_loader.py) at package load time.
         from utils.providers.mdx.config import MdxConfig
+        from utils.providers.mdx.stem_cache import DEFAULT_STEM_CACHE_MB
 
         # Create default instance to extract values
         mdx_defaults = MdxConfig()
@@ -95,6 +96,8 @@ class Config(QObject):
                 "vocal_start_window_sec": int(mdx_defaults.start_window_ms / 1000),
                 "vocal_window_increment_sec": int(mdx_defaults.start_window_increment_ms / 1000),
                 "vocal_window_max_sec": int(mdx_defaults.start_window_max_ms / 1000),
+                "detection_workers": 1,
+                "gpu_detection_workers": 1,
             },
             "Colors": {
                 "detected_gap_color": "blue",
@@ -103,7 +106,13 @@ class Config(QObject):
                 "silence_periods_color": "105,105,105,128",
             },
             "Player": {"adjust_player_position_step_audio": 100, "adjust_player_position_step_vocals": 10},
-            "Processing": {"method": "mdx", "normalization_level": -20, "auto_normalize": False},
+            "Processing": {
+                "method": "mdx",
+                "normalization_level": -20,
+                "auto_normalize": False,
+                "normalization_tolerance": 1.0,
+                "normalization_workers": 0,
+            },
             "mdx": {
                 "chunk_duration_ms": mdx_defaults.chunk_duration_ms,
                 "chunk_overlap_ms": mdx_defaults.chunk_overlap_ms,
@@ -121,6 +130,8 @@ class Config(QObject):
                 "resample_hz": mdx_defaults.resample_hz,
                 "early_stop_tolerance_ms": mdx_defaults.early_stop_tolerance_ms,
                 "tf32": mdx_defaults.tf32,
+                "batch_size": mdx_defaults.batch_size,
+                "stem_cache_mb": DEFAULT_STEM_CACHE_MB,
                 "confidence_threshold": mdx_defaults.confidence_threshold,
                 "preview_pre_ms": mdx_defaults.preview_pre_ms,
                 "preview_post_ms": mdx_defaults.preview_post_ms,
@@ -138,6 +149,9 @@ class Config(QObject):
                 "splash_dont_show_health": False,
                 "prefer_system_pytorch": False,
                 "song_list_batch_size": 25,
+                "scan_workers": 8,
+                "incremental_scan": True,
+                "library_snapshot": True,
             },
             "Audio": {"default_volume": 0.5, "auto_play": False},
             "Window": {
@@ -269,6 +283,10 @@ class Config(QObject):
         self.vocal_window_max_sec = self._config.getint(
             "Detection", "vocal_window_max_sec", fallback=d["vocal_window_max_sec"]
         )
+        self.detection_workers = self._config.getint("Detection", "detection_workers", fallback=d["detection_workers"])
+        self.gpu_detection_workers = self._config.getint(
+            "Detection", "gpu_detection_workers", fallback=d["gpu_detection_workers"]
+        )
 
     def _init_colors(self, defaults: dict):
         """Initialize Colors section properties."""
@@ -302,6 +320,12 @@ class Config(QObject):
             "Processing", "normalization_level", fallback=p["normalization_level"]
         )
         self.auto_normalize = self._config.getboolean("Processing", "auto_normalize", fallback=p["auto_normalize"])
+        self.normalization_tolerance = self._config.getfloat(
+            "Processing", "normalization_tolerance", fallback=p["normalization_tolerance"]
+        )
+        self.normalization_workers = self._config.getint(
+            "Processing", "normalization_workers", fallback=p["normalization_workers"]
+        )
 
     def _init_mdx(self, defaults: dict):
         """Initialize MDX section properties."""
@@ -338,6 +362,8 @@ class Config(QObject):
             "mdx", "early_stop_tolerance_ms", fallback=m["early_stop_tolerance_ms"]
         )
         self.mdx_tf32 = self._config.getboolean("mdx", "tf32", fallback=m["tf32"])
+        self.mdx_batch_size = self._config.getint("mdx", "batch_size", fallback=m["batch_size"])
+        self.mdx_stem_cache_mb = self._config.getint("mdx", "stem_cache_mb", fallback=m["stem_cache_mb"])
         # Confidence and preview
         self.mdx_confidence_threshold = self._config.getfloat(
             "mdx", "confidence_threshold", fallback=m["confidence_threshold"]
@@ -377,6 +403,9 @@ class Config(QObject):
         self.song_list_batch_size = self._config.getint(
             "General", "song_list_batch_size", fallback=g["song_list_batch_size"]
         )
+        self.scan_workers = self._config.getint("General", "scan_workers", fallback=g["scan_workers"])
+        self.incremental_scan = self._config.getboolean("General", "incremental_scan", fallback=g["incremental_scan"])
+        self.library_snapshot = self._config.getboolean("General", "library_snapshot", fallback=g["library_snapshot"])
 
     def _init_audio(self, defaults: dict):
         """Initialize Audio section properties."""
@@ -576,6 +605,9 @@ class Config(QObject):
         config["General"]["splash_dont_show_health"] = "true" if self.splash_dont_show_health else "false"
         config["General"]["prefer_system_pytorch"] = "true" if self.prefer_system_pytorch else "false"
         config["General"]["song_list_batch_size"] = str(self.song_list_batch_size)
+        config["General"]["scan_workers"] = str(self.scan_workers)
+        config["General"]["incremental_scan"] = "true" if self.incremental_scan else "false"
+        config["General"]["library_snapshot"] = "true" if self.library_snapshot else "false"
 
     def _update_window_section(self, config: configparser.ConfigParser):
         """Update Window section in config."""
@@ -5,6 +5,18 @@ This module centralizes cache responsibilities:
 - Handles per-entry schema envelopes/migrations so cached songs survive refactors
 - Provides CRUD helpers used by services/workers (get/set/stream/remove)
 - Manages the cache database initialization and metadata versioning
+- Keeps one long-lived connection per thread (PRAGMAs applied once, statements
+  served from sqlite3's per-connection statement cache)
+- Queues cache writes/removals (write-behind) and commits them in batches; readers
+  see pending writes through an in-memory overlay
+- Stores a stat fingerprint (txt mtime/size, audio mtime) next to every entry, so
+  rescans decide freshness from an index-only query without unpickling songs
+- Keeps a directory journal (mtime and entry counts per scanned folder), so
+  rescans only descend into folders that changed since the last scan
+- Memoizes detection results by audio content and detector settings, so
+  re-detecting unchanged (or duplicated) audio skips the separation model
+- Memoizes loudness measurements (integrated loudness, true peak, LRA) by audio
+  content, so normalization measures every file once
 
 Callers should import the public helpers only; internal migration helpers remain private.
 """
@@ -13,8 +25,13 @@ import sqlite3
 import os
 import logging
 import datetime
+import json
+import atexit
+import threading
 import time
-from typing import overload, Literal, Any
+import weakref
+from contextlib import contextmanager
+from typing import overload, Literal, Any, Mapping, NamedTuple
 
 from utils.files import get_localappdata_dir
 from common.cache_schema import CacheEnvelope, serialize_payload, deserialize_payload
@@ -57,27 +74,82 @@ def _ensure_initialized() -> None:
         init_database()
 
 
-def _persist_cache_payload(
-    key: str,
-    payload: Any,
-    timestamp_override: str | None = None,
-    *,
-    key_is_normalized: bool = False,
-) -> None:
-    """Write the provided payload into the cache using the envelope wrapper."""
+class CacheFileStat(NamedTuple):
+    """Stat fingerprint stored next to a cache entry (None for rows written before v3)."""
 
-    normalized_key = key if key_is_normalized else normalize_cache_key(key).lower()
-    data_blob = serialize_payload(payload)
-    timestamp_value = timestamp_override or datetime.datetime.now().isoformat()
+    txt_mtime: float | None
+    txt_size: int | None
+    audio_mtime: float | None
+    timestamp: str | None
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT OR REPLACE INTO song_cache (file_path, song_data, timestamp) VALUES (?, ?, ?)",
-        (normalized_key, data_blob, timestamp_value),
-    )
-    conn.commit()
-    conn.close()
+
+class ScanJournalEntry(NamedTuple):
+    """Listing summary of one scanned directory (mtimes in nanoseconds)."""
+
+    mtime_ns: int
+    entry_count: int
+    subdir_count: int
+    song_count: int
+    # (name, mtime_ns, size) of its song txt files; an in-place edit need not touch the directory mtime
+    song_files: tuple[tuple[str, int, int], ...] = ()
+
+
+class DetectionResultEntry(NamedTuple):
+    """Memoized detector output for one audio content (gap before the BPM correction)."""
+
+    detected_gap: int
+    silence_periods: list[tuple[float, float]]
+    confidence: float | None
+    detection_method: str
+    vocals_file: str | None
+
+
+class LoudnessEntry(NamedTuple):
+    """EBU R128 measurement of one audio content (LUFS, dBTP, LU, LUFS)."""
+
+    integrated: float
+    true_peak: float
+    lra: float
+    threshold: float
+
+
+def _stat_fingerprint(txt_file: str, payload: Any) -> tuple[float | None, int | None, float | None]:
+    """Capture (txt_mtime, txt_size, audio_mtime) for the file a payload was loaded from."""
+
+    txt_mtime = txt_size = audio_mtime = None
+    try:
+        txt_stat = os.stat(txt_file)
+        txt_mtime, txt_size = txt_stat.st_mtime, txt_stat.st_size
+    except OSError:
+        pass
+
+    audio_file = getattr(payload, "audio_file", None)
+    if isinstance(audio_file, str) and audio_file:
+        try:
+            audio_mtime = os.stat(audio_file).st_mtime
+        except OSError:
+            pass
+
+    return txt_mtime, txt_size, audio_mtime
+
+
+def _persist_cache_payload(key: str, payload: Any, *, deferred: bool = True) -> None:
+    """Write the provided payload into the cache using the envelope wrapper.
+
+    The stat fingerprint is taken from key (the original, non-lowercased path).
+    Deferred writes go through the write-behind queue; otherwise the row is
+    committed before returning.
+    """
+
+    normalized_key = normalize_cache_key(key).lower()
+    row = (serialize_payload(payload), datetime.datetime.now().isoformat(), *_stat_fingerprint(key, payload))
+
+    if deferred:
+        _writes.put(normalized_key, row)
+        return
+
+    with _pooled_cursor() as cursor:
+        cursor.execute(_SQL_UPSERT_ENTRY, (normalized_key, *row))
 
 
 def deserialize_cache_blob(
@@ -95,11 +167,27 @@ def deserialize_cache_blob(
         return None
 
     if migrated:
-        _persist_cache_payload(normalized_key, payload, timestamp_override=timestamp_str, key_is_normalized=True)
+        # Rewrite the blob only: the processed timestamp and stat fingerprint stay valid
+        with _pooled_cursor() as cursor:
+            cursor.execute(_SQL_UPDATE_BLOB, (serialize_payload(payload), normalized_key))
 
     return payload
 
 
+def _remove_library_snapshots() -> None:
+    # Lazy import: library_snapshot builds on this module
+    from common.library_snapshot import delete_library_snapshots
+
+    delete_library_snapshots()
+
+
+def _remove_peaks_cache() -> None:
+    # Lazy import: waveform peaks locate their folder through this module
+    from utils.waveform_peaks import clear_peaks_cache
+
+    clear_peaks_cache()
+
+
 def _get_db_path() -> str:
     """Get database path, initializing it on first access."""
     global _DB_PATH
@@ -108,26 +196,340 @@ def _get_db_path() -> str:
     return _DB_PATH
 
 
+def get_cache_dir() -> str:
+    """Directory holding the cache database (and files derived from it, like library snapshots)."""
+    return os.path.dirname(_get_db_path())
+
+
 # Cache schema version - increment when cache structure changes
 # Version 1: Original cache (pre-multi-txt support)
 # Version 2: Multi-txt support (txt_file path is primary key)
-CACHE_VERSION = 2
+# Version 3: Stat fingerprint columns (txt_mtime, txt_size, audio_mtime) + freshness index
+# Version 4: audio_duration table (probed durations keyed by path, size and mtime)
+CACHE_VERSION = 4
 # Versions that absolutely require a destructive reset (reserved for structural DB changes)
 CACHE_VERSIONS_REQUIRING_CLEAR: set[int] = set()
 
 
-def get_connection():
-    """Get a connection to the database with optimized settings."""
-    conn = sqlite3.connect(_get_db_path())
+# Prepared statements of the hot CRUD paths. sqlite3 caches compiled statements
+# per connection keyed by SQL text, so long-lived connections reuse them.
+_SQL_SELECT_ENTRY = "SELECT song_data, timestamp FROM song_cache WHERE file_path=?"
+_SQL_UPSERT_ENTRY = (
+    "INSERT OR REPLACE INTO song_cache (file_path, song_data, timestamp, txt_mtime, txt_size, audio_mtime) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_UPDATE_BLOB = "UPDATE song_cache SET song_data=? WHERE file_path=?"
+_SQL_DELETE_ENTRY = "DELETE FROM song_cache WHERE file_path = ?"
+# Served from idx_song_cache_freshness alone (covering index), so song_data pages are never read
+_SQL_SELECT_FILE_STATS = "SELECT file_path, txt_mtime, txt_size, audio_mtime, timestamp FROM song_cache"
+
+_SQL_SELECT_DURATION = "SELECT duration_ms FROM audio_duration WHERE file_path=? AND file_size=? AND mtime=?"
+_SQL_UPSERT_DURATION = (
+    "INSERT OR REPLACE INTO audio_duration (file_path, file_size, mtime, duration_ms) VALUES (?, ?, ?, ?)"
+)
+_SQL_DELETE_DURATION = "DELETE FROM audio_duration WHERE file_path = ?"
+
+_SQL_SELECT_JOURNAL = "SELECT dir_path, mtime_ns, entry_count, subdir_count, song_count, song_files FROM scan_journal"
+_SQL_INSERT_JOURNAL = (
+    "INSERT OR REPLACE INTO scan_journal (dir_path, mtime_ns, entry_count, subdir_count, song_count, song_files) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_DELETE_JOURNAL = "DELETE FROM scan_journal WHERE dir_path = ?"
+
+_SQL_SELECT_DETECTION = (
+    "SELECT detected_gap, silence_periods, confidence, detection_method, vocals_file "
+    "FROM detection_result WHERE result_key=?"
+)
+_SQL_UPSERT_DETECTION = (
+    "INSERT OR REPLACE INTO detection_result "
+    "(result_key, detected_gap, silence_periods, confidence, detection_method, vocals_file, timestamp) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+_SQL_SELECT_LOUDNESS = "SELECT integrated, true_peak, lra, threshold FROM loudness_measurement WHERE audio_key=?"
+_SQL_UPSERT_LOUDNESS = (
+    "INSERT OR REPLACE INTO loudness_measurement (audio_key, integrated, true_peak, lra, threshold, timestamp) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# Columns added after the original (file_path, song_data, timestamp) schema
+_FINGERPRINT_COLUMNS = (("txt_mtime", "REAL"), ("txt_size", "INTEGER"), ("audio_mtime", "REAL"))
+_SQL_STATEMENT_CACHE_SIZE = 64
+
+
+class _PooledConnection(sqlite3.Connection):
+    """sqlite3 connection that can be tracked weakly by the connection manager."""
+
+
+def _configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
     cursor = conn.cursor()
     # Performance optimizations for read-heavy workloads
     cursor.execute("PRAGMA journal_mode=WAL")  # Write-ahead logging for better concurrency
     cursor.execute("PRAGMA synchronous=NORMAL")  # Balance safety and speed
     cursor.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp tables
     cursor.execute("PRAGMA cache_size=-32768")  # ~32 MB page cache
+    cursor.close()
     return conn
 
 
+def get_connection():
+    """Get a new (caller-owned) connection to the database with optimized settings.
+
+    The CRUD helpers use the per-thread pooled connections instead; this is for
+    one-off maintenance work that closes its connection when done.
+    """
+    return _configure_connection(sqlite3.connect(_get_db_path()))
+
+
+class _ConnectionManager:
+    """One long-lived connection per thread (and database path).
+
+    Connections are created on first use in a thread with the PRAGMAs applied
+    once. A thread's connection is closed when the thread exits (its
+    thread-local storage is released) or when close_all() is called.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: "weakref.WeakSet[_PooledConnection]" = weakref.WeakSet()
+        self._generation = 0
+
+    def get(self, db_path: str) -> sqlite3.Connection:
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None and local.db_path == db_path and local.generation == self._generation:
+            return conn
+
+        if conn is not None:
+            self._discard(conn)
+
+        conn = sqlite3.connect(
+            db_path,
+            factory=_PooledConnection,
+            cached_statements=_SQL_STATEMENT_CACHE_SIZE,
+            check_same_thread=False,  # close_all() may run on another thread
+        )
+        _configure_connection(conn)
+        with self._lock:
+            self._connections.add(conn)
+            local.generation = self._generation
+        local.conn = conn
+        local.db_path = db_path
+        logger.debug("Opened cache database connection for thread %s", threading.current_thread().name)
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._connections.discard(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._local.conn = None
+
+    def close_all(self) -> int:
+        """Close every open connection; threads reconnect lazily on next use."""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            self._generation += 1
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug("Error closing cache database connection: %s", e)
+        self._local.conn = None
+        return len(connections)
+
+
+_connections = _ConnectionManager()
+
+
+def get_thread_connection() -> sqlite3.Connection:
+    """Get the calling thread's pooled connection (do not close it)."""
+    return _connections.get(_get_db_path())
+
+
+def close_connections() -> None:
+    """Close all pooled cache database connections (shutdown hook, idempotent)."""
+    closed = _connections.close_all()
+    if closed:
+        logger.debug("Closed %s cache database connection(s)", closed)
+
+
+@contextmanager
+def _pooled_cursor(db_path: str | None = None):
+    """Cursor on the thread's pooled connection; commits on success, rolls back on error."""
+    conn = _connections.get(db_path or _get_db_path())
+    cursor = conn.cursor()
+    try:
+        yield cursor
+        if conn.in_transaction:
+            conn.commit()
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+# Write-behind queue: flush when this many keys are pending ...
+CACHE_WRITE_BATCH_SIZE = 256
+# ... or this long after the first pending write
+CACHE_WRITE_FLUSH_INTERVAL_SEC = 0.5
+
+
+class _WriteBehindQueue:
+    """Coalesces cache writes into batched transactions.
+
+    Pending operations are keyed by normalized cache key, so only the last
+    write (or removal) of a key is committed. A background thread flushes when
+    CACHE_WRITE_BATCH_SIZE keys are pending or CACHE_WRITE_FLUSH_INTERVAL_SEC
+    after the first pending write; flush() commits synchronously.
+
+    Operations stay visible through lookup() until their transaction has
+    committed, so readers always see their own writes.
+    """
+
+    def __init__(
+        self,
+        upsert_sql: str = _SQL_UPSERT_ENTRY,
+        delete_sql: str = _SQL_DELETE_ENTRY,
+        name: str = "cache-write-behind",
+        batch_size: int = CACHE_WRITE_BATCH_SIZE,
+        flush_interval: float = CACHE_WRITE_FLUSH_INTERVAL_SEC,
+    ):
+        self.upsert_sql = upsert_sql
+        self.delete_sql = delete_sql
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # (db_path, key) -> row values after the key (see upsert_sql); None marks a removal
+        self._pending: dict[tuple[str, str], tuple | None] = {}
+        self._inflight: dict[tuple[str, str], tuple | None] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._has_pending = threading.Event()
+        self._batch_full = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def put(self, key: str, row: tuple | None) -> None:
+        """Queue a row write (or a removal when row is None) for a normalized key."""
+        db_path = _get_db_path()
+        with self._lock:
+            self._pending[(db_path, key)] = row
+            pending_count = len(self._pending)
+            self._ensure_thread_locked()
+        self._has_pending.set()
+        if pending_count >= self.batch_size:
+            self._batch_full.set()
+
+    def lookup(self, key: str) -> tuple[bool, tuple | None]:
+        """Return (found, row) for a key with an uncommitted operation (row None for a removal)."""
+        pending_key = (_get_db_path(), key)
+        with self._lock:
+            for operations in (self._pending, self._inflight):
+                if pending_key in operations:
+                    return True, operations[pending_key]
+        return False, None
+
+    def pending_rows(self) -> dict[str, tuple | None]:
+        """Snapshot of the uncommitted operations for the current database, keyed by cache key."""
+        db_path = _get_db_path()
+        with self._lock:
+            operations = {**self._inflight, **self._pending}
+        return {key: row for (path, key), row in operations.items() if path == db_path}
+
+    def pending_count(self) -> int:
+        """Number of keys waiting to be committed to the current database."""
+        db_path = _get_db_path()
+        with self._lock:
+            return sum(1 for key in self._pending if key[0] == db_path)
+
+    def flush(self) -> int:
+        """Commit all pending operations in one transaction; returns the number of keys written."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+
+            start_time = time.perf_counter()
+            failed = 0
+            for db_path in {db_path for db_path, _ in batch}:
+                entries = {key: entry for key, entry in batch.items() if key[0] == db_path}
+                try:
+                    with _pooled_cursor(db_path) as cursor:
+                        cursor.executemany(
+                            self.upsert_sql, [(key, *row) for (_, key), row in entries.items() if row is not None]
+                        )
+                        cursor.executemany(
+                            self.delete_sql, [(key,) for (_, key), row in entries.items() if row is None]
+                        )
+                except Exception as e:
+                    # Same policy as the former direct writes: log and drop (the cache is rebuilt by scans)
+                    logger.error("Failed to flush %s cache write(s): %s", len(entries), e)
+                    failed += len(entries)
+
+            with self._lock:
+                self._inflight = {}
+
+            logger.debug(
+                "Flushed %s cache operation(s) in %.1fms",
+                len(batch) - failed,
+                (time.perf_counter() - start_time) * 1000,
+            )
+            return len(batch) - failed
+
+    def discard(self) -> None:
+        """Drop pending operations for the current database (waits for an in-flight flush)."""
+        db_path = _get_db_path()
+        with self._flush_lock:
+            with self._lock:
+                self._pending = {key: entry for key, entry in self._pending.items() if key[0] != db_path}
+
+    def _ensure_thread_locked(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._has_pending.wait()
+            self._batch_full.wait(self.flush_interval)
+            self._has_pending.clear()
+            self._batch_full.clear()
+            self.flush()
+
+
+_writes = _WriteBehindQueue()
+# (file_size, mtime, duration_ms) rows of probed audio durations
+_duration_writes = _WriteBehindQueue(_SQL_UPSERT_DURATION, _SQL_DELETE_DURATION, name="duration-write-behind")
+
+
+def flush_cache_writes() -> int:
+    """Commit all queued cache writes now (e.g. on shutdown or cancellation).
+
+    Returns:
+        int: Number of cache keys written or removed
+    """
+    return _writes.flush() + _duration_writes.flush()
+
+
+def shutdown_cache() -> None:
+    """Flush queued cache writes and close all pooled connections (shutdown hook)."""
+    flush_cache_writes()
+    close_connections()
+
+
+# Daemon flusher threads do not survive interpreter exit; commit what is left
+atexit.register(flush_cache_writes)
+
+
 # ---------------------------------------------------------------------------
 # Maintenance & migrations
 # ---------------------------------------------------------------------------
@@ -141,6 +543,9 @@ def migrate_cache_paths():
     This fixes the issue where the same song was cached with both
     Z:/Songs/Artist/song.txt and Z:/Songs\\Artist\\song.txt paths.
 
+    Runs on every start, so only keys and timestamps are read (index-only);
+    song blobs are touched for duplicate groups alone.
+
     Returns:
         int: Number of duplicate entries removed
     """
@@ -148,54 +553,44 @@ def migrate_cache_paths():
         conn = get_connection()
         cursor = conn.cursor()
 
-        # Get all cache entries
-        cursor.execute("SELECT file_path, song_data, timestamp FROM song_cache")
-        all_entries = cursor.fetchall()
+        cursor.execute("SELECT file_path, timestamp FROM song_cache")
+        groups: dict[str, list[tuple[str, str]]] = {}
+        for file_path, timestamp in cursor.fetchall():
+            groups.setdefault(normalize_cache_key(file_path).lower(), []).append((file_path, timestamp or ""))
 
-        if not all_entries:
+        duplicates = {key: entries for key, entries in groups.items() if len(entries) > 1}
+        if not duplicates:
             conn.close()
             return 0
 
-        # Track normalized paths to detect duplicates
-        normalized_map = {}  # normalized_path -> (song_data, timestamp, original_path)
-        duplicates_removed = 0
-
-        for file_path, song_data, timestamp in all_entries:
-            normalized_path = normalize_cache_key(file_path).lower()
-
-            # If normalized path already exists, keep the newer entry
-            if normalized_path in normalized_map:
-                duplicates_removed += 1
-                existing_timestamp = normalized_map[normalized_path][1]
-                # Keep the newer timestamp
-                if timestamp > existing_timestamp:
-                    normalized_map[normalized_path] = (song_data, timestamp, file_path)
-            else:
-                normalized_map[normalized_path] = (song_data, timestamp, file_path)
+        duplicates_removed = sum(len(entries) - 1 for entries in duplicates.values())
+        logger.info(
+            "Found %s duplicate cache entries with different path separators",
+            duplicates_removed,
+        )
 
-        if duplicates_removed > 0:
-            logger.info(
-                "Found %s duplicate cache entries with different path separators",
-                duplicates_removed,
+        for normalized_path, entries in duplicates.items():
+            # Keep the newest entry of each group under the normalized key
+            newest_path = max(entries, key=lambda entry: entry[1])[0]
+            cursor.execute(
+                "SELECT song_data, timestamp, txt_mtime, txt_size, audio_mtime FROM song_cache WHERE file_path=?",
+                (newest_path,),
             )
-
-            # Clear the entire cache table
-            cursor.execute("DELETE FROM song_cache")
-
-            # Re-insert with normalized paths
-            for normalized_path, (song_data, timestamp, _) in normalized_map.items():
-                cursor.execute(
-                    "INSERT INTO song_cache (file_path, song_data, timestamp) VALUES (?, ?, ?)",
-                    (normalized_path, song_data, timestamp)
-                )
-
-            conn.commit()
-            logger.info(
-                "Cache normalized: removed %s duplicates, kept %s unique songs",
-                duplicates_removed,
-                len(normalized_map),
+            row = cursor.fetchone()
+            cursor.executemany(_SQL_DELETE_ENTRY, ((file_path,) for file_path, _ in entries))
+            cursor.execute(
+                "INSERT INTO song_cache (file_path, song_data, timestamp, txt_mtime, txt_size, audio_mtime) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (normalized_path, *row),
             )
 
+        conn.commit()
+        logger.info(
+            "Cache normalized: removed %s duplicates, kept %s unique songs",
+            duplicates_removed,
+            len(groups),
+        )
+
         conn.close()
         return duplicates_removed
     except Exception as e:
@@ -231,16 +626,92 @@ def init_database():
     CREATE TABLE IF NOT EXISTS song_cache (
         file_path TEXT PRIMARY KEY,
         song_data BLOB,
-        timestamp DATETIME
+        timestamp DATETIME,
+        txt_mtime REAL,
+        txt_size INTEGER,
+        audio_mtime REAL
     )
     """
     )
 
+    # Pre-v3 tables: add the stat fingerprint columns (existing rows keep NULLs until rewritten)
+    cursor.execute("PRAGMA table_info(song_cache)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    for column, column_type in _FINGERPRINT_COLUMNS:
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE song_cache ADD COLUMN {column} {column_type}")
+
     # Create index on file_path for fast prefix filtering
     cursor.execute(
         "CREATE INDEX IF NOT EXISTS idx_song_cache_file_path ON song_cache(file_path)"
     )
 
+    # Covering index for freshness checks (get_cache_file_stats never touches the song blobs)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_song_cache_freshness "
+        "ON song_cache(file_path, txt_mtime, txt_size, audio_mtime, timestamp)"
+    )
+
+    # Probed audio durations; a row only matches while the file's size and mtime are unchanged
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS audio_duration (
+        file_path TEXT PRIMARY KEY,
+        file_size INTEGER,
+        mtime REAL,
+        duration_ms REAL
+    )
+    """
+    )
+
+    # Directory journal of the last completed scan (lets rescans skip unchanged song folders).
+    # Journals without song file stats are dropped; the next scan lists everything once.
+    cursor.execute("PRAGMA table_info(scan_journal)")
+    journal_columns = {row[1] for row in cursor.fetchall()}
+    if journal_columns and "song_files" not in journal_columns:
+        cursor.execute("DROP TABLE scan_journal")
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS scan_journal (
+        dir_path TEXT PRIMARY KEY,
+        mtime_ns INTEGER,
+        entry_count INTEGER,
+        subdir_count INTEGER,
+        song_count INTEGER,
+        song_files TEXT
+    )
+    """
+    )
+
+    # Detector output keyed by audio content, original gap and detector settings (re-detection skips Demucs)
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS detection_result (
+        result_key TEXT PRIMARY KEY,
+        detected_gap INTEGER,
+        silence_periods TEXT,
+        confidence REAL,
+        detection_method TEXT,
+        vocals_file TEXT,
+        timestamp DATETIME
+    )
+    """
+    )
+
+    # Loudness measurements keyed by audio content (normalization skips files already at the target)
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS loudness_measurement (
+        audio_key TEXT PRIMARY KEY,
+        integrated REAL,
+        true_peak REAL,
+        lra REAL,
+        threshold REAL,
+        timestamp DATETIME
+    )
+    """
+    )
+
     # Create metadata table for cache versioning
     cursor.execute(
         """
@@ -266,6 +737,8 @@ def init_database():
         if current_version in CACHE_VERSIONS_REQUIRING_CLEAR:
             logger.warning("This upgrade requires clearing the cache due to structural changes.")
             cursor.execute("DELETE FROM song_cache")
+            cursor.execute("DELETE FROM scan_journal")
+            _remove_library_snapshots()
             _cache_was_cleared = True
             logger.info("Cache cleared as part of version upgrade")
         else:
@@ -347,12 +820,13 @@ def get_cache_entry(key, modified_time=None):
     _ensure_initialized()
     key = normalize_cache_key(key).lower()  # Normalize path separators and lowercase
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT song_data, timestamp FROM song_cache WHERE file_path=?", (key,))
-        result = cursor.fetchone()
-        conn.close()
+        pending, pending_row = _writes.lookup(key)
+        if pending:
+            result = pending_row[:2] if pending_row is not None else None
+        else:
+            with _pooled_cursor() as cursor:
+                cursor.execute(_SQL_SELECT_ENTRY, (key,))
+                result = cursor.fetchone()
 
         if result is None:
             return None
@@ -375,12 +849,14 @@ def set_cache_entry(key, obj):
     """
     Store or update an object in the cache.
 
+    The object is serialized immediately; the database write is queued and
+    committed in a batch (see flush_cache_writes()).
+
     Args:
         key (str): The cache key (filepath)
         obj (object): The object to cache
     """
     _ensure_initialized()
-    key = normalize_cache_key(key).lower()  # Normalize path separators and lowercase for indexing
     start_time = time.perf_counter()
 
     try:
@@ -404,18 +880,24 @@ def clear_cache(key=None):
     _ensure_initialized()
     if key:
         key = normalize_cache_key(key)  # Normalize path separators
+        flush_cache_writes()
+    else:
+        _writes.discard()
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        if key:
-            cursor.execute("DELETE FROM song_cache WHERE file_path=?", (key,))
-        else:
-            cursor.execute("DELETE FROM song_cache")
-
-        rows_affected = cursor.rowcount
-        conn.commit()
-        conn.close()
+        with _pooled_cursor() as cursor:
+            if key:
+                cursor.execute(_SQL_DELETE_ENTRY, (key,))
+            else:
+                cursor.execute("DELETE FROM song_cache")
+            rows_affected = cursor.rowcount
+            if not key:
+                # Without cache entries the journal would let the next scan skip songs
+                cursor.execute("DELETE FROM scan_journal")
+                cursor.execute("DELETE FROM detection_result")
+                cursor.execute("DELETE FROM loudness_measurement")
+        if not key:
+            _remove_library_snapshots()
+            _remove_peaks_cache()
         if rows_affected > 0:
             logger.info("Cleared %s cache entries", rows_affected)
     except Exception as e:
@@ -442,13 +924,11 @@ def get_all_cache_entries(deserialize=False):
         If deserialize=True: Dictionary mapping file_path to deserialized song objects
     """
     _ensure_initialized()
+    flush_cache_writes()
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT file_path, song_data, timestamp FROM song_cache")
-        results = cursor.fetchall()
-        conn.close()
+        with _pooled_cursor() as cursor:
+            cursor.execute("SELECT file_path, song_data, timestamp FROM song_cache")
+            results = cursor.fetchall()
 
         if not deserialize:
             # Return raw data (file_path, song_data) tuples
@@ -483,9 +963,10 @@ def stream_cache_entries(page_size=500, directory_filter=None):
         tuple: (file_path, song_data, timestamp) for each cache entry
     """
     _ensure_initialized()
+    flush_cache_writes()
+    cursor = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        cursor = get_thread_connection().cursor()
 
         if directory_filter:
             # Optimized rowid-based pagination with directory pre-filtering
@@ -527,10 +1008,12 @@ def stream_cache_entries(page_size=500, directory_filter=None):
                     yield row
 
                 offset += page_size
-
-        conn.close()
     except Exception as e:
         logger.error("Error streaming cache entries: %s", str(e))
+    finally:
+        # Release the statement (and its WAL read snapshot) even if the consumer stops early
+        if cursor is not None:
+            cursor.close()
 
 
 def remove_cache_entry(file_path):
@@ -541,51 +1024,348 @@ def remove_cache_entry(file_path):
         file_path (str): Path of the file to remove from cache
     """
     _ensure_initialized()
-    file_path = normalize_cache_key(file_path)  # Normalize path separators
+    file_path = normalize_cache_key(file_path).lower()  # Same key format as set_cache_entry
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("DELETE FROM song_cache WHERE file_path = ?", (file_path,))
-        conn.commit()
-        conn.close()
+        _writes.put(file_path, None)
     except Exception as e:
         logger.error("Error removing cache entry for %s: %s", file_path, str(e))
 
 
+def get_cache_file_stats(directory_filter=None) -> dict[str, CacheFileStat]:
+    """
+    Return the stat fingerprint of every cache entry without reading song data.
+
+    One index-only query; pending writes are overlaid, so the result matches
+    what get_cache_entry() would see.
+
+    Args:
+        directory_filter: Optional directory path to restrict the result to
+
+    Returns:
+        dict: Normalized cache key -> CacheFileStat
+    """
+    _ensure_initialized()
+    sql, params = _SQL_SELECT_FILE_STATS, ()
+    prefix = None
+    if directory_filter:
+        prefix = normalize_cache_key(directory_filter).lower().rstrip("/\\") + "/"
+        sql, params = sql + " WHERE file_path LIKE ? ESCAPE '\\'", (prefix + "%",)
+
+    try:
+        with _pooled_cursor() as cursor:
+            cursor.execute(sql, params)
+            stats = {row[0]: CacheFileStat(*row[1:]) for row in cursor.fetchall()}
+    except Exception as e:
+        logger.error("Error reading cache file stats: %s", str(e))
+        return {}
+
+    for key, row in _writes.pending_rows().items():
+        if prefix is not None and not key.startswith(prefix):
+            continue
+        if row is None:
+            stats.pop(key, None)
+        else:
+            stats[key] = CacheFileStat(row[2], row[3], row[4], row[1])
+    return stats
+
+
+def is_cache_entry_fresh(
+    entry: CacheFileStat | None, txt_mtime: float, txt_size: int, audio_mtime: float | None = None
+) -> bool:
+    """
+    Decide from stat results alone whether a cache entry still matches its files.
+
+    Entries written before the fingerprint columns existed fall back to the
+    former rule (cached after the txt file was last modified).
+
+    Args:
+        entry: Fingerprint from get_cache_file_stats() (None if not cached)
+        txt_mtime: Current st_mtime of the txt file
+        txt_size: Current st_size of the txt file
+        audio_mtime: Current st_mtime of the audio file, if known
+
+    Returns:
+        bool: True if the cached song can be used as is
+    """
+    if entry is None:
+        return False
+    if entry.txt_mtime is None or entry.txt_size is None:
+        try:
+            cached_at = datetime.datetime.fromisoformat(entry.timestamp)
+        except (TypeError, ValueError):
+            return False
+        return datetime.datetime.fromtimestamp(txt_mtime) <= cached_at
+    if entry.txt_mtime != txt_mtime or entry.txt_size != txt_size:
+        return False
+    return audio_mtime is None or entry.audio_mtime is None or entry.audio_mtime == audio_mtime
+
+
+def find_stale_paths(
+    file_stats: Mapping[str, tuple[float, int]], cached_stats: Mapping[str, CacheFileStat] | None = None
+) -> set[str]:
+    """
+    Return the paths whose cache entry is missing or outdated.
+
+    Args:
+        file_stats: File path -> (st_mtime, st_size) of the txt files on disk
+        cached_stats: Result of get_cache_file_stats() (queried if omitted)
+
+    Returns:
+        set: The file_stats keys that need to be (re)loaded from disk
+    """
+    if cached_stats is None:
+        cached_stats = get_cache_file_stats()
+    return {
+        path
+        for path, (txt_mtime, txt_size) in file_stats.items()
+        if not is_cache_entry_fresh(cached_stats.get(normalize_cache_key(path).lower()), txt_mtime, txt_size)
+    }
+
+
 def cleanup_stale_entries(valid_paths):
     """
     Remove cache entries for files that no longer exist.
 
+    The valid paths are loaded into a temporary table and the stale rows are
+    deleted in one set-based statement.
+
     Args:
-        valid_paths (set): Set of file paths that still exist
+        valid_paths (set): Set of normalized cache keys that still exist
 
     Returns:
         int: Number of stale entries removed
     """
     _ensure_initialized()
+    flush_cache_writes()
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with _pooled_cursor() as cursor:
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS valid_cache_paths (file_path TEXT PRIMARY KEY)")
+            cursor.execute("DELETE FROM valid_cache_paths")
+            cursor.executemany("INSERT OR IGNORE INTO valid_cache_paths VALUES (?)", ((path,) for path in valid_paths))
+            cursor.execute("DELETE FROM song_cache WHERE file_path NOT IN (SELECT file_path FROM valid_cache_paths)")
+            removed = cursor.rowcount
+            cursor.execute("DELETE FROM valid_cache_paths")
+
+        if removed > 0:
+            logger.info("Removed %s stale cache entries", removed)
+
+        return removed
+    except Exception as e:
+        logger.error("Error cleaning up stale cache entries: %s", str(e))
+        return 0
 
-        # Get all cached paths
-        cursor.execute("SELECT file_path FROM song_cache")
-        cached_paths = [row[0] for row in cursor.fetchall()]
 
-        # Find paths that are in cache but not in valid_paths
-        stale_paths = [path for path in cached_paths if path not in valid_paths]
+def get_cached_audio_duration(audio_file: str, file_size: int, mtime: float) -> float | None:
+    """
+    Look up a memoized audio duration.
 
-        # Remove stale entries
-        for path in stale_paths:
-            cursor.execute("DELETE FROM song_cache WHERE file_path = ?", (path,))
+    Args:
+        audio_file: Path to the audio file
+        file_size: Current file size in bytes
+        mtime: Current modification time (st_mtime)
 
-        conn.commit()
-        conn.close()
+    Returns:
+        float or None: Duration in milliseconds, or None if unknown or the file changed
+    """
+    _ensure_initialized()
+    key = normalize_cache_key(audio_file).lower()
+    try:
+        pending, pending_row = _duration_writes.lookup(key)
+        if pending:
+            if pending_row is None or tuple(pending_row[:2]) != (file_size, mtime):
+                return None
+            return pending_row[2]
+        with _pooled_cursor() as cursor:
+            cursor.execute(_SQL_SELECT_DURATION, (key, file_size, mtime))
+            result = cursor.fetchone()
+        return result[0] if result else None
+    except Exception as e:
+        logger.error("Error reading cached duration for %s: %s", audio_file, e)
+        return None
 
-        if stale_paths:
-            logger.info("Removed %s stale cache entries", len(stale_paths))
 
-        return len(stale_paths)
+def set_cached_audio_duration(audio_file: str, file_size: int, mtime: float, duration_ms: float) -> None:
+    """
+    Memoize an audio duration for the given file size and mtime (write is batched).
+
+    Args:
+        audio_file: Path to the audio file
+        file_size: File size in bytes the duration was probed at
+        mtime: Modification time (st_mtime) the duration was probed at
+        duration_ms: Duration in milliseconds
+    """
+    _ensure_initialized()
+    try:
+        _duration_writes.put(normalize_cache_key(audio_file).lower(), (file_size, mtime, duration_ms))
     except Exception as e:
-        logger.error("Error cleaning up stale cache entries: %s", str(e))
-        return 0
+        logger.error("Failed to cache duration for %s: %s", audio_file, e)
+
+
+def _journal_prefix(directory: str) -> str:
+    return normalize_cache_key(directory).lower().rstrip("/\\") + "/"
+
+
+def get_scan_journal(directory_filter=None) -> dict[str, ScanJournalEntry]:
+    """
+    Return the directory journal written by the last completed scan.
+
+    Args:
+        directory_filter: Optional root directory to restrict the result to
+            (the root itself is included)
+
+    Returns:
+        dict: Normalized directory key -> ScanJournalEntry
+    """
+    _ensure_initialized()
+    sql, params = _SQL_SELECT_JOURNAL, ()
+    if directory_filter:
+        prefix = _journal_prefix(directory_filter)
+        sql += " WHERE dir_path = ? OR dir_path LIKE ? ESCAPE '\\'"
+        params = (prefix[:-1], prefix + "%")
+    try:
+        with _pooled_cursor() as cursor:
+            cursor.execute(sql, params)
+            return {
+                row[0]: ScanJournalEntry(*row[1:5], tuple(tuple(f) for f in json.loads(row[5] or "[]")))
+                for row in cursor.fetchall()
+            }
+    except Exception as e:
+        logger.error("Error reading scan journal: %s", str(e))
+        return {}
+
+
+def replace_scan_journal(directory: str, entries: Mapping[str, ScanJournalEntry]) -> None:
+    """
+    Replace the journal of a directory tree in one transaction.
+
+    Rows of folders that were not part of the scan (removed folders) are dropped.
+
+    Args:
+        directory: Root directory that was scanned
+        entries: Normalized directory key -> ScanJournalEntry for the whole tree
+    """
+    _ensure_initialized()
+    prefix = _journal_prefix(directory)
+    try:
+        with _pooled_cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM scan_journal WHERE dir_path = ? OR dir_path LIKE ? ESCAPE '\\'",
+                (prefix[:-1], prefix + "%"),
+            )
+            cursor.executemany(
+                _SQL_INSERT_JOURNAL,
+                ((key, *entry[:4], json.dumps(entry.song_files)) for key, entry in entries.items()),
+            )
+        logger.debug("Scan journal updated: %s directories", len(entries))
+    except Exception as e:
+        logger.error("Failed to write scan journal: %s", e)
+
+
+def invalidate_scan_journal(*directories: str) -> None:
+    """
+    Forget the journal rows of the given directories so the next scan lists them again.
+
+    Args:
+        directories: Directory paths that changed
+    """
+    _ensure_initialized()
+    try:
+        with _pooled_cursor() as cursor:
+            cursor.executemany(
+                _SQL_DELETE_JOURNAL, ((normalize_cache_key(path).lower().rstrip("/"),) for path in directories)
+            )
+    except Exception as e:
+        logger.error("Failed to invalidate scan journal: %s", e)
+
+
+def get_detection_result(result_key: str) -> DetectionResultEntry | None:
+    """
+    Look up a memoized detection result.
+
+    Args:
+        result_key: Key built from the audio content and the detector settings
+            (see utils.gap_detection.result_cache)
+
+    Returns:
+        DetectionResultEntry or None if the key was never detected
+    """
+    _ensure_initialized()
+    try:
+        with _pooled_cursor() as cursor:
+            cursor.execute(_SQL_SELECT_DETECTION, (result_key,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        silence_periods = [(float(start), float(end)) for start, end in json.loads(row[1])]
+        return DetectionResultEntry(row[0], silence_periods, row[2], row[3], row[4])
+    except Exception as e:
+        logger.error("Error reading detection result %s: %s", result_key, e)
+        return None
+
+
+def set_detection_result(result_key: str, entry: DetectionResultEntry) -> None:
+    """
+    Memoize a detection result.
+
+    Args:
+        result_key: Key built from the audio content and the detector settings
+        entry: Detector output to store
+    """
+    _ensure_initialized()
+    try:
+        silence_periods = json.dumps([[float(start), float(end)] for start, end in entry.silence_periods])
+        with _pooled_cursor() as cursor:
+            cursor.execute(
+                _SQL_UPSERT_DETECTION,
+                (
+                    result_key,
+                    int(entry.detected_gap),
+                    silence_periods,
+                    entry.confidence,
+                    entry.detection_method,
+                    entry.vocals_file,
+                    datetime.datetime.now().isoformat(),
+                ),
+            )
+    except Exception as e:
+        logger.error("Failed to store detection result %s: %s", result_key, e)
+
+
+def get_loudness_measurement(audio_key: str) -> LoudnessEntry | None:
+    """
+    Look up a memoized loudness measurement.
+
+    Args:
+        audio_key: Key built from the audio content (see utils.audio.loudness_key)
+
+    Returns:
+        LoudnessEntry or None if the audio was never measured
+    """
+    _ensure_initialized()
+    try:
+        with _pooled_cursor() as cursor:
+            cursor.execute(_SQL_SELECT_LOUDNESS, (audio_key,))
+            row = cursor.fetchone()
+        return LoudnessEntry(*row) if row else None
+    except Exception as e:
+        logger.error("Error reading loudness measurement %s: %s", audio_key, e)
+        return None
+
+
+def set_loudness_measurement(audio_key: str, entry: LoudnessEntry) -> None:
+    """
+    Memoize a loudness measurement.
+
+    Args:
+        audio_key: Key built from the audio content
+        entry: Measured values to store
+    """
+    _ensure_initialized()
+    try:
+        with _pooled_cursor() as cursor:
+            cursor.execute(
+                _SQL_UPSERT_LOUDNESS,
+                (audio_key, *(float(value) for value in entry), datetime.datetime.now().isoformat()),
+            )
+    except Exception as e:
+        logger.error("Failed to store loudness measurement %s: %s", audio_key, e)
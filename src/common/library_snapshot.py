@@ -0,0 +1,307 @@
+"""Memory-mapped library snapshot for instant song list start-up.
+
+The snapshot holds exactly what the song table shows per song (paths, artist,
+title, status, gap, detected gap, diff, duration, normalization, timestamps)
+in fixed-size rows plus one string heap, so start-up can populate the list
+from one mmap without touching the SQLite cache. Songs created from it carry
+a reduced GapInfo; the full Song is read from the cache when a row is
+selected (see Songs.hydrate).
+
+File layout: a sequence of segments, each
+
+- header: magic, format version, row count, heap size
+- rows: fixed-size records (heap offset/length, numbers, status bytes, flags)
+- heap: per row, the row's strings joined by NUL (UTF-8)
+
+A full write produces one segment; later changes can be appended as extra
+segments (rows replace earlier rows of the same txt file, tombstone rows
+remove them). A truncated trailing segment (crash while appending) is ignored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+from typing import Iterable, Optional
+
+from common.database import get_cache_dir, normalize_cache_key
+from model.gap_info import GapInfo, GapInfoStatus
+from model.song import Song, SongStatus
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"USNP"
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_FILE_PREFIX = "library_snapshot_"
+# Appending stops paying off once readers have to merge many segments
+SNAPSHOT_MAX_SEGMENTS = 16
+
+_SEGMENT_HEADER = struct.Struct("<4sHHII")  # magic, version, reserved, row count, heap size
+# heap offset, heap length, gap, bpm, start, duration_ms, usdb_id, detected_gap, diff, original_gap,
+# normalization_level, song status, gap status, flags, pad
+_ROW = struct.Struct("<IIqdqdqqqqdBBBx")
+
+_NO_INT = -(2**63)  # usdb_id None
+_TOMBSTONE_NUMBERS = (0, 0.0, 0, 0.0, _NO_INT, 0, 0, 0, float("nan"))
+_NO_GAP_INFO = 0xFF
+_FLAG_RELATIVE = 0x01
+_FLAG_NORMALIZED = 0x02
+_FLAG_TOMBSTONE = 0x04
+
+_SONG_STATUSES = tuple(SongStatus)
+_SONG_STATUS_INDEX = {status: index for index, status in enumerate(_SONG_STATUSES)}
+_GAP_STATUSES = tuple(GapInfoStatus)
+_GAP_STATUS_INDEX = {status: index for index, status in enumerate(_GAP_STATUSES)}
+_STRING_SEPARATOR = "\x00"
+_PREFIX_MARKER = "\x01"  # path is stored relative to the library directory
+_NAN = float("nan")
+
+
+def snapshot_path(directory: str) -> str:
+    """Snapshot file of a library directory (one file per directory, next to the cache database)."""
+    key = normalize_cache_key(directory).lower().rstrip("/")
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(get_cache_dir(), f"{SNAPSHOT_FILE_PREFIX}{digest}.bin")
+
+
+def _relative(path: str, prefix: str) -> str:
+    if path and path.startswith(prefix):
+        return _PREFIX_MARKER + path[len(prefix) :]
+    return path or ""
+
+
+def _absolute(path: str, prefix: str) -> str:
+    return prefix + path[1:] if path[:1] == _PREFIX_MARKER else path
+
+
+def _clean(value) -> str:
+    return str(value).replace(_STRING_SEPARATOR, " ") if value else ""
+
+
+def _int(value) -> int:
+    return int(round(value)) if value else 0
+
+
+def _encode_rows(songs: Iterable[Song], removed: Iterable[str], prefix: str) -> bytes:
+    rows, heap = [], bytearray()
+
+    def add(strings: list, numbers: tuple, status: int, gap_status: int, flags: int):
+        data = _STRING_SEPARATOR.join(strings).encode("utf-8")
+        rows.append(_ROW.pack(len(heap), len(data), *numbers, status, gap_status, flags))
+        heap.extend(data)
+
+    for song in songs:
+        info = song.gap_info
+        level = info.normalization_level if info else None
+        numbers = (
+            _int(song.gap),
+            float(song.bpm or 0),
+            _int(song.start),
+            float(song.duration_ms or 0),
+            _NO_INT if song.usdb_id is None else int(song.usdb_id),
+            _int(info.detected_gap) if info else 0,
+            _int(info.diff) if info else 0,
+            _int(info.original_gap) if info else 0,
+            _NAN if level is None else float(level),
+        )
+        strings = [
+            _relative(song.txt_file, prefix),
+            _relative(song.audio_file, prefix),
+            song.title,
+            song.artist,
+            song.audio,
+            song.error_message,
+            song._status_changed_str,
+            song.title_sort_key,
+        ]
+        if info:
+            strings += [
+                _relative(info.file_path, prefix),
+                info.txt_basename,
+                info.processed_time,
+                info.normalized_date,
+                info.error_message,
+            ]
+        flags = (_FLAG_RELATIVE if song.is_relative else 0) | (_FLAG_NORMALIZED if info and info.is_normalized else 0)
+        gap_status = _GAP_STATUS_INDEX[info.status] if info else _NO_GAP_INFO
+        add([_clean(value) for value in strings], numbers, _SONG_STATUS_INDEX[song.status], gap_status, flags)
+
+    for txt_file in removed:
+        add([_clean(_relative(txt_file, prefix))], _TOMBSTONE_NUMBERS, 0, _NO_GAP_INFO, _FLAG_TOMBSTONE)
+
+    header = _SEGMENT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, 0, len(rows), len(heap))
+    return header + b"".join(rows) + bytes(heap)
+
+
+def _prefix(directory: str) -> str:
+    return directory.rstrip("/\\") + os.sep
+
+
+def write_library_snapshot(directory: str, songs: Iterable[Song]) -> Optional[str]:
+    """
+    Write the snapshot of a library (replaces the file atomically).
+
+    Args:
+        directory: Library root directory
+        songs: Songs in list order
+
+    Returns:
+        str or None: Snapshot path, or None if it could not be written
+    """
+    path = snapshot_path(directory)
+    try:
+        data = _encode_rows(songs, (), _prefix(directory))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return path
+    except (OSError, KeyError, TypeError, ValueError, struct.error) as e:
+        logger.warning("Failed to write library snapshot for %s: %s", directory, e)
+        return None
+
+
+def append_library_snapshot(directory: str, songs: Iterable[Song], removed_txt_files: Iterable[str] = ()) -> int:
+    """
+    Append changed and removed songs to an existing snapshot as a new segment.
+
+    Args:
+        directory: Library root directory
+        songs: Added or changed songs
+        removed_txt_files: txt paths of songs that left the library
+
+    Returns:
+        int: Number of segments in the file afterwards (0 if there is no snapshot to append to)
+    """
+    path = snapshot_path(directory)
+    if not os.path.exists(path):
+        return 0
+    try:
+        data = _encode_rows(songs, removed_txt_files, _prefix(directory))
+        with open(path, "ab") as f:
+            f.write(data)
+        return _count_segments(path)
+    except (OSError, KeyError, TypeError, ValueError, struct.error) as e:
+        logger.warning("Failed to append to library snapshot for %s: %s", directory, e)
+        return 0
+
+
+def delete_library_snapshots() -> None:
+    """Remove all library snapshots (they must not outlive the cache they mirror)."""
+    cache_dir = get_cache_dir()
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith(SNAPSHOT_FILE_PREFIX):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError as e:
+                logger.warning("Failed to remove library snapshot %s: %s", name, e)
+
+
+def _segments(view) -> Iterable[tuple[int, int, int]]:
+    """Yield (rows offset, row count, heap offset) of each complete segment."""
+    position, size = 0, len(view)
+    while position + _SEGMENT_HEADER.size <= size:
+        magic, version, _, row_count, heap_size = _SEGMENT_HEADER.unpack_from(view, position)
+        rows_start = position + _SEGMENT_HEADER.size
+        heap_start = rows_start + row_count * _ROW.size
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT_VERSION or heap_start + heap_size > size:
+            return
+        yield rows_start, row_count, heap_start
+        position = heap_start + heap_size
+
+
+def _count_segments(path: str) -> int:
+    with open(path, "rb") as f:
+        data = f.read()
+    return sum(1 for _ in _segments(data))
+
+
+def _decode_song(row: tuple, strings: list, prefix: str) -> Song:
+    _, _, gap, bpm, start, duration_ms, usdb_id, detected_gap, diff, original_gap, level = row[:11]
+    status, gap_status, flags = row[11:]
+
+    song = Song.__new__(Song)
+    song.txt_file = _absolute(strings[0], prefix)
+    song.audio_file = _absolute(strings[1], prefix)
+    song.title, song.artist, song.audio = strings[2], strings[3], strings[4]
+    song.gap = gap
+    song.bpm = bpm
+    song.start = start
+    song.is_relative = bool(flags & _FLAG_RELATIVE)
+    song.usdb_id = None if usdb_id == _NO_INT else usdb_id
+    song.duration_ms = duration_ms
+    song.notes = None
+    song._status = _SONG_STATUSES[status]
+    song._status_changed_at = None
+    song._status_changed_str = strings[6]
+    song.error_message = strings[5]
+    song._title_sort_key = strings[7]
+    song._gap_info = None
+
+    if gap_status != _NO_GAP_INFO:
+        info = GapInfo(_absolute(strings[8], prefix), strings[9])
+        info._status = _GAP_STATUSES[gap_status]
+        info.detected_gap = detected_gap
+        info.diff = diff
+        info.original_gap = original_gap
+        info.normalization_level = None if level != level else level  # NaN = None
+        info.is_normalized = bool(flags & _FLAG_NORMALIZED)
+        info.processed_time = strings[10]
+        info.normalized_date = strings[11] or None
+        info.error_message = strings[12] or None
+        info.duration = song.duration_ms
+        info.owner = song
+        song._gap_info = info
+    return song
+
+
+def load_library_snapshot(directory: str) -> list[Song]:
+    """
+    Load the songs of a library snapshot via mmap.
+
+    The songs carry the table fields only (no notes, reduced GapInfo);
+    Songs.hydrate() replaces them with the cached Song on selection.
+
+    Args:
+        directory: Library root directory
+
+    Returns:
+        list: Songs in list order (empty if there is no usable snapshot)
+    """
+    path = snapshot_path(directory)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return []
+
+    prefix = _prefix(directory)
+    songs: dict[str, Song] = {}
+    try:
+        with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for rows_start, row_count, heap_start in _segments(view):
+                    rows_end = rows_start + row_count * _ROW.size
+                    for row in _ROW.iter_unpack(view[rows_start:rows_end]):
+                        offset = heap_start + row[0]
+                        strings = str(view[offset : offset + row[1]], "utf-8").split(_STRING_SEPARATOR)
+                        key = strings[0].lower()
+                        if row[-1] & _FLAG_TOMBSTONE:
+                            songs.pop(key, None)
+                        else:
+                            songs[key] = _decode_song(row, strings, prefix)
+            finally:
+                view.release()
+    except (OSError, ValueError, IndexError, UnicodeDecodeError, struct.error) as e:
+        # ValueError also covers mmap of an empty file
+        logger.warning("Ignoring unreadable library snapshot %s: %s", path, e)
+        return []
+    return list(songs.values())
@@ -0,0 +1,345 @@
+"""Compact binary records for cached Song objects.
+
+Replaces pickled Song object graphs in the song cache with a
+versioned, schema-driven layout:
+
+- Numeric/bool/datetime fields are packed into one float64 block plus one
+  kind byte per field (None, int, float, bool, datetime), so ints and floats
+  round-trip exactly as they were stored.
+- String fields reference a per-record string table. Equal strings are stored
+  once, and paths inside the song folder are stored relative to it (the folder
+  prefix is written once per record).
+- GapInfo.silence_periods is a packed float64 array.
+
+Records are decoded with precompiled struct layouts and never import classes
+by name, so refactoring model modules cannot break cached entries. Objects
+that do not fit the schema (unset or unknown slots, unexpected value types) raise
+RecordEncodeError and are stored with the generic pickle envelope instead.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Any, Callable
+
+from model.gap_info import GapInfo, GapInfoStatus
+from model.song import Song, SongStatus
+
+RECORD_MAGIC = b"USR"
+RECORD_FORMAT_VERSION = 1
+
+# Field kinds: numeric slots (float64 block) ...
+NUM = "num"
+BOOL = "bool"
+DATETIME = "datetime"
+# ... and string-table slots
+STR = "str"
+JSON = "json"
+
+SONG_FIELDS: tuple[tuple[str, Any], ...] = (
+    ("txt_file", STR),
+    ("audio_file", STR),
+    ("title", STR),
+    ("artist", STR),
+    ("audio", STR),
+    ("gap", NUM),
+    ("bpm", NUM),
+    ("start", NUM),
+    ("is_relative", BOOL),
+    ("usdb_id", NUM),
+    ("duration_ms", NUM),
+    ("_status", SongStatus),
+    ("_status_changed_at", DATETIME),
+    ("_status_changed_str", STR),
+    ("error_message", STR),
+    ("_title_sort_key", STR),
+)
+
+GAP_INFO_FIELDS: tuple[tuple[str, Any], ...] = (
+    ("file_path", STR),
+    ("txt_basename", STR),
+    ("_status", GapInfoStatus),
+    ("original_gap", NUM),
+    ("detected_gap", NUM),
+    ("updated_gap", NUM),
+    ("diff", NUM),
+    ("duration", NUM),
+    ("processed_time", STR),
+    ("is_normalized", BOOL),
+    ("normalized_date", STR),
+    ("normalization_level", NUM),
+    ("detection_method", STR),
+    ("preview_wav_path", STR),
+    ("waveform_json_path", STR),
+    ("confidence", NUM),
+    ("detected_gap_ms", NUM),
+    ("first_note_ms", NUM),
+    ("tolerance_band_ms", NUM),
+    ("processed_txt_signature", JSON),
+    ("processed_audio_signature", JSON),
+    ("error_message", STR),
+)
+
+# Attributes handled outside the field tables
+_SONG_EXTRA_ATTRS = {"notes", "_gap_info"}
+_GAP_INFO_EXTRA_ATTRS = {"silence_periods", "owner"}
+
+_HEADER = struct.Struct("<3sBB")  # magic, format version, flags
+_FLAG_GAP_INFO = 0x01
+_U32 = struct.Struct("<I")
+_PERIOD = struct.Struct("<2d")  # one (start, end) silence period
+_MAX_EXACT_INT = 2**53
+_STRING_SEPARATOR = "\x00"
+_PREFIX_MARKER = "\x01"  # string is stored relative to the song folder prefix
+
+# Per-field kind bytes; the kind decides the struct code of the value (None and bools take no value bytes)
+_KIND_NONE, _KIND_INT, _KIND_FLOAT, _KIND_FALSE, _KIND_TRUE, _KIND_DATETIME, _KIND_STRING = range(7)
+_KIND_CODES = {_KIND_INT: "q", _KIND_FLOAT: "d", _KIND_DATETIME: "q"}
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_ALL_FIELDS = {0: SONG_FIELDS, _FLAG_GAP_INFO: SONG_FIELDS + GAP_INFO_FIELDS}
+_SONG_NAMES = tuple(name for name, _ in SONG_FIELDS)
+_GAP_INFO_NAMES = tuple(name for name, _ in GAP_INFO_FIELDS)
+
+
+class RecordEncodeError(ValueError):
+    """Raised when an object does not fit the compact record schema."""
+
+
+def is_song_record(data_blob: bytes) -> bool:
+    """Check whether a cache blob is a compact song record (vs. a pickle)."""
+    return data_blob[:3] == RECORD_MAGIC
+
+
+class _DecodePlan:
+    """Precompiled decoding steps for one (flags, field kinds) combination.
+
+    Decoding gathers every attribute from one flat pool (struct values,
+    strings, then None/False/True) with C-level itemgetters, so the cost per
+    record does not grow with a Python loop over the fields.
+    """
+
+    def __init__(self, fields: tuple[tuple[str, Any], ...], kinds: bytes):
+        if len(kinds) != len(fields):
+            raise ValueError("field kinds do not match the schema")
+        codes = []
+        value_slots: list[int] = []
+        string_slots: list[int] = []
+        for slot, kind in enumerate(kinds):
+            if kind in _KIND_CODES:
+                codes.append(_KIND_CODES[kind])
+                value_slots.append(slot)
+            elif kind == _KIND_STRING:
+                string_slots.append(slot)
+            elif kind not in (_KIND_NONE, _KIND_FALSE, _KIND_TRUE):
+                raise ValueError(f"unknown field kind {kind}")
+        self.values = struct.Struct("<" + "".join(codes))
+        self.string_count = len(string_slots)
+
+        # Pool layout: [*values, *strings, None, False, True]
+        pool_size = len(value_slots) + len(string_slots)
+        constants = {_KIND_NONE: pool_size, _KIND_FALSE: pool_size + 1, _KIND_TRUE: pool_size + 2}
+        position = {slot: index for index, slot in enumerate(value_slots + string_slots)}
+        pool_index = [position.get(slot, constants.get(kind)) for slot, kind in enumerate(kinds)]
+
+        self.conversions: list[tuple[int, Callable[[Any], Any]]] = []
+        for slot, ((_, field_kind), kind) in enumerate(zip(fields, kinds)):
+            if kind == _KIND_DATETIME:
+                self.conversions.append((pool_index[slot], _datetime_from_micros))
+            elif kind == _KIND_STRING and field_kind == JSON:
+                self.conversions.append((pool_index[slot], json.loads))
+            elif kind == _KIND_STRING and field_kind != STR:
+                self.conversions.append((pool_index[slot], {member.name: member for member in field_kind}.__getitem__))
+
+        song_count = len(SONG_FIELDS)
+        self.song_values = itemgetter(*pool_index[:song_count])
+        self.gap_info_values = itemgetter(*pool_index[song_count:]) if len(fields) > song_count else None
+
+
+def _datetime_from_micros(value: int) -> datetime:
+    return _EPOCH + value * _MICROSECOND
+
+
+_decode_plans: dict[tuple[int, bytes], _DecodePlan] = {}
+
+
+def _encode_value(name: str, kind: Any, value: Any) -> tuple[int, str, Any]:
+    """Return (kind byte, struct code or "s" for strings, value) for one field."""
+    if value is None:
+        return _KIND_NONE, "", None
+    if kind == BOOL:
+        if not isinstance(value, bool):
+            raise RecordEncodeError(f"{name}: expected bool")
+        return (_KIND_TRUE if value else _KIND_FALSE), "", None
+    if kind == DATETIME:
+        if not isinstance(value, datetime) or value.tzinfo is not None:
+            raise RecordEncodeError(f"{name}: expected naive datetime")
+        return _KIND_DATETIME, "q", (value - _EPOCH) // _MICROSECOND
+    if kind == NUM:
+        if isinstance(value, bool):
+            raise RecordEncodeError(f"{name}: unexpected bool")
+        if isinstance(value, int):
+            if abs(value) >= _MAX_EXACT_INT:
+                raise RecordEncodeError(f"{name}: int out of range")
+            return _KIND_INT, "q", value
+        if isinstance(value, float):
+            return _KIND_FLOAT, "d", value
+        raise RecordEncodeError(f"{name}: expected number, got {type(value).__name__}")
+    if kind == STR:
+        if not isinstance(value, str):
+            raise RecordEncodeError(f"{name}: expected str, got {type(value).__name__}")
+        text = value
+    elif kind == JSON:
+        try:
+            text = json.dumps(value, sort_keys=True, allow_nan=False)
+        except (TypeError, ValueError) as exc:
+            raise RecordEncodeError(f"{name}: {exc}") from exc
+        if json.loads(text) != value:
+            raise RecordEncodeError(f"{name}: value does not round-trip through JSON")
+    else:
+        if not isinstance(value, kind):
+            raise RecordEncodeError(f"{name}: expected {kind.__name__}")
+        text = value.name
+    if _STRING_SEPARATOR in text or _PREFIX_MARKER in text:
+        raise RecordEncodeError(f"{name}: unsupported control character")
+    return _KIND_STRING, "s", text
+
+
+def _state_of(obj: Any, fields: tuple[tuple[str, Any], ...], extra_attrs: set[str]) -> dict[str, Any]:
+    slots = type(obj).__slots__
+    if set(slots) - extra_attrs != {name for name, _ in fields}:
+        raise RecordEncodeError(f"{type(obj).__name__} attributes do not match the record schema")
+    try:
+        return {name: getattr(obj, name) for name in slots}
+    except AttributeError as exc:
+        raise RecordEncodeError(f"{type(obj).__name__}: {exc}") from exc
+
+
+def _encode_periods(periods: Any) -> bytes:
+    if not isinstance(periods, (list, tuple)):
+        raise RecordEncodeError("silence_periods: expected a list")
+    packed = [_U32.pack(len(periods))]
+    for period in periods:
+        if len(period) != 2 or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in period):
+            raise RecordEncodeError("silence_periods: expected (start, end) number pairs")
+        packed.append(_PERIOD.pack(*period))
+    return b"".join(packed)
+
+
+def encode_song(song: Song) -> bytes:
+    """
+    Encode a Song (and its GapInfo) as a compact record.
+
+    Args:
+        song: Song to encode (notes are not stored, as with the pickle format)
+
+    Returns:
+        bytes: Record blob
+
+    Raises:
+        RecordEncodeError: If the song does not fit the schema
+    """
+    if type(song) is not Song:
+        raise RecordEncodeError("only Song instances are supported")
+    gap_info = getattr(song, "_gap_info", None)
+    if gap_info is not None and type(gap_info) is not GapInfo:
+        raise RecordEncodeError("unsupported gap_info type")
+
+    song_state = _state_of(song, SONG_FIELDS, _SONG_EXTRA_ATTRS)
+    items = [(field, song_state) for field in SONG_FIELDS]
+    flags = 0
+    periods = b""
+    if gap_info is not None:
+        flags |= _FLAG_GAP_INFO
+        gap_state = _state_of(gap_info, GAP_INFO_FIELDS, _GAP_INFO_EXTRA_ATTRS)
+        items += [(field, gap_state) for field in GAP_INFO_FIELDS]
+        periods = _encode_periods(gap_state["silence_periods"])
+
+    txt_file = song_state["txt_file"] or ""
+    prefix = txt_file[: max(txt_file.rfind("/"), txt_file.rfind("\\")) + 1]
+    if _STRING_SEPARATOR in prefix or _PREFIX_MARKER in prefix:
+        raise RecordEncodeError("txt_file: unsupported control character")
+
+    kinds = bytearray()
+    codes: list[str] = []
+    values: list[Any] = []
+    texts = [prefix]
+    for (name, field_kind), state in items:
+        kind, code, value = _encode_value(name, field_kind, state[name])
+        kinds.append(kind)
+        if code == "s":
+            if prefix and len(value) > len(prefix) and value.startswith(prefix):
+                value = _PREFIX_MARKER + value[len(prefix) :]
+            texts.append(value)
+        elif code:
+            codes.append(code)
+            values.append(value)
+
+    return b"".join(
+        (
+            _HEADER.pack(RECORD_MAGIC, RECORD_FORMAT_VERSION, flags),
+            bytes(kinds),
+            struct.pack("<" + "".join(codes), *values),
+            periods,
+            _STRING_SEPARATOR.join(texts).encode("utf-8", "surrogatepass"),
+        )
+    )
+
+
+def decode_song(data_blob: bytes) -> Song:
+    """
+    Decode a compact record into a Song (with GapInfo, if one was stored).
+
+    Like unpickling, this restores the attributes directly (through
+    Song.__setstate__) without running property setters, so status and
+    timestamps are exactly as stored.
+
+    Raises:
+        ValueError: If the blob is not a supported record
+    """
+    try:
+        magic, version, flags = _HEADER.unpack_from(data_blob, 0)
+        if magic != RECORD_MAGIC or version != RECORD_FORMAT_VERSION:
+            raise ValueError(f"unsupported song record (magic {magic!r}, version {version})")
+        fields = _ALL_FIELDS[flags]
+        offset = _HEADER.size + len(fields)
+        kinds = data_blob[_HEADER.size : offset]
+        plan = _decode_plans.get((flags, kinds))
+        if plan is None:
+            plan = _decode_plans[(flags, kinds)] = _DecodePlan(fields, kinds)
+
+        values = plan.values.unpack_from(data_blob, offset)
+        offset += plan.values.size
+
+        periods = None
+        if flags & _FLAG_GAP_INFO:
+            (period_count,) = _U32.unpack_from(data_blob, offset)
+            end = offset + _U32.size + _PERIOD.size * period_count
+            periods = list(_PERIOD.iter_unpack(data_blob[offset + _U32.size : end]))
+            offset = end
+
+        prefix, _, text = data_blob[offset:].decode("utf-8", "surrogatepass").partition(_STRING_SEPARATOR)
+        texts = text.replace(_PREFIX_MARKER, prefix).split(_STRING_SEPARATOR) if plan.string_count else []
+        if len(texts) != plan.string_count:
+            raise ValueError("string count does not match the field kinds")
+
+        pool = [*values, *texts, None, False, True]
+        for index, convert in plan.conversions:
+            pool[index] = convert(pool[index])
+    except (struct.error, KeyError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"corrupt song record: {exc}") from exc
+
+    song = Song.__new__(Song)
+    song_state = dict(zip(_SONG_NAMES, plan.song_values(pool)), notes=None, _gap_info=None)
+    if periods is not None:
+        gap_info = GapInfo.__new__(GapInfo)
+        gap_state = dict(zip(_GAP_INFO_NAMES, plan.gap_info_values(pool)), silence_periods=periods, owner=song)
+        gap_info.__setstate__(gap_state)
+        song_state["_gap_info"] = gap_info
+    # Same post-load normalization as unpickling
+    song.__setstate__(song_state)
+    return song
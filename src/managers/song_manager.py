@@ -114,13 +114,15 @@ class SongManager(BaseManager):
         logger.info(f"Attempting to delete {len(selected_songs)} songs.")
         # Confirmation should happen in the UI layer (MenuBar) before calling this
         songs_to_remove = list(selected_songs)  # Copy list as we modify the source
+        deleted = []
         for song in songs_to_remove:
             logger.info(f"Deleting song {song}")
             try:
                 song.delete()  # Assuming song.delete() handles file/folder removal
-                self.data.songs.remove(song)  # Remove from the model's list
+                deleted.append(song)
             except Exception as e:
                 logger.error(f"Failed to delete song {song}: {e}")
+        self.data.songs.remove_batch(deleted)  # Remove from the model's list in one batch
 
         # After attempting deletion, clear the selection
         self.set_selected_songs([])
@@ -6,6 +6,7 @@ to provide seamless watch mode functionality.
 """
 
 import logging
+import os
 from PySide6.QtCore import QObject, Signal
 
 from services.directory_watcher import DirectoryWatcher, WatchEvent, WatchEventType
@@ -13,6 +14,7 @@ from services.cache_update_scheduler import CacheUpdateScheduler
 from services.gap_detection_scheduler import GapDetectionScheduler
 from workers.check_single_song import CheckSingleSongWorker
 from model.song import Song
+from common.database import invalidate_scan_journal
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +50,7 @@ class WatchModeController(QObject):
         songs_add,
         songs_remove_by_txt_file,
         reload_song,
+        songs_remove_by_txt_files=None,
     ):
         """
         Initialize WatchModeController.
@@ -63,6 +66,7 @@ class WatchModeController(QObject):
             songs_add: Callable(song) to add song to Songs collection
             songs_remove_by_txt_file: Callable(txt_file) to remove song
             reload_song: Callable(song) to reload song from disk
+            songs_remove_by_txt_files: Optional Callable(txt_files) to remove songs in one batch
         """
         super().__init__()
 
@@ -91,6 +95,7 @@ class WatchModeController(QObject):
         # Store callbacks
         self._songs_add = songs_add
         self._songs_remove_by_txt_file = songs_remove_by_txt_file
+        self._songs_remove_by_txt_files = songs_remove_by_txt_files
         self._songs_get_by_txt_file = songs_get_by_txt_file
         self._songs_get_by_path = songs_get_by_path
         self._start_gap_detection = start_gap_detection
@@ -103,6 +108,7 @@ class WatchModeController(QObject):
 
         self._cache_scheduler.song_added.connect(self._on_song_added_worker)
         self._cache_scheduler.song_removed.connect(self._on_song_removed)
+        self._cache_scheduler.songs_removed.connect(self._on_songs_removed)
 
         self._gap_scheduler.reload_requested.connect(self._on_reload_requested)
 
@@ -158,6 +164,9 @@ class WatchModeController(QObject):
         try:
             logger.debug(f"WatchModeController received event: {event.event_type.name} for {event.path}")
 
+            # In-place edits leave the folder mtime unchanged: make the next startup scan list the folder again
+            self._invalidate_scan_journal(event)
+
             # Route to cache scheduler for create/delete/move
             if event.event_type in [WatchEventType.CREATED, WatchEventType.DELETED, WatchEventType.MOVED]:
                 logger.debug(f"Routing {event.event_type.name} to cache_scheduler")
@@ -172,6 +181,18 @@ class WatchModeController(QObject):
             logger.error(f"Error handling file event: {e}", exc_info=True)
             self.error_occurred.emit(f"Error handling file event: {e}")
 
+    @staticmethod
+    def _invalidate_scan_journal(event: WatchEvent):
+        """Drop the scan journal rows of the folders touched by an event."""
+        directories = [os.path.dirname(event.path)]
+        if event.is_directory:
+            directories.append(event.path)
+        if event.src_path:
+            directories.append(os.path.dirname(event.src_path))
+            if event.is_directory:
+                directories.append(event.src_path)
+        invalidate_scan_journal(*directories)
+
     def _on_song_added_worker(self, worker: CheckSingleSongWorker):
         """Handle song check worker being added."""
         # Connect to get results
@@ -229,6 +250,19 @@ class WatchModeController(QObject):
         except Exception as e:
             logger.error(f"Error removing song: {e}", exc_info=True)
 
+    def _on_songs_removed(self, txt_files: list):
+        """Handle removal of all songs under a deleted directory."""
+        if not self._songs_remove_by_txt_files:
+            for txt_file in txt_files:
+                self._on_song_removed(txt_file)
+            return
+        try:
+            logger.info(f"Removing {len(txt_files)} songs from collection")
+            self._songs_remove_by_txt_files(txt_files)
+
+        except Exception as e:
+            logger.error(f"Error removing songs: {e}", exc_info=True)
+
     def _on_reload_requested(self, song_path: str):
         """Handle reload request when gap_info file changes."""
         try:
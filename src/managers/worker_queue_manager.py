@@ -42,6 +42,8 @@ class IWorker(QObject):
       (gap detection, normalization, scan all)
     - Instant (is_instant=True): User-triggered tasks that can run immediately
       in parallel with standard tasks (waveform, light reload)
+    - Pooled (pool_lane set): Tasks routed to a named lane with its own concurrency
+      limit (see WorkerQueueManager.configure_pool_lane), e.g. multi-process detection
     """
 
     def __init__(self, is_instant: bool = False):
@@ -52,6 +54,7 @@ class IWorker(QObject):
         self._description = "Undefined"
         self._is_canceled = False
         self.is_instant = is_instant  # Instant tasks can run in parallel with standard tasks
+        self.pool_lane = None  # Name of a configured pool lane; takes precedence over is_instant
         # Cooperative yield: manager can inject a callback the worker checks to decide to yield
         self._yield_check = None
 
@@ -176,6 +179,11 @@ class WorkerQueueManager(QObject):
         self._standard_pause_until: float = 0.0  # When standard lane is allowed to resume
         self._standard_lane_hold_count = 0  # Re-entrant hold for standard lane
 
+        # Pool lanes (named, N concurrent tasks each) - configured via configure_pool_lane()
+        self.pool_lane_capacity: dict = {}
+        self.queued_pool_tasks: dict = {}
+        self.running_pool_tasks: dict = {}
+
         # Connect the internal signal to start_next_task
         self._start_queued_task_signal.connect(self.start_next_task)
 
@@ -257,8 +265,41 @@ class WorkerQueueManager(QObject):
             if _matches(worker):
                 return True
 
+        # Pool lanes (running and queued)
+        for worker in self._iter_pool_workers():
+            if _matches(worker):
+                return True
+
         return False
 
+    def configure_pool_lane(self, name: str, capacity: int):
+        """
+        Create or resize a named pool lane that runs up to `capacity` tasks concurrently.
+
+        Workers opt in by setting `worker.pool_lane = name`. Workers naming an
+        unconfigured lane fall back to the instant/standard lanes.
+        """
+        capacity = max(1, int(capacity))
+        if self.pool_lane_capacity.get(name) == capacity:
+            return
+        logger.debug("Pool lane '%s' capacity set to %d", name, capacity)
+        self.pool_lane_capacity[name] = capacity
+        self.queued_pool_tasks.setdefault(name, deque())
+        self.running_pool_tasks.setdefault(name, {})
+        self.start_next_pool_tasks(name)
+
+    def _iter_pool_workers(self):
+        for lane in self.running_pool_tasks.values():
+            yield from lane.values()
+        for queue in self.queued_pool_tasks.values():
+            yield from queue
+
+    def _pool_lane_of(self, task_id):
+        for name, running in self.running_pool_tasks.items():
+            if task_id in running:
+                return name
+        return None
+
     def add_task(self, worker: IWorker, start_now=False, priority=False):
         worker.id = self.get_unique_task_id()
         logger.debug(
@@ -274,7 +315,12 @@ class WorkerQueueManager(QObject):
         worker.signals.progress.connect(lambda *args, wid=worker.id: self.on_task_updated(wid))
 
         # Route to appropriate lane
-        if worker.is_instant:
+        if worker.pool_lane in self.pool_lane_capacity:
+            worker.status = WorkerStatus.WAITING
+            self.queued_pool_tasks[worker.pool_lane].append(worker)
+            self.on_task_list_changed.emit()
+            self.start_next_pool_tasks(worker.pool_lane)
+        elif worker.is_instant:
             # Instant lane: user-triggered, runs in parallel with standard tasks
             worker.status = WorkerStatus.WAITING
             self.queued_instant_tasks.append(worker)
@@ -364,8 +410,13 @@ class WorkerQueueManager(QObject):
         self._finalize_task(task_id)
 
     def _finalize_task(self, task_id):
+        pool_lane = self._pool_lane_of(task_id)
+        if pool_lane is not None:
+            self.running_pool_tasks[pool_lane].pop(task_id, None)
+            self.on_task_list_changed.emit()
+            self.start_next_pool_tasks(pool_lane)
         # Check if this is an instant task
-        if self.running_instant_task and self.running_instant_task.id == task_id:
+        elif self.running_instant_task and self.running_instant_task.id == task_id:
             self.running_instant_task = None
             # Emit immediately before starting next task to show current state
             self.on_task_list_changed.emit()
@@ -416,6 +467,26 @@ class WorkerQueueManager(QObject):
             self.on_task_list_changed.emit()
             run_async(self._start_instant_worker(worker))
 
+    def start_next_pool_tasks(self, name: str):
+        """Start queued tasks of a pool lane until its capacity is reached"""
+        queue = self.queued_pool_tasks.get(name)
+        running = self.running_pool_tasks.get(name)
+        if queue is None or running is None:
+            return
+        while queue and len(running) < self.pool_lane_capacity[name]:
+            worker = queue.popleft()
+            # Reserve the slot before scheduling so finish callbacks see a consistent state
+            running[worker.id] = worker
+            logger.debug(
+                "Starting pool task [%s]: %s (%d/%d)",
+                name,
+                worker.description,
+                len(running),
+                self.pool_lane_capacity[name],
+            )
+            self.on_task_list_changed.emit()
+            run_async(self._start_worker(worker))
+
     async def _start_instant_worker(self, worker: IWorker):
         """Start an instant worker in the instant lane"""
         try:
@@ -446,6 +517,10 @@ class WorkerQueueManager(QObject):
         # Check instant lane
         if self.running_instant_task and self.running_instant_task.id == task_id:
             return self.running_instant_task
+        # Check pool lanes
+        for running in self.running_pool_tasks.values():
+            if task_id in running:
+                return running[task_id]
         return None
 
     def cancel_task(self, task_id):
@@ -471,6 +546,14 @@ class WorkerQueueManager(QObject):
                     # Mark UI update; heartbeat will emit
                     self._mark_ui_update_needed()
                     return
+            # Check pool lane queues
+            for queue in self.queued_pool_tasks.values():
+                for worker in list(queue):
+                    if worker.id == task_id:
+                        worker.cancel()
+                        queue.remove(worker)
+                        self._mark_ui_update_needed()
+                        return
 
     def cancel_queue(self):
         # Cancel standard queue - head-first for "top-to-bottom" user expectation
@@ -487,6 +570,13 @@ class WorkerQueueManager(QObject):
         if self.running_instant_task:
             self.cancel_task(self.running_instant_task.id)
 
+        # Cancel pool lanes
+        for name, queue in self.queued_pool_tasks.items():
+            while queue:
+                queue.popleft().cancel()
+            for task_id in list(self.running_pool_tasks[name].keys()):
+                self.cancel_task(task_id)
+
         self._mark_ui_update_needed()
 
     def on_task_error(self, task_id, e):
@@ -624,6 +714,9 @@ class WorkerQueueManager(QObject):
             return False
         return True
 
+    def _running_pool_count(self) -> int:
+        return sum(len(running) for running in self.running_pool_tasks.values())
+
     # Add method to clean up when app closes
     def cleanup(self):
         self._heartbeat_active = False
@@ -653,7 +746,7 @@ class WorkerQueueManager(QObject):
 
         # Wait for running tasks to finish gracefully (with a timeout)
         # This is critical - we must wait for async tasks to complete before asyncio shutdown
-        if self.running_tasks or self.running_instant_task:
+        if self.running_tasks or self.running_instant_task or self._running_pool_count():
             MAX_WAIT_MS = 3000  # 3 seconds max wait (increased to allow proper cleanup)
             start_time = time.time()
 
@@ -662,17 +755,21 @@ class WorkerQueueManager(QObject):
                 len(self.running_tasks) + (1 if self.running_instant_task else 0),
             )
 
-            while (self.running_tasks or self.running_instant_task) and time.time() - start_time < (MAX_WAIT_MS / 1000):
+            while (
+                self.running_tasks or self.running_instant_task or self._running_pool_count()
+            ) and time.time() - start_time < (MAX_WAIT_MS / 1000):
                 QApplication.processEvents()
                 time.sleep(0.05)  # Check every 50ms
 
             # Log results
-            remaining = len(self.running_tasks) + (1 if self.running_instant_task else 0)
+            remaining = len(self.running_tasks) + (1 if self.running_instant_task else 0) + self._running_pool_count()
             if remaining > 0:
                 logger.warning("Shutdown timeout - %s tasks still running after %sms", remaining, MAX_WAIT_MS)
                 # Force-clear to prevent further issues
                 self.running_tasks.clear()
                 self.running_instant_task = None
+                for running in self.running_pool_tasks.values():
+                    running.clear()
             else:
                 elapsed_ms = int((time.time() - start_time) * 1000)
                 logger.info("All tasks completed cancellation in %sms", elapsed_ms)
@@ -18,6 +18,33 @@ class GapInfoStatus(Enum):
 class GapInfo:
     """Data class for song gap analysis information"""
 
+    __slots__ = (
+        "file_path",
+        "txt_basename",
+        "_status",
+        "original_gap",
+        "detected_gap",
+        "updated_gap",
+        "diff",
+        "duration",
+        "processed_time",
+        "silence_periods",
+        "is_normalized",
+        "normalized_date",
+        "normalization_level",
+        "detection_method",
+        "preview_wav_path",
+        "waveform_json_path",
+        "confidence",
+        "detected_gap_ms",
+        "first_note_ms",
+        "tolerance_band_ms",
+        "processed_txt_signature",
+        "processed_audio_signature",
+        "error_message",
+        "owner",
+    )
+
     def __init__(self, file_path: str = "", txt_basename: str = ""):
         # File path where the gap info will be stored
         self.file_path = file_path
@@ -98,5 +125,17 @@ class GapInfo:
 
         return await GapInfoService.save(self, refresh_timestamp=refresh_timestamp)
 
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in GapInfo.__slots__ if hasattr(self, name)}
+
+    def __setstate__(self, state):
+        # Also accepts pre-slots __dict__ pickles; unknown legacy attributes are dropped
+        for name, value in state.items():
+            if name in _GAP_INFO_SLOTS:
+                setattr(self, name, value)
+
     def __str__(self):
         return f"GapInfo({self.status.value}, orig={self.original_gap}, det={self.detected_gap})"
+
+
+_GAP_INFO_SLOTS = frozenset(GapInfo.__slots__)
@@ -2,7 +2,7 @@ from enum import Enum
 import os
 import re
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional, Sequence
 
 import logging
 import _strptime  # noqa: F401  # Ensure datetime.strptime dependencies bundled/available
@@ -51,6 +51,27 @@ TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 class Song:
 
+    __slots__ = (
+        "txt_file",
+        "audio_file",
+        "title",
+        "artist",
+        "audio",
+        "gap",
+        "bpm",
+        "start",
+        "is_relative",
+        "usdb_id",
+        "duration_ms",
+        "notes",
+        "_gap_info",
+        "_status",
+        "_status_changed_at",
+        "_status_changed_str",
+        "error_message",
+        "_title_sort_key",
+    )
+
     def __init__(self, txt_file: str = ""):
         # File paths
         self.txt_file: str = txt_file
@@ -70,8 +91,8 @@ class Song:
         # Audio analysis data
         self.duration_ms: int = 0
 
-        # Notes data
-        self.notes: Optional[List[Note]] = None
+        # Notes data (NoteArray when loaded from a file)
+        self.notes: Optional[Sequence[Note]] = None
 
         # Status information
         self._gap_info: Optional[GapInfo] = None
@@ -277,16 +298,22 @@ class Song:
     def __repr__(self):
         return f"<Song: {self.artist} - {self.title}>"
 
+    def copy_state_from(self, other: "Song"):
+        """Overwrite all attributes of this song with those of another song (in place)."""
+        for name in Song.__slots__:
+            if hasattr(other, name):
+                setattr(self, name, getattr(other, name))
+
     def __getstate__(self):
-        # Define which attributes to serialize
-        state = self.__dict__.copy()
-        state.pop("notes", None)  # Exclude notes
-        return state
+        # Define which attributes to serialize (notes are excluded)
+        return {name: getattr(self, name) for name in Song.__slots__ if name != "notes" and hasattr(self, name)}
 
     def __setstate__(self, state):
-        # Restore the state during deserialization
+        # Restore the state during deserialization (also accepts pre-slots __dict__ pickles)
         legacy_status = state.pop("status", None)
-        self.__dict__.update(state)
+        for name, value in state.items():
+            if name in _SONG_SLOTS:
+                setattr(self, name, value)
         self.notes = None
         if not getattr(self, "_title_sort_key", ""):
             self.update_title_sort_key()
@@ -301,3 +328,6 @@ class Song:
             processed = getattr(self._gap_info, "processed_time", "")
             if processed:
                 self.set_status_timestamp_from_string(processed)
+
+
+_SONG_SLOTS = frozenset(Song.__slots__)
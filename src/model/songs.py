@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 from PySide6.QtCore import QObject, Signal  # Updated import
 from model.song import Song, SongStatus as _SongStatus
 
@@ -24,7 +24,10 @@ class Songs(QObject):
     cleared = Signal()  # Updated
     added = Signal(Song)  # Updated
     updated = Signal(Song)  # Updated
+    updatedBatch = Signal(list)  # Songs hydrated together by apply_hydration (one signal per batch)
+    hydrationLoaded = Signal(list)  # (song, full Song) pairs read off the GUI thread, applied on it
     deleted = Signal(Song)  # Updated
+    deletedBatch = Signal(list)  # Songs removed together by remove_batch (one signal per batch)
     error = Signal(Song, Exception)  # Updated
     filterChanged = Signal()  # Updated
     listChanged = Signal()  # Signal for when the list structure changes
@@ -37,11 +40,15 @@ class Songs(QObject):
         self._filter_text: str = ""
         self._songs_by_txt: Dict[str, Song] = {}
         self._songs_by_path: Dict[str, Song] = {}
+        # txt keys of songs created from the library snapshot and not hydrated yet
+        self._snapshot_txt_keys: Set[str] = set()
+        self.hydrationLoaded.connect(self.apply_hydration)
 
     def clear(self):
         self.songs.clear()
         self._songs_by_txt.clear()
         self._songs_by_path.clear()
+        self._snapshot_txt_keys.clear()
         self.cleared.emit()
         self.listChanged.emit()  # Emit list changed signal
 
@@ -91,12 +98,108 @@ class Songs(QObject):
             # Only emit list changed once at the end
             self.listChanged.emit()
 
+    def add_snapshot(self, songs: List[Song]):
+        """Populate an empty list with songs restored from the library snapshot in one batch.
+
+        Snapshot songs hold the table fields only and keep their stored title
+        sort key; they are replaced by the full cached Song on hydrate() or
+        when a scan reloads them.
+        """
+        if not songs:
+            return
+        if self.songs:
+            logger.debug("Library snapshot ignored: song list already populated")
+            return
+        self.songs.extend(songs)
+        for song in songs:
+            txt_key, path_key = self._snapshot_keys(song)
+            if txt_key:
+                self._songs_by_txt[txt_key] = song
+                self._snapshot_txt_keys.add(txt_key)
+            if path_key:
+                self._songs_by_path[path_key] = song
+        self.listChanged.emit()
+
+    def is_hydrated(self, song: Song) -> bool:
+        """False while a song still holds only the snapshot fields."""
+        return self._normalize_key(getattr(song, "txt_file", None)) not in self._snapshot_txt_keys
+
+    def unhydrated(self, songs: Iterable[Song]) -> List[Song]:
+        """Return the given songs that still hold only the snapshot fields."""
+        return [song for song in songs if not self.is_hydrated(song)]
+
+    def hydrate(self, songs: Iterable[Song], load_song: Callable[[str], Optional[Song]]) -> int:
+        """Replace snapshot songs by their full state (in place, instances are kept).
+
+        Loads on the calling thread and emits updated per song; meant for the
+        few songs needed right away (see apply_hydration for the rest).
+
+        Args:
+            songs: Songs to hydrate; already hydrated songs are skipped
+            load_song: Returns the full Song for a txt file path (None if unavailable)
+
+        Returns:
+            Number of songs hydrated
+        """
+        hydrated = self._replace_snapshot_songs((song, load_song(song.txt_file)) for song in self.unhydrated(songs))
+        for song in hydrated:
+            self.updated.emit(song)
+        return len(hydrated)
+
+    def apply_hydration(self, loaded: List[Tuple[Song, Optional[Song]]]):
+        """Apply full songs loaded off the GUI thread with a single updatedBatch signal.
+
+        Songs hydrated or reloaded by a scan in the meantime are skipped.
+
+        Args:
+            loaded: (snapshot song, full Song or None) pairs
+        """
+        hydrated = self._replace_snapshot_songs(loaded)
+        if hydrated:
+            self.updatedBatch.emit(hydrated)
+
+    def _replace_snapshot_songs(self, loaded: Iterable[Tuple[Song, Optional[Song]]]) -> List[Song]:
+        hydrated = []
+        for song, full_song in loaded:
+            key = self._normalize_key(getattr(song, "txt_file", None))
+            if key not in self._snapshot_txt_keys:
+                continue
+            self._snapshot_txt_keys.discard(key)
+            if full_song is None:
+                continue
+            self._update_song(song, full_song)
+            hydrated.append(song)
+        return hydrated
+
     def remove(self, song: Song):
         self.songs.remove(song)
-        self._remove_index_keys(*self._snapshot_keys(song))
+        txt_key, path_key = self._snapshot_keys(song)
+        self._snapshot_txt_keys.discard(txt_key)
+        self._remove_index_keys(txt_key, path_key)
         self.deleted.emit(song)  # Changed from updated to deleted signal
         # Don't emit listChanged for single remove - prevents UI inconsistency
 
+    def remove_batch(self, songs: Iterable[Song]) -> List[Song]:
+        """Remove several songs with one pass over the list and a single deletedBatch signal.
+
+        Args:
+            songs: Songs to remove; songs not in the list are ignored
+
+        Returns:
+            Removed songs in list order
+        """
+        doomed = {id(song) for song in songs}
+        removed = [song for song in self.songs if id(song) in doomed]
+        if not removed:
+            return []
+        self.songs[:] = [song for song in self.songs if id(song) not in doomed]
+        for song in removed:
+            txt_key, path_key = self._snapshot_keys(song)
+            self._snapshot_txt_keys.discard(txt_key)
+            self._remove_index_keys(txt_key, path_key)
+        self.deletedBatch.emit(removed)
+        return removed
+
     def get_by_txt_file(self, txt_file: str) -> Song | None:
         """Get song by txt file path."""
         key = self._normalize_key(txt_file)
@@ -121,6 +224,11 @@ class Songs(QObject):
                 return True
         return False
 
+    def remove_by_txt_files(self, txt_files: Iterable[str]) -> int:
+        """Remove songs by txt file paths in one batch. Returns the number of songs removed."""
+        songs = [self.get_by_txt_file(txt_file) for txt_file in txt_files]
+        return len(self.remove_batch(song for song in songs if song))
+
     def list_changed(self):
         """Manually trigger list changed signal"""
         self.listChanged.emit()
@@ -189,7 +297,8 @@ class Songs(QObject):
 
     def _update_song(self, target: Song, source: Song):
         old_txt_key, old_path_key = self._snapshot_keys(target)
-        target.__dict__.update(source.__dict__)
+        self._snapshot_txt_keys.discard(old_txt_key)
+        target.copy_state_from(source)
         target.update_title_sort_key()
         self._rebind_gap_info_owner(target)
         self._remove_index_keys(old_txt_key, old_path_key)
@@ -1,5 +1,8 @@
 import os
-from typing import List, Optional
+from collections import abc
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
 
 
 class ValidationError(Exception):
@@ -29,6 +32,8 @@ class Tags:
 class Note:
     """Container for USDX note data"""
 
+    __slots__ = ("NoteType", "StartBeat", "Length", "Pitch", "Text", "start_ms", "duration_ms", "end_ms")
+
     def __init__(self):
         self.NoteType: Optional[str] = None
         self.StartBeat: Optional[int] = None
@@ -46,6 +51,212 @@ class Note:
         )
 
 
+# Columnar note storage: one row per note line, lyrics kept in a side list.
+# Timing columns are NaN until note times have been calculated.
+NOTE_DTYPE = np.dtype(
+    [
+        ("type", "U1"),
+        ("start_beat", "i4"),
+        ("length", "i4"),
+        ("pitch", "i4"),
+        ("start_ms", "f8"),
+        ("duration_ms", "f8"),
+        ("end_ms", "f8"),
+    ]
+)
+
+# (NoteType, StartBeat, Length, Pitch, Text) as parsed from a note line
+NoteRow = Tuple[str, int, int, int, str]
+
+
+def _timing_value(value) -> Optional[float]:
+    value = float(value)
+    return None if value != value else value
+
+
+class NoteView:
+    """
+    Note-compatible view of one row of a NoteArray.
+
+    Created on demand when notes are indexed or iterated; attribute writes go
+    straight to the underlying array.
+    """
+
+    __slots__ = ("_notes", "_index")
+
+    def __init__(self, notes: "NoteArray", index: int):
+        self._notes = notes
+        self._index = index
+
+    @property
+    def NoteType(self) -> str:
+        return str(self._notes.data["type"][self._index])
+
+    @NoteType.setter
+    def NoteType(self, value: str):
+        self._notes.data["type"][self._index] = value
+
+    @property
+    def StartBeat(self) -> int:
+        return int(self._notes.data["start_beat"][self._index])
+
+    @StartBeat.setter
+    def StartBeat(self, value: int):
+        self._notes.data["start_beat"][self._index] = value
+
+    @property
+    def Length(self) -> int:
+        return int(self._notes.data["length"][self._index])
+
+    @Length.setter
+    def Length(self, value: int):
+        self._notes.data["length"][self._index] = value
+
+    @property
+    def Pitch(self) -> int:
+        return int(self._notes.data["pitch"][self._index])
+
+    @Pitch.setter
+    def Pitch(self, value: int):
+        self._notes.data["pitch"][self._index] = value
+
+    @property
+    def Text(self) -> str:
+        return self._notes.texts[self._index]
+
+    @Text.setter
+    def Text(self, value: str):
+        self._notes.texts[self._index] = value
+
+    @property
+    def start_ms(self) -> Optional[float]:
+        return _timing_value(self._notes.data["start_ms"][self._index])
+
+    @start_ms.setter
+    def start_ms(self, value: Optional[float]):
+        self._notes.data["start_ms"][self._index] = np.nan if value is None else value
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return _timing_value(self._notes.data["duration_ms"][self._index])
+
+    @duration_ms.setter
+    def duration_ms(self, value: Optional[float]):
+        self._notes.data["duration_ms"][self._index] = np.nan if value is None else value
+
+    @property
+    def end_ms(self) -> Optional[float]:
+        return _timing_value(self._notes.data["end_ms"][self._index])
+
+    @end_ms.setter
+    def end_ms(self, value: Optional[float]):
+        self._notes.data["end_ms"][self._index] = np.nan if value is None else value
+
+    __str__ = Note.__str__
+
+
+class NoteArray(abc.Sequence):
+    """
+    Notes of a song stored as a NumPy structured array (NOTE_DTYPE).
+
+    Behaves like a read/write list of notes: indexing and iteration yield
+    NoteView objects, slicing returns a NoteArray sharing the same storage.
+    Bulk consumers (timing calculation, syllable lookup) work on the columns
+    directly instead of touching per-note objects.
+    """
+
+    __slots__ = ("data", "texts")
+
+    def __init__(self, data: Optional[np.ndarray] = None, texts: Optional[List[str]] = None):
+        self.data = np.zeros(0, dtype=NOTE_DTYPE) if data is None else data
+        self.texts = [""] * len(self.data) if texts is None else texts
+        if len(self.texts) != len(self.data):
+            raise ValueError("NoteArray texts must have one entry per note")
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[NoteRow]) -> "NoteArray":
+        """Build a NoteArray from parsed (NoteType, StartBeat, Length, Pitch, Text) rows."""
+        data = np.empty(len(rows), dtype=NOTE_DTYPE)
+        if rows:
+            note_types, start_beats, lengths, pitches, texts = zip(*rows)
+            data["type"] = note_types
+            data["start_beat"] = start_beats
+            data["length"] = lengths
+            data["pitch"] = pitches
+        else:
+            texts = ()
+        data["start_ms"] = data["duration_ms"] = data["end_ms"] = np.nan
+        return cls(data, list(texts))
+
+    @classmethod
+    def from_notes(cls, notes: Iterable[Note]) -> "NoteArray":
+        """Build a NoteArray from Note-like objects (timing fields are copied when set)."""
+        notes = list(notes)
+        array = cls.from_rows([(n.NoteType, n.StartBeat, n.Length, n.Pitch, n.Text) for n in notes])
+        for column in ("start_ms", "duration_ms", "end_ms"):
+            array.data[column] = [np.nan if getattr(n, column) is None else getattr(n, column) for n in notes]
+        return array
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @overload
+    def __getitem__(self, index: int) -> NoteView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "NoteArray": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[NoteView, "NoteArray"]:
+        if isinstance(index, slice):
+            return NoteArray(self.data[index], self.texts[index])
+        count = len(self.data)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("note index out of range")
+        return NoteView(self, index)
+
+    def __iter__(self) -> Iterator[NoteView]:
+        return (NoteView(self, index) for index in range(len(self.data)))
+
+    def __repr__(self) -> str:
+        return f"NoteArray({len(self.data)} notes)"
+
+    def syllable_at(self, position_beats: float) -> Optional[str]:
+        """Return the text of the first note sounding at position_beats, or None."""
+        start = self.data["start_beat"]
+        hits = np.flatnonzero((start <= position_beats) & (position_beats < start + self.data["length"]))
+        return self.texts[hits[0]] if len(hits) else None
+
+
+def compute_note_times(notes: Sequence[Note], bpm: float, gap: float, is_relative: bool) -> None:
+    """
+    Set start_ms/end_ms/duration_ms of all notes from BPM and gap.
+
+    Ultrastar beats are quarter notes: beats_per_ms = bpm / 60 / 1000 * 4.
+    Relative songs are timed from 0, others from the gap. A NoteArray is
+    updated with column-wise array expressions; plain lists of Note objects
+    are updated note by note (notes missing StartBeat/Length are skipped).
+    """
+    beats_per_ms = (float(bpm) / 60 / 1000) * 4
+    offset = 0.0 if is_relative else float(gap)
+
+    if isinstance(notes, NoteArray):
+        data = notes.data
+        data["start_ms"] = data["start_beat"] / beats_per_ms + offset
+        data["end_ms"] = (data["start_beat"] + data["length"]) / beats_per_ms + offset
+        data["duration_ms"] = data["end_ms"] - data["start_ms"]
+        return
+
+    for note in notes:
+        if note.StartBeat is None or note.Length is None:
+            continue
+        start_beat = float(note.StartBeat)
+        note.start_ms = offset + start_beat / beats_per_ms
+        note.end_ms = offset + (start_beat + float(note.Length)) / beats_per_ms
+        note.duration_ms = float(note.end_ms) - float(note.start_ms)
+
+
 class USDXFile:
     """Data class for USDX file content and metadata"""
 
@@ -58,7 +269,7 @@ class USDXFile:
         # Content
         self.content: Optional[str] = None
         self.tags: Tags = Tags()
-        self.notes: List[Note] = []
+        self.notes: Union[NoteArray, List[Note]] = NoteArray()
 
         # State
         self._loaded: bool = False
@@ -39,11 +39,13 @@ class CacheUpdateScheduler(QObject):
     Signals:
         song_added: Emitted when a new song should be added (CheckSingleSongWorker)
         song_removed: Emitted when a song should be removed (str: txt_file_path)
+        songs_removed: Emitted once for all songs of a deleted directory (list of txt_file_path)
         song_moved: Emitted when a song is moved (old_path: str, new_path: str)
     """
 
     song_added = Signal(object)  # CheckSingleSongWorker
     song_removed = Signal(str)  # txt_file_path
+    songs_removed = Signal(list)  # txt_file_paths
     song_moved = Signal(str, str)  # old_path, new_path
 
     def __init__(self, worker_queue_add_task: Callable, songs_get_by_txt_file: Callable, debounce_ms: int = 2000):
@@ -340,14 +342,15 @@ class CacheUpdateScheduler(QObject):
     def _remove_songs_in_directory(self, directory: str):
         """Remove all songs cached under a directory."""
         try:
-            # Get all cached entries (returns list of tuples when deserialize=False)
-            from common.database import get_all_cache_entries
+            # Cached paths under the directory (index-only query, song data is not read)
+            from common.database import get_cache_file_stats
 
-            cached_entries = get_all_cache_entries(deserialize=False)
+            cached_paths = list(get_cache_file_stats(directory_filter=directory))
 
             directory_norm = os.path.normpath(directory)
+            removed = []
 
-            for txt_path, _ in cached_entries:
+            for txt_path in cached_paths:
                 txt_norm = os.path.normpath(txt_path)
 
                 # Check if song is under deleted directory
@@ -359,7 +362,10 @@ class CacheUpdateScheduler(QObject):
                     except Exception as e:
                         logger.warning(f"Failed to remove cache entry for {txt_path}: {e}")
 
-                    self.song_removed.emit(txt_path)
+                    removed.append(txt_path)
+
+            if removed:
+                self.songs_removed.emit(removed)
 
         except Exception as e:
             logger.error(f"Error removing songs in directory {directory}: {e}", exc_info=True)
@@ -367,14 +373,14 @@ class CacheUpdateScheduler(QObject):
     def _handle_directory_moved(self, src_dir: str, dest_dir: str):
         """Handle directory move/rename by updating all songs inside."""
         try:
-            from common.database import get_all_cache_entries
+            from common.database import get_cache_file_stats
 
-            cached_entries = get_all_cache_entries(deserialize=False)
+            cached_paths = list(get_cache_file_stats(directory_filter=src_dir))
 
             src_norm = os.path.normpath(src_dir)
             dest_norm = os.path.normpath(dest_dir)
 
-            for txt_path, _ in cached_entries:
+            for txt_path in cached_paths:
                 txt_norm = os.path.normpath(txt_path)
 
                 # Check if song is under moved directory
@@ -0,0 +1,276 @@
+"""
+Library scanning primitives: a parallel os.scandir tree walker and a thread
+pool that runs song-loading coroutines concurrently.
+
+On network shares (SMB/NFS) a scan is dominated by per-file round trips
+(directory listings, stat, txt/JSON reads, ffprobe). Walking the top-level
+folders in parallel and loading several songs at once hides that latency;
+the single-threaded os.walk + one-song-at-a-time loop paid it serially.
+
+With a DirectoryJournal, song folders whose mtime, contents and txt file
+stats match the previous scan are not listed at all, so a rescan of an
+unchanged library only lists the folders above the song folders and stats
+the song txt files.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from common.database import ScanJournalEntry, normalize_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Default number of scan threads (listing/loading is I/O bound, so more than the core count pays off)
+DEFAULT_SCAN_WORKERS = 8
+
+# Directories modified this recently are not journaled: on filesystems with coarse
+# timestamps (FAT: 2 s) a later change could keep the recorded mtime
+_RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+WalkEntry = Tuple[str, List[str], List[str]]
+# Directory path and its mtime in ns (None when walking without a journal)
+_Subdir = Tuple[str, Optional[int]]
+
+
+class DirectoryJournal:
+    """
+    Per-directory listing summaries of the previous scan and the scan in progress.
+
+    A directory is skipped when its mtime is unchanged, it had no subfolders
+    (a change deeper down would not touch its mtime), the cache still holds
+    as many songs for it as it had txt files and those txt files keep their
+    mtime and size. Directory mtimes change when entries are added, removed
+    or renamed; a txt rewritten in place (editors, sync tools) only changes
+    its own stat, so skipping a folder costs one stat per song instead of a
+    listing.
+
+    The walker threads call is_unchanged() and record(); the scan calls
+    discard() for folders whose songs could not be cached, then persists
+    entries once the scan completed.
+    """
+
+    def __init__(
+        self,
+        previous: Mapping[str, ScanJournalEntry],
+        cached_song_counts: Mapping[str, int],
+        is_song_file: Callable[[str], bool],
+    ):
+        """
+        Args:
+            previous: Journal of the last completed scan (see get_scan_journal)
+            cached_song_counts: Directory key -> number of cached songs in it
+            is_song_file: Predicate for the file names that count as songs
+        """
+        self._previous = previous
+        self._cached_song_counts = cached_song_counts
+        self._is_song_file = is_song_file
+        self.entries: Dict[str, ScanJournalEntry] = {}
+        self.skipped: List[str] = []
+
+    @staticmethod
+    def key(path: str) -> str:
+        """Journal key of a directory (normalized like cache keys, no trailing slash)."""
+        return normalize_cache_key(path).lower().rstrip("/")
+
+    def is_unchanged(self, path: str, mtime_ns: int) -> bool:
+        """Return True (and carry the entry over) if the directory need not be listed."""
+        key = self.key(path)
+        entry = self._previous.get(key)
+        if entry is None or entry.mtime_ns != mtime_ns or entry.subdir_count:
+            return False
+        if self._cached_song_counts.get(key, 0) != entry.song_count:
+            return False
+        if _song_file_stats(path, (name for name, _, _ in entry.song_files)) != entry.song_files:
+            return False
+        self.entries[key] = entry
+        self.skipped.append(key)
+        return True
+
+    def record(self, path: str, mtime_ns: Optional[int], dirs: List[str], files: List[str]) -> None:
+        """Journal a directory that was listed."""
+        racy_after_ns = time.time_ns() - _RACY_MTIME_WINDOW_NS
+        if mtime_ns is None or mtime_ns >= racy_after_ns:
+            return
+        song_files = _song_file_stats(path, (name for name in files if self._is_song_file(name)))
+        if song_files is None or any(file_mtime_ns >= racy_after_ns for _, file_mtime_ns, _ in song_files):
+            return
+        self.entries[self.key(path)] = ScanJournalEntry(
+            mtime_ns, len(dirs) + len(files), len(dirs), len(song_files), song_files
+        )
+
+    def discard(self, path: str) -> None:
+        """Drop a directory from the new journal so the next scan lists it again."""
+        self.entries.pop(self.key(path), None)
+
+
+def _song_file_stats(path: str, names: Iterable[str]) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+    """(name, mtime_ns, size) of the given files in path, sorted by name; None if one cannot be stat'ed."""
+    stats = []
+    for name in sorted(names):
+        try:
+            stat = os.stat(os.path.join(path, name))
+        except OSError:
+            return None
+        stats.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(stats)
+
+
+def _list_directory(
+    path: str, journal: Optional[DirectoryJournal] = None, mtime_ns: Optional[int] = None
+) -> Tuple[List[str], List[str], List[_Subdir]]:
+    """
+    List one directory with a single scandir call.
+
+    With a journal, subfolders it reports as unchanged are not descended into
+    (their mtime comes from the directory entry, free on Windows/SMB) and the
+    listing itself is recorded under mtime_ns.
+
+    Returns:
+        Tuple of (dir names, file names, (path, mtime_ns) of dirs to descend into).
+        Like os.walk(followlinks=False), symlinked directories are listed but not entered.
+    """
+    dirs, files, descend = [], [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry.name)
+                    continue
+                dirs.append(entry.name)
+                try:
+                    if entry.is_symlink():
+                        continue
+                    child_mtime_ns = None
+                    if journal is not None:
+                        child_mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+                        if journal.is_unchanged(entry.path, child_mtime_ns):
+                            continue
+                    descend.append((entry.path, child_mtime_ns))
+                except OSError:
+                    pass
+    except OSError as e:
+        logger.debug("Cannot list %s: %s", path, e)
+        return dirs, files, descend
+    if journal is not None:
+        journal.record(path, mtime_ns, dirs, files)
+    return dirs, files, descend
+
+
+def _walk_subtree(
+    top: _Subdir, stop_event: threading.Event, journal: Optional[DirectoryJournal] = None
+) -> List[WalkEntry]:
+    """Walk one subtree top-down (os.walk order) on the calling thread."""
+    results: List[WalkEntry] = []
+    stack = [top]
+    while stack and not stop_event.is_set():
+        root, mtime_ns = stack.pop()
+        dirs, files, descend = _list_directory(root, journal, mtime_ns)
+        results.append((root, dirs, files))
+        stack.extend(reversed(descend))
+    return results
+
+
+def walk_directory_tree(
+    directory: str,
+    max_workers: int = DEFAULT_SCAN_WORKERS,
+    stop_event: Optional[threading.Event] = None,
+    journal: Optional[DirectoryJournal] = None,
+) -> Iterator[WalkEntry]:
+    """
+    os.walk()-compatible tree walk that lists top-level folders in parallel.
+
+    The root is listed first; each top-level subfolder is then walked on a
+    pool thread. Results are yielded per top-level folder in listing order,
+    so the output order is deterministic (top-down within each folder).
+
+    Args:
+        directory: Root directory
+        max_workers: Number of walker threads
+        stop_event: Optional event; once set, walking stops early
+        journal: Optional DirectoryJournal; unchanged song folders are skipped
+            (not yielded) and every listed folder is recorded in it
+
+    Yields:
+        (root, dir names, file names) tuples, like os.walk()
+    """
+    stop_event = stop_event or threading.Event()
+    root_mtime_ns = None
+    if journal is not None:
+        try:
+            root_mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            pass
+    dirs, files, descend = _list_directory(directory, journal, root_mtime_ns)
+    yield directory, dirs, files
+
+    if not descend or stop_event.is_set():
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="LibraryWalker")
+    try:
+        futures = [executor.submit(_walk_subtree, subdir, stop_event, journal) for subdir in descend]
+        for future in futures:
+            if stop_event.is_set():
+                return
+            yield from future.result()
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CoroutinePool:
+    """
+    Bounded thread pool that runs coroutines, one event loop per thread.
+
+    Lets async loading code (aiofiles reads, blocking parsing and ffprobe
+    calls inside coroutines) run concurrently without rewriting it.
+
+    Example:
+        with CoroutinePool(8) as pool:
+            future = pool.submit(song_service.load_song, txt_file)
+            song = await asyncio.wrap_future(future)
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_SCAN_WORKERS, thread_name_prefix: str = "ScanPool"):
+        self._local = threading.local()
+        self._loops: List[asyncio.AbstractEventLoop] = []
+        self._loops_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix=thread_name_prefix, initializer=self._init_thread
+        )
+
+    def _init_thread(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._local.loop = loop
+        with self._loops_lock:
+            self._loops.append(loop)
+
+    def _run(self, coro_fn: Callable[..., Coroutine[Any, Any, Any]], args: tuple) -> Any:
+        return self._local.loop.run_until_complete(coro_fn(*args))
+
+    def submit(self, coro_fn: Callable[..., Coroutine[Any, Any, Any]], *args) -> Future:
+        """Schedule coro_fn(*args) on a pool thread; returns a concurrent.futures.Future."""
+        return self._executor.submit(self._run, coro_fn, args)
+
+    def shutdown(self, cancel_pending: bool = False) -> None:
+        """Wait for running coroutines (dropping queued ones if cancel_pending) and close the loops."""
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+        with self._loops_lock:
+            loops, self._loops = self._loops, []
+        for loop in loops:
+            loop.close()
+
+    def __enter__(self) -> "CoroutinePool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown(cancel_pending=exc_type is not None)
@@ -23,9 +23,17 @@ class SongService:
         self.gap_info_service = GapInfoService()
 
     async def load_song(
-        self, txt_file: str, force_reload: bool = False, cancel_check: Optional[Callable] = None
+        self,
+        txt_file: str,
+        force_reload: bool = False,
+        cancel_check: Optional[Callable] = None,
+        headers_only: bool = False,
     ) -> Song:
-        """Load a song from a text file, using cache if available."""
+        """Load a song from a text file, using cache if available.
+
+        With headers_only, notes are not parsed (song.notes stays None, as for
+        cached songs); they are loaded on demand when needed.
+        """
         song = Song(txt_file)
 
         if not os.path.exists(txt_file):
@@ -43,7 +51,7 @@ class SongService:
 
         try:
             usdx_file = USDXFile(txt_file)
-            await USDXFileService.load(usdx_file)
+            await USDXFileService.load(usdx_file, headers_only=headers_only)
             await self._initialize_song_from_usdx(song, usdx_file)
         except FileNotFoundError as e:
             logger.error("File not found during load: %s", txt_file)
@@ -17,6 +17,7 @@ from services.usdx.parsers.handlers import (
     StartTagHandler,
     RelativeTagHandler,
     NoteLineHandler,
+    NOTE_LINE_TYPES,
 )
 
 
@@ -44,10 +45,25 @@ def create_registry() -> TagRegistry:
     return registry
 
 
+# Handlers are stateless, so one registry is shared by all parses (and threads)
+_default_registry = create_registry()
+
+
+def get_registry() -> TagRegistry:
+    """
+    Return the shared TagRegistry with all standard USDX tag handlers.
+
+    Returns:
+        TagRegistry: Registry built once at import time
+    """
+    return _default_registry
+
+
 __all__ = [
     "TagHandler",
     "TagRegistry",
     "create_registry",
+    "get_registry",
     "GapTagHandler",
     "TitleTagHandler",
     "ArtistTagHandler",
@@ -57,4 +73,5 @@ __all__ = [
     "StartTagHandler",
     "RelativeTagHandler",
     "NoteLineHandler",
+    "NOTE_LINE_TYPES",
 ]
@@ -29,6 +29,6 @@ class TagHandler(Protocol):
         Args:
             line: The line to parse
             tags: Tags object to update
-            notes: List of notes to append to
+            notes: List of note rows (NoteType, StartBeat, Length, Pitch, Text) to append to
         """
         ...
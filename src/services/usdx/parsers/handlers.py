@@ -4,7 +4,10 @@ Concrete Tag Handler Implementations
 Each class handles parsing of one specific USDX tag or note type.
 """
 
-from model.usdx_file import Tags, Note
+from model.usdx_file import Tags
+
+# First token of note lines (normal, golden, freestyle, rap, golden rap, line break)
+NOTE_LINE_TYPES = frozenset({":", "*", "R", "-", "F", "G"})
 
 
 class GapTagHandler:
@@ -113,12 +116,7 @@ class NoteLineHandler:
         return ""  # Empty prefix indicates this handles non-tag lines
 
     def parse(self, line: str, tags: Tags, notes: list) -> None:
-        parts = line.strip().split()
-        if len(parts) >= 5 and parts[0] in {":", "*", "R", "-", "F", "G"}:
-            note = Note()
-            note.NoteType = parts[0]
-            note.StartBeat = int(parts[1])
-            note.Length = int(parts[2])
-            note.Pitch = int(parts[3])
-            note.Text = " ".join(parts[4:])
-            notes.append(note)
+        parts = line.split()
+        if len(parts) >= 5 and parts[0] in NOTE_LINE_TYPES:
+            # (NoteType, StartBeat, Length, Pitch, Text) row, see model.usdx_file.NoteArray.from_rows
+            notes.append((parts[0], int(parts[1]), int(parts[2]), int(parts[3]), " ".join(parts[4:])))
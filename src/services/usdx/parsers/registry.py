@@ -1,7 +1,9 @@
 """
 Tag Handler Registry for USDX Parser
 
-Provides O(1) dispatch to appropriate tag handler based on line prefix.
+Provides O(1) dispatch to appropriate tag handler based on line prefix:
+tag lines ('#') are looked up by their "#TAG:" prefix, all other lines go
+to the note handler, and parsing stops at the end-of-song line ('E').
 """
 
 from typing import Dict, List
@@ -44,14 +46,37 @@ class TagRegistry:
         Args:
             line: Line to parse
             tags: Tags object to update
-            notes: List to append notes to
+            notes: List to append note rows to
         """
-        # Check for tag handlers first
-        for prefix, handler in self._handlers.items():
-            if line.startswith(prefix):
+        if line.startswith("#"):
+            handler = self._handlers.get(line[: line.find(":") + 1])
+            if handler is not None:
                 handler.parse(line, tags, notes)
-                return
+            return
 
-        # If not a tag and we have a note handler, try note parsing
-        if self._note_handler and not line.startswith("#"):
+        if self._note_handler:
             self._note_handler.parse(line, tags, notes)
+
+    def parse_content(self, content: str, tags: Tags, notes: list, headers_only: bool = False) -> None:
+        """Parse a whole USDX file.
+
+        Args:
+            content: Decoded file content
+            tags: Tags object to update
+            notes: List to append note rows to
+            headers_only: Stop after the first note (tags precede the notes)
+        """
+        handlers = self._handlers
+        note_handler = self._note_handler
+        for line in content.splitlines():
+            first = line[:1]
+            if first == "#":
+                handler = handlers.get(line[: line.find(":") + 1])
+                if handler is not None:
+                    handler.parse(line, tags, notes)
+            elif first == "E" and line.rstrip() == "E":
+                break
+            elif note_handler is not None:
+                note_handler.parse(line, tags, notes)
+                if headers_only and notes:
+                    break
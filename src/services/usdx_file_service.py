@@ -1,20 +1,56 @@
+import codecs
 import re
 import os
 import logging
 import aiofiles
-from typing import List, Tuple
-from model.usdx_file import USDXFile, Tags, Note, ValidationError
+from typing import List, Optional, Tuple
+from model.usdx_file import USDXFile, Tags, NoteArray, NoteRow, ValidationError, compute_note_times
+from services.usdx.parsers import get_registry
 import utils.files as files
 
 logger = logging.getLogger(__name__)
 
+# Encodings tried (in order) when a file has no byte order mark
+ENCODINGS = [
+    "utf-8",
+    "utf-16",
+    "utf-32",
+    "cp1252",
+    "cp1250",
+    "latin-1",
+    "ascii",
+    "windows-1252",
+    "iso-8859-1",
+    "iso-8859-15",
+]
+_WIDE_ENCODINGS = {"utf-16", "utf-32"}
+# UTF-32 LE starts with the UTF-16 LE mark, so it is checked first
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_TITLE_PATTERN = re.compile(r"#TITLE:.+")
+
 
 class USDXFileService:
     """Service class for operations on USDX files"""
 
     @staticmethod
-    async def load(usdx_file: USDXFile) -> USDXFile:
-        """Load and parse a USDX file"""
+    async def load(usdx_file: USDXFile, headers_only: bool = False) -> USDXFile:
+        """
+        Load and parse a USDX file (one binary read, decoded in memory).
+
+        Args:
+            usdx_file: File to load
+            headers_only: Only parse the tags (stops at the first note line, for
+                list views); usdx_file.notes is None afterwards
+
+        Returns:
+            USDXFile: The loaded file
+        """
         if not usdx_file.filepath:
             raise ValueError("No filepath provided")
 
@@ -24,24 +60,25 @@ class USDXFileService:
         # Set path
         usdx_file.path = files.get_song_path(usdx_file.filepath)
 
-        # Determine encoding if needed
-        if usdx_file.encoding is None:
-            await USDXFileService.determine_encoding(usdx_file)
-
-        # Read file content
-        async with aiofiles.open(usdx_file.filepath, "r", encoding=usdx_file.encoding) as file:
-            usdx_file.content = await file.read()
+        # Read and decode file content (encoding is detected if needed)
+        async with aiofiles.open(usdx_file.filepath, "rb") as file:
+            raw = await file.read()
+        usdx_file.content, usdx_file.encoding = USDXFileService.decode(raw, usdx_file.encoding, usdx_file.filepath)
 
         # Parse content
-        tags, notes = USDXFileService.parse(usdx_file.content)
+        tags, notes = USDXFileService.parse(usdx_file.content, headers_only)
         usdx_file.tags = tags
         usdx_file.notes = notes
 
         # Validate required tags
         USDXFileService.validate(usdx_file)
 
-        # Calculate note timings
-        USDXFileService.calculate_note_times(usdx_file)
+        if headers_only:
+            # Only the first note was parsed (to validate that there are notes)
+            usdx_file.notes = None
+        else:
+            # Calculate note timings
+            USDXFileService.calculate_note_times(usdx_file)
 
         # Mark as loaded
         usdx_file._loaded = True
@@ -54,47 +91,70 @@ class USDXFileService:
         async with aiofiles.open(usdx_file.filepath, "rb") as file:
             raw = await file.read()
 
+        usdx_file.encoding = USDXFileService.detect_encoding(raw, usdx_file.filepath)[1]
+
+    @staticmethod
+    def detect_encoding(raw: bytes, filepath: str = "") -> Tuple[str, str]:
+        """
+        Detect the encoding of raw USDX file content.
+
+        A byte order mark decides directly; otherwise UTF-8 is tried first and
+        the remaining ENCODINGS in order. An encoding is accepted when the
+        decoded text contains a #TITLE tag.
+
+        Returns:
+            Tuple of (decoded text, encoding)
+        """
         # Check if file is empty or too small (likely still being written)
         if not raw or len(raw) < 10:
-            raise Exception(f"File is empty or too small: {usdx_file.filepath}")
-
-        encodings = [
-            "utf-8",
-            "utf-16",
-            "utf-32",
-            "cp1252",
-            "cp1250",
-            "latin-1",
-            "ascii",
-            "windows-1252",
-            "iso-8859-1",
-            "iso-8859-15",
-        ]
-
-        for encoding in encodings:
+            raise Exception(f"File is empty or too small: {filepath}")
+
+        for bom, encoding in _BOMS:
+            if raw.startswith(bom):
+                return raw.decode(encoding), encoding
+
+        # ASCII tags encoded as UTF-16/32 always contain NUL bytes; skip those decoders otherwise
+        wide_possible = b"\x00" in raw
+        for encoding in ENCODINGS:
+            if encoding in _WIDE_ENCODINGS and not wide_possible:
+                continue
             try:
                 content = raw.decode(encoding)
-                if re.search(r"#TITLE:.+", content, re.MULTILINE):
-                    usdx_file.encoding = encoding
-                    return
-            except Exception:
-                pass
+            except UnicodeDecodeError:
+                continue
+            if _TITLE_PATTERN.search(content):
+                return content, encoding
 
-        raise Exception(f"Failed to determine encoding for {usdx_file.filepath}")
+        raise Exception(f"Failed to determine encoding for {filepath}")
 
     @staticmethod
-    def parse(content: str) -> Tuple[Tags, List[Note]]:
-        """Parse USDX file content into tags and notes using strategy pattern"""
-        from services.usdx.parsers import create_registry
+    def decode(raw: bytes, encoding: Optional[str] = None, filepath: str = "") -> Tuple[str, str]:
+        """
+        Decode raw USDX file content like a text-mode read (universal newlines).
+
+        Args:
+            raw: File bytes
+            encoding: Known encoding, or None to detect it
+            filepath: File path (for error messages)
+
+        Returns:
+            Tuple of (content, encoding)
+        """
+        if encoding is None:
+            content, encoding = USDXFileService.detect_encoding(raw, filepath)
+        else:
+            content = raw.decode(encoding)
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content, encoding
 
+    @staticmethod
+    def parse(content: str, headers_only: bool = False) -> Tuple[Tags, NoteArray]:
+        """Parse USDX file content into tags and notes (with headers_only, stops after the first note)"""
         tags = Tags()
-        notes: List[Note] = []
-        registry = create_registry()
-
-        for line in content.splitlines():
-            registry.parse_line(line, tags, notes)
-
-        return tags, notes
+        rows: List[NoteRow] = []
+        get_registry().parse_content(content, tags, rows, headers_only)
+        return tags, NoteArray.from_rows(rows)
 
     @staticmethod
     def validate(usdx_file: USDXFile) -> None:
@@ -122,26 +182,7 @@ class USDXFileService:
             logger.warning(f"Cannot calculate note times for '{usdx_file.filepath}': BPM missing or invalid ({bpm})")
             return
 
-        beats_per_ms = (bpm / 60 / 1000) * 4
-        gap = usdx_file.tags.GAP or 0
-        is_relative = bool(usdx_file.tags.RELATIVE)
-
-        for note in usdx_file.notes or []:
-            # Guard against malformed notes
-            if note.StartBeat is None or note.Length is None:
-                continue
-
-            start_beat = float(note.StartBeat)
-            length_beats = float(note.Length)
-
-            if is_relative:
-                note.start_ms = start_beat / beats_per_ms
-                note.end_ms = (start_beat + length_beats) / beats_per_ms
-            else:
-                note.start_ms = gap + (start_beat / beats_per_ms)
-                note.end_ms = gap + ((start_beat + length_beats) / beats_per_ms)
-
-            note.duration_ms = float(note.end_ms) - float(note.start_ms)
+        compute_note_times(usdx_file.notes or [], bpm, usdx_file.tags.GAP or 0, bool(usdx_file.tags.RELATIVE))
 
     @staticmethod
     async def save(usdx_file: USDXFile) -> None:
@@ -182,34 +223,21 @@ class USDXFileService:
         await USDXFileService.write_tag(usdx_file, "GAP", str(value))
 
     @staticmethod
-    async def load_notes_only(usdx_file: USDXFile) -> List[Note]:
+    async def load_notes_only(usdx_file: USDXFile) -> NoteArray:
         """Load only the notes from the file without parsing all metadata"""
         try:
             if not os.path.exists(usdx_file.filepath):
                 raise FileNotFoundError(f"File not found: {usdx_file.filepath}")
 
-            # Determine encoding if not already set
-            if usdx_file.encoding is None:
-                await USDXFileService.determine_encoding(usdx_file)
-
-            # Open the file and read content asynchronously
-            async with aiofiles.open(usdx_file.filepath, "r", encoding=usdx_file.encoding) as f:
-                lines = await f.readlines()
-
-            # Find and parse notes
-            notes = []
-            for line in lines:
-                parts = line.strip().split()
-                if len(parts) >= 5 and parts[0] in {":", "*", "R", "-", "F", "G"}:
-                    note = Note()
-                    note.NoteType = parts[0]
-                    note.StartBeat = int(parts[1])
-                    note.Length = int(parts[2])
-                    note.Pitch = int(parts[3])
-                    note.Text = " ".join(parts[4:])
-                    notes.append(note)
-
-            return notes
+            async with aiofiles.open(usdx_file.filepath, "rb") as f:
+                raw = await f.read()
+            content, usdx_file.encoding = USDXFileService.decode(raw, usdx_file.encoding, usdx_file.filepath)
+
+            # Tags are parsed into a throwaway Tags object
+            rows: List[NoteRow] = []
+            get_registry().parse_content(content, Tags(), rows)
+
+            return NoteArray.from_rows(rows)
         except Exception as e:
             logger.error(f"Error loading notes from file: {e}")
             raise
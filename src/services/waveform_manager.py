@@ -11,7 +11,7 @@ from services.song_service import SongService
 from services.waveform_path_service import WaveformPathService
 from workers.create_waveform import CreateWaveform
 from utils.run_async import run_async
-from utils.waveform import create_waveform_image, draw_notes, draw_silence_periods, draw_title
+from utils.waveform_peaks import get_peaks, has_cached_peaks
 
 logger = logging.getLogger(__name__)
 
@@ -31,17 +31,17 @@ class _WaveformJobState:
     requesters: Set[str] = field(default_factory=set)
     waiting_for_notes: bool = False
     lane_hold: bool = False
-    target_fingerprints: Dict[str, "_WaveformFingerprint"] = field(default_factory=dict)
-
-
-@dataclass(frozen=True)
-class _WaveformFingerprint:
-    audio_mtime: float
-    audio_size: int
 
 
 class WaveformManager(QObject):
-    """Coordinates waveform generation for songs and deduplicates queued work."""
+    """
+    Coordinates waveform preparation for songs and deduplicates queued work.
+
+    Preparing a waveform decodes the audio and vocals into cached peaks (see
+    utils.waveform_peaks); the media player paints from them. Peaks are keyed
+    by the audio fingerprint, so changed audio is never served stale peaks and
+    cached targets are skipped even when overwrite is requested.
+    """
 
     waveformQueued = Signal(str)
     waveformReady = Signal(object)
@@ -57,7 +57,6 @@ class WaveformManager(QObject):
         self._metadata_waiting: Set[str] = set()
         self._metadata_timeouts: Dict[str, QTimer] = {}
         self._song_service = SongService()
-        self._fingerprints: Dict[str, Dict[str, _WaveformFingerprint]] = {}
 
         songs = getattr(self._data, "songs", None)
         if songs is not None:
@@ -127,51 +126,6 @@ class WaveformManager(QObject):
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _get_cached_fingerprint(self, job_key: str, target_key: str) -> Optional[_WaveformFingerprint]:
-        return self._fingerprints.get(job_key, {}).get(target_key)
-
-    def _remember_fingerprint(
-        self,
-        job_key: str,
-        target_key: str,
-        fingerprint: Optional[_WaveformFingerprint],
-    ) -> None:
-        if not fingerprint:
-            return
-        self._fingerprints.setdefault(job_key, {})[target_key] = fingerprint
-
-    def _compute_audio_fingerprint(self, audio_file: str) -> Optional[_WaveformFingerprint]:
-        try:
-            stat_result = os.stat(audio_file)
-        except OSError:
-            return None
-        return _WaveformFingerprint(audio_mtime=stat_result.st_mtime, audio_size=stat_result.st_size)
-
-    def _waveform_is_stale(
-        self,
-        job_key: str,
-        target_key: str,
-        fingerprint: Optional[_WaveformFingerprint],
-        waveform_file: Optional[str],
-    ) -> bool:
-        if not fingerprint:
-            return True
-
-        cached = self._get_cached_fingerprint(job_key, target_key)
-        if cached and cached == fingerprint:
-            return False
-
-        if not waveform_file or not os.path.exists(waveform_file):
-            return True
-
-        try:
-            waveform_mtime = os.path.getmtime(waveform_file)
-        except OSError:
-            return True
-
-        # Regenerate when audio is newer than the current waveform snapshot
-        return waveform_mtime < fingerprint.audio_mtime
-
     def _resolve_song_key(self, song: Song) -> Optional[str]:
         path = getattr(song, "path", None)
         candidate = path or getattr(song, "audio_file", None)
@@ -322,20 +276,8 @@ class WaveformManager(QObject):
             return
 
         scheduled = 0
-        scheduled += self._schedule_waveform_for_target(
-            job,
-            song,
-            "audio",
-            paths["audio_file"],
-            paths["audio_waveform_file"],
-        )
-        scheduled += self._schedule_waveform_for_target(
-            job,
-            song,
-            "vocals",
-            paths["vocals_file"],
-            paths["vocals_waveform_file"],
-        )
+        scheduled += self._schedule_waveform_for_target(job, song, "audio", paths["audio_file"])
+        scheduled += self._schedule_waveform_for_target(job, song, "vocals", paths["vocals_file"])
 
         if scheduled == 0:
             logger.debug("Waveform already up-to-date for %s", job.song_path)
@@ -350,43 +292,22 @@ class WaveformManager(QObject):
         song: Song,
         target_key: str,
         audio_file: Optional[str],
-        waveform_file: Optional[str],
     ) -> int:
-        if not audio_file or not waveform_file:
-            return 0
-        if not os.path.exists(audio_file):
+        if not audio_file or not os.path.exists(audio_file):
             logger.debug("Skipping %s waveform, audio missing: %s", target_key, audio_file)
             return 0
 
-        fingerprint = self._compute_audio_fingerprint(audio_file)
-        waveform_exists = os.path.exists(waveform_file)
-
-        if not job.overwrite and waveform_exists and fingerprint:
-            if not self._waveform_is_stale(job.song_path, target_key, fingerprint, waveform_file):
-                logger.debug("Skipping %s waveform, fingerprint unchanged", target_key)
-                self._remember_fingerprint(job.song_path, target_key, fingerprint)
-                return 0
-
-        if not job.overwrite and waveform_exists and not fingerprint:
-            logger.debug(
-                "Regenerating %s waveform due to missing fingerprint metadata for %s",
-                target_key,
-                audio_file,
-            )
-
-        if not waveform_exists:
-            logger.debug("Scheduling %s waveform, file missing: %s", target_key, waveform_file)
+        if has_cached_peaks(audio_file):
+            logger.debug("Skipping %s waveform, peaks already cached", target_key)
+            return 0
 
         job.pending_targets.add(target_key)
-        if fingerprint:
-            job.target_fingerprints[target_key] = fingerprint
 
         if job.use_queue:
             worker = CreateWaveform(
                 song,
                 self._data.config,
                 audio_file,
-                waveform_file,
                 is_instant=True,
                 target_label=target_key,
             )
@@ -398,7 +319,7 @@ class WaveformManager(QObject):
             )
             self._data.worker_queue.add_task(worker, True)
         else:
-            self._run_direct_waveform(job, song, audio_file, waveform_file, target_key)
+            self._run_direct_waveform(job, song, audio_file, target_key)
 
         return 1
 
@@ -407,27 +328,11 @@ class WaveformManager(QObject):
         job: _WaveformJobState,
         song: Song,
         audio_file: str,
-        waveform_file: str,
         target_key: str,
     ):
         def _build():
             try:
-                color = getattr(self._data.config, "waveform_color", "gray")
-                create_waveform_image(audio_file, waveform_file, color)
-
-                gap_info = getattr(song, "gap_info", None)
-                duration_ms = int(getattr(gap_info, "duration", 0) or getattr(song, "duration_ms", 0) or 0)
-                silence_periods = getattr(gap_info, "silence_periods", []) if gap_info else []
-                if silence_periods and duration_ms > 0:
-                    draw_silence_periods(waveform_file, silence_periods, duration_ms)
-
-                if song.notes and duration_ms > 0:
-                    draw_notes(waveform_file, song.notes, duration_ms, color)
-
-                title = f"{getattr(song, 'artist', '')} - {getattr(song, 'title', '')}".strip(" -")
-                if title:
-                    draw_title(waveform_file, title, color)
-
+                get_peaks(audio_file)
             except Exception as exc:
                 self._handle_worker_error(job.song_path, target_key, exc)
                 return
@@ -484,9 +389,6 @@ class WaveformManager(QObject):
         if not already_ready:
             logger.debug("Waveform ready for %s", job.song_path)
 
-        for target_key, fingerprint in job.target_fingerprints.items():
-            self._remember_fingerprint(job.song_path, target_key, fingerprint)
-
         self.waveformReady.emit(song)
 
     def _fail_job(self, job: _WaveformJobState, message: str):
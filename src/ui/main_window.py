@@ -25,12 +25,14 @@ from PySide6.QtCore import QTimer, Qt
 
 from actions import Actions
 from app.app_data import AppData
-from common.database import initialize_song_cache
+from common.database import initialize_song_cache, shutdown_cache
 from common.utils.async_logging import shutdown_async_logging
 
 from utils.enable_darkmode import enable_dark_mode
 from utils.check_dependencies import check_dependencies
 from utils.run_async import shutdown_asyncio
+from utils.providers.mdx.model_registry import shutdown_model_registry
+from utils.gap_detection.engine import shutdown_detection_engine
 from utils.files import resource_path
 
 from ui.menu_bar import MenuBar
@@ -394,10 +396,14 @@ def _log_runtime_info_and_check_dependencies():
         logger.debug("Multimedia backend query not available (not critical - app uses its own audio processing)")
 
 
-def _setup_shutdown_sequence(app, data, logViewer):
+def _setup_shutdown_sequence(app, data, logViewer, actions):
     """Setup proper shutdown sequence for cleanup."""
+    app.aboutToQuit.connect(actions.save_library_snapshot)
     app.aboutToQuit.connect(lambda: data.worker_queue.shutdown())
     app.aboutToQuit.connect(shutdown_asyncio)
+    app.aboutToQuit.connect(shutdown_cache)
+    app.aboutToQuit.connect(shutdown_model_registry)
+    app.aboutToQuit.connect(shutdown_detection_engine)
     app.aboutToQuit.connect(logViewer.cleanup)
     app.aboutToQuit.connect(shutdown_async_logging)
 
@@ -429,7 +435,7 @@ def _post_window_show(app, window, actions, config, data, menuBar, logViewer):
     if config.watch_mode_default:
         actions.initial_scan_completed.connect(lambda: _auto_enable_watch_mode(actions))
     enable_dark_mode(app)
-    _setup_shutdown_sequence(app, data, logViewer)
+    _setup_shutdown_sequence(app, data, logViewer, actions)
     logger.info("GUI Initialized Successfully")
     QTimer.singleShot(200, lambda: _log_delayed_start_info(data))
 
@@ -10,6 +10,7 @@ from services.waveform_path_service import WaveformPathService
 
 from ui.mediaplayer.constants import AudioFileStatus
 from ui.mediaplayer.event_filter import MediaPlayerEventFilter
+from ui.mediaplayer.peaks_loader import PeaksLoader
 from ui.mediaplayer.waveform_widget import WaveformWidget
 from ui.mediaplayer.player_controller import PlayerController
 from ui.mediaplayer.ui_manager import UIManager
@@ -37,11 +38,12 @@ class MediaPlayerComponent(QWidget):
         self._suspend_loads = False  # Guard window to avoid reload during status/filter transitions
         self._mode_switch_timer = None  # Debounce timer for mode switch reload
         self._pinned_path: str | None = None  # Tracks the last active song path during scans
-        self._waveform_manager = getattr(self._data, "waveform_manager", None)
+        self._waveform_source = None  # (path, size, mtime) of the media whose waveform is shown or loading
 
         # Initialize controllers
         self.player = PlayerController(self._config)
         self.ui_manager = UIManager(self._config)
+        self._peaks_loader = PeaksLoader(self)
 
         # Position interpolation for smooth 60 FPS updates (works for all backends)
         self._last_backend_position = 0  # Last position from backend
@@ -82,14 +84,13 @@ class MediaPlayerComponent(QWidget):
         self._data.selected_songs_changed.connect(self.on_selected_songs_changed)
         self._data.songs.updated.connect(self.on_song_updated)
         self._data.songs.deleted.connect(lambda: self.player.unload_all_media())
+        self._data.songs.deletedBatch.connect(lambda: self.player.unload_all_media())
         # New: allow actions to request unloading media to prevent Windows file locks during normalization
         self._data.media_unload_requested.connect(lambda: self.player.unload_all_media())
         # Optional: suspend media loads during status/filter transitions (if provided by AppData)
         self._data.media_suspend_requested.connect(self.on_media_suspend_requested)
 
-        if self._waveform_manager:
-            self._waveform_manager.waveformReady.connect(self._handle_waveform_ready)
-            self._waveform_manager.waveformFailed.connect(self._handle_waveform_failed)
+        self._peaks_loader.peaksLoaded.connect(self._on_peaks_loaded)
 
     def initUI(self):
         # Create control buttons
@@ -107,6 +108,7 @@ class MediaPlayerComponent(QWidget):
 
         # Setup waveform
         self.waveform_widget = WaveformWidget(self)
+        self.waveform_widget.set_colors(self._config.waveform_color, self._config.silence_periods_color)
 
         # Setup action buttons
         self.position_label = QLabel("")
@@ -333,7 +335,7 @@ class MediaPlayerComponent(QWidget):
     def on_vocals_validation_failed(self):
         """Handle when vocals file fails validation"""
         # Clear waveform and show error placeholder
-        self.waveform_widget.load_waveform(None)
+        self._clear_waveform()
         self.waveform_widget.set_placeholder("Invalid vocals file - re-run gap detection to regenerate")
 
         # Update vocals button tooltip
@@ -385,6 +387,7 @@ class MediaPlayerComponent(QWidget):
             self.update_player_files()
             # Track B: Clear gap markers
             self.waveform_widget.set_gap_markers(None, None)
+            self._update_waveform_overlays(None)
             return
 
         # Update UI immediately for instant feedback
@@ -398,29 +401,21 @@ class MediaPlayerComponent(QWidget):
                 original_gap_ms=song.gap_info.original_gap, detected_gap_ms=song.gap_info.detected_gap
             )
         else:
-            self.waveform_widget.set_gap_markers(
-                None, None
-            )  # Defer async operations slightly to let UI render selection first
+            self.waveform_widget.set_gap_markers(None, None)
+        self._update_waveform_overlays(song)
+
+        # Defer async operations slightly to let UI render selection first
         # This eliminates any perceived lag from event loop contention
         from PySide6.QtCore import QTimer
 
         # Check if we need to load data (async, non-blocking)
         force_light_reload = self._should_force_light_reload(song)
 
-        waveforms_exist = WaveformPathService.waveforms_exists(song, self._data.tmp_path)
-        if not waveforms_exist:
-            self.waveform_widget.set_placeholder("Loading waveform…")
-
-        requires_waveform = not waveforms_exist
-        if requires_waveform:
-            self.waveform_widget.set_placeholder("Loading waveform…")
-            self._ensure_waveform_generation(song, overwrite=False)
-
         if not song.notes or force_light_reload:
             # Song needs metadata reload - use light reload to avoid status changes
             # Defer by 0ms to let UI render first
             QTimer.singleShot(0, lambda: self._actions.reload_song_light(song, force=force_light_reload))
-            # Note: Waveform will be created after notes load via on_song_updated signal
+            # Note: Notes are drawn on the waveform once they load via on_song_updated signal
 
     def on_song_updated(self, updated_song: Song):
         """Handle when the current song data is updated
@@ -441,23 +436,14 @@ class MediaPlayerComponent(QWidget):
         self._song = updated_song
         self.update_ui()
 
-        # Check if waveform was just created (file now exists but placeholder is showing)
-        # This fixes the "Loading waveform..." placeholder persistence issue
-        waveforms_exist = WaveformPathService.waveforms_exists(updated_song, self._data.tmp_path)
-        if self.waveform_widget.placeholder_visible and waveforms_exist:
-            logger.info(f"Waveform created for {updated_song.title} - reloading display")
-            self.update_player_files()
-            return  # Early return - update_player_files already called
-
-        # Reload media/waveform if status is QUEUED/PROCESSING (handled by _should_skip_loading)
-        # Or if waveform exists and was just regenerated (for gap updates, note changes, etc.)
-        should_reload = updated_song.status in (SongStatus.QUEUED, SongStatus.PROCESSING) or waveforms_exist
-        if should_reload:
-            if updated_song.status in (SongStatus.QUEUED, SongStatus.PROCESSING):
-                logger.debug(f"Status changed to {updated_song.status.name}, reloading player files")
-            else:
-                logger.debug(f"Waveform regenerated for {updated_song.title}, reloading display")
-            self.update_player_files()
+        # Reload media/waveform: QUEUED/PROCESSING unloads media (handled by _should_skip_loading),
+        # afterwards media and waveform are reloaded only if the files changed (e.g. new vocals)
+        if updated_song.status in (SongStatus.QUEUED, SongStatus.PROCESSING):
+            logger.debug(f"Status changed to {updated_song.status.name}, reloading player files")
+        self.update_player_files()
+
+        # Gap edits, new notes or detection results only repaint the overlay layers
+        self._update_waveform_overlays(updated_song)
 
         # Update gap markers from updated song's gap_info
         if updated_song.gap_info:
@@ -468,10 +454,6 @@ class MediaPlayerComponent(QWidget):
         else:
             self.waveform_widget.set_gap_markers(None, None)
 
-        # If notes just finished loading and waveforms don't exist, create them now
-        if not waveforms_exist:
-            self._ensure_waveform_generation(updated_song, overwrite=False)
-
     def update_player_files(self):
         """Load the appropriate media files based on current state"""
         import time
@@ -555,7 +537,7 @@ class MediaPlayerComponent(QWidget):
         """Clear all player UI elements"""
         logger.debug("No song - not loading media")
         self.player.load_media(None)
-        self.waveform_widget.load_waveform(None)
+        self._clear_waveform()
         self.waveform_widget.clear_placeholder()
 
     def _should_skip_loading(self, song: Song) -> bool:
@@ -588,69 +570,58 @@ class MediaPlayerComponent(QWidget):
         if not getattr(self._data, "is_loading_songs", False):
             return False
 
-        # Only force reload when we genuinely need fresh data (no waveforms on disk yet)
+        # Only force reload when we genuinely need fresh data (song never shown, no waveform peaks cached yet)
         return not WaveformPathService.waveforms_exists(song, self._data.tmp_path)
 
-    def _ensure_waveform_generation(self, song: Song, overwrite: bool = False):
-        if not song:
-            return
-        if self._waveform_manager:
-            self._waveform_manager.ensure_waveforms(
-                song,
-                overwrite=overwrite,
-                use_queue=True,
-                emit_on_finish=False,
-                requester="media-player",
-            )
-            return
+    def _update_waveform_overlays(self, song: Song | None):
+        """Set the silence periods, notes and title layers of the waveform from the song."""
+        gap_info = getattr(song, "gap_info", None) if song else None
+        self.waveform_widget.set_silence_periods(getattr(gap_info, "silence_periods", None) if gap_info else None)
+        self.waveform_widget.set_notes(getattr(song, "notes", None) if song else None)
+        self.waveform_widget.set_title(f"{song.artist} - {song.title}" if song else "")
+
+    def _clear_waveform(self):
+        """Clear the waveform and drop any pending peaks load"""
+        self._peaks_loader.cancel()
+        self._waveform_source = None
+        self.waveform_widget.load_waveform(None)
 
-        from actions.audio_actions import AudioActions
+    def _show_waveform(self, media_file: str) -> bool:
+        """Show the waveform of a media file from its peaks (loaded in the background if not in memory).
 
-        def _fallback():
-            audio_actions = AudioActions(self._data)
-            audio_actions._create_waveforms(
-                song,
-                overwrite=overwrite,
-                use_queue=True,
-                emit_on_finish=False,
-                finished_callback=lambda _: self._handle_waveform_ready(song),
-            )
+        Returns:
+            False if the waveform of this exact file is already shown or loading
+        """
+        try:
+            stat_result = os.stat(media_file)
+            source = (media_file, stat_result.st_size, stat_result.st_mtime_ns)
+        except OSError:
+            source = None
+        if source is not None and source == self._waveform_source:
+            return False
+        self._waveform_source = source
 
-        QTimer.singleShot(0, _fallback)
+        peaks = self._peaks_loader.request(media_file)
+        if peaks is not None:
+            self.waveform_widget.set_peaks(peaks)
+        else:
+            self.waveform_widget.set_peaks(None)
+            self.waveform_widget.set_placeholder("Loading waveform…")
+        return True
 
-    def _handle_waveform_ready(self, song: Song | None):
-        if not song or not self._song:
-            return
-        if song.path != self._song.path:
-            logger.debug(
-                "Waveform ready for %s but current selection is %s",
-                song.path,
-                getattr(self._song, "path", None),
-            )
-            return
-        if not WaveformPathService.waveforms_exists(song, self._data.tmp_path):
+    def _on_peaks_loaded(self, media_file: str, peaks):
+        if not self._waveform_source or self._waveform_source[0] != media_file:
             return
-        logger.debug("Waveform ready for active song; refreshing media player")
-        self.waveform_widget.clear_placeholder()
-        self.update_player_files()
-
-    def _handle_waveform_failed(self, song: Song | None, message: str):
-        if not song or not self._song or song.path != self._song.path:
+        if peaks is None:
+            self.waveform_widget.set_placeholder("Waveform unavailable")
             return
-        logger.warning("Waveform generation failed for %s: %s", song.title, message)
-        self.waveform_widget.set_placeholder("Waveform unavailable")
+        self.waveform_widget.set_peaks(peaks)
 
     def _load_audio_mode(self, song: Song, paths: dict):
         """Load audio file and waveform"""
         logger.debug(f"Loading audio file: {paths['audio_file']}")
         self.player.load_media(paths["audio_file"])
-
-        if os.path.exists(paths["audio_waveform_file"]):
-            self._load_audio_waveform(paths)
-        else:
-            logger.debug("Audio waveform missing at %s; showing placeholder", paths["audio_waveform_file"])
-            self._show_waveform_placeholder(song)
-
+        self._load_audio_waveform(paths)
         self.vocals_btn.setToolTip("")
 
     def _load_audio_waveform(self, paths: dict):
@@ -660,7 +631,8 @@ class MediaPlayerComponent(QWidget):
 
         start_time = time.perf_counter()
 
-        self.waveform_widget.load_waveform(paths["audio_waveform_file"])
+        if not self._show_waveform(paths["audio_file"]):
+            return
         duration_f = get_audio_duration(paths["audio_file"])
         if duration_f is not None:
             duration_ms = int(duration_f)
@@ -678,14 +650,6 @@ class MediaPlayerComponent(QWidget):
         else:
             logger.debug(f"_load_audio_waveform completed in {duration_ms:.1f}ms")
 
-    def _show_waveform_placeholder(self, song: Song):
-        """Show appropriate placeholder message"""
-        self.waveform_widget.load_waveform(None)
-        if song.status == SongStatus.PROCESSING:
-            self.waveform_widget.set_placeholder("Gap detection in progress…")
-        else:
-            self.waveform_widget.set_placeholder("Loading waveform…")
-
     def _load_vocals_mode(self, paths: dict):
         """Load vocals file and waveform"""
         if not os.path.exists(paths["vocals_file"]):
@@ -694,21 +658,14 @@ class MediaPlayerComponent(QWidget):
 
         logger.debug(f"Loading vocals file: {paths['vocals_file']}")
         self.player.load_media(paths["vocals_file"])
-
-        if os.path.exists(paths["vocals_waveform_file"]):
-            self._load_vocals_waveform(paths)
-        else:
-            logger.debug("Vocals waveform missing at %s; showing placeholder", paths["vocals_waveform_file"])
-            self.waveform_widget.load_waveform(None)
-            self.waveform_widget.set_placeholder("Loading waveform…")
-
+        self._load_vocals_waveform(paths)
         self.vocals_btn.setToolTip("")
 
     def _show_vocals_missing(self):
         """Show UI for missing vocals file"""
         logger.debug("Vocals file does not exist")
         self.player.load_media(None)
-        self.waveform_widget.load_waveform(None)
+        self._clear_waveform()
         self.waveform_widget.set_placeholder("Run gap detection to generate the vocals waveform.")
         self.vocals_btn.setToolTip("Run gap detection to extract vocals and generate a waveform.")
 
@@ -716,7 +673,8 @@ class MediaPlayerComponent(QWidget):
         """Load vocals waveform and set duration"""
         from utils.audio import get_audio_duration
 
-        self.waveform_widget.load_waveform(paths["vocals_waveform_file"])
+        if not self._show_waveform(paths["vocals_file"]):
+            return
         vocals_duration_f = get_audio_duration(paths["vocals_file"])
         if vocals_duration_f is not None:
             vocals_duration_ms = int(vocals_duration_f)
@@ -738,7 +696,7 @@ class MediaPlayerComponent(QWidget):
         if multiple_songs_selected:
             logger.debug("Multiple songs selected, stopping player")
             self.player.stop()
-            self.waveform_widget.load_waveform(None)
+            self._clear_waveform()
             self._pinned_path = None
         elif self.isEnabled() and self._song:
             self._pinned_path = getattr(self._song, "path", None)
@@ -0,0 +1,75 @@
+import logging
+import threading
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from utils import waveform_peaks
+
+logger = logging.getLogger(__name__)
+
+
+class PeaksLoader(QObject):
+    """
+    Last-request-wins loader for waveform peaks, off the UI thread and outside the worker queue.
+
+    Peaks already in memory are returned synchronously. Otherwise they are read
+    from the peaks cache (or decoded once) on a background thread; a newer
+    request cancels the decode of an older one and only the latest result is
+    delivered through peaksLoaded.
+
+    Usage:
+      - Call request(audio_file); use the returned peaks, or wait for peaksLoaded.
+      - Call cancel() to drop any pending request (e.g. when the player is cleared).
+    """
+
+    # audio_file, WaveformPeaks (None if the file could not be decoded)
+    peaksLoaded = Signal(str, object)
+    _loaded = Signal(int, str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        # Emitted from the loading thread, delivered on the thread owning this object
+        self._loaded.connect(self._on_loaded)
+
+    def request(self, audio_file: str):
+        """
+        Request the peaks of an audio file.
+
+        Args:
+            audio_file: Path to the audio (or vocals) file
+
+        Returns:
+            WaveformPeaks if they are in memory, else None (peaksLoaded follows)
+        """
+        self._generation += 1
+        peaks = waveform_peaks.cached_peaks(audio_file)
+        if peaks is not None:
+            return peaks
+        generation = self._generation
+        threading.Thread(target=self._load, args=(audio_file, generation), daemon=True).start()
+        return None
+
+    def cancel(self):
+        """Drop the pending request; its decode stops at the next chunk."""
+        self._generation += 1
+
+    def _load(self, audio_file: str, generation: int):
+        def superseded():
+            return generation != self._generation
+
+        try:
+            peaks = waveform_peaks.get_peaks(audio_file, superseded)
+        except Exception as e:
+            if superseded():
+                return
+            logger.warning(f"Failed to load waveform peaks for {audio_file}: {e}")
+            peaks = None
+        self._loaded.emit(generation, audio_file, peaks)
+
+    @Slot(int, str, object)
+    def _on_loaded(self, generation: int, audio_file: str, peaks):
+        if generation != self._generation:
+            logger.debug(f"Discarding superseded waveform peaks for {audio_file}")
+            return
+        self.peaksLoaded.emit(audio_file, peaks)
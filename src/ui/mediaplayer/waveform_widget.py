@@ -1,15 +1,45 @@
 import os
 import logging
-from PySide6.QtWidgets import QLabel, QWidget, QSizePolicy
-from PySide6.QtGui import QPainter, QPen, QPixmap, QColor
-from PySide6.QtCore import Qt, Signal, QEvent
+from PySide6.QtWidgets import QWidget, QSizePolicy
+from PySide6.QtGui import QPainter, QPen, QPixmap, QColor, QFont
+from PySide6.QtCore import Qt, Signal, QEvent, QLineF, QRectF, QTimer
 from ui.mediaplayer.gap_marker_colors import PLAYHEAD_COLOR, DETECTED_GAP_COLOR, REVERT_GAP_COLOR
 from utils.time_position import time_to_pixel, time_to_normalized_position
 
 logger = logging.getLogger(__name__)
 
+# Debounce for re-rendering the base layer at a new size; the stale pixmap is scaled meanwhile
+RESIZE_RENDER_DELAY_MS = 120
+
+
+def _qcolor(color, fallback="gray") -> QColor:
+    """Config colors are names/#hex strings or RGB(A) tuples."""
+    if isinstance(color, (tuple, list)):
+        return QColor(*color)
+    qcolor = QColor(str(color))
+    return qcolor if qcolor.isValid() else QColor(fallback)
+
+
+def map_pitch_to_vertical_position(pitch, min_pitch, max_pitch, height):
+    """Map a pitch value to a vertical position around the middle of the given height."""
+    pitch_range = max_pitch - min_pitch
+    if pitch_range == 0:  # Avoid division by zero
+        return height / 2
+    normalized_pitch = (pitch - min_pitch) / pitch_range  # Normalize pitch to 0-1 range
+    return (1 - normalized_pitch) * height / 2 + height / 4
+
+
+class WaveformWidget(QWidget):
+    """
+    Waveform display painted from cached peaks in layers.
+
+    - base layer: the waveform itself, rendered once per peaks/size into a pixmap
+    - overlay layer: silence periods, notes and title, invalidated on their own
+    - marker overlay: playhead and gap markers on a child widget, repainted per frame
+
+    Repaints (playhead movement, placeholder changes) only blit the cached layers.
+    """
 
-class WaveformWidget(QLabel):
     # Change signal type to float
     position_clicked = Signal(float)
 
@@ -17,7 +47,6 @@ class WaveformWidget(QLabel):
         super().__init__(parent)
         self.setStyleSheet("padding: 0px; margin: 0px;")
         self.setMinimumHeight(100)  # Minimum height instead of fixed
-        self.setScaledContents(True)
         self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Expanding)  # Allow vertical expansion
         self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
 
@@ -28,6 +57,21 @@ class WaveformWidget(QLabel):
         # Markers visibility state
         self.markers_visible = True  # Hide markers when player disabled or no media
 
+        # Layer sources and their cached renderings (None = needs rendering)
+        self.peaks = None  # WaveformPeaks of the shown media
+        self._image = QPixmap()  # Pre-rendered waveform image (load_waveform)
+        self.silence_periods = []
+        self.notes = []
+        self.title = ""
+        self.waveform_color = QColor("gray")
+        self.silence_color = QColor(105, 105, 105, 128)
+        self._base_layer = None
+        self._overlay_layer = None
+
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.timeout.connect(self._on_resize_settled)
+
         # Overlay for showing the current play position
         self.overlay = QWidget(self)
         self.overlay.setFixedSize(self.size())
@@ -101,14 +145,85 @@ class WaveformWidget(QLabel):
         self.markers_visible = visible
         self.overlay.update()  # Trigger marker overlay repaint
 
+    def set_colors(self, waveform_color, silence_color):
+        """
+        Set the waveform and silence shading colors.
+
+        Args:
+            waveform_color: Waveform, note and title color (name, #hex or RGB(A) tuple)
+            silence_color: Silence shading color (name, #hex or RGB(A) tuple)
+        """
+        self.waveform_color = _qcolor(waveform_color)
+        self.silence_color = _qcolor(silence_color)
+        self._base_layer = None
+        self._overlay_layer = None
+        self.update()
+
+    def set_peaks(self, peaks):
+        """
+        Show the waveform of the given peaks (None clears it).
+
+        Args:
+            peaks: WaveformPeaks of the loaded media
+        """
+        self.peaks = peaks
+        self._image = QPixmap()
+        self._base_layer = None
+        self._overlay_layer = None  # Overlays are positioned by the media duration
+        if peaks is not None:
+            self.clear_placeholder()  # Clear placeholder when waveform loads
+            self.set_markers_visible(True)  # Restore markers when media loaded
+        else:
+            self.set_markers_visible(False)  # Hide markers when no media
+        self.update()
+
+    def set_silence_periods(self, silence_periods):
+        """Set the (start_ms, end_ms) periods shaded as silence."""
+        silence_periods = list(silence_periods or [])
+        if silence_periods != self.silence_periods:
+            self.silence_periods = silence_periods
+            self.invalidate_overlays()
+
+    def set_notes(self, notes):
+        """Set the notes drawn over the waveform (Note objects with timing and pitch)."""
+        notes = list(notes or [])
+        if notes != self.notes:
+            self.notes = notes
+            self.invalidate_overlays()
+
+    def set_title(self, title: str):
+        """Set the title text drawn in the top left corner."""
+        if (title or "") != self.title:
+            self.title = title or ""
+            self.invalidate_overlays()
+
+    def invalidate_overlays(self):
+        """Re-render the silence/notes/title layer on the next paint; the waveform layer is kept."""
+        self._overlay_layer = None
+        self.update()
+
+    def pixmap(self) -> QPixmap:
+        """The rendered waveform layer (null if nothing is shown)."""
+        return self._image if self.peaks is None else self._render_base_layer()
+
     def paintEvent(self, arg__1):
-        """Custom paint event to draw placeholder text when visible"""
-        # Draw the pixmap first (standard QLabel behavior)
-        super().paintEvent(arg__1)
+        """Blit the cached layers, then the placeholder text when visible"""
+        painter = QPainter(self)
+        rect = self.rect()
+
+        if self.peaks is None:
+            if not self._image.isNull():
+                painter.drawPixmap(rect, self._image)
+        else:
+            # A layer of a stale size is scaled until the resize settles and it is re-rendered
+            painter.drawPixmap(rect, self._base_layer or self._render_base_layer())
+            overlay = self._overlay_layer
+            if overlay is None or overlay.size() != rect.size():
+                overlay = self._render_overlay_layer()
+            painter.drawPixmap(rect.topLeft(), overlay)
 
         # Draw placeholder text if visible
         if self.placeholder_visible and self.placeholder_text:
-            painter = QPainter(self)
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
             # Use default application font (matches buttons)
@@ -119,15 +234,89 @@ class WaveformWidget(QLabel):
             text_rect = painter.fontMetrics().boundingRect(self.placeholder_text)
 
             # Calculate center position
-            widget_rect = self.rect()
-            text_x = (widget_rect.width() - text_rect.width()) // 2
-            text_y = (widget_rect.height() - text_rect.height()) // 2 + text_rect.height()
+            text_x = (rect.width() - text_rect.width()) // 2
+            text_y = (rect.height() - text_rect.height()) // 2 + text_rect.height()
 
             # Draw text in a subtle gray color (no background)
             painter.setPen(QColor(160, 160, 160))  # Medium gray for subtle appearance
             painter.drawText(text_x, text_y, self.placeholder_text)
 
-            painter.end()
+        painter.end()
+
+    def _render_base_layer(self) -> QPixmap:
+        """Render the waveform at the current size (sqrt amplitude scale, like ffmpeg's showwavespic)."""
+        width, height = max(1, self.width()), max(1, self.height())
+        if self._base_layer is not None and self._base_layer.size() == self.size():
+            return self._base_layer
+
+        layer = QPixmap(width, height)
+        layer.fill(Qt.GlobalColor.transparent)
+        minimum, maximum, _ = self.peaks.columns(width)
+        middle = height / 2
+        lines = [
+            QLineF(x + 0.5, middle - (top**0.5) * middle, x + 0.5, middle + (bottom**0.5) * middle)
+            for x, (top, bottom) in enumerate(zip(maximum.clip(0.0, 1.0).tolist(), (-minimum).clip(0.0, 1.0).tolist()))
+        ]
+        painter = QPainter(layer)
+        painter.setPen(QPen(self.waveform_color, 1))
+        painter.drawLines(lines)
+        painter.end()
+
+        self._base_layer = layer
+        return layer
+
+    def _render_overlay_layer(self) -> QPixmap:
+        """Render silence periods, notes and title on a transparent layer."""
+        width, height = max(1, self.width()), max(1, self.height())
+        layer = QPixmap(width, height)
+        layer.fill(Qt.GlobalColor.transparent)
+        duration_ms = self.peaks.duration_ms if self.peaks is not None else 0
+
+        painter = QPainter(layer)
+        if duration_ms > 0:
+            for start_ms, end_ms in self.silence_periods:
+                if start_ms is None or end_ms is None:
+                    continue
+                start_x = start_ms / duration_ms * width
+                painter.fillRect(QRectF(start_x, 0, end_ms / duration_ms * width - start_x, height), self.silence_color)
+            self._paint_notes(painter, duration_ms, width, height)
+        if self.title:
+            painter.setPen(self.waveform_color)
+            painter.drawText(10, 60, self.title)
+        painter.end()
+
+        self._overlay_layer = layer
+        return layer
+
+    def _paint_notes(self, painter: QPainter, duration_ms: float, width: int, height: int):
+        """Draw notes with valid timing and pitch as bars (with their text) positioned by pitch."""
+        valid_notes = [
+            n
+            for n in self.notes
+            if getattr(n, "start_ms", None) is not None
+            and getattr(n, "end_ms", None) is not None
+            and getattr(n, "Pitch", None) is not None
+        ]
+        if not valid_notes:
+            return
+
+        min_pitch = min(n.Pitch for n in valid_notes)
+        max_pitch = max(n.Pitch for n in valid_notes)
+        font = QFont(painter.font())
+        font.setPixelSize(10)
+        painter.setFont(font)
+        painter.setPen(self.waveform_color)
+        line_height = 5
+        for n in valid_notes:
+            start_x = n.start_ms / duration_ms * width
+            end_x = n.end_ms / duration_ms * width
+            vertical_position = map_pitch_to_vertical_position(n.Pitch, min_pitch, max_pitch, height / 2) + height / 4
+            painter.fillRect(
+                QRectF(start_x, vertical_position - line_height / 2, end_x - start_x, line_height),
+                self.waveform_color,
+            )
+            if n.Text:
+                painter.drawText(QRectF(start_x, vertical_position + 4, 200, 14), n.Text)
 
     def update_position(self, position, duration):
         """Update playhead position without affecting gap marker duration.
@@ -153,8 +342,7 @@ class WaveformWidget(QLabel):
         )
         self.original_gap_ms = original_gap_ms
         self.detected_gap_ms = detected_gap_ms
-        self.overlay.update()  # Trigger repaint to show markers
-        self.update()  # Also update the main widget to ensure proper sync
+        self.overlay.update()  # Markers live on their own layer; the waveform layers are not touched
 
     def set_original_audio_duration(self, duration_ms: int):
         """Set the original audio duration for correct timeline mapping in vocals mode.
@@ -166,14 +354,19 @@ class WaveformWidget(QLabel):
         logger.debug(f"Original audio duration set to {duration_ms}ms for timeline mapping")
 
     def load_waveform(self, file: str | None):
+        """Show a pre-rendered waveform image; None clears the waveform (peaks included)."""
+        self.peaks = None
+        self._base_layer = None
+        self._overlay_layer = None
         if file and os.path.exists(file):
-            self.setPixmap(QPixmap(file))
+            self._image = QPixmap(file)
             self.clear_placeholder()  # Clear placeholder when waveform loads
             self.set_markers_visible(True)  # Restore markers when media loaded
         else:
-            self.setPixmap(QPixmap())
+            self._image = QPixmap()
             self.set_markers_visible(False)  # Hide markers when no media
             # Don't clear placeholder here - let caller set appropriate message
+        self.update()
 
     def mousePressEvent(self, ev):
         # Ensure parent gets focus
@@ -195,8 +388,15 @@ class WaveformWidget(QLabel):
         # Let the event continue processing
         super().mousePressEvent(ev)
 
+    def _on_resize_settled(self):
+        self._base_layer = None
+        self.update()
+
     def eventFilter(self, watched, event):
         if watched == self and event.type() == QEvent.Type.Resize:
             # Adjust the overlay size to match the waveformLabel
             self.overlay.setFixedSize(self.size())
+            # Overlays re-render at the new size on the next paint; the base layer is scaled until the resize settles
+            if self._base_layer is not None:
+                self._resize_timer.start(RESIZE_RENDER_DELAY_MS)
         return super().eventFilter(watched, event)
@@ -34,7 +34,9 @@ class SongsStatusVisualizer(QWidget):
         # Connect signals
         self.songs.added.connect(self.update_visualization)
         self.songs.updated.connect(self.update_visualization)
+        self.songs.updatedBatch.connect(self.update_visualization)
         self.songs.deleted.connect(self.update_visualization)
+        self.songs.deletedBatch.connect(self.update_visualization)
         self.songs.cleared.connect(self.update_visualization)
         self.songs.listChanged.connect(self.update_visualization)  # React to batch adds
 
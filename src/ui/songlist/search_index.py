@@ -0,0 +1,168 @@
+"""
+Song List Search Index
+
+Inverted index over the song table's row cache. A filter change computes the
+set of matching songs once (trigram postings for the text, per-status sets)
+and the proxy answers filterAcceptsRow by set membership instead of running
+substring scans per row.
+"""
+
+import logging
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Row cache fields the text filter searches (all lower-cased)
+SEARCH_FIELDS = ("artist_lower", "title_lower", "relative_path_lower")
+NGRAM = 3
+# Postings built per query; further trigrams of a long (pasted) text are covered by the substring check
+MAX_NEW_POSTINGS_PER_QUERY = 4
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+def trigrams(text: str) -> Set[str]:
+    """All 3-character substrings of a text (empty for shorter texts)."""
+    return {text[i : i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class SongSearchIndex:
+    """Trigram postings and status sets for the songs of the table, keyed by song txt file.
+
+    The searchable fields and status sets are kept for every song. A trigram
+    posting is built by one scan the first time a query contains it (typing
+    adds one trigram per keystroke) and is maintained incrementally from then
+    on, so the index only holds trigrams that were actually searched.
+    """
+
+    def __init__(self):
+        self._fields: Dict[str, Tuple[str, ...]] = {}
+        self._status: Dict[str, str] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        # Bumped on every change; callers cache query results per generation
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __contains__(self, txt_file: str) -> bool:
+        return txt_file in self._fields
+
+    def clear(self):
+        self._fields.clear()
+        self._status.clear()
+        self._by_status.clear()
+        self._postings.clear()
+        self.generation += 1
+
+    def add(self, txt_file: str, cache_entry: dict, status: str):
+        """Add or update a song from its row cache entry (no-op if nothing searchable changed)."""
+        fields = tuple(cache_entry.get(name, "") for name in SEARCH_FIELDS)
+        old_fields = self._fields.get(txt_file)
+        old_status = self._status.get(txt_file)
+        if fields == old_fields and status == old_status:
+            return
+
+        if old_status != status:
+            if old_status is not None:
+                self._by_status[old_status].discard(txt_file)
+            self._by_status.setdefault(status, set()).add(txt_file)
+            self._status[txt_file] = status
+
+        if fields != old_fields:
+            if self._postings:
+                old_grams = self._trigrams(old_fields) if old_fields else set()
+                new_grams = self._trigrams(fields)
+                for gram in old_grams - new_grams:
+                    posting = self._postings.get(gram)
+                    if posting is not None:
+                        posting.discard(txt_file)
+                for gram in new_grams - old_grams:
+                    posting = self._postings.get(gram)
+                    if posting is not None:
+                        posting.add(txt_file)
+            self._fields[txt_file] = fields
+        self.generation += 1
+
+    def remove(self, txt_file: str):
+        fields = self._fields.pop(txt_file, None)
+        if fields is None:
+            return
+        status = self._status.pop(txt_file)
+        self._by_status[status].discard(txt_file)
+        if self._postings:
+            for gram in self._trigrams(fields):
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(txt_file)
+        self.generation += 1
+
+    def query(self, text: str, statuses: Iterable[str] = ()) -> Set[str]:
+        """
+        Txt files of the songs matching a text and status filter.
+
+        Args:
+            text: Lower-cased text that must occur in artist, title or relative path ("" = any)
+            statuses: Status names of which one must match (empty = any)
+
+        Returns:
+            Set of txt files of the matching songs
+        """
+        started_at = time.perf_counter()
+        statuses = list(statuses)
+        pool: Optional[Set[str]] = None
+        if statuses:
+            pool = set().union(*(self._by_status.get(status, _EMPTY) for status in statuses))
+
+        if not text:
+            matched = pool if pool is not None else set(self._fields)
+        elif len(text) < NGRAM:
+            matched = {
+                txt_file for txt_file in (self._fields if pool is None else pool) if self._contains(txt_file, text)
+            }
+        else:
+            lists = sorted(self._postings_for(trigrams(text)), key=len)
+            candidates = set(lists[0])
+            for other in (pool, *lists[1:]):
+                if not candidates:
+                    break
+                if other is not None:
+                    candidates &= other
+            # Trigrams may come from different fields or positions; only a 3-character text is exact
+            matched = candidates if len(text) == NGRAM else {p for p in candidates if self._contains(p, text)}
+
+        logger.debug(
+            "Search index matched %s of %s songs in %.1f ms",
+            len(matched),
+            len(self._fields),
+            (time.perf_counter() - started_at) * 1000,
+        )
+        return matched
+
+    def _contains(self, txt_file: str, text: str) -> bool:
+        artist, title, relative_path = self._fields[txt_file]
+        return text in artist or text in title or text in relative_path
+
+    @staticmethod
+    def _trigrams(fields: Tuple[str, ...]) -> Set[str]:
+        # Per field, so no trigram spans two fields
+        grams: Set[str] = set()
+        for field in fields:
+            grams |= trigrams(field)
+        return grams
+
+    def _postings_for(self, grams: Set[str]) -> List[Set[str]]:
+        """Postings of the given trigrams, building up to MAX_NEW_POSTINGS_PER_QUERY missing ones."""
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        missing = [gram for gram in grams if gram not in self._postings]
+        for gram in missing[:MAX_NEW_POSTINGS_PER_QUERY]:
+            posting = {
+                txt_file
+                for txt_file, (artist, title, relative_path) in self._fields.items()
+                if gram in artist or gram in title or gram in relative_path
+            }
+            self._postings[gram] = posting
+            postings.append(posting)
+        return postings
@@ -1,5 +1,7 @@
+import bisect
+import os
 import time
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex, QTimer, Signal
 from PySide6.QtGui import QColor
 import logging
@@ -8,6 +10,7 @@ from app.app_data import AppData
 from model.song import Song, SongStatus
 from model.songs import Songs
 from ui.songlist.columns import create_registry
+from ui.songlist.search_index import SongSearchIndex
 from utils import files
 
 logger = logging.getLogger(__name__)
@@ -32,6 +35,9 @@ class SongTableModel(QAbstractTableModel):
 
         # Performance optimizations
         self._row_cache = {}  # Cache for expensive computations
+        self._row_by_file: Dict[str, int] = {}  # song.txt_file -> row
+        self.layout_generation = 0  # Bumped whenever existing rows move (removal, sort, rebuild)
+        self.search_index = SongSearchIndex()  # Text/status filter index over the row cache
         self._is_streaming = False  # Flag for async loading
         self._dirty_rows = set()  # For throttled dataChanged emissions
         self._update_timer = QTimer()
@@ -42,7 +48,9 @@ class SongTableModel(QAbstractTableModel):
         # Connect signals
         self.songs_model.added.connect(self.song_added)
         self.songs_model.updated.connect(self.song_updated)
+        self.songs_model.updatedBatch.connect(self.songs_updated)
         self.songs_model.deleted.connect(self.song_deleted)
+        self.songs_model.deletedBatch.connect(self.songs_deleted)
         self.songs_model.cleared.connect(self.songs_cleared)
         self.songs_model.listChanged.connect(self.list_changed)  # Handle batch updates
 
@@ -84,6 +92,7 @@ class SongTableModel(QAbstractTableModel):
             self.songs.extend(new_songs)
             for song in new_songs:
                 self._add_to_cache(song)
+            self._index_rows(current_count)
             self.endInsertRows()
             elapsed = 0.0
             if self._bulk_started_at:
@@ -102,11 +111,13 @@ class SongTableModel(QAbstractTableModel):
 
     def add_pending_songs(self):
         if self.pending_songs:
-            self.beginInsertRows(QModelIndex(), len(self.songs), len(self.songs) + len(self.pending_songs) - 1)
+            start_row = len(self.songs)
+            self.beginInsertRows(QModelIndex(), start_row, start_row + len(self.pending_songs) - 1)
             self.songs.extend(self.pending_songs)
             # Populate cache for newly added songs
             for song in self.pending_songs:
                 self._add_to_cache(song)
+            self._index_rows(start_row)
             self.pending_songs.clear()
             self.endInsertRows()
         if not self.pending_songs:
@@ -127,104 +138,186 @@ class SongTableModel(QAbstractTableModel):
     def _rebuild_cache(self):
         """Rebuild the entire cache from current songs list."""
         self._row_cache.clear()
+        self.search_index.clear()
         for song in self.songs:
             self._add_to_cache(song)
+        self._reindex_rows()
+
+    def _index_rows(self, start: int):
+        """Add rows appended from ``start`` on to the txt file -> row index."""
+        for row in range(start, len(self.songs)):
+            self._row_by_file.setdefault(self.songs[row].txt_file, row)
+
+    def _reindex_rows(self):
+        """Rebuild the txt file -> row index after rows moved (removal, sort)."""
+        self._row_by_file.clear()
+        self._index_rows(0)
+        self.layout_generation += 1
+
+    def _row_of(self, song: Song) -> Optional[int]:
+        """Row of a song instance (O(1) unless another instance of the same txt file is listed)."""
+        row = self._row_by_file.get(song.txt_file)
+        if row is not None and self.songs[row] is song:
+            return row
+        try:
+            return self.songs.index(song)
+        except ValueError:
+            return None
+
+    def rows_of_files(self, txt_files: Set[str]) -> bytearray:
+        """Row mask (1 per row whose song.txt_file is in ``txt_files``), e.g. for a search index result."""
+        mask = bytearray(len(self.songs))
+        if len(self._row_by_file) < len(self.songs):
+            # The same txt file is listed more than once; the index only knows its first row
+            for row, song in enumerate(self.songs):
+                if song.txt_file in txt_files:
+                    mask[row] = 1
+            return mask
+        row_by_file = self._row_by_file
+        for txt_file in txt_files:
+            row = row_by_file.get(txt_file)
+            if row is not None:
+                mask[row] = 1
+        return mask
+
+    @staticmethod
+    def _contiguous_ranges(rows: Iterable[int]) -> Iterator[Tuple[int, int]]:
+        """Yield (first, last) of each run of consecutive rows, in ascending order."""
+        start_row = end_row = None
+        for row in sorted(rows):
+            if end_row is not None and row == end_row + 1:
+                end_row = row
+                continue
+            if start_row is not None:
+                yield start_row, end_row
+            start_row = end_row = row
+        if start_row is not None:
+            yield start_row, end_row
+
+    def _relative_path(self, path: str) -> str:
+        """Path relative to the library directory (string slice for paths inside it, else os.path.relpath)."""
+        directory = (self.app_data.directory or "").rstrip("/\\")
+        if directory and path.startswith(directory) and path[len(directory) : len(directory) + 1] in ("/", os.sep):
+            return os.path.normpath(path[len(directory) + 1 :])
+        return files.get_relative_path(self.app_data.directory, path)
 
     def _add_to_cache(self, song: Song):
         """Add a single song to the cache."""
-        relative_path = files.get_relative_path(self.app_data.directory, song.path)
-        self._row_cache[song.path] = {
+        song_path = song.path
+        relative_path = self._relative_path(song_path)
+        entry = {
             "relative_path": relative_path,
             "relative_path_lower": relative_path.lower(),
             "artist_lower": song.artist.lower(),
             "title_lower": song.title.lower(),
             "title_sort_key": song.title_sort_key,
         }
+        self._row_cache[song_path] = entry
+        self.search_index.add(song.txt_file, entry, song.status.name)
 
     def _update_cache(self, song: Song):
         """Update cache entry for a song."""
-        if song.path in self._row_cache:
-            relative_path = files.get_relative_path(self.app_data.directory, song.path)
-            self._row_cache[song.path]["relative_path"] = relative_path
-            self._row_cache[song.path]["relative_path_lower"] = relative_path.lower()
-            self._row_cache[song.path]["artist_lower"] = song.artist.lower()
-            self._row_cache[song.path]["title_lower"] = song.title.lower()
-            self._row_cache[song.path]["title_sort_key"] = song.title_sort_key
+        if song.path not in self._row_cache:
+            # The entry is shared per folder and went away with a removed song of the same folder
+            self._add_to_cache(song)
+            return
+        relative_path = self._relative_path(song.path)
+        self._row_cache[song.path]["relative_path"] = relative_path
+        self._row_cache[song.path]["relative_path_lower"] = relative_path.lower()
+        self._row_cache[song.path]["artist_lower"] = song.artist.lower()
+        self._row_cache[song.path]["title_lower"] = song.title.lower()
+        self._row_cache[song.path]["title_sort_key"] = song.title_sort_key
+        self.search_index.add(song.txt_file, self._row_cache[song.path], song.status.name)
 
     def _remove_from_cache(self, song: Song):
         """Remove a song from the cache."""
         self._row_cache.pop(song.path, None)
+        self.search_index.remove(song.txt_file)
 
     def _emit_coalesced_updates(self):
         """Emit dataChanged for accumulated dirty rows."""
         if not self._dirty_rows:
             return
 
-        # Sort dirty rows and emit ranges
         sorted_rows = sorted(self._dirty_rows)
-        if not sorted_rows:
-            return
-
         ellipsis = "..." if len(sorted_rows) > 10 else ""
         logger.debug(f"Emitting dataChanged for {len(sorted_rows)} rows: " f"{sorted_rows[:10]}{ellipsis}")
 
         # Emit contiguous ranges
-        start_row = sorted_rows[0]
-        end_row = sorted_rows[0]
-
-        for row in sorted_rows[1:]:
-            if row == end_row + 1:
-                end_row = row
-            else:
-                # Emit current range
-                self.dataChanged.emit(
-                    self.index(start_row, 0),
-                    self.index(end_row, self.columnCount() - 1),
-                    [
-                        Qt.ItemDataRole.DisplayRole,
-                        Qt.ItemDataRole.BackgroundRole,
-                        Qt.ItemDataRole.TextAlignmentRole,
-                    ],
-                )
-                start_row = row
-                end_row = row
-
-        # Emit final range
-        self.dataChanged.emit(
-            self.index(start_row, 0),
-            self.index(end_row, self.columnCount() - 1),
-            [
-                Qt.ItemDataRole.DisplayRole,
-                Qt.ItemDataRole.BackgroundRole,
-                Qt.ItemDataRole.TextAlignmentRole,
-            ],
-        )
+        for start_row, end_row in self._contiguous_ranges(sorted_rows):
+            self.dataChanged.emit(
+                self.index(start_row, 0),
+                self.index(end_row, self.columnCount() - 1),
+                [
+                    Qt.ItemDataRole.DisplayRole,
+                    Qt.ItemDataRole.BackgroundRole,
+                    Qt.ItemDataRole.TextAlignmentRole,
+                ],
+            )
 
         self._dirty_rows.clear()
 
     def song_updated(self, song: Song):
-        for idx, s in enumerate(self.songs):
-            if s.path == song.path:
-                # Update cache
-                self._update_cache(song)
-                # Add to dirty rows for coalesced update
-                self._dirty_rows.add(idx)
-                if not self._update_timer.isActive():
-                    self._update_timer.start()
-                logger.debug(f"Marked row {idx} as dirty for song: {song.title} ({song.artist})")
-                return
-        logger.warning(f"Song update received but not found in model: {song.path}")
+        idx = self._row_by_file.get(song.txt_file)
+        if idx is None:
+            logger.warning(f"Song update received but not found in model: {song.path}")
+            return
+        # Update cache
+        self._update_cache(song)
+        # Add to dirty rows for coalesced update
+        self._dirty_rows.add(idx)
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+        logger.debug(f"Marked row {idx} as dirty for song: {song.title} ({song.artist})")
+
+    def songs_updated(self, songs: List[Song]):
+        """Mark the rows of a batch of updated songs dirty (one coalesced dataChanged pass)."""
+        for song in songs:
+            idx = self._row_by_file.get(song.txt_file)
+            if idx is None:
+                continue
+            self._update_cache(song)
+            self._dirty_rows.add(idx)
+        if self._dirty_rows and not self._update_timer.isActive():
+            self._update_timer.start()
 
     def song_deleted(self, song: Song):
-        try:
-            row_index = self.songs.index(song)
-            self.beginRemoveRows(QModelIndex(), row_index, row_index)
-            self.songs.pop(row_index)
-            self._remove_from_cache(song)
-            self.endRemoveRows()
-            logger.info(f"Deleted song: {song}")
-        except ValueError:
+        row_index = self._row_of(song)
+        if row_index is None:
             logger.error(f"Attempted to delete a song not in the list: {song}")
+            return
+        self._remove_rows([row_index], [song])
+        logger.info(f"Deleted song: {song}")
+
+    def songs_deleted(self, songs: List[Song]):
+        """Remove a batch of songs, one beginRemoveRows per contiguous row range."""
+        rows = {}
+        for song in songs:
+            row_index = self._row_of(song)
+            if row_index is None:
+                logger.error(f"Attempted to delete a song not in the list: {song}")
+            else:
+                rows[row_index] = song
+        if rows:
+            self._remove_rows(list(rows), list(rows.values()))
+            logger.info(f"Deleted {len(rows)} songs")
+
+    def _remove_rows(self, rows: List[int], songs: List[Song]):
+        rows_set = set(rows)
+        # Remove bottom-up so the lower ranges keep their row numbers
+        for start_row, end_row in reversed(list(self._contiguous_ranges(rows))):
+            self.beginRemoveRows(QModelIndex(), start_row, end_row)
+            del self.songs[start_row : end_row + 1]
+            self.endRemoveRows()
+        for song in songs:
+            self._remove_from_cache(song)
+        self._reindex_rows()
+        if self._dirty_rows:
+            # Shift coalesced updates past the removed rows
+            removed = sorted(rows)
+            self._dirty_rows = {
+                row - bisect.bisect_left(removed, row) for row in self._dirty_rows if row not in rows_set
+            }
 
     def songs_cleared(self):
         # End bulk loading if active
@@ -235,6 +328,9 @@ class SongTableModel(QAbstractTableModel):
         self.beginResetModel()
         self.songs.clear()
         self._row_cache.clear()
+        self.search_index.clear()
+        self._row_by_file.clear()
+        self._dirty_rows.clear()
         self.endResetModel()
         self._remap_selection_to_current_instances()
 
@@ -299,6 +395,7 @@ class SongTableModel(QAbstractTableModel):
         self.songs.sort(key=lambda song: self._get_sort_key(song, column))
         if order == Qt.SortOrder.DescendingOrder:
             self.songs.reverse()
+        self._reindex_rows()
         self.layoutChanged.emit()
 
     # Streaming API for chunked async loading
@@ -308,6 +405,9 @@ class SongTableModel(QAbstractTableModel):
         self.beginResetModel()
         self.songs.clear()
         self._row_cache.clear()
+        self.search_index.clear()
+        self._row_by_file.clear()
+        self._dirty_rows.clear()
         self.endResetModel()
         logger.info(f"Started async loading, expecting {total_count} songs")
 
@@ -324,6 +424,7 @@ class SongTableModel(QAbstractTableModel):
         # Populate cache for the chunk
         for song in chunk_songs:
             self._add_to_cache(song)
+        self._index_rows(start_row)
         self.endInsertRows()
 
         logger.debug(f"Appended {len(chunk_songs)} songs, total now: {len(self.songs)}")
@@ -340,19 +441,15 @@ class SongTableModel(QAbstractTableModel):
         if not selected:
             return
 
-        path_map = {}
-        for song in self.songs:
-            path = getattr(song, "path", None)
-            if path:
-                path_map[path] = song
-
         remapped = []
         changed = False
         for song in selected:
-            path = getattr(song, "path", None)
-            replacement = path_map.get(path)
-            if replacement is None:
+            row = self._row_of(song)
+            if row is None:
+                row = self._row_by_file.get(getattr(song, "txt_file", None))
+            if row is None:
                 return  # Missing selection in current list; keep existing selection untouched
+            replacement = self.songs[row]
             remapped.append(replacement)
             if replacement is not song:
                 changed = True
@@ -1,6 +1,6 @@
 import logging
 import time
-from typing import List, cast
+from typing import List, Optional, cast
 
 from PySide6.QtCore import QSortFilterProxyModel, QTimer, Qt
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QMessageBox
@@ -22,6 +22,9 @@ CHUNK_DELAY_MS = 16  # Delay between chunks (60 FPS)
 class CustomSortFilterProxyModel(QSortFilterProxyModel):
     def __init__(self, app_data: AppData, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # Per source row: 1 if the row passes the active filters (valid for _accepted_key)
+        self._accepted_rows: Optional[bytearray] = None
+        self._accepted_key = None
         self.selectedStatuses: list[str] = []  # List of status names (strings)
         self.textFilter: str = ""
         self.app_data = app_data  # Reference to AppData for selected songs
@@ -29,21 +32,60 @@ class CustomSortFilterProxyModel(QSortFilterProxyModel):
         self._filter_eval_count = 0
         self._pending_filter_summary = False
 
+    @property
+    def selectedStatuses(self) -> list[str]:
+        return self._selected_statuses
+
+    @selectedStatuses.setter
+    def selectedStatuses(self, value: list[str]):
+        self._selected_statuses = value
+        self._accepted_key = None
+
+    @property
+    def textFilter(self) -> str:
+        return self._text_filter
+
+    @textFilter.setter
+    def textFilter(self, value: str):
+        self._text_filter = value
+        self._accepted_key = None
+
     def filterAcceptsRow(self, source_row, source_parent):
         # Access the source model's data for the given row
         source_model = cast(SongTableModel, self.sourceModel())
-        song: Song = source_model.songs[source_row]
 
         if self._pending_filter_summary:
             self._filter_eval_count += 1
 
+        if not self.selectedStatuses and not self.textFilter:
+            return True
+
+        accepted_rows = self._accepted_rows_for(source_model)
+        if accepted_rows is not None and accepted_rows[source_row]:
+            return True
+
         # Always show selected songs regardless of filters
+        song: Song = source_model.songs[source_row]
         if song in self.app_data.selected_songs:
             return True
 
+        if accepted_rows is not None:
+            return False
         cache_entry = self._get_cache_entry(song, source_model)
         return self._song_passes_active_filters(song, cache_entry)
 
+    def _accepted_rows_for(self, source_model) -> Optional[bytearray]:
+        """Filter result per source row, queried from the search index once per filter/index/layout change."""
+        if not isinstance(source_model, SongTableModel):
+            return None
+        index = source_model.search_index
+        # Filter changes reset _accepted_key in the property setters
+        key = (index.generation, source_model.layout_generation, len(source_model.songs))
+        if key != self._accepted_key:
+            self._accepted_rows = source_model.rows_of_files(index.query(self.textFilter, self.selectedStatuses))
+            self._accepted_key = key
+        return self._accepted_rows
+
     def invalidate(self):
         start = time.perf_counter()
         super().invalidate()
@@ -244,6 +286,7 @@ class SongListWidget(QWidget):
         self.songs_model.filterChanged.connect(self.updateFilter)
         self._data.selected_songs_changed.connect(self.onSelectedSongsChanged)
         self.songs_model.updated.connect(self._on_song_updated)
+        self.songs_model.updatedBatch.connect(self._on_songs_updated)
         self.songs_model.loadingFinished.connect(self._on_loading_finished)
 
     def _refresh_action_buttons(self):
@@ -299,6 +342,12 @@ class SongListWidget(QWidget):
             # Only invalidate filter if this affects visibility
             self._schedule_filter_invalidation(delay_ms=100, songs=[song])
 
+    def _on_songs_updated(self, songs: List[Song]):
+        """Refresh buttons and filter once for a batch of updated songs (selection hydration)."""
+        if self._selected_songs:
+            self._refresh_action_buttons()
+        self._schedule_filter_invalidation(delay_ms=100, songs=songs)
+
     def onDetectClicked(self):
         """Handle Detect button: unload current media then start gap detection.
 
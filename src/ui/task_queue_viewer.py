@@ -79,8 +79,8 @@ class TaskQueueViewer(QWidget):
 
         Order:
         1. Running instant task (if present)
-        2. Running standard tasks
-        3. Queued instant tasks
+        2. Running standard and pool-lane tasks
+        3. Queued instant and pool-lane tasks
         4. Queued standard tasks
 
         Returns:
@@ -96,15 +96,17 @@ class TaskQueueViewer(QWidget):
             can_cancel = status_name not in ("CANCELLING", "FINISHED", "ERROR", "CANCELLED")
             tasks.append((worker.id, description, status_name, can_cancel))
 
-        # 2. Running standard tasks
-        for worker_id, worker in self.workerQueueManager.running_tasks.items():
+        # 2. Running standard and pool-lane tasks
+        running_pool = [w for lane in self.workerQueueManager.running_pool_tasks.values() for w in lane.values()]
+        for worker in list(self.workerQueueManager.running_tasks.values()) + running_pool:
             description = getattr(worker, "description", worker.__class__.__name__)
             status_name = getattr(worker.status, "name", str(worker.status))
             can_cancel = status_name not in ("CANCELLING", "FINISHED", "ERROR", "CANCELLED")
-            tasks.append((worker_id, description, status_name, can_cancel))
+            tasks.append((worker.id, description, status_name, can_cancel))
 
-        # 3. Queued instant tasks
-        for worker in self.workerQueueManager.queued_instant_tasks:
+        # 3. Queued instant and pool-lane tasks
+        queued_pool = [w for queue in self.workerQueueManager.queued_pool_tasks.values() for w in queue]
+        for worker in list(self.workerQueueManager.queued_instant_tasks) + queued_pool:
             description = getattr(worker, "description", worker.__class__.__name__)
             status_name = "QUEUED"
             can_cancel = True
@@ -2,6 +2,7 @@ import sys
 import os
 import logging
 import argparse
+import multiprocessing
 import traceback
 from typing import Optional, Tuple, Any
 
@@ -443,4 +444,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the spawn-based detection worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
@@ -1,13 +1,22 @@
+import json
 import logging
 import os
 import stat
 import time
+from utils.audio_duration import probe_duration_ms
 from utils.cancellable_process import run_cancellable_process
 import tempfile
 from typing import List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# EBU R128 targets of normalization besides the integrated loudness (LU, dBTP)
+LOUDNORM_LRA = 11
+LOUDNORM_TRUE_PEAK = -2
+DEFAULT_NORMALIZATION_TOLERANCE = 1.0
+# Bump when the measurement changes in a way that makes stored values stale
+LOUDNESS_CACHE_VERSION = 1
+
 
 def milliseconds_to_str(time=0, with_milliseconds=False):
     if time is None:
@@ -23,6 +32,36 @@ def milliseconds_to_str(time=0, with_milliseconds=False):
 
 
 def get_audio_duration(audio_file, check_cancellation=None):
+    """
+    Get the duration of the audio file in milliseconds.
+
+    The duration is read from the container headers in-process; ffprobe is only
+    started for files the header reader cannot handle. Results are memoized in
+    the cache database per (path, size, mtime), so repeated calls are lookups.
+    """
+    # Imported lazily: the cache database imports the song model, which imports this module
+    from common.database import get_cached_audio_duration, set_cached_audio_duration
+
+    try:
+        file_stat = os.stat(audio_file)
+    except OSError:
+        file_stat = None
+
+    if file_stat is not None:
+        cached = get_cached_audio_duration(audio_file, file_stat.st_size, file_stat.st_mtime)
+        if cached is not None:
+            return cached
+        duration = probe_duration_ms(audio_file)
+        if duration is None:
+            duration = _ffprobe_duration(audio_file, check_cancellation)
+        if duration is not None:
+            set_cached_audio_duration(audio_file, file_stat.st_size, file_stat.st_mtime, duration)
+        return duration
+
+    return _ffprobe_duration(audio_file, check_cancellation)
+
+
+def _ffprobe_duration(audio_file, check_cancellation=None):
     """Get the duration of the audio file using ffprobe."""
     command = [
         "ffprobe",
@@ -118,11 +157,135 @@ def run_ffmpeg(audio_file, command, check_cancellation=None):
     return audio_file
 
 
-def normalize_audio(audio_file, target_level=-20, check_cancellation=None):
-    """Normalize the audio file to the target level. Default seetings are equal to USDB Syncher."""
-    logger.debug(f"Normalizing {audio_file}...")
-    command = ["-af", f"loudnorm=I={target_level}:LRA=11:TP=-2", "-ar", "48000"]
-    return run_ffmpeg(audio_file, command, check_cancellation)
+def loudness_key(audio_file) -> str | None:
+    """
+    Build the cache key of a loudness measurement from the audio content.
+
+    Returns:
+        Key string, or None if the file cannot be fingerprinted (measured uncached)
+    """
+    from utils.providers.mdx.stem_cache import audio_fingerprint
+
+    fingerprint = audio_fingerprint(audio_file, include_mtime=False)
+    return f"v{LOUDNESS_CACHE_VERSION}:{fingerprint}" if fingerprint else None
+
+
+def parse_loudnorm_stats(output: str):
+    """
+    Parse the JSON summary printed by a loudnorm analysis pass.
+
+    Args:
+        output: ffmpeg stderr of a run with loudnorm print_format=json
+
+    Returns:
+        LoudnessEntry, or None if the output holds no (valid) summary
+    """
+    from common.database import LoudnessEntry
+
+    start, end = output.rfind("{"), output.rfind("}")
+    if start < 0 or end < start:
+        return None
+    try:
+        stats = json.loads(output[start : end + 1])
+        return LoudnessEntry(
+            integrated=float(stats["input_i"]),
+            true_peak=float(stats["input_tp"]),
+            lra=float(stats["input_lra"]),
+            threshold=float(stats["input_thresh"]),
+        )
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def measure_loudness(audio_file, check_cancellation=None):
+    """
+    Measure integrated loudness, true peak and LRA (EBU R128) of an audio file.
+
+    The file is only decoded (nothing is written). Measurements are memoized in
+    the cache database per audio content, so each file is measured once.
+
+    Returns:
+        LoudnessEntry
+
+    Raises:
+        FileNotFoundError: If the audio file does not exist
+        Exception: If ffmpeg fails or prints no measurement
+    """
+    from common.database import get_loudness_measurement, set_loudness_measurement
+
+    if not os.path.exists(audio_file):
+        raise FileNotFoundError(f"Audio file not found: {audio_file}")
+
+    key = loudness_key(audio_file)
+    if key is not None:
+        cached = get_loudness_measurement(key)
+        if cached is not None:
+            return cached
+
+    logger.debug(f"Measuring loudness of {audio_file}...")
+    # The reported input_* values do not depend on the targets of the analysis pass
+    command = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        audio_file,
+        "-af",
+        f"loudnorm=I=-23:LRA={LOUDNORM_LRA}:TP={LOUDNORM_TRUE_PEAK}:print_format=json",
+        "-f",
+        "null",
+        "-",
+    ]
+    returncode, stdout, stderr = run_cancellable_process(command, check_cancellation)
+    measurement = parse_loudnorm_stats(stderr) if returncode == 0 else None
+    if measurement is None:
+        raise Exception(f"Failed to measure loudness of {audio_file}. Error: {stderr}")
+
+    if key is not None:
+        set_loudness_measurement(key, measurement)
+    return measurement
+
+
+def loudness_within_tolerance(measurement, target_level, tolerance=DEFAULT_NORMALIZATION_TOLERANCE) -> bool:
+    """Return True if a measurement is close enough to the target to skip normalization."""
+    return abs(measurement.integrated - target_level) <= tolerance and measurement.true_peak <= LOUDNORM_TRUE_PEAK
+
+
+def normalize_audio(
+    audio_file, target_level=-20, check_cancellation=None, tolerance=DEFAULT_NORMALIZATION_TOLERANCE, measurement=None
+):
+    """
+    Normalize the audio file to the target level. Default settings are equal to USDB Syncher.
+
+    Two-pass EBU R128 normalization: the (cached) measurement decides whether the
+    file needs to change at all, then feeds loudnorm, which applies one linear
+    gain when true peak and LRA allow it and falls back to dynamic mode otherwise.
+
+    Args:
+        audio_file: Audio file, replaced in place
+        target_level: Integrated loudness target in LUFS
+        check_cancellation: Optional cancellation check callback
+        tolerance: Files within this many LU of the target (and below the true peak
+            ceiling) are left untouched
+        measurement: LoudnessEntry if already measured (skips the lookup)
+
+    Returns:
+        bool: True if the file was rewritten, False if it was already within tolerance
+    """
+    if measurement is None:
+        measurement = measure_loudness(audio_file, check_cancellation)
+    if loudness_within_tolerance(measurement, target_level, tolerance):
+        logger.debug(f"Skipping normalization of {audio_file}: {measurement.integrated:.1f} LUFS within tolerance")
+        return False
+
+    logger.debug(f"Normalizing {audio_file} from {measurement.integrated:.1f} LUFS...")
+    loudnorm = (
+        f"loudnorm=I={target_level}:LRA={LOUDNORM_LRA}:TP={LOUDNORM_TRUE_PEAK}"
+        f":measured_I={measurement.integrated}:measured_TP={measurement.true_peak}"
+        f":measured_LRA={measurement.lra}:measured_thresh={measurement.threshold}:linear=true"
+    )
+    run_ffmpeg(audio_file, ["-af", loudnorm, "-ar", "48000"], check_cancellation)
+    return True
 
 
 def convert_to_mp3(audio_file, check_cancellation=None):
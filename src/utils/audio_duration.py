@@ -0,0 +1,321 @@
+"""
+In-process audio duration probing.
+
+Reads the duration from container headers instead of starting an ffprobe
+process per file:
+
+- MP3: Xing/Info or VBRI frame count; CBR files are estimated from the
+  bitrate, other files are frame-scanned
+- MP4/M4A: movie header (mvhd) duration and timescale
+- Ogg Vorbis/Opus: granule position of the last page
+- FLAC: STREAMINFO sample count
+- WAV: data chunk size and byte rate
+
+probe_duration_ms() returns None when a file cannot be handled (unknown
+container, damaged headers); callers fall back to ffprobe then.
+"""
+
+import logging
+import math
+import os
+import struct
+from typing import BinaryIO, Optional
+
+logger = logging.getLogger(__name__)
+
+_ID3V2_HEADER_SIZE = 10
+# Search window for the first MP3 frame after the ID3 tag (leading junk/padding)
+_MP3_SYNC_SEARCH_BYTES = 64 * 1024
+# Frames checked for a constant bitrate before falling back to a full frame scan
+_MP3_CBR_CHECK_FRAMES = 16
+# Largest possible Ogg page (header + 255 segment table entries + 255 * 255 payload)
+_OGG_MAX_PAGE_SIZE = 65307
+
+# Bitrates in kbps by (MPEG-1, layer) and (MPEG-2/2.5, layer)
+_MP3_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Sample rates by version bits (0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1)
+_MP3_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+
+
+class _Mp3Frame:
+    """Decoded MPEG audio frame header."""
+
+    __slots__ = ("mpeg1", "layer", "bitrate", "sample_rate", "samples", "length", "mono")
+
+    def __init__(self, mpeg1, layer, bitrate, sample_rate, samples, length, mono):
+        self.mpeg1 = mpeg1
+        self.layer = layer
+        self.bitrate = bitrate
+        self.sample_rate = sample_rate
+        self.samples = samples
+        self.length = length
+        self.mono = mono
+
+
+def _parse_mp3_frame(header: bytes) -> Optional[_Mp3Frame]:
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = 4 - ((header[1] >> 1) & 0x03)
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    if layer == 1:
+        samples = 384
+    elif layer == 3 and not mpeg1:
+        samples = 576
+    else:
+        samples = 1152
+    padding = (header[2] >> 1) & 0x01
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        length = samples // 8 * bitrate // sample_rate + padding
+    mono = header[3] >> 6 == 3
+    return _Mp3Frame(mpeg1, layer, bitrate, sample_rate, samples, length, mono)
+
+
+def _skip_id3v2(f: BinaryIO) -> int:
+    """Return the offset behind a leading ID3v2 tag (0 without one)."""
+    f.seek(0)
+    header = f.read(_ID3V2_HEADER_SIZE)
+    if len(header) < _ID3V2_HEADER_SIZE or header[:3] != b"ID3":
+        return 0
+    size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+    footer = _ID3V2_HEADER_SIZE if header[5] & 0x10 else 0
+    return _ID3V2_HEADER_SIZE + size + footer
+
+
+def _find_mp3_frame(f: BinaryIO, file_size: int, start: int) -> Optional[tuple]:
+    """Locate the first frame whose successor is also a valid frame header (guards against false syncs)."""
+    f.seek(start)
+    data = f.read(_MP3_SYNC_SEARCH_BYTES)
+    position = data.find(b"\xff")
+    while 0 <= position < len(data) - 4:
+        frame = _parse_mp3_frame(data[position : position + 4])
+        if frame is not None:
+            f.seek(start + position + frame.length)
+            following = _parse_mp3_frame(f.read(4))
+            if following is not None and following.sample_rate == frame.sample_rate:
+                return start + position, frame
+            if following is None and start + position + frame.length >= file_size:
+                return start + position, frame  # The only frame of the file
+        position = data.find(b"\xff", position + 1)
+    return None
+
+
+def _mp3_header_frame_count(f: BinaryIO, offset: int, frame: _Mp3Frame) -> Optional[int]:
+    """Frame count from a Xing/Info or VBRI header in the first frame, if present."""
+    if frame.mpeg1:
+        side_info = 17 if frame.mono else 32
+    else:
+        side_info = 9 if frame.mono else 17
+    f.seek(offset)
+    data = f.read(max(frame.length, 4 + 32 + 18))
+
+    xing = 4 + side_info
+    if data[xing : xing + 4] in (b"Xing", b"Info"):
+        (flags,) = struct.unpack_from(">I", data, xing + 4)
+        if flags & 0x01:
+            (frames,) = struct.unpack_from(">I", data, xing + 8)
+            return frames
+        return None
+
+    vbri = 4 + 32
+    if data[vbri : vbri + 4] == b"VBRI":
+        (frames,) = struct.unpack_from(">I", data, vbri + 14)
+        return frames
+    return None
+
+
+def _probe_mp3(f: BinaryIO, file_size: int, start: int) -> Optional[float]:
+    found = _find_mp3_frame(f, file_size, start)
+    if found is None:
+        return None
+    offset, frame = found
+
+    frames = _mp3_header_frame_count(f, offset, frame)
+    if frames:
+        return frames * frame.samples / frame.sample_rate * 1000
+
+    audio_end = file_size
+    f.seek(max(0, file_size - 128))
+    if f.read(3) == b"TAG":
+        audio_end -= 128
+
+    # Constant bitrate: the duration follows from the audio byte count
+    position, current, constant = offset, frame, True
+    for _ in range(_MP3_CBR_CHECK_FRAMES):
+        position += current.length
+        f.seek(position)
+        current = _parse_mp3_frame(f.read(4))
+        if current is None:
+            break
+        if current.bitrate != frame.bitrate:
+            constant = False
+            break
+    if constant:
+        return (audio_end - offset) * 8 / frame.bitrate * 1000
+
+    # Variable bitrate without a header: count the samples of every frame
+    samples, position = 0, offset
+    while position + 4 <= audio_end:
+        f.seek(position)
+        current = _parse_mp3_frame(f.read(4))
+        if current is None or current.length <= 0:
+            break
+        samples += current.samples
+        position += current.length
+    return samples / frame.sample_rate * 1000
+
+
+def _find_mp4_box(f: BinaryIO, start: int, end: int, box_type: bytes) -> Optional[tuple]:
+    """Return (payload offset, payload end) of the first box_type box between start and end."""
+    position = start
+    while position + 8 <= end:
+        f.seek(position)
+        size, kind = struct.unpack(">I4s", f.read(8))
+        header = 8
+        if size == 1:
+            (size,) = struct.unpack(">Q", f.read(8))
+            header = 16
+        elif size == 0:
+            size = end - position
+        if size < header:
+            return None
+        if kind == box_type:
+            return position + header, position + size
+        position += size
+    return None
+
+
+def _probe_mp4(f: BinaryIO, file_size: int) -> Optional[float]:
+    moov = _find_mp4_box(f, 0, file_size, b"moov")
+    if moov is None:
+        return None
+    mvhd = _find_mp4_box(f, moov[0], moov[1], b"mvhd")
+    if mvhd is None:
+        return None
+    f.seek(mvhd[0])
+    data = f.read(32)
+    if data[0] == 1:
+        timescale, duration = struct.unpack_from(">IQ", data, 20)
+    else:
+        timescale, duration = struct.unpack_from(">II", data, 12)
+    if not timescale:
+        return None
+    return duration / timescale * 1000
+
+
+def _probe_ogg(f: BinaryIO, file_size: int) -> Optional[float]:
+    f.seek(0)
+    header = f.read(27)
+    (serial,) = struct.unpack_from("<I", header, 14)
+    segment_count = header[26]
+    f.read(segment_count)
+    packet = f.read(19)
+    if packet[:7] == b"\x01vorbis":
+        (sample_rate,) = struct.unpack_from("<I", packet, 12)
+        pre_skip = 0
+    elif packet[:8] == b"OpusHead":
+        (pre_skip,) = struct.unpack_from("<H", packet, 10)
+        sample_rate = 48000  # Opus granule positions always count 48 kHz samples
+    else:
+        return None
+    if not sample_rate:
+        return None
+
+    tail_start = max(0, file_size - _OGG_MAX_PAGE_SIZE)
+    f.seek(tail_start)
+    tail = f.read()
+    position = tail.rfind(b"OggS")
+    while position >= 0:
+        if position + 27 <= len(tail):
+            granule, page_serial = struct.unpack_from("<qI", tail, position + 6)
+            if page_serial == serial and granule >= 0:
+                return (granule - pre_skip) / sample_rate * 1000
+        position = tail.rfind(b"OggS", 0, position)
+    return None
+
+
+def _probe_flac(f: BinaryIO, start: int) -> Optional[float]:
+    f.seek(start)
+    if f.read(4) != b"fLaC":
+        return None
+    block_header = f.read(4)
+    if len(block_header) < 4 or block_header[0] & 0x7F != 0:
+        return None
+    streaminfo = f.read(34)
+    packed = int.from_bytes(streaminfo[10:18], "big")
+    sample_rate = packed >> 44
+    total_samples = packed & ((1 << 36) - 1)
+    if not sample_rate or not total_samples:
+        return None
+    return total_samples / sample_rate * 1000
+
+
+def _probe_wav(f: BinaryIO, file_size: int) -> Optional[float]:
+    position = 12
+    byte_rate = None
+    while position + 8 <= file_size:
+        f.seek(position)
+        chunk_id, chunk_size = struct.unpack("<4sI", f.read(8))
+        if chunk_id == b"fmt ":
+            (byte_rate,) = struct.unpack_from("<I", f.read(12), 8)
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            # Streamed/unfinished files may carry a placeholder size
+            data_size = min(chunk_size, file_size - position - 8)
+            return data_size / byte_rate * 1000
+        position += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+def probe_duration_ms(audio_file: str) -> Optional[float]:
+    """
+    Read an audio file's duration from its container headers.
+
+    Args:
+        audio_file: Path to the audio file
+
+    Returns:
+        Duration in milliseconds, or None if the format is not supported or the
+        headers are unusable
+    """
+    try:
+        with open(audio_file, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            magic = f.read(12)
+            if magic[:4] == b"RIFF" and magic[8:12] == b"WAVE":
+                duration = _probe_wav(f, file_size)
+            elif magic[:4] == b"OggS":
+                duration = _probe_ogg(f, file_size)
+            elif magic[4:8] == b"ftyp":
+                duration = _probe_mp4(f, file_size)
+            else:
+                start = _skip_id3v2(f)
+                f.seek(start)
+                if f.read(4) == b"fLaC":
+                    duration = _probe_flac(f, start)
+                else:
+                    duration = _probe_mp3(f, file_size, start)
+    except (OSError, struct.error, IndexError, ValueError) as e:
+        logger.debug("Cannot read duration headers of %s: %s", audio_file, e)
+        return None
+
+    if duration is None or not math.isfinite(duration) or duration <= 0:
+        return None
+    return duration
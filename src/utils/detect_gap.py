@@ -95,9 +95,12 @@ def get_vocals_file(
         raise Exception("Config is required for gap detection.")
 
     provider = get_detection_provider(config)
-    return provider.get_vocals_file(
-        audio_file, temp_root, destination_vocals_filepath, duration, overwrite, check_cancellation
-    )
+    try:
+        return provider.get_vocals_file(
+            audio_file, temp_root, destination_vocals_filepath, duration, overwrite, check_cancellation
+        )
+    finally:
+        provider.release_resources()
 
 
 def perform(options: DetectGapOptions, check_cancellation=None) -> DetectGapResult:
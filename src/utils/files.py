@@ -213,7 +213,33 @@ def get_song_path(txt_file):
 
 
 def get_tmp_path(tmp_dir, audio_file):
-    return os.path.join(tmp_dir, os.path.splitext(os.path.basename(audio_file))[0])
+    """
+    Get the per-song temp directory for an audio file.
+
+    The directory name combines the audio file's base name with a short hash of
+    its full path, so equally named files in different song folders
+    (e.g. two "song.mp3") never share vocals or waveform files.
+
+    A folder from before the hash suffix (<tmp_dir>/<base name>) is renamed to
+    the new name on first use, so earlier vocals and waveforms are kept.
+    """
+    base_name = os.path.splitext(os.path.basename(audio_file))[0]
+    path_hash = generate_directory_hash(os.path.normcase(os.path.abspath(audio_file)))
+    tmp_path = os.path.join(tmp_dir, f"{base_name}_{path_hash}")
+    _migrate_legacy_tmp_path(os.path.join(tmp_dir, base_name), tmp_path)
+    return tmp_path
+
+
+def _migrate_legacy_tmp_path(legacy_path, tmp_path):
+    """Rename a legacy per-song temp folder to its hashed name (first song with that base name wins)."""
+    if os.path.isdir(tmp_path) or not os.path.isdir(legacy_path):
+        return
+    try:
+        os.rename(legacy_path, tmp_path)
+        logger.info(f"Migrated temp folder {legacy_path} -> {tmp_path}")
+    except OSError as e:
+        # Another thread migrated it first, or the folder is in use; the song simply starts without it
+        logger.debug(f"Could not migrate temp folder {legacy_path}: {e}")
 
 
 def get_vocals_path(tmp_path, max_detection_time=None):
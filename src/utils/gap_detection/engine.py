@@ -0,0 +1,286 @@
+"""Multi-process gap detection engine.
+
+Runs detect_gap.perform() in a pool of long-lived worker processes so several
+songs can be detected at once without blocking the asyncio worker thread.
+Each worker process keeps its own warm Demucs model in the process-wide model
+registry, so the model load is paid once per process, not once per song.
+
+Device assignment:
+    The first `gpu_workers` processes that start claim a CUDA slot; all other
+    processes are forced onto the CPU. With a GPU this gives "one GPU worker
+    plus CPU overflow" behaviour, since the executor hands each job to
+    whichever process is free.
+
+Cancellation:
+    Each in-flight job owns a slot in a shared-memory flag array. The parent
+    sets the flag when the worker is cancelled; the child polls it through the
+    regular check_cancellation callback.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+
+from utils.providers.mdx.model_loader import DEVICE_OVERRIDE_ENV, TORCH_THREADS_ENV
+from utils.result_types import DetectGapResult
+
+logger = logging.getLogger(__name__)
+
+# How often the parent checks the worker's cancellation callback while a job runs
+CANCEL_POLL_INTERVAL_SEC = 0.1
+
+# Config attribute types that are safe (and sufficient) to send to worker processes
+_SNAPSHOT_TYPES = (bool, int, float, str, type(None))
+
+# Worker-process globals (set by _init_worker_process)
+_worker_cancel_flags = None
+
+
+def snapshot_config(config) -> SimpleNamespace:
+    """
+    Build a picklable copy of the public, primitive config attributes.
+
+    Config wraps a ConfigParser and file paths that should not cross the
+    process boundary; detection only reads plain attributes via getattr.
+
+    Args:
+        config: Config object (or any object with public attributes)
+
+    Returns:
+        SimpleNamespace with the same public primitive attributes
+    """
+    values = {
+        key: value
+        for key, value in vars(config).items()
+        if not key.startswith("_") and isinstance(value, _SNAPSHOT_TYPES)
+    }
+    return SimpleNamespace(**values)
+
+
+def get_detection_worker_count(config) -> int:
+    """
+    Read the configured number of detection worker processes.
+
+    Args:
+        config: Config object (attribute may be missing on partial configs)
+
+    Returns:
+        Worker count, 1 meaning in-process detection
+    """
+    workers = getattr(config, "detection_workers", 1)
+    if not isinstance(workers, int) or isinstance(workers, bool):
+        return 1
+    return max(1, workers)
+
+
+def get_gpu_detection_worker_count(config, max_workers: int) -> int:
+    """
+    Read how many detection worker processes may use CUDA.
+
+    Args:
+        config: Config object (attribute may be missing on partial configs)
+        max_workers: Number of worker processes of the engine
+
+    Returns:
+        GPU worker count clamped to 0..max_workers (1 for missing or invalid values)
+    """
+    gpu_workers = getattr(config, "gpu_detection_workers", 1)
+    if not isinstance(gpu_workers, int) or isinstance(gpu_workers, bool):
+        gpu_workers = 1
+    return max(0, min(gpu_workers, max_workers))
+
+
+def _init_worker_process(gpu_slots, cancel_flags, torch_threads: int) -> None:
+    """Pool initializer: pick device, then replicate the app's GPU/model bootstrap."""
+    global _worker_cancel_flags
+    _worker_cancel_flags = cancel_flags
+
+    use_gpu = False
+    with gpu_slots.get_lock():
+        if gpu_slots.value > 0:
+            gpu_slots.value -= 1
+            use_gpu = True
+    if not use_gpu:
+        os.environ[DEVICE_OVERRIDE_ENV] = "cpu"
+    os.environ[TORCH_THREADS_ENV] = str(torch_threads)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s [detect-worker] %(name)s %(levelname)s: %(message)s")
+
+    try:
+        from common.config import Config
+        from utils.gpu_bootstrap import bootstrap_gpu
+        from utils.model_paths import setup_model_paths
+
+        # Same torch as the parent process; the device override above decides CPU vs CUDA
+        config = Config()
+        bootstrap_gpu(config)
+        setup_model_paths(config)
+    except Exception as e:
+        # Worker still runs with whatever torch is importable; errors surface per job
+        logging.getLogger(__name__).warning("Detection worker bootstrap failed: %s", e)
+
+
+def _run_detection_job(options, slot: int) -> DetectGapResult:
+    """Entry point executed inside a worker process."""
+    import utils.detect_gap as detect_gap
+
+    def is_cancelled() -> bool:
+        return bool(_worker_cancel_flags is not None and _worker_cancel_flags[slot])
+
+    try:
+        return detect_gap.perform(options, is_cancelled)
+    except Exception as e:
+        # Provider exceptions carry non-picklable causes; the message is what callers inspect
+        raise RuntimeError(str(e)) from None
+
+
+class DetectionEngine:
+    """
+    Process pool that runs gap detection jobs concurrently.
+
+    Example:
+        engine = DetectionEngine(max_workers=4, gpu_workers=1)
+        result = await engine.detect(detect_options, worker.is_cancelled)
+    """
+
+    def __init__(self, max_workers: int, gpu_workers: int = 1, torch_threads: Optional[int] = None):
+        """
+        Initialize engine (worker processes start lazily on first job).
+
+        Args:
+            max_workers: Number of worker processes
+            gpu_workers: How many of the worker processes may use CUDA
+            torch_threads: Torch CPU threads per process (default: cores split across workers)
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.gpu_workers = max(0, min(int(gpu_workers), self.max_workers))
+        cpu_count = os.cpu_count() or 1
+        self.torch_threads = torch_threads or max(1, (cpu_count - 1) // self.max_workers)
+
+        # spawn: fork would duplicate Qt/asyncio threads and CUDA state
+        self._mp_context = multiprocessing.get_context("spawn")
+        self._slot_count = self.max_workers * 4
+        self._cancel_flags = self._mp_context.Array("b", self._slot_count, lock=False)
+        self._free_slots: List[int] = list(range(self._slot_count))
+        # Jobs beyond the slot count wait here until a running job releases its slot
+        self._slots_available = threading.Condition()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self._mp_context,
+            initializer=_init_worker_process,
+            initargs=(self._mp_context.Value("i", self.gpu_workers), self._cancel_flags, self.torch_threads),
+        )
+        logger.info(
+            "Detection engine created: %d worker process(es), %d GPU slot(s), %d torch thread(s) each",
+            self.max_workers,
+            self.gpu_workers,
+            self.torch_threads,
+        )
+
+    def _try_claim_slot(self, timeout: float) -> Optional[int]:
+        """Take a free slot, waiting up to timeout seconds for one (None if none came free)."""
+        with self._slots_available:
+            if not self._slots_available.wait_for(lambda: self._free_slots, timeout=timeout):
+                return None
+            slot = self._free_slots.pop()
+        self._cancel_flags[slot] = 0
+        return slot
+
+    async def _claim_slot(self, check_cancellation: Optional[Callable[[], bool]]) -> int:
+        slot = self._try_claim_slot(0)
+        while slot is None:
+            if check_cancellation and check_cancellation():
+                raise RuntimeError("Detection cancelled by user while waiting for a worker")
+            # Wait off the event loop so other queued coroutines keep running
+            slot = await asyncio.to_thread(self._try_claim_slot, CANCEL_POLL_INTERVAL_SEC)
+        return slot
+
+    def _release_slot(self, slot: int) -> None:
+        self._cancel_flags[slot] = 0
+        with self._slots_available:
+            self._free_slots.append(slot)
+            self._slots_available.notify()
+
+    async def detect(self, options, check_cancellation: Optional[Callable[[], bool]] = None) -> DetectGapResult:
+        """
+        Run one detection job in the pool.
+
+        Jobs beyond the engine's slot count wait until a running job finishes.
+
+        Args:
+            options: DetectGapOptions (config is snapshotted before sending)
+            check_cancellation: Callback returning True if the caller cancelled
+
+        Returns:
+            DetectGapResult from the worker process
+
+        Raises:
+            RuntimeError: If detection fails or is cancelled (message preserved from worker)
+        """
+        job = SimpleNamespace(**vars(options))
+        job.config = snapshot_config(options.config)
+
+        slot = await self._claim_slot(check_cancellation)
+        try:
+            future = asyncio.wrap_future(self._executor.submit(_run_detection_job, job, slot))
+            while True:
+                done, _ = await asyncio.wait({future}, timeout=CANCEL_POLL_INTERVAL_SEC)
+                if done:
+                    return future.result()
+                if check_cancellation and check_cancellation() and not self._cancel_flags[slot]:
+                    logger.debug("Forwarding cancellation to detection worker (slot %d)", slot)
+                    self._cancel_flags[slot] = 1
+        finally:
+            self._release_slot(slot)
+
+    def shutdown(self) -> None:
+        """Stop worker processes; running jobs are asked to cancel first."""
+        for slot in range(self._slot_count):
+            self._cancel_flags[slot] = 1
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Detection engine shut down")
+
+
+_engine: Optional[DetectionEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_detection_engine(config) -> Optional[DetectionEngine]:
+    """
+    Return the shared engine for the configured worker count.
+
+    Args:
+        config: Config with detection_workers / gpu_detection_workers
+
+    Returns:
+        DetectionEngine, or None when detection_workers <= 1 (run in-process)
+    """
+    global _engine
+    max_workers = get_detection_worker_count(config)
+    if max_workers <= 1:
+        return None
+
+    gpu_workers = get_gpu_detection_worker_count(config, max_workers)
+    with _engine_lock:
+        if _engine is not None and (_engine.max_workers, _engine.gpu_workers) != (max_workers, gpu_workers):
+            logger.info("Detection worker settings changed, recreating engine")
+            _engine.shutdown()
+            _engine = None
+        if _engine is None:
+            _engine = DetectionEngine(max_workers, gpu_workers)
+        return _engine
+
+
+def shutdown_detection_engine() -> None:
+    """Shut down the shared engine if one was created (idempotent)."""
+    global _engine
+    with _engine_lock:
+        engine = _engine
+        _engine = None
+    if engine is not None:
+        engine.shutdown()
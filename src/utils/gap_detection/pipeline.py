@@ -19,6 +19,7 @@ import utils.audio as audio
 import utils.files as files
 from common.config import Config
 from utils.providers import get_detection_provider
+from utils.providers.mdx.audio_session import audio_session
 from utils.result_types import DetectGapResult
 
 logger = logging.getLogger(__name__)
@@ -170,11 +171,27 @@ def normalize_context(
     )
 
 
+def get_vocals_destination(ctx: GapDetectionContext) -> str:
+    """Path of the vocals file for the context's audio file (may not exist yet).
+
+    Args:
+        ctx: Detection context
+
+    Returns:
+        Path to vocals file
+    """
+    tmp_path = files.get_tmp_path(ctx.tmp_root, ctx.audio_file)
+    return files.get_vocals_path(tmp_path)
+
+
 def get_or_create_vocals(ctx: GapDetectionContext, check_cancellation: Optional[Callable] = None, provider=None) -> str:
     """Get or create vocals file for detection.
 
     I/O boundary - handles file system operations.
 
+    Called after detect_silence_periods(), so providers can build the file from
+    the stems they already separated while scanning.
+
     Args:
         ctx: Detection context
         check_cancellation: Optional cancellation callback
@@ -183,8 +200,7 @@ def get_or_create_vocals(ctx: GapDetectionContext, check_cancellation: Optional[
     Returns:
         Path to vocals file
     """
-    tmp_path = files.get_tmp_path(ctx.tmp_root, ctx.audio_file)
-    destination_vocals_file = files.get_vocals_path(tmp_path)
+    destination_vocals_file = get_vocals_destination(ctx)
 
     logger.debug(f"Destination vocals file: {destination_vocals_file}")
 
@@ -335,8 +351,8 @@ def perform(
     Pipeline:
         1. Validate inputs
         2. Normalize context
-        3. Get/create vocals file
-        4. Detect silence periods
+        3. Detect silence periods
+        4. Get/create vocals file (reusing the stems separated in step 3)
         5. Find gap from silence
         6. Compute confidence
         7. Return result
@@ -366,14 +382,25 @@ def perform(
         audio_file, tmp_root, original_gap, audio_length, default_detection_time, config, overwrite, check_cancellation
     )
 
-    # Create provider once for reuse across pipeline (avoid redundant model loads)
+    # Create provider once for reuse across pipeline (model itself is shared process-wide)
     provider = get_detection_provider(ctx.config)
+    try:
+        # Decode the audio once; vocals, scanner chunks and confidence all slice the same buffer
+        with audio_session(ctx.audio_file):
+            return _run_detection(ctx, provider, check_cancellation)
+    finally:
+        provider.release_resources()
 
-    # Step 2: Get or create vocals file
-    vocals_file = get_or_create_vocals(ctx, check_cancellation, provider)
 
-    # Step 3: Detect silence periods
-    silence_periods = detect_silence_periods(ctx, vocals_file, check_cancellation, provider)
+def _run_detection(ctx: GapDetectionContext, provider, check_cancellation: Optional[Callable]) -> DetectGapResult:
+    """Run detection steps 2-7 of perform() with an already created provider."""
+    audio_file = ctx.audio_file
+
+    # Step 2: Detect silence periods (separates audio chunks around the expected gap)
+    silence_periods = detect_silence_periods(ctx, get_vocals_destination(ctx), check_cancellation, provider)
+
+    # Step 3: Get or create vocals file (stitched from the chunks separated in step 2)
+    vocals_file = get_or_create_vocals(ctx, check_cancellation, provider)
 
     # Step 4: Find gap from silence (pure function)
     detected_gap = detect_gap_from_silence(silence_periods, ctx.original_gap_ms)
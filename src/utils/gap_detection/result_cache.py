@@ -0,0 +1,147 @@
+"""Memoized gap detection results.
+
+What the detector returns (silence periods, detected gap, confidence) depends
+only on the audio content, the original gap (it centres the onset search and
+sizes the detection window), the detection window setting, the model and the
+detector settings. Results are stored under a key built from exactly these, so
+"Detect" on unchanged audio - or on a byte-identical copy of it in another
+song folder - skips stem separation entirely.
+
+The BPM / first-note correction of the gap runs after the lookup (in the
+worker), so editing BPM or notes re-derives the final gap from the stored
+result instead of invalidating it.
+"""
+
+import dataclasses
+import hashlib
+import logging
+import os
+import shutil
+from typing import Optional
+
+from utils.result_types import DetectGapResult
+
+logger = logging.getLogger(__name__)
+
+# Bump when the detector changes in a way that makes stored results stale
+RESULT_CACHE_VERSION = 1
+
+# MdxConfig fields that only affect speed or the preview snippet, not the detected onsets
+_NON_DETECTION_FIELDS = frozenset({"batch_size", "confidence_threshold", "preview_pre_ms", "preview_post_ms"})
+
+
+def detector_settings_hash(config) -> str:
+    """
+    Hash of the settings that influence detection output.
+
+    Args:
+        config: Application config
+
+    Returns:
+        Hex digest over the detection-relevant MdxConfig fields, the detection
+        window and the separation model
+    """
+    from utils.providers.mdx.config import MdxConfig
+    from utils.providers.mdx.model_loader import DEMUCS_MODEL_NAME
+
+    settings = {
+        name: value
+        for name, value in sorted(dataclasses.asdict(MdxConfig.from_config(config)).items())
+        if name not in _NON_DETECTION_FIELDS
+    }
+    parts = [
+        f"v{RESULT_CACHE_VERSION}",
+        DEMUCS_MODEL_NAME,
+        str(getattr(config, "method", "mdx")),
+        str(config.default_detection_time),
+        repr(settings),
+    ]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def detection_result_key(audio_file: str, original_gap: int, config) -> Optional[str]:
+    """
+    Build the memo key of a detection.
+
+    Args:
+        audio_file: Path to the audio file
+        original_gap: Gap from the txt file in milliseconds
+        config: Application config
+
+    Returns:
+        Key string, or None if the audio file cannot be fingerprinted or the
+        settings cannot be read (detection then runs uncached)
+    """
+    from utils.providers.mdx.stem_cache import audio_fingerprint
+
+    fingerprint = audio_fingerprint(audio_file, include_mtime=False)
+    if fingerprint is None:
+        return None
+    try:
+        settings = detector_settings_hash(config)
+    except (AttributeError, TypeError, ValueError) as e:
+        logger.debug(f"Detection results not memoized, settings unreadable: {e}")
+        return None
+    return f"{fingerprint}:{int(original_gap)}:{settings}"
+
+
+def load_detection_result(result_key: str, vocals_destination: str) -> Optional[DetectGapResult]:
+    """
+    Return the stored detection result for a key.
+
+    The result is only usable if the vocals file (needed by the waveform and
+    the player) exists at the song's destination; for a copy of the audio in
+    another song folder it is copied over from where it was first written.
+
+    Args:
+        result_key: Key from detection_result_key()
+        vocals_destination: Vocals file path of the song being detected
+
+    Returns:
+        DetectGapResult, or None on a miss
+    """
+    from common.database import get_detection_result
+
+    entry = get_detection_result(result_key)
+    if entry is None:
+        return None
+
+    if not os.path.exists(vocals_destination):
+        source = entry.vocals_file
+        if not source or not os.path.exists(source):
+            logger.debug(f"Stored detection result has no vocals file left, detecting again: {vocals_destination}")
+            return None
+        try:
+            os.makedirs(os.path.dirname(vocals_destination), exist_ok=True)
+            shutil.copyfile(source, vocals_destination)
+        except OSError as e:
+            logger.warning(f"Failed to copy vocals file {source} to {vocals_destination}: {e}")
+            return None
+
+    result = DetectGapResult(entry.detected_gap, list(entry.silence_periods), vocals_destination)
+    result.confidence = entry.confidence
+    result.detection_method = entry.detection_method
+    result.detected_gap_ms = float(entry.detected_gap)
+    return result
+
+
+def store_detection_result(result_key: str, result: DetectGapResult) -> None:
+    """
+    Store the detector output of a finished detection.
+
+    Args:
+        result_key: Key from detection_result_key()
+        result: Result returned by the detection pipeline
+    """
+    from common.database import DetectionResultEntry, set_detection_result
+
+    if result.detected_gap is None:
+        return
+    entry = DetectionResultEntry(
+        detected_gap=int(result.detected_gap),
+        silence_periods=list(result.silence_periods or []),
+        confidence=result.confidence,
+        detection_method=result.detection_method,
+        vocals_file=result.vocals_file,
+    )
+    set_detection_result(result_key, entry)
@@ -109,6 +109,41 @@ def hpss_mono(
     return harmonic_file, percussive_file
 
 
+def hpss_blend(
+    samples: "np.ndarray",
+    harmonic_weight: float = 0.8,
+    percussive_weight: float = 0.2,
+    kernel_size: int = 31,
+    power: float = 2.0,
+    margin: float = 1.0,
+) -> "np.ndarray":
+    """
+    Separate mono samples and blend the components in memory.
+
+    The blend is applied to the separated spectrograms, so a single inverse
+    STFT yields weight_h * harmonic + weight_p * percussive.
+
+    Args:
+        samples: Mono samples
+        harmonic_weight: Weight for harmonic (0.0-1.0)
+        percussive_weight: Weight for percussive (0.0-1.0)
+        kernel_size: Size of median filter kernel
+        power: Exponent for the spectrogram magnitude
+        margin: Margin for separation (higher = more aggressive separation)
+
+    Returns:
+        Blended float32 samples of the same length
+    """
+    if not LIBROSA_AVAILABLE:
+        raise ImportError("librosa is required for HPSS. Install with: pip install librosa soundfile")
+
+    logger.debug(f"Blending HPSS components in memory: {harmonic_weight}*H + {percussive_weight}*P")
+    stft = librosa.stft(samples)
+    harmonic, percussive = librosa.decompose.hpss(stft, kernel_size=kernel_size, power=power, margin=margin)
+    blended = librosa.istft(harmonic_weight * harmonic + percussive_weight * percussive, length=len(samples))
+    return blended.astype(np.float32)
+
+
 def blend_hpss_components(
     harmonic_file: str,
     percussive_file: str,
@@ -0,0 +1,132 @@
+"""
+Size-capped directory of cache files with least-recently-used eviction.
+
+Shared by the caches that persist derived data as one file per key (separated
+vocal stems, waveform peaks). File mtime serves as the LRU clock: readers
+touch() a file on every hit, and once the files with the store's suffix
+exceed the cap the oldest ones are removed.
+
+Safe to share between threads and processes: writers publish files with an
+atomic rename and then add() them; evictions tolerate concurrent removal.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LruFileStore:
+    """
+    Size accounting and LRU eviction for the files of one cache directory.
+
+    Example:
+        store = LruFileStore(root_dir, max_bytes=256 * 1024 * 1024, suffix=".peaks")
+        os.replace(tmp_file, store.path(file_name))
+        store.add(file_name)
+    """
+
+    def __init__(self, root_dir: str, max_bytes: int, suffix: str):
+        """
+        Initialize the store (creates root_dir if needed).
+
+        Args:
+            root_dir: Directory holding the cache files
+            max_bytes: Size cap for all files with the suffix together
+            suffix: File name suffix of the entries (other files are ignored)
+        """
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._sizes: Optional[Dict[str, int]] = None  # file name -> size, loaded lazily
+        os.makedirs(root_dir, exist_ok=True)
+
+    def path(self, file_name: str) -> str:
+        """Path of an entry."""
+        return os.path.join(self.root_dir, file_name)
+
+    def touch(self, file_name: str) -> None:
+        """Mark an entry as recently used."""
+        try:
+            os.utime(self.path(file_name))
+        except OSError:
+            pass
+
+    def add(self, file_name: str) -> None:
+        """Account for a file that was just written and evict least recently used entries over the cap."""
+        try:
+            size = os.path.getsize(self.path(file_name))
+        except OSError:
+            return
+        with self._lock:
+            sizes = self._load_sizes()
+            sizes[file_name] = size
+            self._evict_locked(sizes)
+
+    def discard(self, file_name: str) -> None:
+        """Remove an entry (e.g. an unreadable one)."""
+        with self._lock:
+            self._remove(file_name)
+
+    def total_bytes(self) -> int:
+        """Current size of all entries."""
+        with self._lock:
+            return sum(self._load_sizes().values())
+
+    def clear(self) -> None:
+        """Delete all entries."""
+        with self._lock:
+            for file_name in list(self._load_sizes()):
+                self._remove(file_name)
+            self._sizes = {}
+
+    def _load_sizes(self) -> Dict[str, int]:
+        if self._sizes is None:
+            self._sizes = {name: size for name, size, _ in self._scan()}
+        return self._sizes
+
+    def _scan(self) -> List[Tuple[str, int, int]]:
+        try:
+            entries = list(os.scandir(self.root_dir))
+        except OSError:
+            return []
+        result = []
+        for entry in entries:
+            if not entry.name.endswith(self.suffix):
+                continue
+            try:
+                stat_result = entry.stat()
+            except OSError:
+                continue
+            result.append((entry.name, stat_result.st_size, stat_result.st_mtime_ns))
+        return result
+
+    def _evict_locked(self, sizes: Dict[str, int]) -> None:
+        if sum(sizes.values()) <= self.max_bytes:
+            return
+
+        # Re-scan for mtimes (LRU order) and pick up entries written by other processes
+        entries = sorted(self._scan(), key=lambda item: item[2])
+        sizes.clear()
+        sizes.update({name: size for name, size, _ in entries})
+        total = sum(sizes.values())
+        for name, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(name)
+            sizes.pop(name, None)
+            total -= size
+            logger.debug(f"Evicted {name} from {self.root_dir} ({size / 1024:.0f} KB)")
+
+    def _remove(self, file_name: str) -> None:
+        try:
+            os.remove(self.path(file_name))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Could not remove cache entry {file_name}: {e}")
+        if self._sizes is not None:
+            self._sizes.pop(file_name, None)
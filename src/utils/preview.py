@@ -1,11 +1,17 @@
 """
 Vocals preview generator for gap detection.
 Creates focused audio previews around detected gap points.
+
+The preview window is decoded once into a mono float32 buffer; HPSS, VAD
+gating and the voice clarity EQ/compression run as array operations on that
+buffer, and only the finished preview is written (or the buffer is handed to
+the caller directly via render_vocals_preview).
 """
 
 import logging
 import os
-import tempfile
+import subprocess
+import platform
 from typing import Optional, List, Tuple, Callable
 
 logger = logging.getLogger(__name__)
@@ -14,6 +20,7 @@ try:
     import librosa
     import soundfile as sf
     import numpy as np
+    from scipy import ndimage, signal
 
     LIBROSA_AVAILABLE = True
 except ImportError:
@@ -22,132 +29,260 @@ except ImportError:
     librosa = None  # type: ignore
     sf = None  # type: ignore
     np = None  # type: ignore
+    ndimage = None  # type: ignore
+    signal = None  # type: ignore
     logger.warning("librosa not available. Preview generation will be limited.")
 
+# Sample rate of windows decoded via ffmpeg (soundfile reads keep the file's rate)
+PREVIEW_SAMPLE_RATE = 44100
+
+# How often a running ffmpeg decode checks the cancellation callback
+_CANCEL_POLL_INTERVAL_SEC = 0.05
+
+
+def _check_cancelled(check_cancellation: Optional[Callable[[], bool]]):
+    if check_cancellation and check_cancellation():
+        raise Exception("Operation cancelled")
+
 
-def extract_time_window(
+def _decode_window_with_ffmpeg(
+    audio_file: str, start_ms: float, end_ms: float, check_cancellation: Optional[Callable[[], bool]]
+) -> "np.ndarray":
+    command = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-ss",
+        str(start_ms / 1000.0),
+        "-t",
+        str((end_ms - start_ms) / 1000.0),
+        "-i",
+        audio_file,
+        "-f",
+        "f32le",
+        "-acodec",
+        "pcm_f32le",
+        "-ac",
+        "1",
+        "-ar",
+        str(PREVIEW_SAMPLE_RATE),
+        "-",
+    ]
+    popen_kwargs = {"stdout": subprocess.PIPE, "stderr": subprocess.PIPE}
+    if platform.system() == "Windows":
+        popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+    try:
+        process = subprocess.Popen(command, **popen_kwargs)
+    except OSError as e:
+        raise Exception(f"Failed to execute ffmpeg (is it installed?): {e}") from e
+
+    # communicate() drains both pipes without extra reader threads; the timeout only serves cancellation
+    while True:
+        try:
+            stdout, stderr = process.communicate(timeout=_CANCEL_POLL_INTERVAL_SEC)
+            break
+        except subprocess.TimeoutExpired:
+            if check_cancellation and check_cancellation():
+                process.kill()
+                process.communicate()
+                raise Exception("Operation cancelled")
+
+    if process.returncode != 0:
+        raise Exception(f"Failed to extract window: {stderr.decode('utf-8', errors='ignore').strip()}")
+    return np.frombuffer(stdout, dtype="<f4")
+
+
+def decode_window(
     audio_file: str,
     start_ms: float,
     end_ms: float,
-    output_file: Optional[str] = None,
     check_cancellation: Optional[Callable[[], bool]] = None,
-) -> str:
+) -> Tuple["np.ndarray", int]:
     """
-    Extract a time window from audio file.
+    Decode a time window of an audio file into a mono float32 buffer.
+
+    Served from the shared buffer if a detection audio session is open for the
+    file, read directly with soundfile where libsndfile supports the format,
+    and decoded by one ffmpeg process (straight to a pipe) otherwise.
 
     Args:
         audio_file: Path to input audio file
         start_ms: Start time in milliseconds
         end_ms: End time in milliseconds
-        output_file: Path for output file (defaults to temp file)
         check_cancellation: Optional cancellation check callback
 
     Returns:
-        Path to extracted window audio file
+        Tuple of (samples, sample_rate)
     """
-    from utils.cancellable_process import run_cancellable_process
+    if not LIBROSA_AVAILABLE:
+        raise ImportError("librosa is required for previews. Install with: pip install librosa soundfile")
+    if not os.path.exists(audio_file):
+        raise FileNotFoundError(f"Audio file not found: {audio_file}")
 
-    if output_file is None:
-        temp_dir = os.path.dirname(audio_file)
-        output_file = tempfile.NamedTemporaryFile(delete=False, suffix="_window.wav", dir=temp_dir).name
+    from utils.providers.mdx.audio_session import get_session_audio, needs_ffmpeg_decode
 
-    # Use ffmpeg for precise window extraction
-    start_sec = start_ms / 1000.0
-    duration_sec = (end_ms - start_ms) / 1000.0
+    decoded = get_session_audio(audio_file)
+    if decoded is not None:
+        start = int(start_ms * decoded.sample_rate / 1000)
+        end = int(end_ms * decoded.sample_rate / 1000)
+        return decoded.samples[:, start:end].mean(axis=0, dtype=np.float32), decoded.sample_rate
 
-    command = [
-        "ffmpeg",
-        "-y",
-        "-ss",
-        str(start_sec),
-        "-t",
-        str(duration_sec),
-        "-i",
-        audio_file,
-        "-acodec",
-        "pcm_s16le",
-        output_file,
-    ]
+    if not needs_ffmpeg_decode(audio_file):
+        try:
+            with sf.SoundFile(audio_file) as f:
+                start = int(start_ms * f.samplerate / 1000)
+                f.seek(min(start, f.frames))
+                frames = f.read(int(end_ms * f.samplerate / 1000) - start, dtype="float32", always_2d=True)
+                return frames.mean(axis=1, dtype=np.float32), f.samplerate
+        except RuntimeError as e:
+            logger.debug(f"soundfile cannot read {audio_file}, decoding with ffmpeg: {e}")
 
-    returncode, stdout, stderr = run_cancellable_process(command, check_cancellation)
-
-    if returncode != 0:
-        if os.path.exists(output_file):
-            os.remove(output_file)
-        raise Exception(f"Failed to extract window: {stderr}")
-
-    return output_file
+    return _decode_window_with_ffmpeg(audio_file, start_ms, end_ms, check_cancellation), PREVIEW_SAMPLE_RATE
 
 
 def apply_vad_gate(
-    audio_file: str,
+    samples: "np.ndarray",
+    sample_rate: int,
     vad_segments: List[Tuple[float, float]],
     attenuation_db: float = -12.0,
-    output_file: Optional[str] = None,
-    check_cancellation: Optional[Callable[[], bool]] = None,
-) -> str:
+) -> "np.ndarray":
     """
     Apply VAD-based gating to attenuate non-vocal frames.
 
     Args:
-        audio_file: Path to input audio file
-        vad_segments: List of (start_ms, end_ms) speech segments
+        samples: Mono samples
+        sample_rate: Sample rate in Hz
+        vad_segments: List of (start_ms, end_ms) speech segments relative to the buffer
         attenuation_db: Attenuation for non-speech areas in dB
-        output_file: Path for output file
-        check_cancellation: Optional cancellation check callback
 
     Returns:
-        Path to gated audio file
+        Gated samples (new array)
     """
-    if not LIBROSA_AVAILABLE:
-        logger.warning("librosa not available, skipping VAD gating")
-        return audio_file
+    logger.debug("Applying VAD gate with {} speech segments".format(len(vad_segments)))
 
-        logger.debug("Applying VAD gate with {} speech segments".format(len(vad_segments)))
+    # Non-speech samples get the attenuation factor, speech regions full volume
+    mask = np.full(len(samples), 10 ** (attenuation_db / 20.0), dtype=np.float32)
+    for start_ms, end_ms in vad_segments:
+        start_sample = max(0, int(start_ms * sample_rate / 1000))
+        end_sample = min(len(samples), int(end_ms * sample_rate / 1000))
+        mask[start_sample:end_sample] = 1.0
+    return samples * mask
+
+
+def clarify_voice(
+    samples: "np.ndarray",
+    sample_rate: int,
+    highpass_hz: float = 80.0,
+    lowpass_hz: float = 8000.0,
+    level_db: float = -12.0,
+    threshold_db: float = -20.0,
+    ratio: float = 3.0,
+    attack_ms: float = 5.0,
+    release_ms: float = 50.0,
+    peak_db: float = -2.0,
+) -> "np.ndarray":
+    """
+    Voice clarity EQ and compression (array version of audio.make_clearer_voice).
 
-    # Load audio (type-narrow for static checker)
-    assert LIBROSA_AVAILABLE and librosa is not None and np is not None and sf is not None
-    from typing import cast, Any
+    Band-limits to the voice range, levels the window to a fixed RMS so the
+    compressor threshold behaves the same for quiet and loud songs, compresses
+    with a sliding-max attack and one-pole release envelope and normalizes the
+    peak.
 
-    lib = cast(Any, librosa)
-    np_mod = cast(Any, np)
-    sf_mod = cast(Any, sf)
-    y, sr = lib.load(audio_file, sr=None, mono=True)
+    Args:
+        samples: Mono samples
+        sample_rate: Sample rate in Hz
+        highpass_hz: High-pass cutoff
+        lowpass_hz: Low-pass cutoff (clamped below Nyquist)
+        level_db: RMS level before compression in dBFS
+        threshold_db: Compressor threshold in dBFS
+        ratio: Compression ratio
+        attack_ms: Compressor attack time
+        release_ms: Compressor release time
+        peak_db: Output peak level in dBFS
 
-    if check_cancellation and check_cancellation():
-        raise Exception("Operation cancelled")
+    Returns:
+        Processed float32 samples (new array)
+    """
+    if len(samples) == 0:
+        return np.zeros(0, dtype=np.float32)
 
-    # Create mask for speech regions
-    mask = np_mod.ones_like(y)
-    attenuation_factor = 10 ** (attenuation_db / 20.0)  # Convert dB to linear
+    band = [highpass_hz, min(lowpass_hz, 0.45 * sample_rate)]
+    y = signal.sosfilt(signal.butter(2, band, btype="bandpass", fs=sample_rate, output="sos"), samples)
 
-    # Set mask to attenuation factor for non-speech regions
-    mask[:] = attenuation_factor
+    rms = float(np.sqrt(np.mean(np.square(y))))
+    if rms > 0:
+        y *= 10 ** (level_db / 20.0) / rms
 
-    # Mark speech regions as full volume (1.0)
-    for start_ms, end_ms in vad_segments:
-        start_sample = int(start_ms * sr / 1000)
-        end_sample = int(end_ms * sr / 1000)
-        start_sample = max(0, start_sample)
-        end_sample = min(len(y), end_sample)
-        mask[start_sample:end_sample] = 1.0
+    attack = max(1, int(attack_ms * sample_rate / 1000))
+    release = np.exp(-1.0 / max(1.0, release_ms * sample_rate / 1000))
+    envelope = signal.lfilter([1 - release], [1, -release], ndimage.maximum_filter1d(np.abs(y), attack))
+    over_db = np.maximum(20 * np.log10(np.maximum(envelope, 1e-9)) - threshold_db, 0.0)
+    y *= 10 ** (-over_db * (1 - 1 / ratio) / 20.0)
 
-    # Apply mask
-    y_gated = y * mask
+    peak = float(np.max(np.abs(y)))
+    if peak > 0:
+        y *= 10 ** (peak_db / 20.0) / peak
+    return y.astype(np.float32)
 
-    if check_cancellation and check_cancellation():
-        raise Exception("Operation cancelled")
 
-    # Determine output file
-    if output_file is None:
-        temp_dir = os.path.dirname(audio_file)
-        output_file = tempfile.NamedTemporaryFile(delete=False, suffix="_gated.wav", dir=temp_dir).name
+def render_vocals_preview(
+    audio_file: str,
+    detected_gap_ms: float,
+    pre_ms: int = 3000,
+    post_ms: int = 9000,
+    vad_segments: Optional[List[Tuple[float, float]]] = None,
+    use_hpss: bool = True,
+    check_cancellation: Optional[Callable[[], bool]] = None,
+) -> Tuple["np.ndarray", int]:
+    """
+    Render a vocals-focused preview window around the detected gap into memory.
+
+    Args:
+        audio_file: Path to input audio file
+        detected_gap_ms: Detected gap time in milliseconds
+        pre_ms: Milliseconds before gap to include
+        post_ms: Milliseconds after gap to include
+        vad_segments: Optional VAD segments for gating (relative to audio start)
+        use_hpss: Whether to use HPSS blend
+        check_cancellation: Optional cancellation check callback
 
-    # Save
-    logger.debug(f"Saving gated audio to {output_file}")
-    sf_mod.write(output_file, y_gated, sr)
+    Returns:
+        Tuple of (samples, sample_rate), ready to be played or written
+    """
+    logger.info(f"Building vocals preview around {detected_gap_ms}ms (±{pre_ms}/{post_ms}ms)")
 
-    return output_file
+    # Calculate window bounds
+    start_ms = max(0, detected_gap_ms - pre_ms)
+    end_ms = detected_gap_ms + post_ms
+
+    samples, sample_rate = decode_window(audio_file, start_ms, end_ms, check_cancellation)
+    _check_cancelled(check_cancellation)
+
+    if use_hpss and len(samples):
+        from utils.hpss import hpss_blend
+
+        # Blend: 0.8 harmonic + 0.2 percussive
+        logger.debug("Applying HPSS blend to preview")
+        samples = hpss_blend(samples, harmonic_weight=0.8, percussive_weight=0.2)
+        _check_cancelled(check_cancellation)
+
+    if vad_segments:
+        # Window-relative segments that overlap the window
+        window_ms = end_ms - start_ms
+        adjusted_segments = [
+            (max(0, seg_start - start_ms), min(window_ms, seg_end - start_ms))
+            for seg_start, seg_end in vad_segments
+            if seg_end - start_ms > 0 and seg_start - start_ms < window_ms
+        ]
+        if adjusted_segments:
+            # 9dB attenuation for non-vocal
+            samples = apply_vad_gate(samples, sample_rate, adjusted_segments, attenuation_db=-9.0)
+
+    logger.debug("Applying voice clarity filter")
+    samples = clarify_voice(samples, sample_rate)
+    _check_cancelled(check_cancellation)
+    return samples, sample_rate
 
 
 def build_vocals_preview(
@@ -176,100 +311,14 @@ def build_vocals_preview(
     Returns:
         Path to vocals preview file
     """
-    logger.info(f"Building vocals preview around {detected_gap_ms}ms (±{pre_ms}/{post_ms}ms)")
+    samples, sample_rate = render_vocals_preview(
+        audio_file, detected_gap_ms, pre_ms, post_ms, vad_segments, use_hpss, check_cancellation
+    )
 
-    # Calculate window bounds
-    start_ms = max(0, detected_gap_ms - pre_ms)
-    end_ms = detected_gap_ms + post_ms
-
-    # Extract time window
-    window_file = extract_time_window(audio_file, start_ms, end_ms, check_cancellation=check_cancellation)
+    # Determine final output file
+    if output_file is None:
+        output_file = os.path.join(os.path.dirname(audio_file), "vocals_preview.wav")
 
-    try:
-        # Apply HPSS blend if available and requested
-        if use_hpss and LIBROSA_AVAILABLE:
-            logger.debug("Applying HPSS blend to preview")
-            from utils.hpss import hpss_mono, blend_hpss_components
-
-            # Perform HPSS on the window
-            output_dir = os.path.dirname(window_file)
-            harmonic_file, percussive_file = hpss_mono(
-                window_file, output_dir=output_dir, check_cancellation=check_cancellation
-            )
-
-            try:
-                # Blend: 0.8 harmonic + 0.2 percussive
-                blended_file = blend_hpss_components(
-                    harmonic_file,
-                    percussive_file,
-                    harmonic_weight=0.8,
-                    percussive_weight=0.2,
-                    check_cancellation=check_cancellation,
-                )
-
-                # Replace window file with blended version
-                if os.path.exists(window_file):
-                    os.remove(window_file)
-                window_file = blended_file
-
-            finally:
-                # Clean up HPSS components
-                if os.path.exists(harmonic_file):
-                    os.remove(harmonic_file)
-                if os.path.exists(percussive_file):
-                    os.remove(percussive_file)
-
-        # Apply VAD gating if segments provided
-        if vad_segments and LIBROSA_AVAILABLE:
-            # Adjust VAD segments to window coordinates
-            adjusted_segments = []
-            for seg_start, seg_end in vad_segments:
-                # Convert to window-relative time
-                rel_start = seg_start - start_ms
-                rel_end = seg_end - start_ms
-
-                # Only include segments that overlap the window
-                if rel_end > 0 and rel_start < (end_ms - start_ms):
-                    rel_start = max(0, rel_start)
-                    rel_end = min(end_ms - start_ms, rel_end)
-                    adjusted_segments.append((rel_start, rel_end))
-
-            if adjusted_segments:
-                logger.debug(f"Applying VAD gating with {len(adjusted_segments)} segments")
-                gated_file = apply_vad_gate(
-                    window_file,
-                    adjusted_segments,
-                    attenuation_db=-9.0,  # 9dB attenuation for non-vocal
-                    check_cancellation=check_cancellation,
-                )
-
-                if gated_file != window_file:
-                    if os.path.exists(window_file):
-                        os.remove(window_file)
-                    window_file = gated_file
-
-        # Apply voice clarity filter
-        from utils.audio import make_clearer_voice
-
-        logger.debug("Applying voice clarity filter")
-        window_file = make_clearer_voice(window_file, check_cancellation)
-
-        # Determine final output file
-        if output_file is None:
-            temp_dir = os.path.dirname(audio_file)
-            output_file = os.path.join(temp_dir, "vocals_preview.wav")
-
-        # Move to final location
-        if window_file != output_file:
-            if os.path.exists(output_file):
-                os.remove(output_file)
-            os.rename(window_file, output_file)
-
-        logger.info(f"Vocals preview created: {output_file}")
-        return output_file
-
-    except Exception as e:
-        # Clean up on error
-        if os.path.exists(window_file):
-            os.remove(window_file)
-        raise e
+    sf.write(output_file, samples, sample_rate, subtype="PCM_16")
+    logger.info(f"Vocals preview created: {output_file}")
+    return output_file
@@ -27,10 +27,12 @@ class IDetectionProvider(ABC):
 
     Lifecycle:
         1. Provider instantiated via factory with Config
-        2. get_vocals_file() creates/retrieves vocals or preview audio
-        3. detect_silence_periods() analyzes audio for silence/speech boundaries
+        2. detect_silence_periods() analyzes audio for silence/speech boundaries
+        3. get_vocals_file() creates/retrieves vocals or preview audio (may reuse
+           intermediate results of detect_silence_periods())
         4. compute_confidence() calculates detection quality metric
         5. get_method_name() identifies provider for logging/UI
+        6. release_resources() returns shared resources (e.g. model references)
     """
 
     def __init__(self, config: Config):
@@ -105,7 +107,8 @@ class IDetectionProvider(ABC):
 
         Args:
             audio_file: Absolute path to original audio file
-            vocals_file: Absolute path to vocals/preview file from get_vocals_file()
+            vocals_file: Destination path of the vocals/preview file (the pipeline creates it
+                afterwards via get_vocals_file(), so it may not exist yet)
             check_cancellation: Optional callback returning True if cancelled
 
         Returns:
@@ -171,3 +174,12 @@ class IDetectionProvider(ABC):
         Note:
             Must match the method name in Config.method for factory selection.
         """
+
+    def release_resources(self) -> None:
+        """
+        Release shared resources held by this provider.
+
+        Called once the pipeline is done with the provider. Providers holding
+        references to shared resources (e.g. registry models) override this;
+        the default implementation does nothing.
+        """
@@ -16,6 +16,12 @@ def __getattr__(name):
     elif name == "ModelLoader":
         from .model_loader import ModelLoader
         return ModelLoader
+    elif name == "ModelRegistry":
+        from .model_registry import ModelRegistry
+        return ModelRegistry
+    elif name == "get_model_registry":
+        from .model_registry import get_model_registry
+        return get_model_registry
     elif name == "flush_logs":
         from .logging import flush_logs
         return flush_logs
@@ -37,11 +43,19 @@ def __getattr__(name):
     elif name == "VocalsCache":
         from .vocals_cache import VocalsCache
         return VocalsCache
+    elif name == "StemCache":
+        from .stem_cache import StemCache
+        return StemCache
+    elif name == "StemCollector":
+        from .stem_stitcher import StemCollector
+        return StemCollector
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "MdxConfig",
     "ModelLoader",
+    "ModelRegistry",
+    "get_model_registry",
     "flush_logs",
     "separate_vocals_chunk",
     "detect_onset_in_vocal_chunk",
@@ -49,4 +63,6 @@ __all__ = [
     "estimate_noise_floor",
     "compute_confidence_score",
     "VocalsCache",
+    "StemCache",
+    "StemCollector",
 ]
@@ -2,6 +2,7 @@
 Audio format compatibility utilities for torchaudio.
 
 Handles formats not natively supported by torchaudio/soundfile (e.g., M4A/AAC).
+Inside an audio_session() both helpers are served from one shared decode.
 """
 
 import logging
@@ -13,6 +14,8 @@ from contextlib import contextmanager
 
 import torchaudio
 
+from utils.providers.mdx.audio_session import FFMPEG_DECODE_SAMPLE_RATE, get_session_audio, needs_ffmpeg_decode
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,7 +26,7 @@ def _needs_conversion(audio_file: str) -> bool:
     - .m4a / .aac: AAC audio (not supported by libsndfile)
     - .opus: Opus audio (not supported by libsndfile)
     """
-    return audio_file.lower().endswith((".m4a", ".aac", ".opus"))
+    return needs_ffmpeg_decode(audio_file)
 
 
 def _convert_to_wav(audio_file: str, duration_sec: Optional[float] = None) -> str:
@@ -43,7 +46,7 @@ def _convert_to_wav(audio_file: str, duration_sec: Optional[float] = None) -> st
     fd, temp_wav = tempfile.mkstemp(suffix=".wav", prefix="usdxfixgap_")
     os.close(fd)
 
-    cmd = ["ffmpeg", "-y", "-i", audio_file, "-ar", "44100"]
+    cmd = ["ffmpeg", "-y", "-i", audio_file, "-ar", str(FFMPEG_DECODE_SAMPLE_RATE)]
     if duration_sec is not None:
         cmd.extend(["-t", str(duration_sec)])
     cmd.append(temp_wav)
@@ -58,13 +61,23 @@ def _convert_to_wav(audio_file: str, duration_sec: Optional[float] = None) -> st
     return temp_wav
 
 
+class AudioInfo:
+    """Minimal AudioMetaData-like object for files torchaudio cannot probe directly."""
+
+    def __init__(self, sample_rate: int, num_frames: int, num_channels: int = 2):
+        self.sample_rate = sample_rate
+        self.num_frames = num_frames
+        self.num_channels = num_channels
+
+
 @contextmanager
 def load_audio_compat(audio_file: str, frame_offset: int = 0, num_frames: int = -1):
     """
     Load audio with M4A/AAC compatibility.
 
     Context manager that converts M4A/AAC to WAV if needed, loads with torchaudio,
-    and cleans up temporary files automatically.
+    and cleans up temporary files automatically. Inside an audio_session() for
+    the file, yields a zero-copy view of the shared decoded buffer instead.
 
     Args:
         audio_file: Path to audio file
@@ -80,6 +93,11 @@ def load_audio_compat(audio_file: str, frame_offset: int = 0, num_frames: int =
             pass
         # Temp file cleaned up automatically
     """
+    decoded = get_session_audio(audio_file)
+    if decoded is not None:
+        yield decoded.slice(frame_offset, num_frames), decoded.sample_rate
+        return
+
     temp_file = None
     try:
         if _needs_conversion(audio_file):
@@ -109,9 +127,24 @@ def get_audio_info_compat(audio_file: str) -> torchaudio.AudioMetaData:
     Raises:
         RuntimeError: If probing fails
     """
+    decoded = get_session_audio(audio_file)
+    if decoded is not None:
+        return AudioInfo(decoded.sample_rate, decoded.num_frames, decoded.num_channels)
+
     if _needs_conversion(audio_file):
-        # Use ffprobe to get duration directly
-        cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration,sample_rate", "-of", "json", audio_file]
+        # ffprobe gives duration and channels; the sample rate is the one loads are converted to
+        cmd = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "a:0",
+            "-show_entries",
+            "format=duration:stream=channels",
+            "-of",
+            "json",
+            audio_file,
+        ]
         result = subprocess.run(cmd, capture_output=True, text=True)
 
         if result.returncode != 0:
@@ -121,25 +154,9 @@ def get_audio_info_compat(audio_file: str) -> torchaudio.AudioMetaData:
 
         data = json.loads(result.stdout)
         duration_sec = float(data["format"]["duration"])
+        streams = data.get("streams") or [{}]
+        num_channels = int(streams[0].get("channels", 2))
 
-        # Create a minimal AudioMetaData-like object
-        # We'll probe a tiny chunk to get sample rate
-        temp_file = _convert_to_wav(audio_file, duration_sec=0.1)
-        try:
-            info = torchaudio.info(temp_file)
-            # Replace num_frames with actual duration
-            num_frames = int(duration_sec * info.sample_rate)
-
-            # Return modified info
-            class AudioInfo:
-                def __init__(self, sample_rate: int, num_frames: int, num_channels: int = 2):
-                    self.sample_rate = sample_rate
-                    self.num_frames = num_frames
-                    self.num_channels = num_channels
-
-            return AudioInfo(info.sample_rate, num_frames, info.num_channels)
-        finally:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+        return AudioInfo(FFMPEG_DECODE_SAMPLE_RATE, int(duration_sec * FFMPEG_DECODE_SAMPLE_RATE), num_channels)
     else:
         return torchaudio.info(audio_file)
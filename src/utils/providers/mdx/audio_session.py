@@ -0,0 +1,196 @@
+"""
+Per-song decoded-audio sessions.
+
+A detection touches the same audio file many times: audio info, one load per
+scanner chunk, the confidence segment and the vocals preview. For formats that
+need ffmpeg (.m4a/.aac/.opus) every one of those used to transcode the whole
+file again.
+
+While an audio_session() is open for a file, load_audio_compat() and
+get_audio_info_compat() serve that file from a single decoded float32 buffer
+(decoded on first use). Loads return zero-copy views into the buffer, so
+callers must not modify the returned waveform in place.
+
+NOTE: This module does not import torch at import time, so the gap detection
+pipeline can open sessions before GPU bootstrap has run.
+"""
+
+import logging
+import os
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Formats decoded via ffmpeg (not supported by libsndfile)
+FFMPEG_DECODE_EXTENSIONS = (".m4a", ".aac", ".opus")
+
+# Sample rate used when decoding via ffmpeg (matches the former WAV conversion)
+FFMPEG_DECODE_SAMPLE_RATE = 44100
+
+
+def needs_ffmpeg_decode(audio_file: str) -> bool:
+    """Check if audio file must be decoded with ffmpeg instead of torchaudio/soundfile."""
+    return audio_file.lower().endswith(FFMPEG_DECODE_EXTENSIONS)
+
+
+class DecodedAudio:
+    """
+    Fully decoded audio file held as a float32 (channels, samples) array.
+
+    Attributes:
+        samples: float32 array (channels, samples), C-contiguous
+        sample_rate: Sample rate in Hz
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int):
+        self.samples = samples
+        self.sample_rate = sample_rate
+
+    @property
+    def num_channels(self) -> int:
+        """Number of channels."""
+        return self.samples.shape[0]
+
+    @property
+    def num_frames(self) -> int:
+        """Number of sample frames."""
+        return self.samples.shape[1]
+
+    def slice(self, frame_offset: int = 0, num_frames: int = -1):
+        """
+        Get a zero-copy torch view of a frame range (torchaudio.load semantics).
+
+        Args:
+            frame_offset: First frame
+            num_frames: Number of frames (-1 for all remaining)
+
+        Returns:
+            torch.Tensor (channels, frames) sharing memory with the buffer
+        """
+        import torch
+
+        start = max(0, frame_offset)
+        end = self.num_frames if num_frames < 0 else min(self.num_frames, start + num_frames)
+        return torch.from_numpy(self.samples[:, start : max(start, end)])
+
+
+def _decode_with_ffmpeg(audio_file: str) -> DecodedAudio:
+    cmd = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-i",
+        audio_file,
+        "-f",
+        "f32le",
+        "-acodec",
+        "pcm_f32le",
+        "-ac",
+        "2",
+        "-ar",
+        str(FFMPEG_DECODE_SAMPLE_RATE),
+        "-",
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to decode audio: {result.stderr.decode('utf-8', errors='ignore')}")
+
+    interleaved = np.frombuffer(result.stdout, dtype="<f4").reshape(-1, 2)
+    return DecodedAudio(np.ascontiguousarray(interleaved.T, dtype=np.float32), FFMPEG_DECODE_SAMPLE_RATE)
+
+
+def decode_audio(audio_file: str) -> DecodedAudio:
+    """
+    Decode a whole audio file into memory (one ffmpeg or soundfile pass).
+
+    Args:
+        audio_file: Path to audio file
+
+    Returns:
+        DecodedAudio with float32 samples
+
+    Raises:
+        RuntimeError: If decoding fails
+    """
+    logger.debug(f"Decoding {audio_file} into shared audio buffer")
+    if needs_ffmpeg_decode(audio_file):
+        return _decode_with_ffmpeg(audio_file)
+
+    import torchaudio
+
+    waveform, sample_rate = torchaudio.load(audio_file)
+    samples = waveform.numpy()
+    if samples.dtype != np.float32:
+        samples = samples.astype(np.float32)
+    return DecodedAudio(samples, sample_rate)
+
+
+class _Session:
+    def __init__(self, audio_file: str):
+        self.audio_file = audio_file
+        self.ref_count = 0
+        self._decoded: Optional[DecodedAudio] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> DecodedAudio:
+        with self._lock:
+            if self._decoded is None:
+                self._decoded = decode_audio(self.audio_file)
+            return self._decoded
+
+
+_sessions: Dict[str, _Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _session_key(audio_file: str) -> str:
+    return os.path.normcase(os.path.abspath(audio_file))
+
+
+@contextmanager
+def audio_session(audio_file: str):
+    """
+    Share one decode of audio_file between all loads inside the block.
+
+    Sessions for the same file nest (reference counted); the buffer is freed
+    when the outermost session closes.
+
+    Example:
+        with audio_session(audio_file):
+            info = get_audio_info_compat(audio_file)   # decodes once
+            with load_audio_compat(audio_file, offset, n) as (waveform, sr):
+                ...                                    # slices the buffer
+    """
+    key = _session_key(audio_file)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = _Session(audio_file)
+        session.ref_count += 1
+    try:
+        yield
+    finally:
+        with _sessions_lock:
+            session.ref_count -= 1
+            if session.ref_count <= 0 and _sessions.get(key) is session:
+                del _sessions[key]
+
+
+def get_session_audio(audio_file: str) -> Optional[DecodedAudio]:
+    """
+    Get the shared decoded buffer if a session is open for audio_file.
+
+    Args:
+        audio_file: Path to audio file
+
+    Returns:
+        DecodedAudio (decoded on first call), or None if no session is open
+    """
+    with _sessions_lock:
+        session = _sessions.get(_session_key(audio_file))
+    return session.get() if session is not None else None
@@ -13,6 +13,7 @@ DEFAULT_RESAMPLE_HZ = 0
 DEFAULT_FP16 = False
 DEFAULT_EARLY_STOP_TOLERANCE_MS = 500
 DEFAULT_TF32 = True
+DEFAULT_BATCH_SIZE = 0  # 0 = auto (free VRAM on CUDA, 1 on CPU)
 
 
 @dataclass
@@ -49,6 +50,7 @@ class MdxConfig:
     resample_hz: int = DEFAULT_RESAMPLE_HZ
     early_stop_tolerance_ms: int = DEFAULT_EARLY_STOP_TOLERANCE_MS
     tf32: bool = DEFAULT_TF32
+    batch_size: int = DEFAULT_BATCH_SIZE
 
     # Confidence and preview
     confidence_threshold: float = 0.55
@@ -72,6 +74,8 @@ class MdxConfig:
             raise ValueError(f"hop_duration_ms must be positive, got {self.hop_duration_ms}")
         if self.noise_floor_duration_ms < 0:
             raise ValueError(f"noise_floor_duration_ms must be non-negative, got {self.noise_floor_duration_ms}")
+        if self.batch_size < 0:
+            raise ValueError(f"batch_size must be non-negative, got {self.batch_size}")
 
     @classmethod
     def from_config(cls, config) -> "MdxConfig":
@@ -96,6 +100,7 @@ class MdxConfig:
             resample_hz=getattr(config, "mdx_resample_hz", cls.resample_hz),
             early_stop_tolerance_ms=getattr(config, "mdx_early_stop_tolerance_ms", cls.early_stop_tolerance_ms),
             tf32=getattr(config, "mdx_tf32", cls.tf32),
+            batch_size=getattr(config, "mdx_batch_size", cls.batch_size),
             confidence_threshold=getattr(config, "mdx_confidence_threshold", cls.confidence_threshold),
             preview_pre_ms=getattr(config, "mdx_preview_pre_ms", cls.preview_pre_ms),
             preview_post_ms=getattr(config, "mdx_preview_post_ms", cls.preview_post_ms),
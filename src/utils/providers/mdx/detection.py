@@ -17,11 +17,17 @@ from utils.providers.mdx.config import MdxConfig
 
 logger = logging.getLogger(__name__)
 
+# How far (in frames) after a sustained silence the sustained sound may start
+SOUND_SEARCH_FRAMES = 50
+
 
 def compute_rms(audio: np.ndarray, frame_samples: int, hop_samples: int) -> np.ndarray:
     """
     Compute short-time RMS energy.
 
+    Frames are read through a strided view of the signal, so all frames are
+    reduced in one vectorized call without copying the audio per frame.
+
     Args:
         audio: Audio signal (mono)
         frame_samples: Frame size in samples
@@ -36,16 +42,87 @@ def compute_rms(audio: np.ndarray, frame_samples: int, hop_samples: int) -> np.n
     if num_frames <= 0:
         return np.array([])
 
-    # Compute RMS for each frame
-    rms_values = np.zeros(num_frames)
-    for i in range(num_frames):
-        start = i * hop_samples
-        end = start + frame_samples
-        if end <= len(audio):
-            frame = audio[start:end]
-            rms_values[i] = np.sqrt(np.mean(frame**2))
+    frames = np.lib.stride_tricks.sliding_window_view(audio, frame_samples)[::hop_samples][:num_frames]
+    energy = np.einsum("ij,ij->i", frames, frames) / frame_samples
+    return np.sqrt(energy).astype(np.float64)
 
-    return rms_values
+
+def _window_all(mask: np.ndarray, width: int) -> np.ndarray:
+    """
+    Vectorized sliding all(): result[i] == mask[i:i + width].all().
+
+    Args:
+        mask: Boolean array
+        width: Window length in elements
+
+    Returns:
+        Boolean array of length len(mask) - width + 1
+    """
+    if width <= 0:
+        return np.ones(len(mask) + 1, dtype=bool)
+    counts = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+    return (counts[width:] - counts[:-width]) == width
+
+
+def _next_index(indices: np.ndarray, position: int) -> Optional[int]:
+    """First entry of sorted indices that is >= position, or None."""
+    k = int(np.searchsorted(indices, position))
+    return int(indices[k]) if k < len(indices) else None
+
+
+def find_onset_frame(below_threshold: np.ndarray, min_silence_frames: int, min_sound_frames: int) -> Optional[int]:
+    """
+    Find the first sustained silence followed by sustained sound.
+
+    Scans for a run of at least min_silence_frames silent frames followed,
+    within SOUND_SEARCH_FRAMES, by a run of at least min_sound_frames sounding
+    frames. A silence without sound after it is skipped as a whole. If no such
+    transition exists, falls back to the first sustained sound.
+
+    Sustained runs are found with cumulative sums over the threshold mask, so
+    the search only visits silence-run starts instead of every frame.
+
+    Args:
+        below_threshold: Boolean mask, True where the frame is silent
+        min_silence_frames: Minimum silent run length
+        min_sound_frames: Minimum sounding run length
+
+    Returns:
+        Frame index where sound begins, or None if not found
+    """
+    num_frames = len(below_threshold)
+    above_threshold = ~below_threshold
+    sound_starts = np.flatnonzero(_window_all(above_threshold, min_sound_frames))
+
+    # Silence runs may only start early enough to leave room for the sound run
+    search_end = num_frames - min_silence_frames - min_sound_frames
+    silence_starts = np.flatnonzero(_window_all(below_threshold, min_silence_frames)[: max(0, search_end)])
+
+    i = 0
+    while True:
+        i = _next_index(silence_starts, i)
+        if i is None:
+            break
+        silence_end = i + min_silence_frames
+        onset_frame = _next_index(sound_starts, silence_end)
+        if onset_frame is not None and onset_frame < min(
+            silence_end + SOUND_SEARCH_FRAMES, num_frames - min_sound_frames
+        ):
+            logger.debug(
+                f"Found silence→sound transition: silence at frames {i}-{silence_end}, "
+                f"sound starts at frame {onset_frame}"
+            )
+            return onset_frame
+        # No sound after this silence, skip ahead
+        i = max(silence_end, i + 1)
+
+    logger.debug("No silence→sound transition found, falling back to first sustained sound")
+    # Fallback: find first sustained sound (original vocal-centric approach)
+    fallback = sound_starts[sound_starts < num_frames - min_sound_frames]
+    if len(fallback) == 0:
+        return None
+    logger.debug(f"Fallback: first sustained sound at frame {fallback[0]}")
+    return int(fallback[0])
 
 
 def estimate_noise_floor(rms_values: np.ndarray, noise_floor_frames: int) -> Tuple[float, float]:
@@ -143,52 +220,14 @@ def detect_onset_in_vocal_chunk(
         min_silence_frames = int((config.min_voiced_duration_ms / 1000.0) / (config.hop_duration_ms / 1000.0))
         min_sound_frames = min_silence_frames  # Sound must also sustain for verification
 
-        # Identify frames below/above threshold
+        # Identify frames below threshold
         below_threshold = rms_values <= combined_threshold
-        above_threshold = ~below_threshold
 
         # Start search from beginning (don't skip noise floor region - we want to find the FIRST silence)
         search_start = 0
 
-        # Find first significant silence→sound transition
-        # Strategy: scan forward looking for pattern: [sustained silence] → [sustained sound]
-        onset_frame = None
-        i = search_start
-
-        while i < len(below_threshold) - min_silence_frames - min_sound_frames:
-            # Check if we have sustained silence starting at i
-            if np.all(below_threshold[i : i + min_silence_frames]):
-                # Found sustained silence, now check if followed by sustained sound
-                silence_end = i + min_silence_frames
-
-                # Look for sound starting after the silence
-                for j in range(silence_end, min(silence_end + 50, len(above_threshold) - min_sound_frames)):
-                    # Check if we have sustained sound at position j
-                    if np.all(above_threshold[j : j + min_sound_frames]):
-                        # Found silence→sound transition!
-                        onset_frame = j  # Onset is where sound begins
-                        logger.debug(
-                            f"Found silence→sound transition: silence at frames {i}-{silence_end}, "
-                            f"sound starts at frame {onset_frame}"
-                        )
-                        break
-
-                if onset_frame is not None:
-                    break  # Found the first transition, stop searching
-                else:
-                    # No sound after this silence, skip ahead
-                    i = silence_end
-            else:
-                i += 1
-
-        if onset_frame is None:
-            logger.debug("No silence→sound transition found, falling back to first sustained sound")
-            # Fallback: find first sustained sound (original vocal-centric approach)
-            for i in range(search_start, len(above_threshold) - min_sound_frames):
-                if np.all(above_threshold[i : i + min_sound_frames]):
-                    onset_frame = i
-                    logger.debug(f"Fallback: first sustained sound at frame {onset_frame}")
-                    break
+        # Find first significant silence→sound transition: [sustained silence] → [sustained sound]
+        onset_frame = find_onset_frame(below_threshold, min_silence_frames, min_sound_frames)
 
         if onset_frame is None:
             logger.debug("No onset found")
@@ -210,11 +249,8 @@ def detect_onset_in_vocal_chunk(
                     mean_derivative = np.mean(np.abs(energy_derivative))
                     threshold_derivative = mean_derivative * 0.3  # 30% of mean change
 
-                    first_rise_idx = None
-                    for idx, deriv in enumerate(energy_derivative):
-                        if deriv > threshold_derivative:
-                            first_rise_idx = idx
-                            break
+                    rising = np.flatnonzero(energy_derivative > threshold_derivative)
+                    first_rise_idx = int(rising[0]) if len(rising) else None
 
                     if first_rise_idx is not None:
                         # Adjust onset to the rising edge
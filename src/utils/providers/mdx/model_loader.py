@@ -1,35 +1,159 @@
 """
-Model loading and caching for MDX detection.
+Model loading for MDX detection.
 
-Provides thread-safe model loading with instance-level caching to avoid
-global mutable state. Handles device selection (CUDA/CPU) and optimizations
-(FP16, cuDNN, threading).
+Loads Demucs with device-specific optimizations (FP16, cuDNN, threading).
+Loaded models are shared process-wide through the model registry, so every
+ModelLoader instance in the process reuses the same weights.
 """
 
 import logging
+import os
 import threading
+from typing import Optional
 
 from utils.logging_utils import flush_logs
+from utils.providers.mdx.model_registry import ModelRegistry, get_model_registry
 
 logger = logging.getLogger(__name__)
 
 # Demucs model name - must be compatible with demucs.pretrained.get_model()
 DEMUCS_MODEL_NAME = "htdemucs"
 
+# Set by the multi-process detection engine for its worker processes
+DEVICE_OVERRIDE_ENV = "USDXFIXGAP_DETECTION_DEVICE"
+TORCH_THREADS_ENV = "USDXFIXGAP_TORCH_THREADS"
+
+
+def get_default_device() -> str:
+    """
+    Determine optimal device for model execution.
+
+    Returns:
+        'cuda' if NVIDIA GPU available (and not overridden), otherwise 'cpu'
+    """
+    if os.environ.get(DEVICE_OVERRIDE_ENV) == "cpu":
+        return "cpu"
+
+    # Lazy import to avoid loading torch until needed
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def _cpu_thread_count() -> int:
+    """Torch CPU threads: explicit override, else all cores but one."""
+    override = os.environ.get(TORCH_THREADS_ENV)
+    if override and override.isdigit() and int(override) > 0:
+        return int(override)
+    cpu_count = os.cpu_count()
+    return max(1, cpu_count - 1) if cpu_count else 1
+
+
+def load_demucs_model(model_name: str, device: str, use_fp16: bool):
+    """
+    Load Demucs model with device optimizations and a warm-up pass.
+
+    Called by the model registry on first use of a (model, device, precision)
+    combination. Callers should go through ModelLoader/registry instead of
+    invoking this directly, otherwise the model is loaded again.
+
+    Args:
+        model_name: Demucs model name (e.g. 'htdemucs')
+        device: Target device ('cuda' or 'cpu')
+        use_fp16: Enable FP16 mixed precision (CUDA only)
+
+    Returns:
+        Loaded Demucs model in eval mode
+
+    Raises:
+        DetectionFailedError: If model loading fails
+    """
+    try:
+        # Lazy imports - only load torch/demucs when actually needed
+        import torch
+        from demucs.pretrained import get_model
+        from demucs.apply import apply_model
+
+        device_name = "GPU (CUDA)" if device == "cuda" else "CPU"
+        logger.debug(f"Loading Demucs model on {device_name}...")
+        flush_logs()
+
+        # Enable device-specific optimizations
+        if device == "cuda":
+            # Enable cuDNN auto-tuner for optimal convolution algorithms
+            torch.backends.cudnn.benchmark = True
+            logger.debug("Enabled cuDNN benchmark for GPU optimization")
+            flush_logs()
+
+            # Enable TF32 for faster matrix multiplication on Ampere+ GPUs
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+            torch.set_float32_matmul_precision("high")
+            logger.debug("Enabled TF32 for faster matrix operations on CUDA")
+            flush_logs()
+        else:
+            # CPU optimization: use most cores but leave one free (or the engine's per-process share)
+            num_threads = _cpu_thread_count()
+            torch.set_num_threads(num_threads)
+            logger.debug(f"Set torch threads to {num_threads} for CPU optimization")
+            flush_logs()
+
+        model = get_model(model_name)
+        model.to(device)
+        model.eval()
+
+        logger.debug("Demucs model loaded successfully")
+
+        # Warm up model with dummy input to trigger JIT compilation
+        logger.debug("Warming up model (JIT compilation, memory allocation)...")
+        flush_logs()
+        try:
+            dummy_input = torch.zeros(1, 2, 44100, device=device)  # 1 second stereo (already [1, 2, 44100])
+            with torch.no_grad():
+                if device == "cuda" and use_fp16:
+                    dummy_input = dummy_input.half()
+                # Use apply_model for Demucs inference (no additional unsqueeze needed)
+                _ = apply_model(model, dummy_input, device=device)
+            logger.debug("Model warm-up complete, ready for detection")
+            flush_logs()
+        except Exception as e:
+            logger.warning(f"Model warm-up failed (non-critical): {e}")
+            flush_logs()
+
+        return model
+    except Exception as e:
+        # Import here to avoid circular dependency
+        from utils.providers.exceptions import DetectionFailedError
+
+        raise DetectionFailedError(f"Failed to load Demucs model: {e}", provider_name="mdx", cause=e)
+
 
 class ModelLoader:
     """
-    Thread-safe model loader with instance-level cache.
+    Per-provider handle on the process-wide model registry.
 
-    Replaces global _GLOBAL_MODEL_CACHE to eliminate shared mutable state.
-    Each instance maintains its own cache and lock.
+    The first get_model() call takes one registry reference; release() gives it
+    back. The model itself is shared across all loaders in the process.
     """
 
-    def __init__(self):
-        """Initialize empty cache and lock."""
-        self._cache: dict = {"model": None, "device": None}
+    def __init__(self, model_name: str = DEMUCS_MODEL_NAME, registry: Optional[ModelRegistry] = None):
+        """
+        Initialize loader.
+
+        Args:
+            model_name: Demucs model name to load
+            registry: Registry to use (defaults to process-wide registry)
+        """
+        self._model_name = model_name
+        self._registry = registry
+        self._held: Optional[tuple] = None  # (device, use_fp16) of the reference we hold
         self._lock = threading.Lock()
 
+    @property
+    def registry(self) -> ModelRegistry:
+        """Registry backing this loader."""
+        return self._registry if self._registry is not None else get_model_registry()
+
     def get_device(self) -> str:
         """
         Determine optimal device for model execution.
@@ -37,17 +161,14 @@ class ModelLoader:
         Returns:
             'cuda' if NVIDIA GPU available, otherwise 'cpu'
         """
-        # Lazy import to avoid loading torch until needed
-        import torch
-
-        return "cuda" if torch.cuda.is_available() else "cpu"
+        return get_default_device()
 
     def get_model(self, device: str, use_fp16: bool):
         """
-        Load Demucs model with GPU optimizations (thread-safe).
+        Get shared Demucs model (thread-safe).
 
-        Uses instance cache to avoid reloading model for each detection.
-        Applies device-specific optimizations (cuDNN for GPU, threading for CPU).
+        Loads the model on first use anywhere in the process; later calls from
+        any loader return the same instance.
 
         Args:
             device: Target device ('cuda' or 'cpu')
@@ -60,76 +181,41 @@ class ModelLoader:
             DetectionFailedError: If model loading fails
         """
         with self._lock:
-            # Check if we can reuse cached model
-            if self._cache["model"] is not None and self._cache["device"] == device:
-                logger.debug(f"Reusing cached Demucs model (device={device})")
-                flush_logs()
-                return self._cache["model"]
-
-            # Need to load model
-            try:
-                # Lazy imports - only load torch/demucs when actually needed
-                import torch
-                from demucs.pretrained import get_model
-                from demucs.apply import apply_model
-                from utils.providers.exceptions import DetectionFailedError
-
-                device_name = "GPU (CUDA)" if device == "cuda" else "CPU"
-                logger.debug(f"Loading Demucs model on {device_name}...")
-                flush_logs()
-
-                # Enable device-specific optimizations
-                if device == "cuda":
-                    # Enable cuDNN auto-tuner for optimal convolution algorithms
-                    torch.backends.cudnn.benchmark = True
-                    logger.debug("Enabled cuDNN benchmark for GPU optimization")
-                    flush_logs()
-
-                    # Enable TF32 for faster matrix multiplication on Ampere+ GPUs
-                    torch.backends.cuda.matmul.allow_tf32 = True
-                    torch.backends.cudnn.allow_tf32 = True
-                    torch.set_float32_matmul_precision("high")
-                    logger.debug("Enabled TF32 for faster matrix operations on CUDA")
-                    flush_logs()
-                else:
-                    # CPU optimization: use most cores but leave one free
-                    import os
-
-                    cpu_count = os.cpu_count()
-                    num_threads = max(1, cpu_count - 1) if cpu_count else 1
-                    torch.set_num_threads(num_threads)
-                    logger.debug(f"Set torch threads to {num_threads} for CPU optimization")
-                    flush_logs()
-
-                model = get_model(DEMUCS_MODEL_NAME)
-                model.to(device)
-                model.eval()
-
-                # Cache in instance (not global)
-                self._cache["model"] = model
-                self._cache["device"] = device
-
-                logger.debug("Demucs model loaded successfully")
-
-                # Warm up model with dummy input to trigger JIT compilation
-                logger.debug("Warming up model (JIT compilation, memory allocation)...")
-                flush_logs()
-                try:
-                    dummy_input = torch.zeros(1, 2, 44100, device=device)  # 1 second stereo (already [1, 2, 44100])
-                    with torch.no_grad():
-                        if device == "cuda" and use_fp16:
-                            dummy_input = dummy_input.half()
-                        # Use apply_model for Demucs inference (no additional unsqueeze needed)
-                        _ = apply_model(model, dummy_input, device=device)
-                    logger.debug("Model warm-up complete, ready for detection")
-                    flush_logs()
-                except Exception as e:
-                    logger.warning(f"Model warm-up failed (non-critical): {e}")
-                    flush_logs()
-
-                return model
-            except Exception as e:
-                # Import here to avoid circular dependency
-                from utils.providers.exceptions import DetectionFailedError
-
-                raise DetectionFailedError(f"Failed to load Demucs model: {e}", provider_name="mdx", cause=e)
+            if self._held == (device, use_fp16):
+                return self.registry.get(self._model_name, device, use_fp16)
+
+            # Device/precision changed - swap our reference to the new entry
+            self._release_locked()
+            model = self.registry.acquire(self._model_name, device, use_fp16)
+            self._held = (device, use_fp16)
+            return model
+
+    def release(self) -> None:
+        """Give back the registry reference held by this loader (idempotent)."""
+        with self._lock:
+            self._release_locked()
+
+    def _release_locked(self) -> None:
+        if self._held is None:
+            return
+        device, use_fp16 = self._held
+        self._held = None
+        self.registry.release(self._model_name, device, use_fp16)
+
+
+def warm_up_model(use_fp16: bool, model_name: str = DEMUCS_MODEL_NAME) -> None:
+    """
+    Load the model for the default device into the process-wide registry.
+
+    Meant to run on a background thread when a batch of detections is queued,
+    so the first detection task finds the model already loaded (or loading).
+    Failures are logged only; the detection itself reports load errors.
+
+    Args:
+        use_fp16: Whether FP16 precision is configured
+        model_name: Demucs model name to load
+    """
+    try:
+        get_model_registry().warm_up(model_name, get_default_device(), use_fp16)
+    except Exception as e:
+        logger.warning(f"Model warm-up failed (non-critical): {e}")
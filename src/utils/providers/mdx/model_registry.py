@@ -0,0 +1,263 @@
+"""
+Process-wide registry for loaded Demucs models.
+
+Keeps one loaded model per (model name, device, precision) for the lifetime of
+the process, so consecutive detections reuse the same weights instead of
+reloading htdemucs for every provider instance.
+
+Entries are reference counted. A model nobody holds is kept warm for an idle
+timeout and evicted lazily on the next registry access (or explicitly via
+evict_idle()/shutdown_model_registry()).
+
+NOTE: This module does not import torch at import time. The default loader
+imports torch/demucs lazily so the registry can be referenced before GPU
+bootstrap (e.g. from shutdown hooks).
+"""
+
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.logging_utils import flush_logs
+
+logger = logging.getLogger(__name__)
+
+# Keep unreferenced models loaded for 10 minutes so back-to-back batches
+# ("Detect All", re-detect after config tweak) never pay the load twice.
+DEFAULT_IDLE_TIMEOUT_SEC = 600.0
+
+ModelKey = Tuple[str, str, str]
+ModelLoaderFn = Callable[[str, str, bool], Any]
+
+
+def make_model_key(model_name: str, device: str, use_fp16: bool) -> ModelKey:
+    """
+    Build registry key for a model configuration.
+
+    FP16 only applies on CUDA, so CPU requests always map to the fp32 entry.
+
+    Args:
+        model_name: Demucs model name (e.g. 'htdemucs')
+        device: Target device ('cuda' or 'cpu')
+        use_fp16: Whether FP16 precision was requested
+
+    Returns:
+        Tuple of (model_name, device, precision)
+    """
+    precision = "fp16" if (use_fp16 and device == "cuda") else "fp32"
+    return (model_name, device, precision)
+
+
+@dataclass
+class _RegistryEntry:
+    """Loaded model plus bookkeeping for reference counting and eviction."""
+
+    model: Any
+    ref_count: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ModelRegistry:
+    """
+    Thread-safe, reference-counted cache of loaded models.
+
+    Example:
+        registry = get_model_registry()
+        model = registry.acquire("htdemucs", "cpu", use_fp16=False)
+        try:
+            ...  # run inference
+        finally:
+            registry.release("htdemucs", "cpu", use_fp16=False)
+    """
+
+    def __init__(
+        self,
+        loader: Optional[ModelLoaderFn] = None,
+        idle_timeout_sec: float = DEFAULT_IDLE_TIMEOUT_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize registry.
+
+        Args:
+            loader: Function(model_name, device, use_fp16) -> model. Defaults to load_demucs_model.
+            idle_timeout_sec: Seconds an unreferenced model stays loaded before eviction
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._loader = loader
+        self._idle_timeout_sec = idle_timeout_sec
+        self._clock = clock
+        self._entries: Dict[ModelKey, _RegistryEntry] = {}
+        self._lock = threading.RLock()
+
+    def _load(self, model_name: str, device: str, use_fp16: bool) -> Any:
+        if self._loader is not None:
+            return self._loader(model_name, device, use_fp16)
+
+        # Lazy import - model_loader pulls in torch/demucs
+        from utils.providers.mdx.model_loader import load_demucs_model
+
+        return load_demucs_model(model_name, device, use_fp16)
+
+    def _get_or_load(self, model_name: str, device: str, use_fp16: bool) -> _RegistryEntry:
+        key = make_model_key(model_name, device, use_fp16)
+        entry = self._entries.get(key)
+        if entry is not None:
+            logger.debug("Reusing registered model %s", key)
+            flush_logs()
+            return entry
+
+        logger.info("Loading model %s into process-wide registry", key)
+        flush_logs()
+        entry = _RegistryEntry(model=self._load(model_name, device, use_fp16), last_used=self._clock())
+        self._entries[key] = entry
+        return entry
+
+    def acquire(self, model_name: str, device: str, use_fp16: bool) -> Any:
+        """
+        Get a model and take a reference on it (loads on first use).
+
+        Args:
+            model_name: Demucs model name
+            device: Target device ('cuda' or 'cpu')
+            use_fp16: Whether FP16 precision was requested
+
+        Returns:
+            Loaded model in eval mode
+        """
+        with self._lock:
+            self._evict_idle_locked(exclude=make_model_key(model_name, device, use_fp16))
+            entry = self._get_or_load(model_name, device, use_fp16)
+            entry.ref_count += 1
+            entry.last_used = self._clock()
+            return entry.model
+
+    def release(self, model_name: str, device: str, use_fp16: bool) -> None:
+        """
+        Drop a reference taken by acquire().
+
+        The model stays loaded until it has been idle for idle_timeout_sec.
+
+        Args:
+            model_name: Demucs model name
+            device: Target device ('cuda' or 'cpu')
+            use_fp16: Whether FP16 precision was requested
+        """
+        key = make_model_key(model_name, device, use_fp16)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                logger.debug("Release for unregistered model %s ignored", key)
+                return
+            entry.ref_count = max(0, entry.ref_count - 1)
+            entry.last_used = self._clock()
+            self._evict_idle_locked()
+
+    def get(self, model_name: str, device: str, use_fp16: bool) -> Any:
+        """
+        Get a model without taking a reference (loads on first use).
+
+        Args:
+            model_name: Demucs model name
+            device: Target device ('cuda' or 'cpu')
+            use_fp16: Whether FP16 precision was requested
+
+        Returns:
+            Loaded model in eval mode
+        """
+        with self._lock:
+            entry = self._get_or_load(model_name, device, use_fp16)
+            entry.last_used = self._clock()
+            return entry.model
+
+    def warm_up(self, model_name: str, device: str, use_fp16: bool) -> None:
+        """
+        Load a model ahead of time so the first detection does not pay the load.
+
+        Args:
+            model_name: Demucs model name
+            device: Target device ('cuda' or 'cpu')
+            use_fp16: Whether FP16 precision was requested
+        """
+        self.get(model_name, device, use_fp16)
+
+    def is_loaded(self, model_name: str, device: str, use_fp16: bool) -> bool:
+        """Check whether a model is currently resident in the registry."""
+        with self._lock:
+            return make_model_key(model_name, device, use_fp16) in self._entries
+
+    def ref_count(self, model_name: str, device: str, use_fp16: bool) -> int:
+        """Return number of outstanding references for a model (0 if not loaded)."""
+        with self._lock:
+            entry = self._entries.get(make_model_key(model_name, device, use_fp16))
+            return entry.ref_count if entry else 0
+
+    def evict_idle(self) -> int:
+        """
+        Evict unreferenced models that exceeded the idle timeout.
+
+        Returns:
+            Number of evicted models
+        """
+        with self._lock:
+            return self._evict_idle_locked()
+
+    def clear(self) -> None:
+        """Drop all models regardless of references (used at shutdown)."""
+        with self._lock:
+            if self._entries:
+                logger.debug("Clearing model registry (%d models)", len(self._entries))
+            self._entries.clear()
+        self._release_device_memory()
+
+    def _evict_idle_locked(self, exclude: Optional[ModelKey] = None) -> int:
+        now = self._clock()
+        expired = [
+            key
+            for key, entry in self._entries.items()
+            if key != exclude and entry.ref_count == 0 and now - entry.last_used >= self._idle_timeout_sec
+        ]
+        for key in expired:
+            logger.info("Evicting idle model %s", key)
+            del self._entries[key]
+        if expired:
+            self._release_device_memory()
+        return len(expired)
+
+    @staticmethod
+    def _release_device_memory() -> None:
+        # Only touch torch if something already imported it - never trigger the import here
+        torch = sys.modules.get("torch")
+        if torch is None:
+            return
+        try:
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception as e:
+            logger.debug("Failed to release CUDA cache (non-critical): %s", e)
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry (created on first use)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
+
+
+def shutdown_model_registry() -> None:
+    """Release all registered models (idempotent)."""
+    global _registry
+    with _registry_lock:
+        registry = _registry
+        _registry = None
+    if registry is not None:
+        registry.clear()
@@ -6,14 +6,17 @@ Clear I/O boundaries - delegates actual processing to specialized modules.
 """
 
 import logging
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 import torch
 import torchaudio
 import numpy as np
 
-from utils.providers.mdx.separator import separate_vocals_chunk
+from utils.providers.mdx.separator import resolve_batch_size, separate_vocals_batch, separate_vocals_chunk
 from utils.providers.mdx.detection import detect_onset_in_vocal_chunk
 from utils.providers.mdx.vocals_cache import VocalsCache
+from utils.providers.mdx.stem_cache import StemCache, audio_fingerprint
+from utils.providers.mdx.stem_stitcher import StemCollector
+from utils.providers.mdx.model_loader import DEMUCS_MODEL_NAME
 from utils.providers.mdx.config import MdxConfig
 from utils.providers.mdx.scanner.chunk_iterator import ChunkBoundaries
 from utils.providers.mdx.audio_compat import get_audio_info_compat, load_audio_compat
@@ -29,11 +32,17 @@ class OnsetDetectorPipeline:
         1. Load audio chunk from file
         2. Separate vocals using Demucs (delegate to separator module)
         3. Detect onset in vocals (delegate to detection module)
-        4. Cache vocals for potential reuse in confidence computation
+        4. Cache vocals for potential reuse in confidence computation (in memory)
+           and in later detections (persistent stem cache, if provided)
+        5. Hand vocals to the stem collector (if provided), so the vocals file
+           can be stitched from them instead of separating the audio again
 
     This class acts as the I/O boundary - it handles file loading and
     coordinates between modules, but delegates actual processing.
 
+    Several chunks can be processed together via process_chunks(); their
+    separation then runs as one batched Demucs call (up to batch_size chunks).
+
     Example:
         pipeline = OnsetDetectorPipeline(
             audio_file="song.mp3",
@@ -46,7 +55,16 @@ class OnsetDetectorPipeline:
         onset_ms = pipeline.process_chunk(chunk_boundaries)
     """
 
-    def __init__(self, audio_file: str, model, device: str, config: MdxConfig, vocals_cache: VocalsCache):
+    def __init__(
+        self,
+        audio_file: str,
+        model,
+        device: str,
+        config: MdxConfig,
+        vocals_cache: VocalsCache,
+        stem_cache: Optional[StemCache] = None,
+        stem_collector: Optional[StemCollector] = None,
+    ):
         """
         Initialize onset detector pipeline.
 
@@ -56,18 +74,26 @@ class OnsetDetectorPipeline:
             device: Device for processing ("cuda" or "cpu")
             config: MDX configuration
             vocals_cache: Cache for separated vocals
+            stem_cache: Optional persistent stem cache (skips Demucs for known chunks)
+            stem_collector: Optional collector receiving every chunk stem (for vocals stitching)
         """
         self.audio_file = audio_file
         self.model = model
         self.device = device
         self.config = config
         self.vocals_cache = vocals_cache
+        self.stem_cache = stem_cache
+        self.stem_collector = stem_collector
+        self._fingerprint = audio_fingerprint(audio_file) if stem_cache is not None else None
 
         # Get audio info once (handles M4A)
         info = get_audio_info_compat(audio_file)
         self.sample_rate = info.sample_rate
         self.num_frames = info.num_frames
 
+        # Chunks per Demucs call (config value, or auto-sized from free VRAM)
+        self.batch_size = resolve_batch_size(getattr(config, "batch_size", 0), device, config.use_fp16)
+
     def process_chunk(
         self, chunk: ChunkBoundaries, check_cancellation: Optional[Callable[[], bool]] = None
     ) -> Optional[float]:
@@ -81,30 +107,84 @@ class OnsetDetectorPipeline:
         Returns:
             Absolute onset timestamp in milliseconds, or None if not found
         """
+        return self.process_chunks([chunk], check_cancellation)[0]
+
+    def process_chunks(
+        self, chunks: List[ChunkBoundaries], check_cancellation: Optional[Callable[[], bool]] = None
+    ) -> List[Optional[float]]:
+        """
+        Process several chunks for onset detection with one batched separation.
+
+        Chunks found in the persistent stem cache skip audio loading and Demucs.
+
+        Args:
+            chunks: Chunk boundaries to process (at most batch_size for one model call)
+            check_cancellation: Callback returning True if cancelled
+
+        Returns:
+            Absolute onset timestamp in milliseconds (or None) per chunk, in input order
+        """
         # Check cancellation
         if check_cancellation and check_cancellation():
-            return None
-
-        # Load audio chunk
-        waveform = self._load_chunk(chunk)
+            return [None] * len(chunks)
 
-        # Apply optional resampling for CPU speedup
+        # Optional resampling for CPU speedup
         if self.config.resample_hz > 0 and self.sample_rate != self.config.resample_hz:
-            waveform = torchaudio.functional.resample(waveform, self.sample_rate, self.config.resample_hz)
             current_sample_rate = self.config.resample_hz
         else:
             current_sample_rate = self.sample_rate
 
-        # Separate vocals
-        vocals = self._separate_vocals(waveform, current_sample_rate, check_cancellation)
-
-        # Cache vocals for potential reuse
-        self.vocals_cache.put(self.audio_file, chunk.start_ms, chunk.end_ms, vocals)
+        vocals_list = [self._get_cached_stem(chunk, current_sample_rate) for chunk in chunks]
+        missing = [i for i, vocals in enumerate(vocals_list) if vocals is None]
+        if missing:
+            # Load audio chunks and separate vocals
+            waveforms = [self._load_chunk(chunks[i]) for i in missing]
+            if current_sample_rate != self.sample_rate:
+                waveforms = [
+                    torchaudio.functional.resample(waveform, self.sample_rate, current_sample_rate)
+                    for waveform in waveforms
+                ]
+            separated = self._separate_many(waveforms, current_sample_rate, check_cancellation)
+            for i, vocals in zip(missing, separated):
+                vocals_list[i] = vocals
+                self._put_cached_stem(chunks[i], current_sample_rate, vocals)
+
+        onsets = []
+        for chunk, vocals in zip(chunks, vocals_list):
+            # Cache vocals for potential reuse
+            self.vocals_cache.put(self.audio_file, chunk.start_ms, chunk.end_ms, vocals)
+            if self.stem_collector is not None:
+                self.stem_collector.add(self.audio_file, chunk.start_ms, chunk.end_ms, current_sample_rate, vocals)
+
+            # Detect onset in vocals
+            onsets.append(self._detect_onset(vocals, current_sample_rate, chunk.start_ms))
+
+        return onsets
+
+    def _separate_many(
+        self, waveforms: List[torch.Tensor], sample_rate: int, check_cancellation: Optional[Callable[[], bool]]
+    ) -> List[np.ndarray]:
+        """Separate one chunk directly, several with one batched Demucs call."""
+        if len(waveforms) == 1:
+            return [self._separate_vocals(waveforms[0], sample_rate, check_cancellation)]
+        return separate_vocals_batch(
+            model=self.model,
+            waveforms=waveforms,
+            sample_rate=sample_rate,
+            device=self.device,
+            use_fp16=self.config.use_fp16,
+            check_cancellation=check_cancellation,
+        )
 
-        # Detect onset in vocals
-        onset_ms = self._detect_onset(vocals, current_sample_rate, chunk.start_ms)
+    def _get_cached_stem(self, chunk: ChunkBoundaries, sample_rate: int) -> Optional[np.ndarray]:
+        if self.stem_cache is None or self._fingerprint is None:
+            return None
+        return self.stem_cache.get(self._fingerprint, DEMUCS_MODEL_NAME, sample_rate, chunk.start_ms, chunk.end_ms)
 
-        return onset_ms
+    def _put_cached_stem(self, chunk: ChunkBoundaries, sample_rate: int, vocals: np.ndarray) -> None:
+        if self.stem_cache is None or self._fingerprint is None:
+            return
+        self.stem_cache.put(self._fingerprint, DEMUCS_MODEL_NAME, sample_rate, chunk.start_ms, chunk.end_ms, vocals)
 
     def _load_chunk(self, chunk: ChunkBoundaries) -> torch.Tensor:
         """
@@ -6,12 +6,14 @@ High-level coordination - delegates actual work to specialized modules.
 """
 
 import logging
-from typing import Optional, Callable, List
+from typing import Optional, Callable, Iterator, List
 
 from utils.providers.mdx.config import MdxConfig
 from utils.providers.mdx.vocals_cache import VocalsCache
+from utils.providers.mdx.stem_cache import StemCache
+from utils.providers.mdx.stem_stitcher import StemCollector
 from utils.providers.mdx.logging import flush_logs as _flush_logs
-from utils.providers.mdx.scanner.chunk_iterator import ChunkIterator
+from utils.providers.mdx.scanner.chunk_iterator import ChunkBoundaries, ChunkIterator
 from utils.providers.mdx.scanner.expansion_strategy import ExpansionStrategy
 from utils.providers.mdx.scanner.onset_detector import OnsetDetectorPipeline
 from utils.providers.exceptions import DetectionFailedError
@@ -69,6 +71,44 @@ def _is_duplicate_onset(onset_ms: float, existing_onsets: List[float], threshold
     return any(abs(onset_ms - existing) < threshold_ms for existing in existing_onsets)
 
 
+def _collect_gated_chunks(
+    chunk_iterator: ChunkIterator, window, band_start: float, band_end: float
+) -> List[ChunkBoundaries]:
+    """
+    Collect unprocessed chunks of a window that overlap the distance band.
+
+    Args:
+        chunk_iterator: Iterator tracking already processed chunks
+        window: Expansion window (start_ms/end_ms)
+        band_start: Distance band start in milliseconds
+        band_end: Distance band end in milliseconds
+
+    Returns:
+        Chunks to process, in scan order
+    """
+    chunks = []
+    for chunk in chunk_iterator.generate_chunks(window.start_ms, window.end_ms):
+        # Skip chunks outside the distance band
+        if chunk.end_ms < band_start or chunk.start_ms > band_end:
+            logger.debug(
+                "Distance gating: chunk [%.1fs-%.1fs] outside band [%.1fs-%.1fs] → skipped",
+                chunk.start_ms / 1000,
+                chunk.end_ms / 1000,
+                band_start / 1000,
+                band_end / 1000,
+            )
+            continue
+        chunks.append(chunk)
+    return chunks
+
+
+def _split_batches(chunks: List[ChunkBoundaries], batch_size: int) -> Iterator[List[ChunkBoundaries]]:
+    """Yield consecutive slices of at most batch_size chunks."""
+    batch_size = max(1, batch_size)
+    for start in range(0, len(chunks), batch_size):
+        yield chunks[start : start + batch_size]
+
+
 def scan_for_onset(
     audio_file: str,
     expected_gap_ms: float,
@@ -78,6 +118,8 @@ def scan_for_onset(
     vocals_cache: VocalsCache,
     total_duration_ms: float,
     check_cancellation: Optional[Callable[[], bool]] = None,
+    stem_cache: Optional[StemCache] = None,
+    stem_collector: Optional[StemCollector] = None,
 ) -> Optional[float]:
     """
     Vocal onset detection with expanding window search.
@@ -89,7 +131,7 @@ def scan_for_onset(
 
     Strategy:
         - Start with small window around expected gap (±initial_radius)
-        - Process chunks in window, detecting onsets
+        - Process chunks in window in batches (one Demucs call per batch), detecting onsets
         - If no onset found, expand search window (up to max_expansions)
         - Return closest onset to expected gap
 
@@ -106,6 +148,8 @@ def scan_for_onset(
         vocals_cache: Cache for separated vocals
         total_duration_ms: Total audio duration in milliseconds
         check_cancellation: Callback returning True if cancelled
+        stem_cache: Optional persistent stem cache shared across detections
+        stem_collector: Optional collector receiving every separated chunk (for vocals stitching)
 
     Returns:
         Absolute onset timestamp in milliseconds, or None if not found
@@ -132,7 +176,13 @@ def scan_for_onset(
         )
 
         onset_detector = OnsetDetectorPipeline(
-            audio_file=audio_file, model=model, device=device, config=config, vocals_cache=vocals_cache
+            audio_file=audio_file,
+            model=model,
+            device=device,
+            config=config,
+            vocals_cache=vocals_cache,
+            stem_cache=stem_cache,
+            stem_collector=stem_collector,
         )
 
         # Collect all detected onsets
@@ -179,59 +229,48 @@ def scan_for_onset(
                 )
                 _flush_logs()
 
-                # Process chunks in current window (gate by distance from expected)
+                # Process chunks in current window (gate by distance from expected), batch by batch
+                chunks = _collect_gated_chunks(chunk_iterator, window, band_start, band_end)
                 chunks_processed = 0
-                for chunk in chunk_iterator.generate_chunks(window.start_ms, window.end_ms):
-                    # Skip chunks outside the distance band
-                    if chunk.end_ms < band_start or chunk.start_ms > band_end:
-                        logger.debug(
-                            "Distance gating: chunk [%.1fs-%.1fs] outside band [%.1fs-%.1fs] → skipped",
-                            chunk.start_ms / 1000,
-                            chunk.end_ms / 1000,
-                            band_start / 1000,
-                            band_end / 1000,
-                        )
-                        continue
-
+                for batch in _split_batches(chunks, onset_detector.batch_size):
                     # Check cancellation
                     if check_cancellation and check_cancellation():
                         raise DetectionFailedError("Search cancelled by user", provider_name="mdx")
 
-                    chunks_processed += 1
                     logger.debug(
-                        "Loading chunk at %.1fs-%.1fs (expansion #%d, chunk %d)",
-                        chunk.start_s,
-                        chunk.end_s,
+                        "Loading %d chunk(s) at %.1fs-%.1fs (expansion #%d, chunk %d)",
+                        len(batch),
+                        batch[0].start_s,
+                        batch[-1].end_s,
                         window.expansion_num,
-                        chunks_processed,
+                        chunks_processed + 1,
                     )
                     _flush_logs()
+                    chunks_processed += len(batch)
 
-                    # Process chunk for onset
-                    onset_ms = onset_detector.process_chunk(chunk, check_cancellation)
+                    # Process chunks for onsets (one batched separation), then evaluate in order
+                    for onset_ms in onset_detector.process_chunks(batch, check_cancellation):
+                        if onset_ms is None or _is_duplicate_onset(onset_ms, all_onsets):
+                            continue
+                        all_onsets.append(onset_ms)
+                        logger.debug(
+                            "Found vocal onset at %.0fms (distance from expected: %.0fms)",
+                            onset_ms,
+                            abs(onset_ms - expected_gap_ms),
+                        )
 
-                    if onset_ms is not None:
-                        # Check for duplicates (within 1 second)
-                        if not _is_duplicate_onset(onset_ms, all_onsets):
-                            all_onsets.append(onset_ms)
+                        # Early-stop if onset is within tolerance
+                        diff = abs(onset_ms - expected_gap_ms)
+                        early_stop_threshold = max(config.hysteresis_ms, config.early_stop_tolerance_ms)
+                        if diff <= early_stop_threshold:
                             logger.debug(
-                                "Found vocal onset at %.0fms (distance from expected: %.0fms)",
+                                "Early-stop triggered: onset within %.0fms tolerance (diff=%.0fms). Returning %.0fms",
+                                early_stop_threshold,
+                                diff,
                                 onset_ms,
-                                abs(onset_ms - expected_gap_ms),
                             )
-
-                            # Early-stop if onset is within tolerance
-                            diff = abs(onset_ms - expected_gap_ms)
-                            early_stop_threshold = max(config.hysteresis_ms, config.early_stop_tolerance_ms)
-                            if diff <= early_stop_threshold:
-                                logger.debug(
-                                    "Early-stop triggered: onset within %.0fms tolerance (diff=%.0fms). Returning %.0fms",
-                                    early_stop_threshold,
-                                    diff,
-                                    onset_ms,
-                                )
-                                _flush_logs()
-                                return onset_ms
+                            _flush_logs()
+                            return onset_ms
 
                 logger.debug(
                     "Expansion #%d complete: processed %d new chunks, found %d total onset(s)",
@@ -1,12 +1,14 @@
 """
 Vocal separation logic for MDX detection.
 
-Provides chunk-based Demucs separation with GPU optimizations (FP16, cuDNN).
+Provides chunk-based Demucs separation with GPU optimizations (FP16, cuDNN),
+plus batched separation that runs several equal-length chunks of one song
+through the model in one (B, 2, T) call (batch size: see resolve_batch_size).
 """
 
 import logging
 import time
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 
 import numpy as np
 import torch
@@ -20,6 +22,16 @@ logger = logging.getLogger(__name__)
 # Demucs htdemucs model: drums=0, bass=1, other=2, vocals=3
 VOCALS_INDEX = 3
 
+# Upper bound for automatic batch sizing
+MAX_AUTO_BATCH_SIZE = 8
+
+# Rough CUDA memory needed per batch item. apply_model splits input into ~8s
+# segments, so peak memory scales with batch size, not chunk length.
+CUDA_BYTES_PER_BATCH_ITEM = 768 * 1024 * 1024
+
+# Fraction of free VRAM that batching may use (rest stays free for allocator/other apps)
+CUDA_MEMORY_HEADROOM = 0.8
+
 
 def separate_vocals_chunk(
     model,
@@ -79,3 +91,132 @@ def separate_vocals_chunk(
         flush_logs()
 
     return vocals
+
+
+def resolve_batch_size(requested, device: str, use_fp16: bool) -> int:
+    """
+    Determine how many chunks to separate per Demucs call.
+
+    A positive `requested` value is used as-is. Otherwise the size is derived
+    from free VRAM on CUDA, where small per-chunk calls leave the device idle.
+
+    On CPU the automatic size stays 1 regardless of free RAM. Demucs already
+    runs one chunk on all cores (torch intra-op threads), so a (B, 2, T) batch
+    takes about B times as long as one chunk and gains little throughput.
+    Memory is not what limits CPU separation. A larger batch only delays the
+    first onset check, and the scanner stops early once it finds an onset.
+    Users who want CPU batches anyway can set [mdx] batch_size explicitly.
+
+    Batches only hold chunks of one song. Batching across songs would need
+    one in-process queue feeding a shared model. With the multi-process
+    detection engine, each worker process owns its own model and detects one
+    song at a time, so no such queue exists.
+
+    Args:
+        requested: Configured batch size (0 or invalid = auto)
+        device: Target device ('cuda' or 'cpu')
+        use_fp16: Whether FP16 is used (halves per-item memory)
+
+    Returns:
+        Batch size >= 1
+    """
+    if isinstance(requested, int) and not isinstance(requested, bool) and requested > 0:
+        return requested
+    if device != "cuda":
+        return 1
+
+    try:
+        free_bytes, _ = torch.cuda.mem_get_info()
+    except Exception as e:
+        logger.debug(f"Could not query free VRAM, disabling batching: {e}")
+        return 1
+
+    per_item = CUDA_BYTES_PER_BATCH_ITEM // (2 if use_fp16 else 1)
+    batch_size = int(free_bytes * CUDA_MEMORY_HEADROOM) // per_item
+    return max(1, min(MAX_AUTO_BATCH_SIZE, batch_size))
+
+
+def _is_out_of_memory(error: Exception) -> bool:
+    return isinstance(error, torch.cuda.OutOfMemoryError) or "out of memory" in str(error).lower()
+
+
+def _separate_batch_tensor(model, batch: "torch.Tensor", device: str, use_fp16: bool) -> List[np.ndarray]:
+    """Run one (B, 2, T) batch, halving it on CUDA out-of-memory."""
+    try:
+        with torch.no_grad():
+            batch_gpu = batch.to(device)
+            if use_fp16 and device == "cuda":
+                batch_gpu = batch_gpu.to(torch.float16)
+            sources = apply_model(model, batch_gpu, device=device)
+            vocals = sources[:, VOCALS_INDEX].cpu().numpy()
+        return list(vocals)
+    except Exception as e:
+        if batch.shape[0] == 1 or not _is_out_of_memory(e):
+            raise
+        logger.warning(f"Out of memory separating batch of {batch.shape[0]}, retrying in halves")
+        flush_logs()
+        torch.cuda.empty_cache()
+        half = batch.shape[0] // 2
+        return _separate_batch_tensor(model, batch[:half], device, use_fp16) + _separate_batch_tensor(
+            model, batch[half:], device, use_fp16
+        )
+
+
+def separate_vocals_batch(
+    model,
+    waveforms: List["torch.Tensor"],
+    sample_rate: int,
+    device: str,
+    use_fp16: bool,
+    check_cancellation: Optional[Callable[[], bool]] = None,
+) -> List[np.ndarray]:
+    """
+    Separate vocals from several audio chunks with batched Demucs calls.
+
+    Chunks are grouped by length and each group is stacked into one
+    (B, 2, T) tensor, so results are identical to separating every chunk on
+    its own (no zero padding reaches the model).
+
+    Args:
+        model: Loaded Demucs model
+        waveforms: Audio waveform tensors (channels, samples)
+        sample_rate: Sample rate of audio
+        device: Target device ('cuda' or 'cpu')
+        use_fp16: Enable FP16 mixed precision (CUDA only)
+        check_cancellation: Cancellation callback
+
+    Returns:
+        Vocals-only numpy arrays (channels, samples), in input order
+
+    Raises:
+        DetectionFailedError: If cancelled or separation fails
+    """
+    if check_cancellation and check_cancellation():
+        raise DetectionFailedError("Separation cancelled by user", provider_name="mdx")
+
+    # Group indices by chunk length (only the final chunk of a song is usually shorter)
+    groups = {}
+    for index, waveform in enumerate(waveforms):
+        groups.setdefault(waveform.shape[-1], []).append(index)
+
+    total_s = sum(w.shape[-1] for w in waveforms) / sample_rate
+    logger.debug(f"Running batched Demucs separation on {len(waveforms)} chunks ({total_s:.1f}s audio)...")
+    flush_logs()
+
+    results: List[Optional[np.ndarray]] = [None] * len(waveforms)
+    start_time = time.time()
+    for indices in groups.values():
+        if check_cancellation and check_cancellation():
+            raise DetectionFailedError("Separation cancelled by user", provider_name="mdx")
+        batch = torch.stack([waveforms[i] for i in indices])
+        for index, vocals in zip(indices, _separate_batch_tensor(model, batch, device, use_fp16)):
+            results[index] = vocals
+    elapsed = time.time() - start_time
+
+    logger.debug(
+        f"Batched separation complete in {elapsed:.1f}s ({total_s / max(elapsed, 1e-6):.1f}x realtime, "
+        f"{len(groups)} model call(s))"
+    )
+    flush_logs()
+
+    return results
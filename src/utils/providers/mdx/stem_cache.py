@@ -0,0 +1,218 @@
+"""
+Persistent, content-addressed cache of separated vocal stems.
+
+Complements the in-memory VocalsCache: stems survive provider instances, app
+restarts and rescans, so re-running detection (after a config tweak, a crash
+or a folder rescan) skips Demucs for every chunk it has already separated.
+
+Entries are keyed by:
+    - an audio fingerprint (size, mtime and a hash of the file's head and tail),
+      so renamed/moved copies of a file hit while edited files miss
+    - model name and sample rate (the stem depends on both)
+    - chunk boundaries in milliseconds
+
+Stems are stored as float16 .npy files (half the size of float32, well below
+the precision onset detection needs) and opened memory-mapped on read.
+Total size is capped; least recently used entries are evicted first (file
+mtime is bumped on every hit and serves as the LRU clock).
+
+NOTE: This module does not import torch.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.lru_file_store import LruFileStore
+
+logger = logging.getLogger(__name__)
+
+# Bytes hashed from the start and from the end of the audio file for the fingerprint
+FINGERPRINT_SAMPLE_BYTES = 64 * 1024
+
+# Default size cap for the stem cache directory
+DEFAULT_STEM_CACHE_MB = 1024
+
+STEM_FILE_SUFFIX = ".npy"
+
+
+def audio_fingerprint(audio_file: str, include_mtime: bool = True) -> Optional[str]:
+    """
+    Build a cheap content fingerprint for an audio file.
+
+    Hashes file size, mtime and the first/last FINGERPRINT_SAMPLE_BYTES of
+    content instead of the whole file, so fingerprinting stays O(1) in file size.
+
+    Args:
+        audio_file: Path to audio file
+        include_mtime: Hash the mtime too. Without it, byte-identical copies of a
+            file (e.g. the same audio in several song folders) share the fingerprint,
+            and a sample from the middle of the file is hashed as well.
+
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    try:
+        stat_result = os.stat(audio_file)
+        digest = hashlib.sha1()
+        if include_mtime:
+            digest.update(f"{stat_result.st_size}:{stat_result.st_mtime_ns}".encode("ascii"))
+        else:
+            digest.update(f"{stat_result.st_size}".encode("ascii"))
+        with open(audio_file, "rb") as f:
+            digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+            if not include_mtime and stat_result.st_size > 3 * FINGERPRINT_SAMPLE_BYTES:
+                f.seek((stat_result.st_size - FINGERPRINT_SAMPLE_BYTES) // 2)
+                digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+            if stat_result.st_size > 2 * FINGERPRINT_SAMPLE_BYTES:
+                f.seek(-FINGERPRINT_SAMPLE_BYTES, os.SEEK_END)
+                digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+        return digest.hexdigest()
+    except OSError as e:
+        logger.debug(f"Cannot fingerprint {audio_file}: {e}")
+        return None
+
+
+class StemCache(LruFileStore):
+    """
+    Size-capped, on-disk LRU store for separated vocal chunks.
+
+    Safe to share between threads and processes: writes go to a temp file and
+    are published with an atomic rename; evictions tolerate concurrent removal
+    (see LruFileStore).
+
+    Example:
+        cache = StemCache(root_dir, max_bytes=512 * 1024 * 1024)
+        fingerprint = audio_fingerprint(audio_file)
+        vocals = cache.get(fingerprint, "htdemucs", 44100, 0, 12000)
+        if vocals is None:
+            vocals = separate(...)
+            cache.put(fingerprint, "htdemucs", 44100, 0, 12000, vocals)
+    """
+
+    def __init__(self, root_dir: str, max_bytes: int):
+        """
+        Initialize stem cache (creates root_dir if needed).
+
+        Args:
+            root_dir: Directory holding stem files
+            max_bytes: Size cap for all stem files together
+        """
+        super().__init__(root_dir, max_bytes, STEM_FILE_SUFFIX)
+
+    @staticmethod
+    def make_key(fingerprint: str, model_name: str, sample_rate: int, start_ms: float, end_ms: float) -> str:
+        """Build the file-name key for a stem."""
+        raw = f"{fingerprint}|{model_name}|{int(sample_rate)}|{int(round(start_ms))}|{int(round(end_ms))}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return self.path(key + STEM_FILE_SUFFIX)
+
+    def get(
+        self, fingerprint: str, model_name: str, sample_rate: int, start_ms: float, end_ms: float
+    ) -> Optional[np.ndarray]:
+        """
+        Load a cached stem.
+
+        Args:
+            fingerprint: audio_fingerprint() of the source file
+            model_name: Separation model name
+            sample_rate: Sample rate the stem was separated at
+            start_ms: Chunk start (milliseconds)
+            end_ms: Chunk end (milliseconds)
+
+        Returns:
+            float32 vocals array (channels, samples), or None on miss
+        """
+        path = self._path(self.make_key(fingerprint, model_name, sample_rate, start_ms, end_ms))
+        try:
+            stored = np.load(path, mmap_mode="r")
+            vocals = np.asarray(stored, dtype=np.float32)
+            del stored
+            self.touch(os.path.basename(path))
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.debug(f"Dropping unreadable stem cache entry {path}: {e}")
+                self.discard(os.path.basename(path))
+            return None
+
+        logger.debug(f"Stem cache HIT: [{start_ms:.0f}ms-{end_ms:.0f}ms] @ {sample_rate}Hz")
+        return vocals
+
+    def put(
+        self,
+        fingerprint: str,
+        model_name: str,
+        sample_rate: int,
+        start_ms: float,
+        end_ms: float,
+        vocals: np.ndarray,
+    ) -> None:
+        """
+        Store a stem (float16) and evict least recently used entries over the cap.
+
+        Failures are logged and ignored - the cache is an optimization only.
+
+        Args:
+            fingerprint: audio_fingerprint() of the source file
+            model_name: Separation model name
+            sample_rate: Sample rate the stem was separated at
+            start_ms: Chunk start (milliseconds)
+            end_ms: Chunk end (milliseconds)
+            vocals: Vocals array (channels, samples)
+        """
+        file_name = self.make_key(fingerprint, model_name, sample_rate, start_ms, end_ms) + STEM_FILE_SUFFIX
+        tmp_file = None
+        try:
+            fd, tmp_file = tempfile.mkstemp(dir=self.root_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(vocals, dtype=np.float16))
+            os.replace(tmp_file, self.path(file_name))
+            tmp_file = None
+        except OSError as e:
+            logger.warning(f"Failed to write stem cache entry: {e}")
+            return
+        finally:
+            if tmp_file and os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+        self.add(file_name)
+
+
+_caches: Dict[str, StemCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_stem_cache(config) -> Optional[StemCache]:
+    """
+    Return the shared stem cache for a config.
+
+    Args:
+        config: Config with tmp_root and mdx_stem_cache_mb
+
+    Returns:
+        StemCache under <tmp_root>/stems, or None if disabled (size 0) or no tmp_root
+    """
+    tmp_root = getattr(config, "tmp_root", None)
+    size_mb = getattr(config, "mdx_stem_cache_mb", DEFAULT_STEM_CACHE_MB)
+    if not isinstance(tmp_root, str) or not tmp_root or not isinstance(size_mb, int) or size_mb <= 0:
+        return None
+
+    root_dir = os.path.join(tmp_root, "stems")
+    with _caches_lock:
+        cache = _caches.get(root_dir)
+        if cache is None:
+            try:
+                cache = StemCache(root_dir, size_mb * 1024 * 1024)
+            except OSError as e:
+                logger.warning(f"Stem cache disabled, cannot create {root_dir}: {e}")
+                return None
+            _caches[root_dir] = cache
+        cache.max_bytes = size_mb * 1024 * 1024
+        return cache
@@ -0,0 +1,152 @@
+"""
+Overlap-add stitching of separated vocal chunks.
+
+The scanner separates overlapping chunks around the expected gap. Instead of
+running Demucs over the same audio again to build the vocals preview file,
+the provider collects those chunk stems and stitches them into one track.
+Only regions no chunk covered still need a separation pass.
+
+Chunks are blended with trapezoid weights (linear fade in/out) and the sum is
+normalized by the summed weights, so overlapping chunks crossfade smoothly
+while non-overlapping regions keep their exact amplitude.
+
+NOTE: This module does not import torch.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Floor for chunk-edge weights, so a lone chunk edge is still normalized back to full amplitude
+MIN_EDGE_WEIGHT = 1e-3
+
+
+def _fade_weights(length: int, fade_samples: int) -> np.ndarray:
+    """Trapezoid window: linear ramps of fade_samples at both ends, 1.0 in between."""
+    weights = np.ones(length, dtype=np.float32)
+    fade = min(fade_samples, length // 2)
+    if fade > 0:
+        ramp = np.linspace(MIN_EDGE_WEIGHT, 1.0, fade, endpoint=False, dtype=np.float32)
+        weights[:fade] = ramp
+        weights[length - fade :] = ramp[::-1]
+    return weights
+
+
+def stitch_segments(
+    segments: Sequence[Tuple[int, np.ndarray]], num_samples: int, fade_samples: int, num_channels: int = 2
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Overlap-add separated segments into one track.
+
+    Args:
+        segments: (start_sample, vocals (channels, samples)) pairs, any order
+        num_samples: Length of the output track
+        fade_samples: Crossfade ramp length at each segment edge
+        num_channels: Channel count of the output track
+
+    Returns:
+        Tuple of (float32 track (channels, num_samples), bool coverage mask (num_samples,))
+    """
+    acc = np.zeros((num_channels, num_samples), dtype=np.float32)
+    weight_sum = np.zeros(num_samples, dtype=np.float32)
+
+    for start, vocals in segments:
+        start = int(start)
+        end = min(num_samples, start + vocals.shape[-1])
+        if start < 0 or end <= start:
+            continue
+        weights = _fade_weights(vocals.shape[-1], fade_samples)[: end - start]
+        acc[:, start:end] += vocals[:num_channels, : end - start] * weights
+        weight_sum[start:end] += weights
+
+    covered = weight_sum > 0
+    acc[:, covered] /= weight_sum[covered]
+    return acc, covered
+
+
+def uncovered_ranges(covered: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Find the sample ranges not covered by any segment.
+
+    Args:
+        covered: Bool coverage mask from stitch_segments()
+
+    Returns:
+        (start, end) half-open sample ranges, in order
+    """
+    edges = np.diff(np.concatenate(([1], covered.astype(np.int8), [1])))
+    starts = np.flatnonzero(edges == -1)
+    ends = np.flatnonzero(edges == 1)
+    return [(int(start), int(end)) for start, end in zip(starts, ends)]
+
+
+class StemCollector:
+    """
+    Remembers the chunk stems separated for each audio file during a detection.
+
+    Thread-safe. Stems are held in memory until clear() (the provider clears
+    it when it releases its resources at the end of a detection).
+
+    Example:
+        collector = StemCollector()
+        collector.add(audio_file, 0.0, 12000.0, 44100, vocals)
+        segments, sample_rate = collector.segments(audio_file)
+    """
+
+    def __init__(self):
+        self._stems: Dict[str, Dict[Tuple[int, int], Tuple[int, np.ndarray]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(audio_file: str) -> str:
+        return os.path.normcase(os.path.abspath(audio_file))
+
+    def add(self, audio_file: str, start_ms: float, end_ms: float, sample_rate: int, vocals: np.ndarray) -> None:
+        """
+        Record a separated chunk.
+
+        Args:
+            audio_file: Source audio file
+            start_ms: Chunk start (milliseconds)
+            end_ms: Chunk end (milliseconds)
+            sample_rate: Sample rate of the stem
+            vocals: Vocals array (channels, samples)
+        """
+        with self._lock:
+            stems = self._stems.setdefault(self._key(audio_file), {})
+            stems[(int(round(start_ms)), int(round(end_ms)))] = (sample_rate, vocals)
+
+    def segments(self, audio_file: str) -> Tuple[List[Tuple[int, np.ndarray]], Optional[int]]:
+        """
+        Get the recorded chunks of a file as sample-offset segments.
+
+        Args:
+            audio_file: Source audio file
+
+        Returns:
+            Tuple of ([(start_sample, vocals), ...], sample_rate), or ([], None) if nothing was recorded.
+            If stems were separated at several rates, only the most common rate is returned.
+        """
+        with self._lock:
+            stems = dict(self._stems.get(self._key(audio_file), {}))
+        if not stems:
+            return [], None
+
+        rates = [sample_rate for sample_rate, _ in stems.values()]
+        sample_rate = max(set(rates), key=rates.count)
+        segments = [
+            (int(start_ms / 1000.0 * sample_rate), vocals)
+            for (start_ms, _), (rate, vocals) in sorted(stems.items())
+            if rate == sample_rate
+        ]
+        return segments, sample_rate
+
+    def clear(self) -> None:
+        """Drop all recorded stems."""
+        with self._lock:
+            self._stems.clear()
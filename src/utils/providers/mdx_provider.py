@@ -39,6 +39,8 @@ from utils.providers.mdx.separator import separate_vocals_chunk
 from utils.providers.mdx.detection import detect_onset_in_vocal_chunk
 from utils.providers.mdx.confidence import compute_confidence_score
 from utils.providers.mdx.vocals_cache import VocalsCache
+from utils.providers.mdx.stem_cache import get_stem_cache
+from utils.providers.mdx.stem_stitcher import StemCollector, stitch_segments, uncovered_ranges
 from utils.providers.mdx.audio_compat import load_audio_compat, get_audio_info_compat
 
 # Suppress TorchAudio MP3 warning globally for this module
@@ -76,13 +78,19 @@ class MdxProvider(IDetectionProvider):
         # Parse and validate configuration
         self.mdx_config = MdxConfig.from_config(config)
 
-        # Model loader (lazy loading)
+        # Model loader (lazy loading, shared process-wide via model registry)
         self._model_loader = ModelLoader()
         self._device = self._model_loader.get_device()
 
         # LRU cache for separated vocals (avoid re-separation in compute_confidence)
         self._vocals_cache = VocalsCache()
 
+        # Persistent stem cache (survives provider instances and restarts; None if disabled)
+        self._stem_cache = get_stem_cache(config)
+
+        # Chunk stems separated by the scanner, stitched into the vocals file afterwards
+        self._stem_collector = StemCollector()
+
         logger.debug(
             "MDX provider initialized: chunk=%sms, SNR_threshold=%s, abs_threshold=%s, initial_radius=±%.1fs, "
             "max_expansions=%s, device=%s, fp16=%s",
@@ -99,11 +107,16 @@ class MdxProvider(IDetectionProvider):
         """
         Get Demucs model (lazy loading via ModelLoader).
 
-        Returns cached model or loads new one with optimizations.
+        Returns the process-wide shared model, loading it on first use.
         Thread-safe via ModelLoader's internal lock.
         """
         return self._model_loader.get_model(self._device, self.mdx_config.use_fp16)
 
+    def release_resources(self) -> None:
+        """Return the shared model reference to the registry and drop collected stems."""
+        self._model_loader.release()
+        self._stem_collector.clear()
+
     @staticmethod
     def _raise_if_cancelled(check_cancellation: Optional[Callable[[], bool]]) -> None:
         if check_cancellation and check_cancellation():
@@ -152,6 +165,59 @@ class MdxProvider(IDetectionProvider):
         logger.debug("Separation complete in %.1fs", elapsed)
         return vocals
 
+    def _assemble_vocals(
+        self,
+        audio_file: str,
+        waveform: "torch.Tensor",
+        sample_rate: int,
+        duration: int,
+        track_duration_sec: float,
+        check_cancellation: Optional[Callable[[], bool]] = None,
+    ) -> tuple["torch.Tensor", int]:
+        """
+        Build the vocals track from collected scanner stems plus separation of the gaps.
+
+        Args:
+            audio_file: Source audio file (key of the collected stems)
+            waveform: Stereo waveform, already capped to the vocals file length
+            sample_rate: Sample rate of waveform
+            duration: Requested vocals length in seconds (for logging)
+            track_duration_sec: Full track length in seconds (for logging)
+            check_cancellation: Callback returning True if user cancelled
+
+        Returns:
+            Tuple of (vocals tensor (2, samples), sample rate of the vocals)
+        """
+        segments, stem_rate = self._stem_collector.segments(audio_file)
+        if stem_rate is None:
+            stem_rate = sample_rate
+        num_samples = int(round(waveform.shape[1] * stem_rate / sample_rate))
+        fade_samples = int(self.mdx_config.chunk_overlap_ms / 2000.0 * stem_rate)
+
+        track, covered = stitch_segments(segments, num_samples, fade_samples)
+        gaps = uncovered_ranges(covered)
+        if segments:
+            logger.debug(
+                "Stitched %d scanner chunk(s) into vocals; %d uncovered region(s) left to separate",
+                len(segments),
+                len(gaps),
+            )
+        if not gaps:
+            return torch.from_numpy(track), stem_rate
+
+        if stem_rate != sample_rate:
+            waveform = torchaudio.functional.resample(waveform, sample_rate, stem_rate)
+        for gap_start, gap_end in gaps:
+            self._raise_if_cancelled(check_cancellation)
+            # Extend into covered neighbours so the new segment crossfades with them
+            start = max(0, gap_start - fade_samples)
+            end = min(num_samples, gap_end + fade_samples)
+            vocals = self._run_demucs_separation(waveform[:, start:end], stem_rate, duration, track_duration_sec)
+            segments.append((start, vocals.float().numpy()))
+
+        track, _ = stitch_segments(segments, num_samples, fade_samples)
+        return torch.from_numpy(track), stem_rate
+
     @staticmethod
     def _save_vocals_file(destination_vocals_filepath: str, vocals: "torch.Tensor", sample_rate: int) -> None:
         logger.debug("Saving vocals to: %s", destination_vocals_filepath)
@@ -200,11 +266,15 @@ class MdxProvider(IDetectionProvider):
         For preview/final vocals, this creates a full-quality separated vocal file.
         Uses Demucs 'htdemucs' model for high-quality separation.
 
+        Chunks already separated by detect_silence_periods() are stitched in
+        (overlap-add) instead of being separated again; Demucs only runs on the
+        regions the scanner did not cover.
+
         Args:
             audio_file: Absolute path to input audio
             temp_root: Root directory for temporary files
             destination_vocals_filepath: Target path for vocals file
-            duration: Track duration in seconds (not used - separates full track)
+            duration: Length of the vocals file in seconds (0 or beyond track end: full track)
             overwrite: If True, regenerate even if destination exists
             check_cancellation: Callback returning True if user cancelled
 
@@ -227,7 +297,9 @@ class MdxProvider(IDetectionProvider):
                     waveform, track_duration_sec = self._cap_waveform_duration(waveform, sample_rate, duration)
                     self._raise_if_cancelled(check_cancellation)
 
-                    vocals = self._run_demucs_separation(waveform, sample_rate, duration, track_duration_sec)
+                    vocals, sample_rate = self._assemble_vocals(
+                        audio_file, waveform, sample_rate, duration, track_duration_sec, check_cancellation
+                    )
                     self._raise_if_cancelled(check_cancellation)
 
                     self._save_vocals_file(destination_vocals_filepath, vocals, sample_rate)
@@ -269,6 +341,7 @@ class MdxProvider(IDetectionProvider):
             - cuDNN benchmark mode for optimal convolution
             - CPU thread optimization (uses N-1 cores)
             - Vocals caching to reuse in compute_confidence()
+            - Persistent stem cache: re-detection skips Demucs for known chunks
             - Optional downsampling to 32kHz for CPU speedup
             - Tuned parameters: 20ms hop, 300ms min duration
 
@@ -411,6 +484,8 @@ class MdxProvider(IDetectionProvider):
             vocals_cache=self._vocals_cache,
             total_duration_ms=total_duration_ms,
             check_cancellation=check_cancellation,
+            stem_cache=self._stem_cache,
+            stem_collector=self._stem_collector,
         )
 
     def _separate_vocals_chunk(
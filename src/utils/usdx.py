@@ -1,6 +1,6 @@
 import logging
 from typing import List
-from model.usdx_file import Note
+from model.usdx_file import Note, NoteArray
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +70,9 @@ def get_syllable(notes: List[Note], position_ms: int, bpm: float, gap: int, is_r
     # Convert the current position in milliseconds to beats
     position_beats = (position_ms - gap) * beats_per_ms if not is_relative else (position_ms * beats_per_ms)
 
+    if isinstance(notes, NoteArray):
+        return notes.syllable_at(position_beats)
+
     for note in notes:
         # Guard against malformed notes
         if note.StartBeat is None or note.Length is None:
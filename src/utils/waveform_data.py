@@ -0,0 +1,179 @@
+"""
+Compact binary container for waveform peaks.
+
+Replaces the indented waveform JSON as the stored format: a small versioned
+header, a level table and the min/max/RMS arrays of every pyramid level as
+raw little-endian float16 (or int16) values. Reading maps the file and views
+the arrays in place, so loading peaks costs a header parse instead of text
+parsing and list building.
+
+Layout (all little-endian):
+    header   "<4sHHIIQI"  magic, format version, sample format, sample rate,
+                          bin samples, decoded samples, level count
+    table    "<QQ" x levels  byte offset and bin count of each level
+    levels   bins x 3 (min, max, rms) values per level, 16-byte aligned
+"""
+
+import logging
+import os
+import struct
+import tempfile
+from typing import Callable, Optional
+
+import numpy as np
+
+from utils.waveform_peaks import WaveformPeaks, decode_peaks
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"UGWF"
+# Bump when the layout changes; readers reject other versions
+FORMAT_VERSION = 1
+WAVEFORM_DATA_EXTENSION = ".peaks"
+
+# Sample format codes stored in the header
+FLOAT16 = 1
+INT16 = 2
+_DTYPES = {FLOAT16: np.dtype("<f2"), INT16: np.dtype("<i2")}
+_FORMAT_CODES = {"float16": FLOAT16, "int16": INT16}
+_INT16_SCALE = 32767.0
+
+_HEADER = struct.Struct("<4sHHIIQI")
+_LEVEL = struct.Struct("<QQ")
+_ALIGNMENT = 16
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_waveform_data(path: str, peaks: WaveformPeaks, sample_format: str = "float16") -> str:
+    """
+    Write peaks (all pyramid levels) to a waveform data file, atomically.
+
+    Args:
+        path: Output file path
+        peaks: WaveformPeaks to store
+        sample_format: "float16" (default) or "int16" (values scaled by 32767)
+
+    Returns:
+        str: Path of the written file
+
+    Raises:
+        ValueError: If the sample format is unknown
+    """
+    format_code = _FORMAT_CODES.get(sample_format)
+    if format_code is None:
+        raise ValueError(f"Unknown waveform sample format: {sample_format}")
+    dtype = _DTYPES[format_code]
+
+    arrays = []
+    for level in peaks.levels:
+        values = np.asarray(level, dtype=np.float32)
+        if format_code == INT16:
+            values = np.round(np.clip(values, -1.0, 1.0) * _INT16_SCALE)
+        arrays.append(np.ascontiguousarray(values, dtype=dtype))
+
+    offset = _align(_HEADER.size + _LEVEL.size * len(arrays))
+    table = []
+    for array in arrays:
+        table.append((offset, len(array)))
+        offset = _align(offset + array.nbytes)
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # Unique temp file per writer: two workers may store peaks of the same audio at once
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    MAGIC,
+                    FORMAT_VERSION,
+                    format_code,
+                    peaks.sample_rate,
+                    peaks.bin_samples,
+                    peaks.num_samples,
+                    len(arrays),
+                )
+            )
+            for entry in table:
+                f.write(_LEVEL.pack(*entry))
+            for (level_offset, _), array in zip(table, arrays):
+                f.write(b"\0" * (level_offset - f.tell()))
+                f.write(array.tobytes())
+        os.replace(tmp_path, path)
+        tmp_path = None
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def read_waveform_data(path: str, memory_map: bool = True) -> Optional[WaveformPeaks]:
+    """
+    Read a waveform data file written by write_waveform_data.
+
+    Args:
+        path: Waveform data file
+        memory_map: View float16 levels in a read-only memory map instead of
+            reading the file (int16 levels are always converted to float32)
+
+    Returns:
+        WaveformPeaks, or None if the file is missing, of another version or damaged
+    """
+    try:
+        with open(path, "rb") as f:
+            magic, version, format_code, sample_rate, bin_size, num_samples, level_count = _HEADER.unpack(
+                f.read(_HEADER.size)
+            )
+            if magic != MAGIC or version != FORMAT_VERSION or format_code not in _DTYPES:
+                raise ValueError(f"unsupported header (version {version}, format {format_code})")
+            table = [_LEVEL.unpack(f.read(_LEVEL.size)) for _ in range(level_count)]
+            if memory_map and format_code == FLOAT16:
+                buffer = np.memmap(path, dtype=np.uint8, mode="r")
+            else:
+                f.seek(0)
+                buffer = np.frombuffer(f.read(), dtype=np.uint8)
+    except FileNotFoundError:
+        return None
+    except (OSError, struct.error, ValueError) as e:
+        logger.debug(f"Ignoring unreadable waveform data file {path}: {e}")
+        return None
+
+    dtype = _DTYPES[format_code]
+    levels = []
+    for offset, bins in table:
+        end = offset + bins * 3 * dtype.itemsize
+        if end > len(buffer):
+            logger.debug(f"Ignoring truncated waveform data file {path}")
+            return None
+        level = buffer[offset:end].view(dtype).reshape(bins, 3)
+        if format_code == INT16:
+            level = level.astype(np.float32) / _INT16_SCALE
+        levels.append(level)
+    return WaveformPeaks(sample_rate, bin_size, num_samples, levels)
+
+
+def build_waveform_data(
+    audio_file: str,
+    output_file: Optional[str] = None,
+    check_cancellation: Optional[Callable[[], bool]] = None,
+) -> str:
+    """
+    Decode an audio file once and write its peaks as a waveform data file.
+
+    Args:
+        audio_file: Path to input audio file
+        output_file: Output path (defaults to <audio name>_waveform.peaks next to the audio)
+        check_cancellation: Optional cancellation check callback
+
+    Returns:
+        Path to generated waveform data file
+    """
+    if output_file is None:
+        output_file = f"{os.path.splitext(audio_file)[0]}_waveform{WAVEFORM_DATA_EXTENSION}"
+    peaks = decode_peaks(audio_file, check_cancellation)
+    write_waveform_data(output_file, peaks)
+    logger.debug(f"Waveform data created: {output_file}")
+    return output_file
@@ -0,0 +1,391 @@
+"""
+Waveform peaks: decoded once, cached as a multi-resolution pyramid.
+
+An audio file is decoded in a single ffmpeg pass (mono, PEAKS_SAMPLE_RATE)
+and reduced to min/max/RMS bins of BASE_BIN_SAMPLES samples with vectorized
+NumPy while the PCM stream is read. Coarser levels halve the bin count until
+a level has at most MIN_LEVEL_BINS bins (a mipmap), so any widget width or
+zoom range is served by reducing the nearest level instead of the samples.
+
+Peaks are kept in a small in-memory LRU and persisted per audio fingerprint
+under <cache dir>/peaks in the binary container of utils.waveform_data
+(memory-mapped on load), so showing a waveform again never runs ffmpeg. The
+folder is capped at PEAKS_CACHE_MAX_MB; peaks of the least recently shown
+audio are evicted first.
+"""
+
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.lru_file_store import LruFileStore
+
+logger = logging.getLogger(__name__)
+
+# Decode rate; waveforms never need more than ~11 ms per bin
+PEAKS_SAMPLE_RATE = 22050
+BASE_BIN_SAMPLES = 256
+# Coarsest level still holds this many bins (well below any widget width)
+MIN_LEVEL_BINS = 256
+PEAKS_DIR_NAME = "peaks"
+# Peaks of recently shown songs kept in memory (audio and vocals per song)
+MEMORY_CACHE_ENTRIES = 8
+# Size cap of the peaks folder (a 4 minute song takes about 250 KB)
+PEAKS_CACHE_MAX_MB = 256
+
+# PCM bytes read per chunk from ffmpeg (int16 mono, a multiple of the bin size)
+_READ_CHUNK_BYTES = BASE_BIN_SAMPLES * 2 * 1024
+
+
+@dataclass
+class WaveformPeaks:
+    """
+    Min/max/RMS pyramid of one audio file.
+
+    Attributes:
+        sample_rate: Sample rate the bins were computed at
+        bin_samples: Samples per bin of level 0
+        num_samples: Decoded length in samples
+        levels: Arrays of shape (bins, 3) with min, max, RMS columns (float32,
+            or float16 views of a memory-mapped peaks file); level k holds
+            bins of bin_samples * 2**k samples
+    """
+
+    sample_rate: int
+    bin_samples: int
+    num_samples: int
+    levels: List[np.ndarray]
+
+    @property
+    def duration_ms(self) -> float:
+        """Decoded duration in milliseconds."""
+        return self.num_samples * 1000.0 / self.sample_rate if self.sample_rate else 0.0
+
+    def columns(
+        self, width: int, start_ms: float = 0.0, end_ms: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Min, max and RMS per pixel column for a time range.
+
+        Args:
+            width: Number of columns
+            start_ms: Range start in milliseconds
+            end_ms: Range end in milliseconds (default: end of audio)
+
+        Returns:
+            (minimum, maximum, rms) float32 arrays of length width (zeros outside the audio)
+        """
+        width = max(1, int(width))
+        end_ms = self.duration_ms if end_ms is None else end_ms
+        zeros = np.zeros(width, dtype=np.float32)
+        if not self.levels or end_ms <= start_ms:
+            return zeros, zeros.copy(), zeros.copy()
+
+        # Coarsest level whose bins are still no wider than one column
+        samples_per_column = (end_ms - start_ms) * self.sample_rate / 1000.0 / width
+        level_index = 0
+        while level_index + 1 < len(self.levels) and self.bin_samples << (level_index + 1) <= samples_per_column:
+            level_index += 1
+        level = self.levels[level_index]
+        bin_ms = (self.bin_samples << level_index) * 1000.0 / self.sample_rate
+
+        # Bin range of every column (at least one bin per column, clipped to the audio)
+        edges = np.linspace(start_ms / bin_ms, end_ms / bin_ms, width + 1)
+        first = np.floor(edges[:-1]).astype(np.int64)
+        last = np.maximum(first + 1, np.ceil(edges[1:]).astype(np.int64))
+        inside = (first >= 0) & (first < len(level))
+        if not inside.any():
+            return zeros, zeros.copy(), zeros.copy()
+        first, last = first[inside], np.minimum(last[inside], len(level))
+
+        # reduceat over [first[i], first[i+1]); columns sharing a bin repeat it
+        lo = int(first[0])
+        view = np.asarray(level[lo : int(last[-1])], dtype=np.float32)
+        starts = first - lo
+        minimum, maximum, rms = zeros.copy(), zeros.copy(), zeros.copy()
+        minimum[inside] = np.minimum.reduceat(view[:, 0], starts)
+        maximum[inside] = np.maximum.reduceat(view[:, 1], starts)
+        squares = np.add.reduceat(view[:, 2] ** 2, starts)
+        spans = np.maximum(np.diff(np.append(starts, len(view))), 1)
+        rms[inside] = np.sqrt(squares / spans)
+        return minimum, maximum, rms
+
+
+def bin_samples(samples: np.ndarray, bin_size: int = BASE_BIN_SAMPLES) -> np.ndarray:
+    """
+    Reduce mono float samples to (bins, 3) min/max/RMS rows (last bin may be partial).
+
+    Args:
+        samples: 1-D float array
+        bin_size: Samples per bin
+
+    Returns:
+        float32 array of shape (ceil(len / bin_size), 3)
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    full = len(samples) // bin_size
+    rows = []
+    if full:
+        blocks = samples[: full * bin_size].reshape(full, bin_size)
+        rows.append(
+            np.stack([blocks.min(axis=1), blocks.max(axis=1), np.sqrt(np.mean(blocks * blocks, axis=1))], axis=1)
+        )
+    tail = samples[full * bin_size :]
+    if len(tail):
+        rows.append(np.array([[tail.min(), tail.max(), np.sqrt(np.mean(tail * tail))]], dtype=np.float32))
+    if not rows:
+        return np.zeros((0, 3), dtype=np.float32)
+    return np.concatenate(rows).astype(np.float32, copy=False)
+
+
+def build_mipmaps(base: np.ndarray, min_bins: int = MIN_LEVEL_BINS) -> List[np.ndarray]:
+    """
+    Build the level pyramid from level-0 bins by merging bin pairs.
+
+    Args:
+        base: (bins, 3) min/max/RMS rows
+        min_bins: Stop once a level has at most this many bins
+
+    Returns:
+        List of levels, finest first
+    """
+    levels = [base]
+    while len(levels[-1]) > min_bins:
+        level = levels[-1]
+        if len(level) % 2:
+            level = np.concatenate([level, level[-1:]])
+        even, odd = level[0::2], level[1::2]
+        levels.append(
+            np.stack(
+                [
+                    np.minimum(even[:, 0], odd[:, 0]),
+                    np.maximum(even[:, 1], odd[:, 1]),
+                    np.sqrt((even[:, 2] ** 2 + odd[:, 2] ** 2) / 2),
+                ],
+                axis=1,
+            )
+        )
+    return levels
+
+
+def compute_peaks(samples: np.ndarray, sample_rate: int, bin_size: int = BASE_BIN_SAMPLES) -> WaveformPeaks:
+    """Build the peaks pyramid of an in-memory mono signal."""
+    return WaveformPeaks(sample_rate, bin_size, len(samples), build_mipmaps(bin_samples(samples, bin_size)))
+
+
+def decode_peaks(audio_file: str, check_cancellation: Optional[Callable[[], bool]] = None) -> WaveformPeaks:
+    """
+    Decode an audio file once with ffmpeg and bin it while streaming.
+
+    Args:
+        audio_file: Path to audio file
+        check_cancellation: Optional callback returning True to abort
+
+    Returns:
+        WaveformPeaks
+
+    Raises:
+        FileNotFoundError: If the audio file does not exist
+        Exception: If ffmpeg fails or the operation is cancelled
+    """
+    if not os.path.exists(audio_file):
+        raise FileNotFoundError(f"Audio file not found: {audio_file}")
+
+    command = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-i",
+        audio_file,
+        "-f",
+        "s16le",
+        "-acodec",
+        "pcm_s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(PEAKS_SAMPLE_RATE),
+        "-",
+    ]
+    popen_kwargs = {"stdout": subprocess.PIPE, "stderr": subprocess.PIPE}
+    if platform.system() == "Windows":
+        popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+    try:
+        process = subprocess.Popen(command, **popen_kwargs)
+    except OSError as e:
+        raise Exception(f"Failed to execute ffmpeg (is it installed?): {e}") from e
+
+    # stderr is drained in the background so a chatty ffmpeg cannot block on a full pipe
+    stderr_chunks: List[bytes] = []
+    stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+    stderr_thread.start()
+
+    bins, pending, num_samples = [], b"", 0
+    try:
+        while True:
+            if check_cancellation and check_cancellation():
+                raise Exception("Operation cancelled")
+            chunk = process.stdout.read(_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            data = pending + chunk
+            usable = len(data) - len(data) % (BASE_BIN_SAMPLES * 2)
+            pending = data[usable:]
+            if usable:
+                samples = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+                bins.append(bin_samples(samples))
+                num_samples += len(samples)
+        if len(pending) >= 2:
+            samples = np.frombuffer(pending[: len(pending) - len(pending) % 2], dtype="<i2").astype(np.float32)
+            bins.append(bin_samples(samples / 32768.0))
+            num_samples += len(samples)
+        returncode = process.wait()
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        stderr_thread.join(timeout=1)
+
+    if returncode != 0:
+        message = b"".join(stderr_chunks).decode("utf-8", errors="ignore").strip() or "Unknown error"
+        raise Exception(f"ffmpeg failed with exit code {returncode}: {message}")
+
+    base = np.concatenate(bins) if bins else np.zeros((0, 3), dtype=np.float32)
+    return WaveformPeaks(PEAKS_SAMPLE_RATE, BASE_BIN_SAMPLES, num_samples, build_mipmaps(base))
+
+
+def save_peaks(path: str, peaks: WaveformPeaks) -> None:
+    """Write a peaks file (all levels, float16 waveform data container)."""
+    from utils.waveform_data import write_waveform_data
+
+    write_waveform_data(path, peaks)
+
+
+def load_peaks(path: str) -> Optional[WaveformPeaks]:
+    """Memory-map a peaks file written by save_peaks (None if missing or unreadable)."""
+    from utils.waveform_data import read_waveform_data
+
+    return read_waveform_data(path)
+
+
+def peaks_cache_path(audio_file: str) -> Optional[str]:
+    """Peaks file of an audio file (keyed by content fingerprint), or None if it cannot be fingerprinted."""
+    from common.database import get_cache_dir
+    from utils.providers.mdx.stem_cache import audio_fingerprint
+
+    fingerprint = audio_fingerprint(audio_file)
+    if fingerprint is None:
+        return None
+    from utils.waveform_data import WAVEFORM_DATA_EXTENSION
+
+    return os.path.join(get_cache_dir(), PEAKS_DIR_NAME, f"{fingerprint}{WAVEFORM_DATA_EXTENSION}")
+
+
+_memory_cache: "OrderedDict[tuple, WaveformPeaks]" = OrderedDict()
+_memory_lock = threading.Lock()
+_store: Optional[LruFileStore] = None
+_store_lock = threading.Lock()
+
+
+def _peaks_store(path: str) -> Optional[LruFileStore]:
+    """Size-capped store of the folder holding a peaks file (None if it cannot be created)."""
+    global _store
+    from utils.waveform_data import WAVEFORM_DATA_EXTENSION
+
+    root_dir = os.path.dirname(path)
+    with _store_lock:
+        if _store is None or _store.root_dir != root_dir:
+            try:
+                _store = LruFileStore(root_dir, PEAKS_CACHE_MAX_MB * 1024 * 1024, WAVEFORM_DATA_EXTENSION)
+            except OSError as e:
+                logger.warning(f"Peaks cache disabled, cannot create {root_dir}: {e}")
+                return None
+        return _store
+
+
+def clear_peaks_cache() -> None:
+    """Delete the peaks folder and forget the peaks held in memory."""
+    global _store
+    from common.database import get_cache_dir
+
+    with _store_lock:
+        _store = None
+    with _memory_lock:
+        _memory_cache.clear()
+    shutil.rmtree(os.path.join(get_cache_dir(), PEAKS_DIR_NAME), ignore_errors=True)
+
+
+def _memory_key(audio_file: str) -> Optional[tuple]:
+    try:
+        stat_result = os.stat(audio_file)
+    except OSError:
+        return None
+    return (os.path.normcase(os.path.abspath(audio_file)), stat_result.st_size, stat_result.st_mtime_ns)
+
+
+def cached_peaks(audio_file: str) -> Optional[WaveformPeaks]:
+    """Peaks of an audio file if they are in memory (a single stat, safe on the UI thread)."""
+    memory_key = _memory_key(audio_file)
+    if memory_key is None:
+        return None
+    with _memory_lock:
+        peaks = _memory_cache.get(memory_key)
+        if peaks is not None:
+            _memory_cache.move_to_end(memory_key)
+        return peaks
+
+
+def has_cached_peaks(audio_file: str) -> bool:
+    """True if peaks of the audio file are in memory or in the peaks cache folder."""
+    if cached_peaks(audio_file) is not None:
+        return True
+    path = peaks_cache_path(audio_file)
+    return bool(path) and os.path.exists(path)
+
+
+def get_peaks(audio_file: str, check_cancellation: Optional[Callable[[], bool]] = None) -> WaveformPeaks:
+    """
+    Peaks of an audio file from memory, the peaks file, or one decode (which is then persisted).
+
+    Args:
+        audio_file: Path to audio file
+        check_cancellation: Optional callback returning True to abort decoding
+
+    Returns:
+        WaveformPeaks
+    """
+    memory_key = _memory_key(audio_file)
+    if memory_key is None:
+        raise FileNotFoundError(f"Audio file not found: {audio_file}")
+    peaks = cached_peaks(audio_file)
+    if peaks is not None:
+        return peaks
+
+    path = peaks_cache_path(audio_file)
+    peaks = load_peaks(path) if path else None
+    store = _peaks_store(path) if path else None
+    if peaks is not None and store is not None:
+        store.touch(os.path.basename(path))
+    elif peaks is None:
+        peaks = decode_peaks(audio_file, check_cancellation)
+        if path:
+            try:
+                save_peaks(path, peaks)
+                if store is not None:
+                    store.add(os.path.basename(path))
+            except OSError as e:
+                logger.warning(f"Failed to write peaks file {path}: {e}")
+
+    with _memory_lock:
+        _memory_cache[memory_key] = peaks
+        while len(_memory_cache) > MEMORY_CACHE_ENTRIES:
+            _memory_cache.popitem(last=False)
+    return peaks
@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Tuple, Optional
 from PySide6.QtCore import Signal
 from common.config import Config
@@ -7,7 +8,10 @@ from managers.worker_queue_manager import IWorker, IWorkerSignals
 import utils.audio as audio
 import utils.usdx as usdx
 import utils.detect_gap as detect_gap
+import utils.files as files
 from utils.detect_gap import DetectGapOptions
+from utils.gap_detection import result_cache
+from utils.gap_detection.engine import get_detection_engine, get_detection_worker_count
 
 import logging
 
@@ -64,6 +68,10 @@ class GapDetectionResult:
         self.detected_gap_ms: Optional[float] = None
 
 
+# WorkerQueueManager pool lane used when the multi-process detection engine is enabled
+DETECTION_POOL_LANE = "detection"
+
+
 class WorkerSignals(IWorkerSignals):
     finished = Signal(GapDetectionResult)
 
@@ -75,6 +83,9 @@ class DetectGapWorker(IWorker):
         self.options = options
         self._isCancelled = False
         self.description = f"Detecting gap in {options.audio_file}."
+        if get_detection_worker_count(options.config) > 1:
+            # Multi-process engine: run alongside other detections instead of one at a time
+            self.pool_lane = DETECTION_POOL_LANE
 
     async def run(self):
         result = GapDetectionResult(self.options.txt_file)
@@ -95,8 +106,19 @@ class DetectGapWorker(IWorker):
                 config=self.options.config,  # Pass config for provider selection
             )
 
-            # Perform gap detection
-            detection_result = detect_gap.perform(detect_options, self.is_cancelled)
+            # Unchanged (or duplicated) audio with unchanged detector settings reuses the stored result
+            result_key, detection_result = await asyncio.to_thread(self._load_memoized_result)
+
+            if detection_result is None:
+                # Perform gap detection (worker process pool if configured, else a thread so the
+                # asyncio loop keeps serving other tasks)
+                engine = get_detection_engine(self.options.config)
+                if engine is not None:
+                    detection_result = await engine.detect(detect_options, self.is_cancelled)
+                else:
+                    detection_result = await asyncio.to_thread(detect_gap.perform, detect_options, self.is_cancelled)
+                if result_key is not None:
+                    await asyncio.to_thread(result_cache.store_detection_result, result_key, detection_result)
 
             # Fix gap based on the song's BPM and other factors
             start_beat = None
@@ -158,3 +180,22 @@ class DetectGapWorker(IWorker):
 
             # We should still emit the result
             self.signals.finished.emit(result)
+
+    def _load_memoized_result(self):
+        """Return (memo key, stored detection result or None); the key is None if results are not memoized.
+
+        With overwrite set the stored result is ignored, but the key is still returned so the fresh result replaces it.
+        """
+        result_key = result_cache.detection_result_key(
+            self.options.audio_file, self.options.original_gap, self.options.config
+        )
+        if result_key is None:
+            return None, None
+        if self.options.overwrite:
+            # Explicit re-detection: run the detector and replace the stored result
+            return result_key, None
+        vocals_file = files.get_vocals_path(files.get_tmp_path(self.options.tmp_path, self.options.audio_file))
+        detection_result = result_cache.load_detection_result(result_key, vocals_file)
+        if detection_result is not None:
+            logger.info(f"Reusing stored detection result for '{self.options.audio_file}'")
+        return result_key, detection_result
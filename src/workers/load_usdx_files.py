@@ -1,21 +1,28 @@
 import os
 import logging
 import time
-import datetime
 import asyncio
 import threading
+from collections import Counter, deque
+from concurrent.futures import Future
 from typing import AsyncGenerator, Optional, Tuple
 from PySide6.QtCore import Signal
-from model.song import Song
+from model.song import Song, SongStatus
 from services.song_service import SongService
+from services.library_scanner import DEFAULT_SCAN_WORKERS, CoroutinePool, DirectoryJournal, walk_directory_tree
 from managers.worker_queue_manager import IWorker, IWorkerSignals
 from common.database import (
     cleanup_stale_entries,
     stream_cache_entries,
     normalize_cache_key,
+    get_cache_file_stats,
     get_cache_entry,
+    is_cache_entry_fresh,
     get_all_cache_entries,  # noqa: F401 - Backward compatibility for tests that patch symbol
     deserialize_cache_blob,
+    flush_cache_writes,
+    get_scan_journal,
+    replace_scan_journal,
 )
 
 logger = logging.getLogger(__name__)
@@ -38,12 +45,21 @@ class LoadUsdxFilesWorker(IWorker):
         self.description = f"Preparing to scan {directory}"
         self.path_usdb_id_map = {}
         self.loaded_paths = set()  # Track files we've loaded to detect stale cache entries
+        self.cached_file_stats = {}  # Normalized path -> CacheFileStat, for stat-only freshness checks
         self.reload_single_file = None  # Path to single file to reload (when used for reload)
         self.song_service = SongService()  # Create song service
         self._cache_loaded_count = 0
 
         # Batching for performance - use config or default to 50
         self.batch_size = config.song_list_batch_size if config else 50
+        scan_workers = getattr(config, "scan_workers", DEFAULT_SCAN_WORKERS) if config else DEFAULT_SCAN_WORKERS
+        self.scan_workers = max(1, scan_workers) if isinstance(scan_workers, int) else DEFAULT_SCAN_WORKERS
+        # Skip unchanged song folders using the directory journal of the previous scan
+        incremental_scan = getattr(config, "incremental_scan", False) if config else False
+        self.incremental_scan = incremental_scan if isinstance(incremental_scan, bool) else False
+        self._journal: Optional[DirectoryJournal] = None
+        # Cache keys of songs already shown from the library snapshot (not re-emitted from the cache)
+        self.snapshot_keys: set[str] = set()
         self._pending_scan_batch: list[Song] = []
         self._ttfb_start = 0.0  # Track time to first batch
         self._ttfb_logged = False
@@ -140,8 +156,9 @@ class LoadUsdxFilesWorker(IWorker):
 
         try:
             # Use the service to load the song with proper argument order:
-            # load_song(txt_file, force_reload, cancel_check)
-            song = await self.song_service.load_song(txt_file_path, force_reload, self.is_cancelled)
+            # load_song(txt_file, force_reload, cancel_check); the list only needs the tags,
+            # notes are loaded on demand (like for cached songs)
+            song = await self.song_service.load_song(txt_file_path, force_reload, self.is_cancelled, headers_only=True)
             song.usdb_id = self.path_usdb_id_map.get(song.path, None)
             return song
 
@@ -161,6 +178,10 @@ class LoadUsdxFilesWorker(IWorker):
         self.description = "Loading songs from cache"
         logger.info("Loading songs from cache for directory: %s", self.directory)
 
+        if self.snapshot_keys:
+            await self._load_cache_outside_snapshot()
+            return
+
         # Use SQL-side filtering for massive performance boost
         loaded = 0
         # Stream with directory filter (rowid-based pagination, SQL LIKE pre-filter)
@@ -196,12 +217,48 @@ class LoadUsdxFilesWorker(IWorker):
         # Track how many songs we loaded from cache for cleanup logic
         self._cache_loaded_count = loaded
 
+        # Fingerprints for the rescan: one index-only query instead of a cache read per file
+        self.cached_file_stats = get_cache_file_stats(directory_filter=self.directory)
+
         elapsed_ms = (time.time() - start_time) * 1000
         logger.info("Loaded %s cached songs in %.1f ms", loaded, elapsed_ms)
 
         # Flush any remaining songs in batch
         await self._emit_batch(page_songs)
 
+    async def _load_cache_outside_snapshot(self):
+        """Cache pass when the list was populated from the library snapshot.
+
+        Only reads the cache index; song blobs are decoded just for entries the
+        snapshot does not contain (songs cached after it was written).
+        """
+        start_time = time.time()
+        self.cached_file_stats = get_cache_file_stats(directory_filter=self.directory)
+        self.loaded_paths.update(self.cached_file_stats)
+        self._cache_loaded_count = len(self.cached_file_stats)
+
+        page_songs: list[Song] = []
+        for key in self.cached_file_stats.keys() - self.snapshot_keys:
+            if self.is_cancelled():
+                break
+            await self._maybe_yield()
+            song = get_cache_entry(key)
+            if not isinstance(song, Song) or not getattr(song, "path", None):
+                continue
+            song.usdb_id = self.path_usdb_id_map.get(song.path, None)
+            page_songs.append(song)
+            if len(page_songs) >= self.batch_size:
+                await self._emit_batch(page_songs)
+        await self._emit_batch(page_songs)
+
+        elapsed_ms = (time.time() - start_time) * 1000
+        logger.info(
+            "Cache index of %s songs checked in %.1f ms (%s shown from snapshot)",
+            self._cache_loaded_count,
+            elapsed_ms,
+            len(self.snapshot_keys),
+        )
+
     async def _async_os_walk(self, directory: str) -> AsyncGenerator[Tuple[str, list[str], list[str]], None]:
         """Stream os.walk results from a background thread without blocking the event loop."""
 
@@ -211,7 +268,7 @@ class LoadUsdxFilesWorker(IWorker):
 
         def _walker():
             try:
-                for root, dirs, files in os.walk(directory):
+                for root, dirs, files in walk_directory_tree(directory, self.scan_workers, stop_event, self._journal):
                     if stop_event.is_set():
                         break
                     loop.call_soon_threadsafe(queue.put_nowait, (root, dirs, files))
@@ -233,10 +290,26 @@ class LoadUsdxFilesWorker(IWorker):
         finally:
             stop_event.set()
 
+    def _create_journal(self) -> DirectoryJournal:
+        """Directory journal of the previous scan, checked against the songs loaded from cache."""
+        cached_song_counts = Counter(path.rpartition("/")[0] for path in self.cached_file_stats)
+        return DirectoryJournal(
+            get_scan_journal(directory_filter=self.directory),
+            cached_song_counts,
+            lambda name: name.endswith(".txt") and not self._is_system_file(name),
+        )
+
     async def scan_directory(self):
-        """Scan directory for new or changed songs and USDB metadata."""
+        """Scan directory for new or changed songs and USDB metadata.
+
+        The tree is listed by a parallel scandir walker and txt files are loaded
+        on a pool of scan_workers threads. Results are emitted in walk order.
+        With incremental_scan, song folders the directory journal reports as
+        unchanged are not listed; the journal is rewritten after a complete scan.
+        """
         self.description = "Scanning directory for new/changed songs"
         logger.info("Scanning directory %s for songs and USDB metadata", self.directory)
+        self._journal = self._create_journal() if self.incremental_scan else None
 
         # Throttling: only emit progress every N files or every X seconds
         file_count = 0
@@ -245,28 +318,57 @@ class LoadUsdxFilesWorker(IWorker):
         PROGRESS_FILE_INTERVAL = self.batch_size  # Emit progress aligned with batch size
         PROGRESS_TIME_INTERVAL = 0.3  # Or every 300ms
 
-        async for root, dirs, files in self._async_os_walk(self.directory):
-            self.description = f"Searching for updates in {root}"
-            if await self._handle_scan_cancellation():
-                return
-
-            await self._maybe_yield()
-            self._extract_usdb_metadata(root, files)
-
-            file_count, last_progress_time, cancelled = await self._process_directory_files(
-                root,
-                files,
-                file_count,
-                last_progress_time,
-                PROGRESS_FILE_INTERVAL,
-                PROGRESS_TIME_INTERVAL,
+        # (normalized path, was cached, future) in submission order
+        in_flight: deque[tuple[str, bool, Future]] = deque()
+        max_in_flight = self.scan_workers * 4
+        pool = CoroutinePool(self.scan_workers, thread_name_prefix="LoadUsdxFilesScan")
+        try:
+            async for root, dirs, files in self._async_os_walk(self.directory):
+                self.description = f"Searching for updates in {root}"
+                if await self._handle_scan_cancellation():
+                    return
+
+                await self._maybe_yield()
+                # USDB ids of a folder must be known before its songs are loaded
+                self._extract_usdb_metadata(root, files)
+
+                for file in files:
+                    # Skip system/metadata files (macOS, Windows, Linux)
+                    if self._is_system_file(file) or not file.endswith(".txt"):
+                        continue
+                    song_path = os.path.join(root, file)
+                    normalized_path = normalize_cache_key(song_path).lower()
+                    cached = normalized_path in self.loaded_paths
+                    in_flight.append((normalized_path, cached, pool.submit(self._scan_song, song_path, cached)))
+
+                    if len(in_flight) >= max_in_flight or in_flight[0][2].done():
+                        completed = await self._emit_scanned_songs(in_flight, max_in_flight - 1)
+                        file_count, last_progress_time = self._count_scanned_files(
+                            completed, file_count, last_progress_time, PROGRESS_FILE_INTERVAL, PROGRESS_TIME_INTERVAL
+                        )
+                    if await self._handle_scan_cancellation():
+                        return
+
+            completed = await self._emit_scanned_songs(in_flight, 0)
+            self._count_scanned_files(
+                completed, file_count, last_progress_time, PROGRESS_FILE_INTERVAL, PROGRESS_TIME_INTERVAL
             )
+        finally:
+            cancelled = self.is_cancelled()
+            # Waits for in-flight song loads; off the loop so other queued coroutines keep running
+            await asyncio.to_thread(pool.shutdown, cancel_pending=cancelled)
             if cancelled:
-                return
+                # Keep what already finished loading; queued files were dropped
+                await self._emit_scanned_songs(in_flight, 0, done_only=True)
+                await self._flush_scan_batch()
 
         # Flush any remaining songs in batch
         await self._flush_scan_batch()
 
+        if self._journal is not None and not self.is_cancelled():
+            replace_scan_journal(self.directory, self._journal.entries)
+            logger.info("Skipped %s unchanged song folders", len(self._journal.skipped))
+
         # Log USDB IDs found during scan
         if self.path_usdb_id_map:
             logger.info("Found %s USDB metadata files", len(self.path_usdb_id_map))
@@ -296,72 +398,72 @@ class LoadUsdxFilesWorker(IWorker):
                 logger.warning("Failed to parse .usdb file %s: %s", usdb_file_path, e)
             break
 
-    async def _process_directory_files(
-        self,
-        root: str,
-        files: list[str],
-        file_count: int,
-        last_progress_time: float,
-        file_interval: int,
-        time_interval: float,
-    ) -> tuple[int, float, bool]:
-        for file in files:
-            # Skip system/metadata files (macOS, Windows, Linux)
-            if self._is_system_file(file):
-                continue
-            if not file.endswith(".txt"):
-                continue
-            if await self._handle_scan_cancellation():
-                return file_count, last_progress_time, True
+    async def _scan_song(self, song_path: str, cached: bool) -> Song | None:
+        """Load one scanned txt file (runs on a scan pool thread).
 
-            await self._process_text_file(root, file)
-            file_count += 1
-            last_progress_time = self._maybe_emit_progress(
-                file_count,
-                last_progress_time,
-                file_interval,
-                time_interval,
-            )
-
-        last_progress_time = self._maybe_emit_progress(
-            file_count,
-            last_progress_time,
-            file_interval,
-            time_interval,
-        )
-        return file_count, last_progress_time, False
-
-    async def _process_text_file(self, root: str, filename: str):
-        await self._maybe_yield()
-        song_path = os.path.join(root, filename)
-        normalized_path = normalize_cache_key(song_path).lower()
-        if normalized_path in self.loaded_paths:
-            await self._handle_cached_song(song_path)
-            return
+        Returns None for a cached song whose file is unchanged.
+        """
+        if cached:
+            try:
+                stat = os.stat(song_path)
+                normalized_path = normalize_cache_key(song_path).lower()
+                if is_cache_entry_fresh(self.cached_file_stats.get(normalized_path), stat.st_mtime, stat.st_size):
+                    return None
+            except Exception as e:
+                logger.warning("Error checking mtime for %s: %s", song_path, e)
+                return None
+            logger.info("Detected modified file: %s", song_path)
 
-        await self._handle_new_song(song_path, normalized_path)
+        return await self.load(song_path, force_reload=cached)
 
-    async def _handle_cached_song(self, song_path: str):
-        try:
-            mod_time = datetime.datetime.fromtimestamp(os.path.getmtime(song_path))
-            cached_song = get_cache_entry(song_path, mod_time)
-            if cached_song:
-                return
+    async def _emit_scanned_songs(
+        self, in_flight: deque[tuple[str, bool, Future]], keep: int, done_only: bool = False
+    ) -> int:
+        """Emit finished scan results in submission order until at most keep are in flight.
 
-            logger.info("Detected modified file: %s", song_path)
-            await self._maybe_yield()
-            song = await self.load(song_path, force_reload=True)
+        Returns:
+            Number of files completed
+        """
+        completed = 0
+        while in_flight and (len(in_flight) > keep or in_flight[0][2].done()):
+            normalized_path, cached, future = in_flight[0]
+            if done_only and not future.done():
+                break
+            in_flight.popleft()
+            if future.cancelled():
+                continue
+            try:
+                song = await asyncio.wrap_future(future)
+            except Exception as e:  # pragma: no cover - _scan_song handles its errors
+                logger.warning("Error scanning %s: %s", normalized_path, e)
+                self._discard_from_journal(normalized_path)
+                continue
+            completed += 1
+            if song and song.status == SongStatus.ERROR:
+                # Failed songs are not cached; keep listing their folder until they load
+                self._discard_from_journal(normalized_path)
             if song:
                 await self._append_scan_song(song)
-        except Exception as e:
-            logger.warning("Error checking mtime for %s: %s", song_path, e)
+                if not cached:
+                    self.loaded_paths.add(normalized_path)
+        return completed
 
-    async def _handle_new_song(self, song_path: str, normalized_path: str):
-        await self._maybe_yield()
-        song = await self.load(song_path)
-        if song:
-            await self._append_scan_song(song)
-            self.loaded_paths.add(normalized_path)
+    def _discard_from_journal(self, normalized_path: str):
+        if self._journal is not None:
+            self._journal.discard(normalized_path.rpartition("/")[0])
+
+    def _count_scanned_files(
+        self,
+        completed: int,
+        file_count: int,
+        last_progress_time: float,
+        file_interval: int,
+        time_interval: float,
+    ) -> tuple[int, float]:
+        for _ in range(completed):
+            file_count += 1
+            last_progress_time = self._maybe_emit_progress(file_count, last_progress_time, file_interval, time_interval)
+        return file_count, last_progress_time
 
     def _maybe_emit_progress(
         self,
@@ -423,6 +525,9 @@ class LoadUsdxFilesWorker(IWorker):
         # Flush any remaining songs in batch (safety net)
         await self._flush_scan_batch()
 
+        # Commit queued cache writes now (also on cancellation) instead of waiting for the write-behind timer
+        flush_cache_writes()
+
         # Always emit finished signal, even if cancelled
         self.signals.finished.emit()
         if self.is_cancelled():
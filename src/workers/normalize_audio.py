@@ -1,5 +1,11 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import Signal as pyqtSignal
+
 from model.song import Song
-from managers.worker_queue_manager import IWorker
+from managers.worker_queue_manager import IWorker, IWorkerSignals
 import utils.audio as audio
 from app.app_data import AppData
 from services.gap_info_service import GapInfoService  # Add this import
@@ -11,6 +17,31 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def get_normalization_tolerance(config) -> float:
+    """Read the loudness tolerance in LU (attribute may be missing on partial configs)."""
+    tolerance = getattr(config, "normalization_tolerance", audio.DEFAULT_NORMALIZATION_TOLERANCE)
+    if not isinstance(tolerance, (int, float)) or isinstance(tolerance, bool):
+        return audio.DEFAULT_NORMALIZATION_TOLERANCE
+    return max(0.0, float(tolerance))
+
+
+def get_normalization_worker_count(config, job_count: int) -> int:
+    """
+    Read how many songs of a batch are normalized concurrently.
+
+    Args:
+        config: Config object (attribute may be missing on partial configs)
+        job_count: Number of songs in the batch
+
+    Returns:
+        Worker count between 1 and job_count; 0 in the config means one per CPU core
+    """
+    workers = getattr(config, "normalization_workers", 0)
+    if not isinstance(workers, int) or isinstance(workers, bool) or workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, job_count))
+
+
 class NormalizeAudioWorker(IWorker):
     def __init__(self, song: Song):
         super().__init__(is_instant=True)
@@ -25,10 +56,14 @@ class NormalizeAudioWorker(IWorker):
             # Use the normalization level from config
             normalization_level = self.config.normalization_level
             with FileMutationGuard.guard(self.song.audio_file):
-                audio.normalize_audio(
-                    self.song.audio_file, target_level=normalization_level, check_cancellation=self.is_cancelled
+                changed = audio.normalize_audio(
+                    self.song.audio_file,
+                    target_level=normalization_level,
+                    check_cancellation=self.is_cancelled,
+                    tolerance=get_normalization_tolerance(self.config),
                 )
-                SongSignatureService.capture_processed_signatures(self.song, include_txt=False)
+                if changed:
+                    SongSignatureService.capture_processed_signatures(self.song, include_txt=False)
 
             # Update normalization info using service
             GapInfoService.set_normalized(self.song.gap_info, normalization_level)
@@ -42,3 +77,82 @@ class NormalizeAudioWorker(IWorker):
 
         # Always emit finished signal, even if cancelled
         self.signals.finished.emit()
+
+
+class BatchWorkerSignals(IWorkerSignals):
+    songStarted = pyqtSignal(Song)
+    # Song, True if the audio file was rewritten (False: within tolerance or cancelled)
+    songFinished = pyqtSignal(Song, bool)
+    songError = pyqtSignal(Song, object)
+
+
+class NormalizeAudioBatchWorker(IWorker):
+    """
+    Normalize a selection of songs with a bounded number of concurrent ffmpeg processes.
+
+    Each song is measured (or its cached measurement reused) and rewritten only
+    if it is outside the loudness tolerance. Per-song progress is reported
+    through songStarted / songFinished / songError; finished is emitted once
+    for the whole batch.
+    """
+
+    def __init__(self, songs: list[Song]):
+        super().__init__(is_instant=False)
+        self.songs = list(songs)
+        self.signals = BatchWorkerSignals()
+        self.description = f"Normalizing {len(self.songs)} songs."
+        self.config = AppData().config
+
+    def _normalize(self, song: Song, target_level, tolerance: float):
+        """Runs on a pool thread; returns True/False like normalize_audio, None if cancelled first."""
+        if self.is_cancelled():
+            return None
+        self.signals.songStarted.emit(song)
+        with FileMutationGuard.guard(song.audio_file):
+            changed = audio.normalize_audio(
+                song.audio_file, target_level=target_level, check_cancellation=self.is_cancelled, tolerance=tolerance
+            )
+            if changed:
+                SongSignatureService.capture_processed_signatures(song, include_txt=False)
+        return changed
+
+    async def run(self):
+        normalization_level = self.config.normalization_level
+        tolerance = get_normalization_tolerance(self.config)
+        max_workers = get_normalization_worker_count(self.config, len(self.songs))
+        logger.info(f"Normalizing {len(self.songs)} songs with {max_workers} concurrent ffmpeg processes")
+
+        loop = asyncio.get_running_loop()
+        rewritten = skipped = 0
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="normalize") as executor:
+            pending = {
+                loop.run_in_executor(executor, self._normalize, song, normalization_level, tolerance): song
+                for song in self.songs
+            }
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for job in done:
+                    song = pending.pop(job)
+                    try:
+                        changed = job.result()
+                        if changed is None:
+                            self.signals.songFinished.emit(song, False)
+                            continue
+                        GapInfoService.set_normalized(song.gap_info, normalization_level)
+                        await GapInfoService.save(song.gap_info)
+                        if changed:
+                            rewritten += 1
+                        else:
+                            skipped += 1
+                        self.signals.songFinished.emit(song, changed)
+                    except Exception as e:
+                        if self.is_cancelled():
+                            self.signals.songFinished.emit(song, False)
+                            continue
+                        logger.error(f"Error normalizing audio: {song.audio_file}: {e}")
+                        self.save_error_to_song(song, e)
+                        self.signals.songError.emit(song, e)
+
+        logger.info(f"Batch normalization done: {rewritten} rewritten, {skipped} already within tolerance")
+        # Always emit finished signal, even if cancelled
+        self.signals.finished.emit()
@@ -0,0 +1,139 @@
+"""Tests for in-process audio duration probing and the duration cache."""
+
+import struct
+import wave
+from unittest.mock import patch
+
+import pytest
+
+import common.database as db_module
+from common.database import close_connections, flush_cache_writes, get_cached_audio_duration
+from utils import audio
+from utils.audio_duration import probe_duration_ms
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, no padding, joint stereo: 417-byte frames of 1152 samples
+MP3_FRAME_HEADER = b"\xff\xfb\x90\x44"
+MP3_FRAME_LENGTH = 417
+MP3_FRAME_MS = 1152 / 44100 * 1000
+# CBR durations are estimated from the byte count (real streams average 417.96 bytes per frame)
+MP3_CBR_FRAME_MS = MP3_FRAME_LENGTH * 8 / 128
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path):
+    db_module._db_initialized = False
+    db_module._DB_PATH = str(tmp_path / "cache" / "test_cache.db")
+    yield
+    db_module._duration_writes.discard()
+    close_connections()
+    db_module._db_initialized = False
+    db_module._DB_PATH = None
+
+
+def _mp3_frame(payload=b""):
+    body = payload.ljust(MP3_FRAME_LENGTH - 4, b"\x00")
+    return MP3_FRAME_HEADER + body
+
+
+def _write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_wav(tmp_path):
+    path = str(tmp_path / "a.wav")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(44100)
+        w.writeframes(b"\x00\x00" * 2 * 44100 * 3)
+
+    assert probe_duration_ms(path) == pytest.approx(3000.0)
+
+
+def test_cbr_mp3_with_id3_tags(tmp_path):
+    id3v2 = b"ID3\x04\x00\x00\x00\x00\x00\x10" + b"\x00" * 16
+    id3v1 = b"TAG" + b"\x00" * 125
+    path = _write(tmp_path / "a.mp3", id3v2 + _mp3_frame() * 100 + id3v1)
+
+    assert probe_duration_ms(path) == pytest.approx(100 * MP3_CBR_FRAME_MS)
+
+
+def test_mp3_xing_frame_count(tmp_path):
+    # Xing header behind the 32-byte MPEG-1 stereo side info, frame count flag set
+    xing = b"\x00" * 32 + b"Xing" + struct.pack(">II", 0x01, 5000)
+    path = _write(tmp_path / "a.mp3", _mp3_frame(xing) + _mp3_frame() * 10)
+
+    assert probe_duration_ms(path) == pytest.approx(5000 * MP3_FRAME_MS)
+
+
+def test_flac_streaminfo(tmp_path):
+    packed = (48000 << 44) | (1 << 41) | (15 << 36) | (48000 * 7)
+    streaminfo = b"\x00" * 10 + packed.to_bytes(8, "big") + b"\x00" * 16
+    path = _write(tmp_path / "a.flac", b"fLaC" + b"\x80\x00\x00\x22" + streaminfo)
+
+    assert probe_duration_ms(path) == pytest.approx(7000.0)
+
+
+def test_mp4_mvhd_after_media_data(tmp_path):
+    ftyp = struct.pack(">I4s", 16, b"ftyp") + b"M4A \x00\x00\x00\x00"
+    mdat = struct.pack(">I4s", 1008, b"mdat") + b"\x00" * 1000
+    mvhd_body = b"\x00\x00\x00\x00" + struct.pack(">IIII", 0, 0, 1000, 123456) + b"\x00" * 80
+    mvhd = struct.pack(">I4s", 8 + len(mvhd_body), b"mvhd") + mvhd_body
+    moov = struct.pack(">I4s", 8 + len(mvhd), b"moov") + mvhd
+    path = _write(tmp_path / "a.m4a", ftyp + mdat + moov)
+
+    assert probe_duration_ms(path) == pytest.approx(123456.0)
+
+
+def _ogg_page(granule, serial, payload):
+    header = b"OggS" + struct.pack("<BBqIII", 0, 0, granule, serial, 0, 0) + bytes([1, len(payload)])
+    return header + payload
+
+
+def test_opus_granule_minus_pre_skip(tmp_path):
+    opus_head = b"OpusHead" + struct.pack("<BBHIhB", 1, 2, 312, 48000, 0, 0)
+    data = _ogg_page(0, 7, opus_head) + _ogg_page(-1, 7, b"x" * 50) + _ogg_page(48000 * 2 + 312, 7, b"y" * 50)
+    path = _write(tmp_path / "a.opus", data)
+
+    assert probe_duration_ms(path) == pytest.approx(2000.0)
+
+
+def test_vorbis_sample_rate(tmp_path):
+    vorbis_id = b"\x01vorbis" + struct.pack("<IBI", 0, 2, 44100) + b"\x00" * 15
+    path = _write(tmp_path / "a.ogg", _ogg_page(0, 3, vorbis_id) + _ogg_page(44100 * 5, 3, b"z" * 20))
+
+    assert probe_duration_ms(path) == pytest.approx(5000.0)
+
+
+def test_unknown_format_returns_none(tmp_path):
+    assert probe_duration_ms(_write(tmp_path / "a.bin", b"not audio at all" * 10)) is None
+    assert probe_duration_ms(str(tmp_path / "missing.mp3")) is None
+
+
+def test_get_audio_duration_memoizes_by_size_and_mtime(tmp_path):
+    path = _write(tmp_path / "a.mp3", _mp3_frame() * 50)
+
+    with patch.object(audio, "probe_duration_ms", wraps=probe_duration_ms) as probe:
+        first = audio.get_audio_duration(path)
+        flush_cache_writes()
+        second = audio.get_audio_duration(path)
+    assert first == second == pytest.approx(50 * MP3_CBR_FRAME_MS)
+    assert probe.call_count == 1
+
+    _write(tmp_path / "a.mp3", _mp3_frame() * 80)
+    assert audio.get_audio_duration(path) == pytest.approx(80 * MP3_CBR_FRAME_MS)
+
+
+def test_ffprobe_only_for_unreadable_headers(tmp_path):
+    readable = _write(tmp_path / "a.mp3", _mp3_frame() * 10)
+    unreadable = _write(tmp_path / "b.wma", b"\x30\x26\xb2\x75" * 64)
+
+    with patch.object(audio, "run_cancellable_process", return_value=(0, "1.5\n", "")) as ffprobe:
+        audio.get_audio_duration(readable)
+        assert ffprobe.call_count == 0
+        assert audio.get_audio_duration(unreadable) == 1500.0
+        assert ffprobe.call_count == 1
+
+    stat = (tmp_path / "b.wma").stat()
+    assert get_cached_audio_duration(unreadable, stat.st_size, stat.st_mtime) == 1500.0
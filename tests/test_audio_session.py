@@ -0,0 +1,75 @@
+"""Tests for shared per-song audio decoding."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+import torchaudio
+
+from utils.providers.mdx import audio_session as session_module
+from utils.providers.mdx.audio_compat import get_audio_info_compat, load_audio_compat
+from utils.providers.mdx.audio_session import audio_session, get_session_audio
+
+
+def _write_wav(tmp_path, seconds=2, sample_rate=8000):
+    path = str(tmp_path / "song.wav")
+    waveform = torch.linspace(-0.5, 0.5, seconds * sample_rate).repeat(2, 1)
+    torchaudio.save(path, waveform, sample_rate)
+    return path
+
+
+def test_session_slices_match_direct_loads(tmp_path):
+    audio_file = _write_wav(tmp_path)
+    with load_audio_compat(audio_file, frame_offset=1000, num_frames=500) as (expected, expected_sr):
+        expected = expected.clone()
+
+    with audio_session(audio_file):
+        with load_audio_compat(audio_file, frame_offset=1000, num_frames=500) as (waveform, sample_rate):
+            assert sample_rate == expected_sr
+            torch.testing.assert_close(waveform, expected)
+        info = get_audio_info_compat(audio_file)
+
+    assert info.sample_rate == 8000
+    assert info.num_frames == 16000
+
+
+def test_session_decodes_once(tmp_path, monkeypatch):
+    audio_file = _write_wav(tmp_path)
+    decodes = []
+    real_decode = session_module.decode_audio
+    monkeypatch.setattr(session_module, "decode_audio", lambda path: decodes.append(path) or real_decode(path))
+
+    with audio_session(audio_file):
+        get_audio_info_compat(audio_file)
+        for offset in range(0, 16000, 4000):
+            with load_audio_compat(audio_file, frame_offset=offset, num_frames=4000):
+                pass
+
+    assert decodes == [audio_file]
+
+
+def test_nested_sessions_share_buffer_and_release(tmp_path):
+    audio_file = _write_wav(tmp_path)
+
+    with audio_session(audio_file):
+        outer = get_session_audio(audio_file)
+        with audio_session(audio_file):
+            assert get_session_audio(audio_file) is outer
+        assert get_session_audio(audio_file) is outer
+
+    assert get_session_audio(audio_file) is None
+
+
+def test_ffmpeg_decode_deinterleaves_stereo(monkeypatch):
+    interleaved = np.array([0.1, -0.1, 0.2, -0.2, 0.3, -0.3], dtype="<f4")
+
+    def fake_run(cmd, **kwargs):
+        return SimpleNamespace(returncode=0, stdout=interleaved.tobytes(), stderr=b"")
+
+    monkeypatch.setattr(session_module, "subprocess", SimpleNamespace(run=fake_run))
+
+    decoded = session_module.decode_audio("song.m4a")
+
+    assert decoded.sample_rate == session_module.FFMPEG_DECODE_SAMPLE_RATE
+    np.testing.assert_allclose(decoded.samples, [[0.1, 0.2, 0.3], [-0.1, -0.2, -0.3]])
+    assert decoded.slice(1, 5).shape == (2, 2)
@@ -0,0 +1,146 @@
+"""Tests for the stat fingerprint columns and index-only freshness checks of the song cache."""
+
+import os
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import common.database as db_module
+from common.database import (
+    CacheFileStat,
+    cleanup_stale_entries,
+    close_connections,
+    find_stale_paths,
+    flush_cache_writes,
+    get_cache_file_stats,
+    init_database,
+    is_cache_entry_fresh,
+    remove_cache_entry,
+    set_cache_entry,
+)
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path):
+    db_module._db_initialized = False
+    db_module._DB_PATH = str(tmp_path / "test_cache.db")
+    yield
+    db_module._writes.discard()
+    close_connections()
+    db_module._db_initialized = False
+    db_module._DB_PATH = None
+
+
+def _write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_set_cache_entry_stores_stat_fingerprint(tmp_path):
+    txt = _write(tmp_path / "Song.txt", "#TITLE:A\n")
+    audio = _write(tmp_path / "song.mp3", "audio")
+
+    set_cache_entry(txt, SimpleNamespace(audio_file=audio))
+    flush_cache_writes()
+
+    entry = get_cache_file_stats()[txt.lower()]
+    assert entry.txt_mtime == os.stat(txt).st_mtime
+    assert entry.txt_size == os.stat(txt).st_size
+    assert entry.audio_mtime == os.stat(audio).st_mtime
+
+
+def test_file_stats_overlay_pending_writes_and_removals(tmp_path):
+    first = _write(tmp_path / "a.txt", "a")
+    second = _write(tmp_path / "b.txt", "b")
+    set_cache_entry(first, {"title": "A"})
+    set_cache_entry(second, {"title": "B"})
+    flush_cache_writes()
+
+    remove_cache_entry(first)
+    set_cache_entry(_write(tmp_path / "c.txt", "c"), {"title": "C"})
+
+    assert set(get_cache_file_stats()) == {second.lower(), str(tmp_path / "c.txt").lower()}
+
+
+def test_file_stats_never_read_song_data(tmp_path):
+    set_cache_entry(_write(tmp_path / "a.txt", "a"), {"title": "A"})
+    flush_cache_writes()
+
+    with patch.object(db_module, "deserialize_cache_blob") as deserialize:
+        get_cache_file_stats()
+    deserialize.assert_not_called()
+
+    conn = sqlite3.connect(db_module._DB_PATH)
+    plan = " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + db_module._SQL_SELECT_FILE_STATS))
+    conn.close()
+    assert "COVERING INDEX idx_song_cache_freshness" in plan
+
+
+def test_directory_filter_restricts_stats(tmp_path):
+    (tmp_path / "one").mkdir()
+    (tmp_path / "two").mkdir()
+    inside = _write(tmp_path / "one" / "a.txt", "a")
+    set_cache_entry(inside, {"title": "A"})
+    set_cache_entry(_write(tmp_path / "two" / "b.txt", "b"), {"title": "B"})
+    flush_cache_writes()
+
+    assert list(get_cache_file_stats(directory_filter=str(tmp_path / "one"))) == [inside.lower()]
+
+
+def test_freshness_decision():
+    entry = CacheFileStat(100.0, 42, 50.0, "2025-01-01T00:00:00")
+
+    assert is_cache_entry_fresh(entry, 100.0, 42)
+    assert is_cache_entry_fresh(entry, 100.0, 42, audio_mtime=50.0)
+    assert not is_cache_entry_fresh(entry, 101.0, 42)
+    assert not is_cache_entry_fresh(entry, 100.0, 43)
+    assert not is_cache_entry_fresh(entry, 100.0, 42, audio_mtime=51.0)
+    assert not is_cache_entry_fresh(None, 100.0, 42)
+
+
+def test_legacy_rows_fall_back_to_timestamp():
+    entry = CacheFileStat(None, None, None, "2025-01-01T12:00:00")
+    before = db_module.datetime.datetime(2025, 1, 1, 11).timestamp()
+    after = db_module.datetime.datetime(2025, 1, 1, 13).timestamp()
+
+    assert is_cache_entry_fresh(entry, before, 10)
+    assert not is_cache_entry_fresh(entry, after, 10)
+
+
+def test_find_stale_paths(tmp_path):
+    unchanged = _write(tmp_path / "same.txt", "same")
+    changed = _write(tmp_path / "changed.txt", "old")
+    set_cache_entry(unchanged, {"title": "same"})
+    set_cache_entry(changed, {"title": "changed"})
+    _write(tmp_path / "changed.txt", "new content")
+    uncached = _write(tmp_path / "new.txt", "new")
+
+    file_stats = {path: (os.stat(path).st_mtime, os.stat(path).st_size) for path in (unchanged, changed, uncached)}
+
+    assert find_stale_paths(file_stats) == {changed, uncached}
+
+
+def test_cleanup_stale_entries_is_set_based(tmp_path):
+    paths = [_write(tmp_path / f"{name}.txt", name) for name in ("a", "b", "c")]
+    for path in paths:
+        set_cache_entry(path, {"title": path})
+
+    removed = cleanup_stale_entries({paths[0].lower()})
+
+    assert removed == 2
+    assert list(get_cache_file_stats()) == [paths[0].lower()]
+    assert cleanup_stale_entries({paths[0].lower()}) == 0
+
+
+def test_pre_v3_table_gains_fingerprint_columns():
+    conn = sqlite3.connect(db_module._DB_PATH)
+    conn.execute("CREATE TABLE song_cache (file_path TEXT PRIMARY KEY, song_data BLOB, timestamp DATETIME)")
+    conn.execute("INSERT INTO song_cache VALUES (?, ?, ?)", ("/songs/a.txt", b"blob", "2025-01-01T00:00:00"))
+    conn.commit()
+    conn.close()
+
+    init_database()
+
+    assert get_cache_file_stats() == {"/songs/a.txt": CacheFileStat(None, None, None, "2025-01-01T00:00:00")}
@@ -1,5 +1,6 @@
 """Test cache versioning and migration"""
 
+import copyreg
 import sqlite3
 import tempfile
 import os
@@ -11,6 +12,17 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 
+class _DictStatePickle:
+    """Pickles like a pre-__slots__ object: the class plus a plain attribute dict."""
+
+    def __init__(self, cls, state):
+        self.cls = cls
+        self.state = state
+
+    def __reduce__(self):
+        return copyreg._reconstructor, (self.cls, object, None), self.state
+
+
 class TestCacheVersioning:
     """Test cache version migration functionality"""
 
@@ -253,7 +265,7 @@ class TestCacheVersioning:
             get_cache_entry,
             normalize_cache_key,
         )
-        from common.cache_schema import CacheEnvelope, CACHE_ENTRY_VERSION
+        from common.song_record import decode_song, is_song_record
 
         with tempfile.TemporaryDirectory() as temp_dir:
             db_path = os.path.join(temp_dir, "test_cache.db")
@@ -272,12 +284,13 @@ class TestCacheVersioning:
                 song.status = SongStatus.MATCH
 
                 # Simulate pre-envelope payload missing backing attributes
-                song.__dict__["status"] = "MATCH"
-                song.__dict__.pop("_status", None)
-                song.__dict__.pop("_status_changed_at", None)
-                song.__dict__.pop("_status_changed_str", None)
+                legacy_state = song.__getstate__()
+                legacy_state["status"] = "MATCH"
+                legacy_state.pop("_status", None)
+                legacy_state.pop("_status_changed_at", None)
+                legacy_state.pop("_status_changed_str", None)
 
-                legacy_blob = pickle.dumps(song)
+                legacy_blob = pickle.dumps(_DictStatePickle(Song, legacy_state))
                 timestamp = "2025-01-01T00:00:00"
                 normalized_path = normalize_cache_key(song.txt_file).lower()
 
@@ -301,7 +314,6 @@ class TestCacheVersioning:
                 conn.close()
 
                 assert row is not None, "Migrated row should still exist"
-                envelope = pickle.loads(row[0])
-                assert isinstance(envelope, CacheEnvelope), "Migrated entry should be wrapped in envelope"
-                assert envelope.schema_version == CACHE_ENTRY_VERSION, "Envelope should use latest schema"
+                assert is_song_record(row[0]), "Migrated song should be rewritten as a compact record"
+                assert decode_song(row[0]).status == SongStatus.MATCH, "Status should survive the rewrite"
                 assert row[1] == timestamp, "Original processed timestamp should be preserved"
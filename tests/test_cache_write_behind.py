@@ -0,0 +1,108 @@
+"""Tests for the write-behind song cache writer in common.database."""
+
+import sqlite3
+import time
+
+import pytest
+
+import common.database as db_module
+from common.database import (
+    close_connections,
+    flush_cache_writes,
+    get_all_cache_entries,
+    get_cache_entry,
+    remove_cache_entry,
+    set_cache_entry,
+)
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path, monkeypatch):
+    db_module._db_initialized = False
+    db_module._DB_PATH = str(tmp_path / "test_cache.db")
+    # Keep the background flusher out of the way unless a test asks for it
+    monkeypatch.setattr(db_module._writes, "batch_size", 10_000)
+    monkeypatch.setattr(db_module._writes, "flush_interval", 60.0)
+    yield
+    db_module._writes.discard()
+    close_connections()
+    db_module._db_initialized = False
+    db_module._DB_PATH = None
+
+
+def _committed_rows():
+    conn = sqlite3.connect(db_module._DB_PATH)
+    try:
+        return dict(conn.execute("SELECT file_path, song_data FROM song_cache").fetchall())
+    finally:
+        conn.close()
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_reads_see_pending_writes():
+    set_cache_entry("Z:/Songs/A/song.txt", {"title": "A"})
+
+    assert "z:/songs/a/song.txt" not in _committed_rows()
+    assert get_cache_entry("z:/songs/a/song.txt") == {"title": "A"}
+
+
+def test_writes_are_coalesced_last_write_wins():
+    for title in ("first", "second", "third"):
+        set_cache_entry("song.txt", {"title": title})
+
+    assert db_module._writes.pending_count() == 1
+    assert flush_cache_writes() == 1
+    assert get_cache_entry("song.txt") == {"title": "third"}
+    assert list(_committed_rows()) == ["song.txt"]
+
+
+def test_pending_write_is_snapshot_of_object():
+    song = {"title": "before"}
+    set_cache_entry("song.txt", song)
+    song["title"] = "after"
+
+    assert get_cache_entry("song.txt") == {"title": "before"}
+
+
+def test_remove_supersedes_pending_write():
+    set_cache_entry("Song.txt", {"title": "A"})
+    flush_cache_writes()
+    set_cache_entry("Song.txt", {"title": "B"})
+
+    remove_cache_entry("Song.txt")
+
+    assert get_cache_entry("Song.txt") is None
+    flush_cache_writes()
+    assert _committed_rows() == {}
+
+
+def test_batch_size_triggers_background_flush(monkeypatch):
+    monkeypatch.setattr(db_module._writes, "batch_size", 3)
+
+    for i in range(3):
+        set_cache_entry(f"song{i}.txt", {"n": i})
+
+    assert _wait_until(lambda: len(_committed_rows()) == 3)
+
+
+def test_time_threshold_triggers_background_flush(monkeypatch):
+    monkeypatch.setattr(db_module._writes, "flush_interval", 0.05)
+
+    set_cache_entry("song.txt", {"title": "A"})
+
+    assert _wait_until(lambda: "song.txt" in _committed_rows())
+
+
+def test_bulk_reads_flush_first():
+    set_cache_entry("song.txt", {"title": "A"})
+
+    assert get_all_cache_entries(deserialize=True) == {"song.txt": {"title": "A"}}
+    assert db_module._writes.pending_count() == 0
@@ -0,0 +1,65 @@
+"""Tests for the per-thread SQLite connection pool in common.database."""
+
+import threading
+
+import pytest
+
+import common.database as db_module
+from common.database import close_connections, get_cache_entry, get_thread_connection, set_cache_entry
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path):
+    db_module._db_initialized = False
+    db_module._DB_PATH = str(tmp_path / "test_cache.db")
+    yield
+    close_connections()
+    db_module._db_initialized = False
+    db_module._DB_PATH = None
+
+
+def _in_thread(fn):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_connection_reused_within_thread_with_pragmas_applied():
+    first = get_thread_connection()
+
+    assert get_thread_connection() is first
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert first.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+
+def test_threads_get_separate_connections():
+    main_conn = get_thread_connection()
+    other_conn = _in_thread(get_thread_connection)
+
+    assert other_conn is not main_conn
+
+
+def test_entries_visible_across_threads():
+    set_cache_entry("Z:/Songs/A/song.txt", {"title": "A"})
+
+    assert _in_thread(lambda: get_cache_entry("z:/songs/a/song.txt")) == {"title": "A"}
+
+
+def test_close_connections_reconnects_lazily():
+    first = get_thread_connection()
+    set_cache_entry("song.txt", {"title": "A"})
+
+    close_connections()
+
+    assert get_thread_connection() is not first
+    assert get_cache_entry("song.txt") == {"title": "A"}
+
+
+def test_database_path_change_replaces_connection(tmp_path):
+    first = get_thread_connection()
+
+    db_module._DB_PATH = str(tmp_path / "other.db")
+
+    assert get_thread_connection() is not first
@@ -0,0 +1,130 @@
+"""Tests for the multi-process gap detection engine helpers."""
+
+import asyncio
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from utils.gap_detection import engine as engine_module
+from utils.gap_detection.engine import get_detection_engine, snapshot_config
+
+
+def test_snapshot_config_keeps_public_primitives_only():
+    config = SimpleNamespace(
+        method="mdx",
+        mdx_chunk_duration_ms=12000,
+        mdx_energy_threshold=6.0,
+        mdx_use_fp16=False,
+        tmp_root=None,
+        _parser=object(),
+        callback=lambda: None,
+    )
+
+    snapshot = snapshot_config(config)
+
+    assert vars(snapshot) == {
+        "method": "mdx",
+        "mdx_chunk_duration_ms": 12000,
+        "mdx_energy_threshold": 6.0,
+        "mdx_use_fp16": False,
+        "tmp_root": None,
+    }
+    # Must survive the trip to a worker process
+    assert vars(pickle.loads(pickle.dumps(snapshot))) == vars(snapshot)
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_single_worker_runs_in_process(workers):
+    assert get_detection_engine(SimpleNamespace(detection_workers=workers)) is None
+
+
+def test_missing_setting_runs_in_process():
+    assert get_detection_engine(SimpleNamespace()) is None
+
+
+def test_engine_recreated_when_settings_change(monkeypatch):
+    created = []
+
+    class FakeEngine:
+        def __init__(self, max_workers, gpu_workers):
+            self.max_workers = max_workers
+            self.gpu_workers = gpu_workers
+            self.shut_down = False
+            created.append(self)
+
+        def shutdown(self):
+            self.shut_down = True
+
+    monkeypatch.setattr(engine_module, "DetectionEngine", FakeEngine)
+    monkeypatch.setattr(engine_module, "_engine", None)
+
+    first = get_detection_engine(SimpleNamespace(detection_workers=2, gpu_detection_workers=1))
+    assert get_detection_engine(SimpleNamespace(detection_workers=2, gpu_detection_workers=1)) is first
+
+    second = get_detection_engine(SimpleNamespace(detection_workers=4, gpu_detection_workers=1))
+    assert second is not first
+    assert first.shut_down
+
+    engine_module.shutdown_detection_engine()
+    assert second.shut_down
+    assert engine_module._engine is None
+
+
+def test_worker_count_ignores_non_integer_values():
+    assert engine_module.get_detection_worker_count(SimpleNamespace(detection_workers="4")) == 1
+    assert engine_module.get_detection_worker_count(SimpleNamespace(detection_workers=True)) == 1
+    assert engine_module.get_detection_worker_count(SimpleNamespace(detection_workers=3)) == 3
+
+
+@pytest.mark.parametrize("value", ["2", True, None, 1.5])
+def test_gpu_worker_count_ignores_invalid_values(value):
+    assert engine_module.get_gpu_detection_worker_count(SimpleNamespace(gpu_detection_workers=value), 4) == 1
+
+
+def test_gpu_worker_count_is_clamped():
+    assert engine_module.get_gpu_detection_worker_count(SimpleNamespace(gpu_detection_workers=8), 4) == 4
+    assert engine_module.get_gpu_detection_worker_count(SimpleNamespace(gpu_detection_workers=-1), 4) == 0
+    assert engine_module.get_gpu_detection_worker_count(SimpleNamespace(), 4) == 1
+
+
+@pytest.fixture
+def thread_engine(monkeypatch):
+    """Engine with one worker whose jobs run on threads instead of spawned processes."""
+    running, peak = [], []
+
+    def fake_job(options, slot):
+        running.append(slot)
+        peak.append(len(running))
+        time.sleep(0.02)
+        running.remove(slot)
+        return options.name
+
+    monkeypatch.setattr(engine_module, "_run_detection_job", fake_job)
+    engine = engine_module.DetectionEngine(max_workers=1)
+    engine._executor.shutdown(wait=False)
+    engine._executor = ThreadPoolExecutor(max_workers=engine._slot_count)
+    yield engine, peak
+    engine._executor.shutdown(wait=True)
+
+
+def test_jobs_beyond_slot_count_wait_for_a_free_slot(thread_engine):
+    engine, peak = thread_engine
+    jobs = [SimpleNamespace(name=i, config=SimpleNamespace()) for i in range(engine._slot_count * 3)]
+
+    async def detect_all():
+        return await asyncio.gather(*(engine.detect(job) for job in jobs))
+
+    assert asyncio.run(detect_all()) == list(range(len(jobs)))
+    assert max(peak) <= engine._slot_count
+    assert sorted(engine._free_slots) == list(range(engine._slot_count))
+
+
+def test_cancelled_job_stops_waiting_for_a_slot(thread_engine):
+    engine, _ = thread_engine
+    engine._free_slots.clear()
+
+    with pytest.raises(RuntimeError, match="cancelled by user"):
+        asyncio.run(engine.detect(SimpleNamespace(name=0, config=SimpleNamespace()), lambda: True))
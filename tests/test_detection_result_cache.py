@@ -0,0 +1,146 @@
+"""Tests for memoized gap detection results."""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import common.database as db_module
+from common.database import clear_cache, close_connections
+from model.usdx_file import Note
+from utils import files
+from utils.gap_detection.result_cache import detection_result_key
+from utils.result_types import DetectGapResult
+from workers.detect_gap import DetectGapWorker, DetectGapWorkerOptions
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path):
+    db_module._db_initialized = False
+    db_module._DB_PATH = str(tmp_path / "cache" / "test_cache.db")
+    yield
+    db_module._writes.discard()
+    close_connections()
+    db_module._db_initialized = False
+    db_module._DB_PATH = None
+
+
+@pytest.fixture
+def detections(monkeypatch):
+    """Fake pipeline that writes the vocals file and records the audio files it ran on."""
+    calls = []
+
+    def fake_perform(options, _check_cancellation=None):
+        calls.append(options.audio_file)
+        vocals_file = files.get_vocals_path(files.get_tmp_path(options.tmp_root, options.audio_file))
+        os.makedirs(os.path.dirname(vocals_file), exist_ok=True)
+        with open(vocals_file, "wb") as f:
+            f.write(b"vocals")
+        result = DetectGapResult(1500, [(0.0, 1500.0), (9000.0, 9500.0)], vocals_file)
+        result.confidence, result.detection_method = 0.8, "mdx"
+        return result
+
+    monkeypatch.setattr("workers.detect_gap.detect_gap.perform", fake_perform)
+    return calls
+
+
+def _audio(tmp_path, folder, content=b"ID3" + bytes(range(256)) * 1000):
+    path = tmp_path / "library" / folder / "song.mp3"
+    path.parent.mkdir(parents=True)
+    path.write_bytes(content)
+    return str(path)
+
+
+def _config(**overrides):
+    return SimpleNamespace(default_detection_time=20, gap_tolerance=400, method="mdx", **overrides)
+
+
+def _detect(tmp_path, audio_file, config=None, bpm=300, original_gap=1400, overwrite=False):
+    note = Note()
+    note.StartBeat = 8
+    options = DetectGapWorkerOptions(
+        audio_file=audio_file,
+        txt_file=os.path.join(os.path.dirname(audio_file), "song.txt"),
+        notes=[note],
+        bpm=bpm,
+        original_gap=original_gap,
+        duration_ms=180000,
+        config=config or _config(),
+        tmp_path=str(tmp_path / "tmp"),
+        overwrite=overwrite,
+    )
+    worker = DetectGapWorker(options)
+    results = []
+    worker.signals.finished.connect(results.append)
+    asyncio.run(worker.run())
+    assert results[0].error is None
+    return results[0]
+
+
+def test_unchanged_audio_reuses_the_stored_result(tmp_path, detections):
+    audio_file = _audio(tmp_path, "a")
+
+    first = _detect(tmp_path, audio_file)
+    again = _detect(tmp_path, audio_file, bpm=250)  # BPM only changes the post-processing
+
+    assert detections == [audio_file]
+    assert again.silence_periods == first.silence_periods == [(0.0, 1500.0), (9000.0, 9500.0)]
+    assert (again.confidence, again.detection_method, again.detected_gap_ms) == (0.8, "mdx", 1500.0)
+    assert (first.detected_gap, again.detected_gap) == (1100, 1020)  # corrected with the new BPM
+
+
+def test_duplicate_audio_in_another_folder_hits_and_gets_vocals(tmp_path, detections):
+    original, duplicate = _audio(tmp_path, "a"), _audio(tmp_path, "b")
+
+    _detect(tmp_path, original)
+    _detect(tmp_path, duplicate)
+
+    assert detections == [original]
+    vocals_file = files.get_vocals_path(files.get_tmp_path(str(tmp_path / "tmp"), duplicate))
+    with open(vocals_file, "rb") as f:
+        assert f.read() == b"vocals"
+
+
+def test_changed_inputs_miss(tmp_path, detections):
+    audio_file = _audio(tmp_path, "a")
+    _detect(tmp_path, audio_file)
+
+    _detect(tmp_path, audio_file, original_gap=5000)
+    _detect(tmp_path, audio_file, config=_config(mdx_onset_snr_threshold=4.0))
+    _detect(tmp_path, audio_file, config=_config(mdx_batch_size=8))  # speed-only setting, still a hit
+    assert len(detections) == 3
+
+    with open(audio_file, "r+b") as f:
+        f.seek(100000)
+        f.write(b"edited")
+    _detect(tmp_path, audio_file)
+    assert len(detections) == 4
+
+    clear_cache()
+    _detect(tmp_path, audio_file)
+    assert len(detections) == 5
+
+
+def test_overwrite_runs_detection_again_and_refreshes_the_stored_result(tmp_path, detections):
+    audio_file = _audio(tmp_path, "a")
+    _detect(tmp_path, audio_file)
+
+    _detect(tmp_path, audio_file, overwrite=True)
+    _detect(tmp_path, audio_file)
+
+    assert len(detections) == 2
+
+
+def test_missing_vocals_file_runs_detection_again(tmp_path, detections):
+    audio_file = _audio(tmp_path, "a")
+    _detect(tmp_path, audio_file)
+    os.remove(files.get_vocals_path(files.get_tmp_path(str(tmp_path / "tmp"), audio_file)))
+
+    _detect(tmp_path, audio_file)
+
+    assert len(detections) == 2
+
+
+def test_unreadable_audio_is_not_memoized(tmp_path):
+    assert detection_result_key(str(tmp_path / "missing.mp3"), 0, _config()) is None
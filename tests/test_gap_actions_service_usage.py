@@ -337,3 +337,29 @@ class TestServiceIntegration:
 
         # This would raise AttributeError if code tried to access it
         # The test passing means our refactoring removed all such access
+
+
+class TestDetectGapWarmUp:
+    """Tests for model warm-up when a detection batch is queued"""
+
+    @pytest.mark.parametrize(
+        "song_count, method, workers, expected",
+        [(2, "mdx", 1, True), (1, "mdx", 1, False), (2, "mdx", 4, False), (2, "other", 1, False)],
+    )
+    @patch("actions.gap_actions.threading.Thread")
+    def test_warm_up_only_for_in_process_mdx_batches(
+        self, mock_thread, mock_app_data, sample_song, song_count, method, workers, expected
+    ):
+        mock_app_data.selected_songs = [sample_song] * song_count
+        mock_app_data.config.method = method
+        mock_app_data.config.detection_workers = workers
+        mock_app_data.config.mdx_use_fp16 = False
+        gap_actions = GapActions(mock_app_data)
+
+        with patch.object(gap_actions, "_queue_tasks_non_blocking"):
+            gap_actions.detect_gap(overwrite=True)
+
+        assert mock_thread.called == expected
+        if expected:
+            assert mock_thread.call_args.kwargs["args"] == (False,)
+            mock_thread.return_value.start.assert_called_once()
@@ -0,0 +1,121 @@
+"""Tests for the parallel scandir walker, the coroutine pool and the parallel library scan."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+import common.database as db_module
+from common.database import close_connections
+from services.library_scanner import CoroutinePool, walk_directory_tree
+from workers.load_usdx_files import LoadUsdxFilesWorker
+
+
+def _make_tree(root):
+    for artist in ("A", "B", "C"):
+        for song in ("one", "two"):
+            folder = root / artist / song
+            folder.mkdir(parents=True)
+            (folder / f"{artist} - {song}.txt").write_text("#TITLE:x\n")
+            (folder / "audio.mp3").write_bytes(b"")
+    (root / "loose.txt").write_text("#TITLE:loose\n")
+
+
+def _normalize(walk):
+    return sorted((root, sorted(dirs), sorted(files)) for root, dirs, files in walk)
+
+
+def test_walk_matches_os_walk(tmp_path):
+    _make_tree(tmp_path)
+
+    assert _normalize(walk_directory_tree(str(tmp_path), max_workers=4)) == _normalize(os.walk(str(tmp_path)))
+
+
+def test_walk_is_top_down_and_ordered(tmp_path):
+    _make_tree(tmp_path)
+
+    roots = [root for root, _, _ in walk_directory_tree(str(tmp_path), max_workers=4)]
+
+    assert roots[0] == str(tmp_path)
+    for root in roots[1:]:
+        parent = os.path.dirname(root)
+        assert parent in roots[: roots.index(root)]
+    assert roots == [root for root, _, _ in walk_directory_tree(str(tmp_path), max_workers=1)]
+
+
+def test_walk_stops_when_event_set(tmp_path):
+    _make_tree(tmp_path)
+    stop = threading.Event()
+    stop.set()
+
+    assert [root for root, _, _ in walk_directory_tree(str(tmp_path), stop_event=stop)] == [str(tmp_path)]
+
+
+def test_coroutine_pool_runs_concurrently():
+    async def slow(value):
+        await asyncio.sleep(0)
+        time.sleep(0.1)
+        return value * 2
+
+    start = time.perf_counter()
+    with CoroutinePool(4) as pool:
+        futures = [pool.submit(slow, value) for value in range(4)]
+        results = [future.result() for future in futures]
+
+    assert results == [0, 2, 4, 6]
+    assert time.perf_counter() - start < 0.35
+
+
+@pytest.fixture
+def temp_database(tmp_path):
+    db_module._db_initialized = False
+    db_module._DB_PATH = str(tmp_path / "cache" / "test_cache.db")
+    yield
+    db_module._writes.discard()
+    close_connections()
+    db_module._db_initialized = False
+    db_module._DB_PATH = None
+
+
+def test_parallel_scan_emits_songs_in_walk_order(tmp_path, temp_database):
+    library = tmp_path / "library"
+    library.mkdir()
+    _make_tree(library)
+    expected = [
+        os.path.join(root, name)
+        for root, _, files in walk_directory_tree(str(library))
+        for name in files
+        if name.endswith(".txt")
+    ]
+
+    worker = LoadUsdxFilesWorker(str(library), str(tmp_path / "tmp"), None)
+    worker.scan_workers = 4
+    emitted = []
+    worker.signals.songsLoadedBatch.connect(lambda songs: emitted.extend(song.txt_file for song in songs))
+
+    asyncio.run(worker.run())
+
+    assert emitted == expected
+    assert len(worker.loaded_paths) == len(expected)
+
+
+def test_scan_pool_shuts_down_off_the_event_loop(tmp_path, temp_database, monkeypatch):
+    library = tmp_path / "library"
+    library.mkdir()
+    _make_tree(library)
+    shutdown_threads = []
+    original_shutdown = CoroutinePool.shutdown
+
+    def recording_shutdown(pool, cancel_pending=False):
+        shutdown_threads.append(threading.current_thread())
+        original_shutdown(pool, cancel_pending)
+
+    monkeypatch.setattr(CoroutinePool, "shutdown", recording_shutdown)
+    worker = LoadUsdxFilesWorker(str(library), str(tmp_path / "tmp"), None)
+    worker.scan_workers = 2
+
+    asyncio.run(worker.run())
+
+    assert shutdown_threads and threading.current_thread() not in shutdown_threads
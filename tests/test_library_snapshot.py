@@ -0,0 +1,233 @@
+"""Tests for the memory-mapped library snapshot and snapshot-backed start-up."""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import common.database as db_module
+from common.database import clear_cache, close_connections, get_connection, migrate_cache_paths, set_cache_entry
+from common.library_snapshot import (
+    append_library_snapshot,
+    load_library_snapshot,
+    snapshot_path,
+    write_library_snapshot,
+)
+from model.gap_info import GapInfo, GapInfoStatus
+from model.song import Song, SongStatus
+from model.songs import Songs
+from workers.load_usdx_files import LoadUsdxFilesWorker
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path):
+    db_module._db_initialized = False
+    db_module._DB_PATH = str(tmp_path / "cache" / "test_cache.db")
+    yield
+    db_module._writes.discard()
+    close_connections()
+    db_module._db_initialized = False
+    db_module._DB_PATH = None
+
+
+@pytest.fixture
+def library(tmp_path):
+    return str(tmp_path / "library")
+
+
+def _song(library, name, detected_gap=None, **attrs):
+    song = Song(os.path.join(library, name, f"{name}.txt"))
+    song.audio_file = os.path.join(library, name, "audio.mp3")
+    song.title, song.artist, song.gap, song.bpm = name.title(), "Artist", 1200, 300.5
+    for attr, value in attrs.items():
+        setattr(song, attr, value)
+    if detected_gap is not None:
+        info = GapInfo(os.path.join(library, name, "usdxfixgap.info"), f"{name}.txt")
+        info.detected_gap, info.diff, info.original_gap = detected_gap, detected_gap - 1200, 1200
+        info.status = GapInfoStatus.MISMATCH
+        info.processed_time = "2026-01-02 03:04:05"
+        info.is_normalized, info.normalization_level = True, -23.0
+        song.gap_info = info
+    song.update_title_sort_key()
+    return song
+
+
+def _table_fields(song):
+    info = song.gap_info
+    return (
+        song.txt_file,
+        song.audio_file,
+        song.artist,
+        song.title,
+        song.title_sort_key,
+        song.gap,
+        song.bpm,
+        song.duration_ms,
+        song.usdb_id,
+        song.status,
+        song.status_time_display,
+        song.normalized_str,
+        song.error_message or "",
+        (info.detected_gap, info.diff, info.original_gap, info.status, info.file_path) if info else None,
+    )
+
+
+def test_round_trip_keeps_table_fields(library):
+    songs = [
+        _song(library, "one", detected_gap=1500, duration_ms=183000.5, usdb_id=42),
+        _song(library, "two"),
+        _song("/elsewhere", "three"),
+    ]
+    songs[1].set_error("Broken\x00file")
+
+    write_library_snapshot(library, songs)
+    restored = load_library_snapshot(library)
+
+    assert [_table_fields(song) for song in restored[:1]] == [_table_fields(songs[0])]
+    assert restored[1].status == SongStatus.ERROR and restored[1].error_message == "Broken file"
+    assert restored[2].txt_file == songs[2].txt_file
+    assert restored[0].gap_info.owner is restored[0]
+    assert restored[0].notes is None
+
+
+def test_appended_segments_replace_and_remove_rows(library):
+    songs = [_song(library, name) for name in ("one", "two", "three")]
+    write_library_snapshot(library, songs)
+
+    songs[1].gap = 999
+    assert append_library_snapshot(library, [songs[1]], [songs[2].txt_file]) == 2
+
+    restored = load_library_snapshot(library)
+    assert [(song.title, song.gap) for song in restored] == [("One", 1200), ("Two", 999)]
+
+
+def test_truncated_segment_is_ignored(library):
+    write_library_snapshot(library, [_song(library, "one")])
+    append_library_snapshot(library, [_song(library, "two")])
+    with open(snapshot_path(library), "r+b") as f:
+        f.truncate(os.path.getsize(snapshot_path(library)) - 3)
+
+    assert [song.title for song in load_library_snapshot(library)] == ["One"]
+
+
+def test_missing_or_empty_snapshot(library):
+    assert load_library_snapshot(library) == []
+    assert append_library_snapshot(library, [_song(library, "one")]) == 0
+
+    os.makedirs(os.path.dirname(snapshot_path(library)), exist_ok=True)
+    open(snapshot_path(library), "wb").close()
+    assert load_library_snapshot(library) == []
+
+
+def test_clearing_the_cache_removes_snapshots(library):
+    write_library_snapshot(library, [_song(library, "one")])
+
+    clear_cache()
+
+    assert not os.path.exists(snapshot_path(library))
+
+
+def test_hydrate_replaces_snapshot_fields_in_place(library):
+    full = _song(library, "one", detected_gap=1500)
+    full.gap_info.silence_periods = [(0.0, 1.5)]
+    write_library_snapshot(library, [full])
+
+    songs = Songs()
+    songs.add_snapshot(load_library_snapshot(library))
+    song = songs.songs[0]
+    assert not songs.is_hydrated(song)
+    assert song.gap_info.silence_periods == []
+
+    updated = []
+    songs.updated.connect(updated.append)
+    assert songs.hydrate([song], lambda txt_file: full if txt_file == full.txt_file else None) == 1
+
+    assert songs.songs[0] is song and updated == [song]
+    assert songs.is_hydrated(song)
+    assert song.gap_info.silence_periods == [(0.0, 1.5)]
+    assert songs.hydrate([song], lambda txt_file: pytest.fail("already hydrated")) == 0
+
+
+def test_apply_hydration_emits_one_batch_and_skips_reloaded_songs(library):
+    full = [_song(library, name, detected_gap=1500) for name in ("one", "two", "three")]
+    write_library_snapshot(library, full)
+    songs = Songs()
+    songs.add_snapshot(load_library_snapshot(library))
+    by_txt = {song.txt_file: song for song in full}
+    reloaded = songs.songs[2]
+    songs.add_batch([by_txt[reloaded.txt_file]])  # A scan reloaded it meanwhile
+
+    batches, single = [], []
+    songs.updatedBatch.connect(batches.append)
+    songs.updated.connect(single.append)
+    songs.apply_hydration([(song, by_txt[song.txt_file]) for song in songs.songs])
+
+    assert batches == [songs.songs[:2]] and single == []
+    assert songs.unhydrated(songs.songs) == []
+
+
+def test_selection_hydrates_first_song_now_and_the_rest_in_batches(library, monkeypatch):
+    import actions.song_actions as song_actions_module
+    from actions.song_actions import SongActions
+
+    full = {song.txt_file: song for song in (_song(library, f"song{i}") for i in range(5))}
+    write_library_snapshot(library, list(full.values()))
+    songs = Songs()
+    songs.add_snapshot(load_library_snapshot(library))
+    selection = list(songs.songs)
+
+    background = []
+    monkeypatch.setattr(song_actions_module, "run_async", background.append)
+    monkeypatch.setattr(song_actions_module, "get_cache_entry", full.get)
+    monkeypatch.setattr(song_actions_module, "HYDRATION_BATCH_SIZE", 3)
+    data = SimpleNamespace(songs=songs, config=None, worker_queue=None)
+    actions = SongActions(data)
+
+    actions.set_selected_songs(selection)
+
+    assert songs.unhydrated(selection) == selection[1:]
+    batches = []
+    songs.updatedBatch.connect(batches.append)
+    asyncio.run(background[0])
+    assert batches == [selection[1:4], selection[4:]]
+    assert songs.unhydrated(selection) == []
+
+
+def test_worker_only_decodes_cache_entries_missing_from_snapshot(library, tmp_path):
+    shown, cached_later = _song(library, "one"), _song(library, "two")
+    set_cache_entry(shown.txt_file, shown)
+    set_cache_entry(cached_later.txt_file, cached_later)
+
+    worker = LoadUsdxFilesWorker(library, str(tmp_path / "tmp"), SimpleNamespace(song_list_batch_size=10))
+    worker.snapshot_keys = {db_module.normalize_cache_key(shown.txt_file).lower()}
+    emitted = []
+    worker.signals.songsLoadedBatch.connect(lambda batch: emitted.extend(song.title for song in batch))
+
+    asyncio.run(worker.load_from_cache())
+
+    assert emitted == ["Two"]
+    assert len(worker.loaded_paths) == 2
+    assert worker._cache_loaded_count == 2
+
+
+def test_migrate_cache_paths_keeps_newest_duplicate():
+    db_module.init_database()
+    conn = get_connection()
+    conn.executemany(
+        "INSERT INTO song_cache (file_path, song_data, timestamp) VALUES (?, ?, ?)",
+        [
+            ("z:/songs\\a\\song.txt", b"old", "2026-01-01T00:00:00"),
+            ("Z:/Songs/A/Song.txt", b"new", "2026-02-01T00:00:00"),
+            ("z:/songs/b/song.txt", b"other", "2026-01-01T00:00:00"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    assert migrate_cache_paths() == 1
+
+    conn = get_connection()
+    rows = sorted(conn.execute("SELECT file_path, song_data FROM song_cache").fetchall())
+    conn.close()
+    assert rows == [("z:/songs/a/song.txt", b"new"), ("z:/songs/b/song.txt", b"other")]
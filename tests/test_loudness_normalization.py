@@ -0,0 +1,165 @@
+"""Tests for cached loudness measurement, two-pass normalization and batch normalization."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import common.database as db_module
+import utils.audio as audio
+import workers.normalize_audio as normalize_module
+from common.database import LoudnessEntry, clear_cache, close_connections
+from workers.normalize_audio import NormalizeAudioBatchWorker, get_normalization_worker_count
+
+LOUDNORM_OUTPUT = """[Parsed_loudnorm_0 @ 0x5581]
+{
+\t"input_i" : "-14.32",
+\t"input_tp" : "-0.51",
+\t"input_lra" : "6.80",
+\t"input_thresh" : "-24.55",
+\t"output_i" : "-23.01",
+\t"output_tp" : "-9.12",
+\t"output_lra" : "5.90",
+\t"output_thresh" : "-33.21",
+\t"normalization_type" : "dynamic",
+\t"target_offset" : "0.01"
+}
+"""
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path):
+    db_module._db_initialized = False
+    db_module._DB_PATH = str(tmp_path / "cache" / "test_cache.db")
+    yield
+    db_module._writes.discard()
+    close_connections()
+    db_module._db_initialized = False
+    db_module._DB_PATH = None
+
+
+@pytest.fixture
+def analysis_runs(monkeypatch):
+    """Fake ffmpeg analysis pass; records the audio files it measured."""
+    calls = []
+
+    def fake_run(command, check_cancellation=None):
+        calls.append(command[command.index("-i") + 1])
+        return 0, "", LOUDNORM_OUTPUT
+
+    monkeypatch.setattr(audio, "run_cancellable_process", fake_run)
+    return calls
+
+
+@pytest.fixture
+def rewrites(monkeypatch):
+    """Fake second pass; records the ffmpeg arguments per file."""
+    calls = []
+    monkeypatch.setattr(audio, "run_ffmpeg", lambda audio_file, command, _cancel=None: calls.append(command))
+    return calls
+
+
+def _audio(tmp_path, name="song.mp3"):
+    path = tmp_path / name
+    path.write_bytes(b"ID3" + bytes(range(256)) * 1000)
+    return str(path)
+
+
+def test_parse_loudnorm_stats():
+    assert audio.parse_loudnorm_stats(LOUDNORM_OUTPUT) == LoudnessEntry(-14.32, -0.51, 6.8, -24.55)
+    assert audio.parse_loudnorm_stats("Error opening input") is None
+    assert audio.parse_loudnorm_stats('{"input_i" : "-inf"}') is None
+
+
+def test_measurement_is_cached_per_audio_content(tmp_path, analysis_runs):
+    audio_file = _audio(tmp_path)
+
+    first = audio.measure_loudness(audio_file)
+    again = audio.measure_loudness(audio_file)
+
+    assert first == again == LoudnessEntry(-14.32, -0.51, 6.8, -24.55)
+    assert analysis_runs == [audio_file]
+
+    with open(audio_file, "r+b") as f:
+        f.write(b"edited")
+    audio.measure_loudness(audio_file)
+    clear_cache()
+    audio.measure_loudness(audio_file)
+    assert len(analysis_runs) == 3
+
+
+def test_normalization_uses_measurement_in_linear_second_pass(tmp_path, analysis_runs, rewrites):
+    audio_file = _audio(tmp_path)
+
+    assert audio.normalize_audio(audio_file, target_level=-20) is True
+
+    (command,) = rewrites
+    loudnorm = command[command.index("-af") + 1]
+    assert loudnorm.startswith("loudnorm=I=-20:LRA=11:TP=-2:")
+    assert "measured_I=-14.32:measured_TP=-0.51:measured_LRA=6.8:measured_thresh=-24.55:linear=true" in loudnorm
+
+
+def test_files_within_tolerance_are_not_rewritten(tmp_path, analysis_runs, rewrites):
+    audio_file = _audio(tmp_path)
+    quiet_peaks = LoudnessEntry(-19.4, -3.0, 6.8, -30.0)
+
+    assert audio.normalize_audio(audio_file, target_level=-20, tolerance=1.0, measurement=quiet_peaks) is False
+    # Within tolerance, but the true peak is above the ceiling
+    hot_peaks = quiet_peaks._replace(true_peak=-0.5)
+    assert audio.normalize_audio(audio_file, target_level=-20, tolerance=1.0, measurement=hot_peaks) is True
+    assert audio.normalize_audio(audio_file, target_level=-14, tolerance=0.5) is True
+    assert audio.normalize_audio(audio_file, target_level=-14, tolerance=0.5) is True
+    assert len(rewrites) == 3
+    assert analysis_runs == [audio_file]
+
+
+def test_worker_count_defaults_to_cores_bounded_by_batch(monkeypatch):
+    monkeypatch.setattr(normalize_module.os, "cpu_count", lambda: 8)
+    assert get_normalization_worker_count(SimpleNamespace(normalization_workers=0), 100) == 8
+    assert get_normalization_worker_count(SimpleNamespace(normalization_workers=3), 100) == 3
+    assert get_normalization_worker_count(SimpleNamespace(normalization_workers=16), 5) == 5
+    assert get_normalization_worker_count(SimpleNamespace(), 2) == 2
+
+
+def test_batch_worker_runs_songs_concurrently_within_the_bound(tmp_path, song_factory, monkeypatch):
+    songs = [song_factory(title=f"Song {index}", audio_file=_audio(tmp_path, f"{index}.mp3")) for index in range(6)]
+    config = SimpleNamespace(normalization_level=-20, normalization_tolerance=1.0, normalization_workers=3)
+    monkeypatch.setattr(normalize_module, "AppData", lambda: SimpleNamespace(config=config))
+
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def fake_normalize(audio_file, target_level, check_cancellation=None, tolerance=None):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        if audio_file.endswith("3.mp3"):
+            raise Exception("ffmpeg failed")
+        # Even songs are already within tolerance
+        return int(audio_file[-5]) % 2 == 1
+
+    monkeypatch.setattr(audio, "normalize_audio", fake_normalize)
+    worker = NormalizeAudioBatchWorker(songs)
+    finished, errors, done = [], [], []
+    worker.signals.songFinished.connect(lambda song, changed: finished.append((song.title, changed)))
+    worker.signals.songError.connect(lambda song, error: errors.append(song.title))
+    worker.signals.finished.connect(lambda: done.append(True))
+
+    asyncio.run(worker.run())
+
+    assert 1 < peak[0] <= 3
+    assert sorted(finished) == [
+        ("Song 0", False),
+        ("Song 1", True),
+        ("Song 2", False),
+        ("Song 4", False),
+        ("Song 5", True),
+    ]
+    assert errors == ["Song 3"] and done == [True]
+    assert songs[3].error_message == "ffmpeg failed"
+    assert all(song.gap_info.is_normalized for song in songs if song.title != "Song 3")
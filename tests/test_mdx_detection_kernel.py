@@ -0,0 +1,119 @@
+"""Parity tests: vectorized MDX onset kernel vs. the original per-frame loops."""
+
+import numpy as np
+import pytest
+
+from utils.providers.mdx.config import MdxConfig
+from utils.providers.mdx.detection import compute_rms, detect_onset_in_vocal_chunk, find_onset_frame
+
+
+def _legacy_compute_rms(audio, frame_samples, hop_samples):
+    num_frames = 1 + (len(audio) - frame_samples) // hop_samples
+    if num_frames <= 0:
+        return np.array([])
+    rms_values = np.zeros(num_frames)
+    for i in range(num_frames):
+        start = i * hop_samples
+        end = start + frame_samples
+        if end <= len(audio):
+            frame = audio[start:end]
+            rms_values[i] = np.sqrt(np.mean(frame**2))
+    return rms_values
+
+
+def _legacy_find_onset_frame(below_threshold, min_silence_frames, min_sound_frames):
+    above_threshold = ~below_threshold
+    onset_frame = None
+    i = 0
+    while i < len(below_threshold) - min_silence_frames - min_sound_frames:
+        if np.all(below_threshold[i : i + min_silence_frames]):
+            silence_end = i + min_silence_frames
+            for j in range(silence_end, min(silence_end + 50, len(above_threshold) - min_sound_frames)):
+                if np.all(above_threshold[j : j + min_sound_frames]):
+                    onset_frame = j
+                    break
+            if onset_frame is not None:
+                break
+            i = silence_end
+        else:
+            i += 1
+
+    if onset_frame is None:
+        for i in range(0, len(above_threshold) - min_sound_frames):
+            if np.all(above_threshold[i : i + min_sound_frames]):
+                return i
+    return onset_frame
+
+
+def _piecewise_signal(rng, sr, duration_s):
+    """Random sequence of quiet/loud noise segments (vocal-stem-like envelope)."""
+    parts = []
+    remaining = int(duration_s * sr)
+    while remaining > 0:
+        length = min(remaining, int(rng.uniform(0.05, 2.0) * sr))
+        level = rng.choice([0.001, 0.005, 0.05, 0.2])
+        parts.append(rng.normal(0, level, length))
+        remaining -= length
+    return np.concatenate(parts).astype(np.float32)
+
+
+@pytest.mark.parametrize("frame_samples,hop_samples", [(1102, 882), (1024, 512), (7, 3)])
+def test_compute_rms_matches_loop(frame_samples, hop_samples):
+    audio = np.random.default_rng(0).normal(0, 0.1, 44100).astype(np.float32)
+
+    np.testing.assert_allclose(
+        compute_rms(audio, frame_samples, hop_samples),
+        _legacy_compute_rms(audio, frame_samples, hop_samples),
+        rtol=1e-6,
+    )
+    assert len(compute_rms(audio[:100], 1102, 882)) == 0
+
+
+def test_find_onset_frame_matches_loop_on_random_masks():
+    rng = np.random.default_rng(1)
+    for _ in range(500):
+        n = int(rng.integers(0, 200))
+        # Runs of random length, so sustained silence/sound actually occur
+        mask = np.repeat(rng.random(n) < rng.random(), rng.integers(1, 25, n))[:n]
+        min_silence = int(rng.integers(1, 20))
+        min_sound = int(rng.integers(1, 20))
+
+        assert find_onset_frame(mask, min_silence, min_sound) == _legacy_find_onset_frame(mask, min_silence, min_sound)
+
+
+def test_skipped_silence_keeps_original_semantics():
+    # Sound 0-9, silence 10-20, no sustained sound until frame 70. The original scan checks
+    # the silence at frame 10 (sound window ends at 70) and then jumps past the silence, so
+    # the start at frame 11 (window reaching frame 70) is never tried and it falls back to 0.
+    mask = np.zeros(100, dtype=bool)
+    mask[10:21] = True
+    mask[21:70:2] = True
+
+    assert _legacy_find_onset_frame(mask, 10, 5) == 0
+    assert find_onset_frame(mask, 10, 5) == 0
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_detect_onset_matches_original_on_random_chunks(seed):
+    from unittest.mock import patch
+
+    rng = np.random.default_rng(seed)
+    sr = 44100
+    vocals = np.stack([_piecewise_signal(rng, sr, 12.0)] * 2)
+    config = MdxConfig()
+
+    expected_frame = None
+
+    def legacy_kernel(below_threshold, min_silence_frames, min_sound_frames):
+        nonlocal expected_frame
+        expected_frame = _legacy_find_onset_frame(below_threshold, min_silence_frames, min_sound_frames)
+        return expected_frame
+
+    onset = detect_onset_in_vocal_chunk(vocals, sr, 1000.0, config)
+    with (
+        patch("utils.providers.mdx.detection.compute_rms", side_effect=_legacy_compute_rms),
+        patch("utils.providers.mdx.detection.find_onset_frame", side_effect=legacy_kernel),
+    ):
+        legacy_onset = detect_onset_in_vocal_chunk(vocals, sr, 1000.0, config)
+
+    assert onset == legacy_onset
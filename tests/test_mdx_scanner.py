@@ -508,3 +508,58 @@ class TestScanForOnset:
         )
 
         assert onset_ms is None
+
+    @patch("utils.providers.mdx.audio_compat.torchaudio")
+    @patch("utils.providers.mdx.scanner.onset_detector.torchaudio")
+    @patch("utils.providers.mdx.scanner.onset_detector.separate_vocals_chunk")
+    @patch("utils.providers.mdx.scanner.onset_detector.separate_vocals_batch")
+    @patch("utils.providers.mdx.scanner.onset_detector.detect_onset_in_vocal_chunk")
+    def test_batches_window_chunks(
+        self, mock_detect, mock_separate_batch, mock_separate, mock_torchaudio, mock_torchaudio_compat
+    ):
+        """Chunks of a window are separated in batches of batch_size."""
+        mock_info = Mock()
+        mock_info.sample_rate = 44100
+        mock_info.num_frames = 44100 * 60
+        mock_torchaudio_compat.info.return_value = mock_info
+        mock_torchaudio.info.return_value = mock_info
+
+        mock_waveform = torch.randn(2, 44100 * 12)
+        mock_torchaudio_compat.load.return_value = (mock_waveform, 44100)
+        mock_torchaudio.load.return_value = (mock_waveform, 44100)
+
+        mock_separate_batch.side_effect = lambda waveforms, **kwargs: [np.zeros((2, 10))] * len(waveforms)
+        mock_separate.return_value = np.zeros((2, 10))
+        mock_detect.return_value = None
+
+        mock_config = Mock()
+        mock_config.chunk_duration_ms = 12000
+        mock_config.chunk_overlap_ms = 6000
+        mock_config.initial_radius_ms = 15000
+        mock_config.radius_increment_ms = 7500
+        mock_config.max_expansions = 0
+        mock_config.start_window_ms = 30000
+        mock_config.start_window_increment_ms = 15000
+        mock_config.start_window_max_ms = 30000
+        mock_config.resample_hz = 0
+        mock_config.use_fp16 = False
+        mock_config.hysteresis_ms = 200
+        mock_config.early_stop_tolerance_ms = 500
+        mock_config.batch_size = 2
+
+        onset_ms = scan_for_onset(
+            audio_file="test.mp3",
+            expected_gap_ms=15000.0,
+            model=Mock(),
+            device="cpu",
+            config=mock_config,
+            vocals_cache=Mock(),
+            total_duration_ms=60000.0,
+        )
+
+        assert onset_ms is None
+        batch_sizes = [len(call.kwargs["waveforms"]) for call in mock_separate_batch.call_args_list]
+        assert batch_sizes and all(size == 2 for size in batch_sizes)
+        # A trailing single chunk goes through the unbatched path
+        assert mock_separate.call_count <= 1
+        assert mock_detect.call_count == sum(batch_sizes) + mock_separate.call_count
@@ -0,0 +1,55 @@
+"""Tests for batched Demucs separation and batch sizing."""
+
+import numpy as np
+import torch
+
+from utils.providers.mdx import separator
+from utils.providers.mdx.separator import VOCALS_INDEX, resolve_batch_size, separate_vocals_batch
+
+
+def _fake_apply_model(calls):
+    def apply_model(model, mix, device):
+        calls.append(tuple(mix.shape))
+        # sources: (B, 4, C, T) with vocals = mix * 2 so results are traceable per item
+        sources = torch.zeros(mix.shape[0], 4, *mix.shape[1:])
+        sources[:, VOCALS_INDEX] = mix * 2
+        return sources
+
+    return apply_model
+
+
+def test_batch_groups_by_length_and_preserves_order(monkeypatch):
+    calls = []
+    monkeypatch.setattr(separator, "apply_model", _fake_apply_model(calls))
+    waveforms = [torch.full((2, 100), 1.0), torch.full((2, 60), 2.0), torch.full((2, 100), 3.0)]
+
+    vocals = separate_vocals_batch(None, waveforms, sample_rate=100, device="cpu", use_fp16=False)
+
+    assert sorted(calls) == [(1, 2, 60), (2, 2, 100)]
+    assert [v.shape for v in vocals] == [(2, 100), (2, 60), (2, 100)]
+    assert [float(v[0, 0]) for v in vocals] == [2.0, 4.0, 6.0]
+
+
+def test_batch_matches_single_chunk_separation(monkeypatch):
+    monkeypatch.setattr(separator, "apply_model", _fake_apply_model([]))
+    waveforms = [torch.randn(2, 50) for _ in range(3)]
+
+    batched = separate_vocals_batch(None, waveforms, sample_rate=50, device="cpu", use_fp16=False)
+    single = [separator.separate_vocals_chunk(None, w, 50, "cpu", False) for w in waveforms]
+
+    for a, b in zip(batched, single):
+        np.testing.assert_allclose(a, b)
+
+
+def test_resolve_batch_size():
+    assert resolve_batch_size(4, "cpu", False) == 4
+    assert resolve_batch_size(0, "cpu", False) == 1
+    assert resolve_batch_size("auto", "cpu", False) == 1
+
+
+def test_resolve_batch_size_from_free_vram(monkeypatch):
+    per_item = separator.CUDA_BYTES_PER_BATCH_ITEM
+    monkeypatch.setattr(torch.cuda, "mem_get_info", lambda: (int(per_item * 3 / separator.CUDA_MEMORY_HEADROOM), 0))
+
+    assert resolve_batch_size(0, "cuda", False) == 3
+    assert resolve_batch_size(0, "cuda", True) == 6
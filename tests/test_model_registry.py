@@ -0,0 +1,91 @@
+"""Tests for the process-wide Demucs model registry."""
+
+from utils.providers.mdx.model_loader import ModelLoader
+from utils.providers.mdx.model_registry import ModelRegistry, make_model_key
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _make_registry(idle_timeout_sec=60.0):
+    loads = []
+
+    def loader(model_name, device, use_fp16):
+        loads.append((model_name, device, use_fp16))
+        return object()
+
+    clock = _FakeClock()
+    registry = ModelRegistry(loader=loader, idle_timeout_sec=idle_timeout_sec, clock=clock)
+    return registry, loads, clock
+
+
+def test_make_model_key_ignores_fp16_on_cpu():
+    assert make_model_key("htdemucs", "cpu", True) == make_model_key("htdemucs", "cpu", False)
+    assert make_model_key("htdemucs", "cuda", True) != make_model_key("htdemucs", "cuda", False)
+
+
+def test_acquire_loads_model_once_across_loaders():
+    registry, loads, _ = _make_registry()
+
+    loaders = [ModelLoader(registry=registry) for _ in range(5)]
+    models = [loader.get_model("cpu", False) for loader in loaders]
+
+    assert len(loads) == 1
+    assert all(model is models[0] for model in models)
+    assert registry.ref_count("htdemucs", "cpu", False) == 5
+
+
+def test_repeated_get_model_holds_single_reference():
+    registry, _, _ = _make_registry()
+    loader = ModelLoader(registry=registry)
+
+    loader.get_model("cpu", False)
+    loader.get_model("cpu", False)
+
+    assert registry.ref_count("htdemucs", "cpu", False) == 1
+    loader.release()
+    loader.release()
+    assert registry.ref_count("htdemucs", "cpu", False) == 0
+
+
+def test_idle_model_evicted_after_timeout():
+    registry, loads, clock = _make_registry(idle_timeout_sec=60.0)
+    loader = ModelLoader(registry=registry)
+    loader.get_model("cpu", False)
+    loader.release()
+
+    clock.now = 30.0
+    assert registry.evict_idle() == 0
+    assert registry.is_loaded("htdemucs", "cpu", False)
+
+    clock.now = 120.0
+    assert registry.evict_idle() == 1
+    assert not registry.is_loaded("htdemucs", "cpu", False)
+
+    ModelLoader(registry=registry).get_model("cpu", False)
+    assert len(loads) == 2
+
+
+def test_referenced_model_never_evicted():
+    registry, _, clock = _make_registry(idle_timeout_sec=1.0)
+    ModelLoader(registry=registry).get_model("cpu", False)
+
+    clock.now = 1000.0
+
+    assert registry.evict_idle() == 0
+    assert registry.is_loaded("htdemucs", "cpu", False)
+
+
+def test_warm_up_loads_without_reference():
+    registry, loads, _ = _make_registry()
+
+    registry.warm_up("htdemucs", "cpu", False)
+    ModelLoader(registry=registry).get_model("cpu", False)
+
+    assert len(loads) == 1
+    assert registry.ref_count("htdemucs", "cpu", False) == 1
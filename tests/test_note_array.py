@@ -0,0 +1,106 @@
+"""Tests for the columnar NoteArray storage and vectorized note timing."""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from model.gap_info import GapInfo
+from model.song import Song
+from model.usdx_file import Note, NoteArray, compute_note_times
+from services.usdx_file_service import USDXFileService
+from utils.usdx import get_syllable
+
+CONTENT = """#TITLE:Title
+#ARTIST:Artist
+#BPM:300
+#GAP:1000
+: 0 4 5 Hel
+* 4 2 7 lo
+- 8
+F 10 3 2 world
+E
+"""
+
+
+def _note(start_beat, length, pitch=0, text="la"):
+    note = Note()
+    note.NoteType = ":"
+    note.StartBeat = start_beat
+    note.Length = length
+    note.Pitch = pitch
+    note.Text = text
+    return note
+
+
+def test_parse_returns_note_array_with_views():
+    _, notes = USDXFileService.parse(CONTENT)
+
+    assert isinstance(notes, NoteArray)
+    assert len(notes) == 3
+    assert [(n.NoteType, n.StartBeat, n.Length, n.Pitch, n.Text) for n in notes] == [
+        (":", 0, 4, 5, "Hel"),
+        ("*", 4, 2, 7, "lo"),
+        ("F", 10, 3, 2, "world"),
+    ]
+    assert notes[-1].Text == "world"
+    assert notes[0].start_ms is None
+    assert len(notes[1:]) == 2 and notes[1:][0].Text == "lo"
+
+
+def test_views_write_through():
+    notes = NoteArray.from_notes([_note(0, 4), _note(4, 4)])
+
+    notes[1].StartBeat = 8
+    notes[1].Text = "changed"
+    notes[0].start_ms = 12.5
+
+    assert notes.data["start_beat"].tolist() == [0, 8]
+    assert notes.texts == ["la", "changed"]
+    assert notes[0].start_ms == 12.5
+    with pytest.raises(IndexError):
+        notes[2]
+
+
+@pytest.mark.parametrize("is_relative", [False, True])
+def test_vectorized_times_match_per_note_times(is_relative):
+    plain = [_note(start, length) for start, length in [(0, 4), (7, 3), (250, 16), (1001, 1)]]
+    array = NoteArray.from_notes(plain)
+
+    compute_note_times(plain, 301.5, 1234, is_relative)
+    compute_note_times(array, 301.5, 1234, is_relative)
+
+    for expected, view in zip(plain, array):
+        assert (view.start_ms, view.end_ms, view.duration_ms) == (
+            expected.start_ms,
+            expected.end_ms,
+            expected.duration_ms,
+        )
+
+
+def test_syllable_lookup_uses_columns():
+    _, notes = USDXFileService.parse(CONTENT)
+    plain = list(NoteArray.from_notes(notes))
+
+    for position_ms in (900, 1000, 1150, 1205, 1400, 1550, 5000):
+        assert get_syllable(notes, position_ms, 300, 1000) == get_syllable(plain, position_ms, 300, 1000)
+
+
+def test_models_use_slots_and_pickle_without_notes():
+    song = Song("/songs/a/a.txt")
+    song.notes = NoteArray.from_notes([_note(0, 4)])
+    song.gap_info = GapInfo("/songs/a/usdxfixgap.info", "a.txt")
+
+    assert not hasattr(song, "__dict__") and not hasattr(song.gap_info, "__dict__")
+    restored = pickle.loads(pickle.dumps(song))
+    assert restored.notes is None
+    assert restored.gap_info.owner is restored
+    assert restored.txt_file == "/songs/a/a.txt"
+
+
+def test_note_array_is_compact():
+    notes = NoteArray.from_rows([(":", beat, 2, 0, "la") for beat in range(600)])
+
+    # U1 type + three int32 columns + three float64 timing columns
+    assert notes.data.nbytes == 600 * (4 * 4 + 3 * 8)
+    assert np.isnan(notes.data["start_ms"]).all()
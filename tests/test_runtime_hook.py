@@ -289,6 +289,7 @@ class TestReorderSyspathForGpuPack:
         # Setup: include both _MEIPASS and a derived path (like base_library.zip)
         sys._MEIPASS = meipass
         base_lib = meipass + "/base_library.zip"
+        saved_path = sys.path.copy()
         original_path = [base_lib, "/some/path", meipass, "/another/path"]
         sys.path[:] = original_path.copy()
 
@@ -304,7 +305,7 @@ class TestReorderSyspathForGpuPack:
             # _MEIPASS should appear only once
             assert sys.path.count(meipass) == 1
         finally:
-            sys.path[:] = original_path
+            sys.path[:] = saved_path
             delattr(sys, "_MEIPASS")
 
 
@@ -0,0 +1,183 @@
+"""Tests for the directory journal that lets rescans skip unchanged song folders."""
+
+import asyncio
+import os
+import time
+import wave
+from types import SimpleNamespace
+
+import pytest
+
+import common.database as db_module
+from common.database import (
+    ScanJournalEntry,
+    clear_cache,
+    close_connections,
+    get_scan_journal,
+    invalidate_scan_journal,
+    replace_scan_journal,
+)
+from services.library_scanner import DirectoryJournal, walk_directory_tree
+from workers.load_usdx_files import LoadUsdxFilesWorker
+
+SONG = "#TITLE:{title}\n#ARTIST:Artist\n#MP3:audio.wav\n#BPM:120\n#GAP:0\n: 0 4 0 la\nE\n"
+PAST = time.time() - 3600
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path):
+    db_module._db_initialized = False
+    db_module._DB_PATH = str(tmp_path / "cache" / "test_cache.db")
+    yield
+    db_module._writes.discard()
+    db_module._duration_writes.discard()
+    close_connections()
+    db_module._db_initialized = False
+    db_module._DB_PATH = None
+
+
+def _age(*paths):
+    """Move directory mtimes out of the racy window."""
+    for path in paths:
+        os.utime(path, (PAST, PAST))
+
+
+def _add_song(folder, title):
+    folder.mkdir(parents=True)
+    (folder / f"{title}.txt").write_text(SONG.format(title=title))
+    _age(folder / f"{title}.txt")
+    with wave.open(str(folder / "audio.wav"), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(b"\x00\x00" * 8000)
+
+
+def _make_library(root):
+    for artist in ("A", "B"):
+        for song in ("one", "two"):
+            _add_song(root / artist / song, f"{artist} {song}")
+    _age(*(root / artist / song for artist in ("A", "B") for song in ("one", "two")), root / "A", root / "B", root)
+
+
+def _journal(previous=None, counts=None):
+    return DirectoryJournal(previous or {}, counts or {}, lambda name: name.endswith(".txt"))
+
+
+def _walked(root, journal):
+    return {os.path.relpath(path, root) for path, _, _ in walk_directory_tree(str(root), 2, journal=journal)}
+
+
+def test_walk_records_listed_directories(tmp_path):
+    _make_library(tmp_path)
+    journal = _journal()
+
+    assert len(_walked(tmp_path, journal)) == 7
+
+    song_folder = journal.entries[DirectoryJournal.key(str(tmp_path / "A" / "one"))]
+    txt = os.stat(tmp_path / "A" / "one" / "A one.txt")
+    assert song_folder == ScanJournalEntry(
+        os.stat(tmp_path / "A" / "one").st_mtime_ns, 2, 0, 1, (("A one.txt", txt.st_mtime_ns, txt.st_size),)
+    )
+    assert journal.entries[DirectoryJournal.key(str(tmp_path / "A"))].subdir_count == 2
+
+
+def test_walk_skips_unchanged_song_folders(tmp_path):
+    _make_library(tmp_path)
+    first = _journal()
+    _walked(tmp_path, first)
+    counts = {key: entry.song_count for key, entry in first.entries.items()}
+
+    _add_song(tmp_path / "B" / "three", "B three")
+    (tmp_path / "A" / "two" / "cover.jpg").write_bytes(b"")
+    second = _journal(first.entries, counts)
+
+    assert _walked(tmp_path, second) == {".", "A", "B", os.path.join("A", "two"), os.path.join("B", "three")}
+    assert sorted(second.skipped) == [DirectoryJournal.key(str(tmp_path / p)) for p in ("A/one", "B/one", "B/two")]
+    # Skipped folders carry their entry over; recently changed ones are not journaled yet
+    assert DirectoryJournal.key(str(tmp_path / "B" / "one")) in second.entries
+    assert DirectoryJournal.key(str(tmp_path / "A" / "two")) not in second.entries
+
+
+def test_folder_is_listed_when_txt_is_edited_in_place(tmp_path):
+    _make_library(tmp_path)
+    first = _journal()
+    _walked(tmp_path, first)
+    counts = {key: entry.song_count for key, entry in first.entries.items()}
+
+    # Rewriting a file keeps the folder mtime on most filesystems; restore it explicitly to be sure
+    song_folder = tmp_path / "A" / "one"
+    (song_folder / "A one.txt").write_text(SONG.format(title="A one edited"))
+    _age(song_folder / "A one.txt", song_folder)
+
+    second = _journal(first.entries, counts)
+    assert os.path.join("A", "one") in _walked(tmp_path, second)
+    assert DirectoryJournal.key(str(song_folder)) not in second.skipped
+
+
+def test_folder_is_listed_when_cache_lost_its_songs(tmp_path):
+    _make_library(tmp_path)
+    first = _journal()
+    _walked(tmp_path, first)
+    counts = {key: entry.song_count for key, entry in first.entries.items()}
+    counts[DirectoryJournal.key(str(tmp_path / "A" / "one"))] = 0
+
+    assert os.path.join("A", "one") in _walked(tmp_path, _journal(first.entries, counts))
+
+
+def test_journal_persistence(tmp_path):
+    library = str(tmp_path / "library")
+    entries = {
+        DirectoryJournal.key(library): ScanJournalEntry(1, 2, 2, 0),
+        DirectoryJournal.key(library + "/a"): ScanJournalEntry(3, 2, 0, 1, (("a.txt", 5, 6),)),
+    }
+    replace_scan_journal(library, {**entries, DirectoryJournal.key(library + "/b"): ScanJournalEntry(4, 1, 0, 1)})
+    replace_scan_journal(library, entries)
+    replace_scan_journal(str(tmp_path / "other"), {DirectoryJournal.key(str(tmp_path / "other")): entries[library]})
+
+    assert get_scan_journal(library) == entries
+
+    invalidate_scan_journal(library + "/a")
+    assert list(get_scan_journal(library)) == [DirectoryJournal.key(library)]
+
+    clear_cache()
+    assert get_scan_journal() == {}
+
+
+def _scan(library, tmp_path):
+    worker = LoadUsdxFilesWorker(str(library), str(tmp_path / "tmp"), SimpleNamespace(song_list_batch_size=10))
+    worker.incremental_scan = True
+    emitted = []
+    worker.signals.songsLoadedBatch.connect(lambda songs: emitted.extend(song.title for song in songs))
+    asyncio.run(worker.run())
+    return worker, emitted
+
+
+def test_incremental_scan_only_loads_changed_folders(tmp_path):
+    library = tmp_path / "library"
+    _make_library(library)
+
+    worker, emitted = _scan(library, tmp_path)
+    assert sorted(emitted) == ["A one", "A two", "B one", "B two"]
+    assert worker._journal.skipped == []
+
+    _add_song(library / "A" / "three", "A three")
+    worker, emitted = _scan(library, tmp_path)
+
+    # Cached songs are emitted from the cache, the new one from the scan
+    assert sorted(emitted) == ["A one", "A three", "A two", "B one", "B two"]
+    assert len(worker._journal.skipped) == 4
+    assert DirectoryJournal.key(str(library / "A" / "three")) not in get_scan_journal(str(library))
+
+
+def test_failed_songs_keep_their_folder_listed(tmp_path):
+    library = tmp_path / "library"
+    _make_library(library)
+    (library / "A" / "one" / "A one.txt").write_text("#ARTIST:no title\n")
+    _age(library / "A" / "one")
+
+    _scan(library, tmp_path)
+
+    journal = get_scan_journal(str(library))
+    assert DirectoryJournal.key(str(library / "A" / "one")) not in journal
+    assert DirectoryJournal.key(str(library / "A" / "two")) in journal
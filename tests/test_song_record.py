@@ -0,0 +1,112 @@
+"""Tests for the compact binary song cache records."""
+
+import pickle
+from datetime import datetime
+
+import pytest
+
+from common.cache_schema import CacheEnvelope, deserialize_payload, serialize_payload
+from common.song_record import RecordEncodeError, decode_song, encode_song, is_song_record
+from model.gap_info import GapInfo, GapInfoStatus
+from model.song import Song, SongStatus
+
+
+def _song(with_gap_info=True):
+    song = Song("Z:/Songs/Artist - Title/Artist - Title.txt")
+    song.title = "Title"
+    song.artist = "Artist"
+    song.audio = "Artist - Title.mp3"
+    song.audio_file = "Z:/Songs/Artist - Title/Artist - Title.mp3"
+    song.gap = 1234
+    song.bpm = 301.5
+    song.usdb_id = 4711
+    song.duration_ms = 201000
+    if with_gap_info:
+        gap_info = GapInfo("Z:/Songs/Artist - Title/usdxfixgap.info", "Artist - Title.txt")
+        gap_info.status = GapInfoStatus.MISMATCH
+        gap_info.original_gap = 1234
+        gap_info.detected_gap = 1180.5
+        gap_info.silence_periods = [(0.0, 1100.25), (5000, 5600)]
+        gap_info.processed_time = "2025-01-01 10:00:00"
+        gap_info.confidence = 0.91
+        gap_info.processed_txt_signature = {"size": 123, "mtime": 1.5, "sha256": "ab" * 32}
+        song.gap_info = gap_info
+    return song
+
+
+def _state(obj, *skip):
+    return {key: value for key, value in obj.__getstate__().items() if key not in skip}
+
+
+@pytest.mark.parametrize("with_gap_info", [True, False])
+def test_round_trip_matches_pickle(with_gap_info):
+    song = _song(with_gap_info)
+
+    restored = decode_song(encode_song(song))
+    pickled = pickle.loads(pickle.dumps(song))
+
+    assert _state(restored, "_gap_info") == _state(pickled, "_gap_info")
+    assert type(restored.gap) is int and type(restored.bpm) is float
+    assert isinstance(restored._status_changed_at, datetime)
+    if with_gap_info:
+        assert _state(restored.gap_info, "owner", "silence_periods") == _state(
+            pickled.gap_info, "owner", "silence_periods"
+        )
+        assert restored.gap_info.silence_periods == [(0.0, 1100.25), (5000.0, 5600.0)]
+        assert restored.gap_info.owner is restored
+        assert restored.status == SongStatus.MISMATCH
+    else:
+        assert restored.gap_info is None
+
+
+def test_record_is_smaller_than_pickle_and_stores_folder_once():
+    song = _song()
+
+    record = encode_song(song)
+
+    assert is_song_record(record)
+    assert len(record) < len(pickle.dumps(CacheEnvelope(1, "song", song))) / 2
+    assert record.count(b"Z:/Songs/Artist - Title/") == 1
+
+
+def test_unicode_and_empty_strings_round_trip():
+    song = Song("/songs/Björk – Jóga/Björk – Jóga.txt")
+    song.title = "Jóga 🎤"
+    song.error_message = None
+
+    restored = decode_song(encode_song(song))
+
+    assert restored.txt_file == song.txt_file
+    assert restored.title == "Jóga 🎤"
+    assert restored.artist == ""
+    assert restored.error_message is None
+
+
+def test_unset_attributes_fall_back_to_pickle():
+    song = _song()
+    del song.usdb_id
+
+    with pytest.raises(RecordEncodeError):
+        encode_song(song)
+
+    blob = serialize_payload(song)
+    assert not is_song_record(blob)
+    restored, migrated = deserialize_payload("x", blob)
+    assert restored.title == "Title" and not migrated
+
+
+def test_pickled_songs_are_flagged_for_rewrite():
+    song = _song()
+
+    restored, migrated = deserialize_payload("x", pickle.dumps(CacheEnvelope(1, "song", song)))
+
+    assert migrated
+    assert is_song_record(serialize_payload(restored))
+
+
+def test_corrupt_record_is_rejected():
+    record = encode_song(_song())
+
+    with pytest.raises(ValueError):
+        decode_song(record[:20])
+    assert deserialize_payload("x", record[:-40] + b"\xff") == (None, False)
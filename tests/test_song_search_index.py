@@ -0,0 +1,151 @@
+"""Tests for the song list search index and the index-backed proxy filter."""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+from PySide6.QtCore import Qt
+
+from model.song import Song, SongStatus
+from model.songs import Songs
+from ui.songlist.search_index import MAX_NEW_POSTINGS_PER_QUERY, SongSearchIndex
+from ui.songlist.songlist_model import SongTableModel
+from ui.songlist.songlist_widget import CustomSortFilterProxyModel
+
+WORDS = ["love", "night", "heart", "dance", "fire", "rain", "über", "dream", "light", "baby"]
+STATUSES = ["MATCH", "MISMATCH", "NOT_PROCESSED"]
+
+
+def _entry(artist, title, relative_path):
+    return {"artist_lower": artist, "title_lower": title, "relative_path_lower": relative_path}
+
+
+def _brute_force(entries, text, statuses):
+    return {
+        path
+        for path, (entry, status) in entries.items()
+        if (not statuses or status in statuses)
+        and (not text or any(text in entry[field] for field in ("artist_lower", "title_lower", "relative_path_lower")))
+    }
+
+
+def test_queries_match_substring_scan():
+    rng = random.Random(7)
+    index, entries = SongSearchIndex(), {}
+    for i in range(300):
+        artist, title = f"{rng.choice(WORDS)} {rng.choice(WORDS)}", " ".join(rng.sample(WORDS, 3))
+        entries[f"/lib/{i}"] = (_entry(artist, title, f"{artist}/{title} {i}"), rng.choice(STATUSES))
+    for path, (entry, status) in entries.items():
+        index.add(path, entry, status)
+
+    for text in ["", "l", "ht", "ove", "love n", "über", "e/d", "zzz", "light dream baby 1"]:
+        for statuses in ([], ["MATCH"], ["MATCH", "NOT_PROCESSED"]):
+            assert index.query(text, statuses) == _brute_force(entries, text, statuses), (text, statuses)
+
+
+def test_postings_follow_updates_and_removals():
+    index = SongSearchIndex()
+    index.add("/a", _entry("abba", "waterloo", "abba/waterloo"), "MATCH")
+    index.add("/b", _entry("queen", "bohemian rhapsody", "queen/bohemian"), "MATCH")
+    assert index.query("abba") == {"/a"}
+
+    generation = index.generation
+    index.add("/a", _entry("abba", "waterloo", "abba/waterloo"), "MATCH")
+    assert index.generation == generation  # nothing searchable changed
+
+    index.add("/b", _entry("abba", "mamma mia", "abba/mamma mia"), "ERROR")
+    assert index.query("abba") == {"/a", "/b"}
+    assert index.query("queen") == set()
+    assert index.query("", ["ERROR"]) == {"/b"}
+
+    index.remove("/a")
+    assert index.query("abba") == {"/b"}
+    assert "/a" not in index and len(index) == 1
+
+
+def test_long_text_builds_limited_postings():
+    index = SongSearchIndex()
+    index.add("/a", _entry("artist", "a very long song title", "artist/title"), "MATCH")
+
+    assert index.query("a very long song title") == {"/a"}
+    assert len(index._postings) == MAX_NEW_POSTINGS_PER_QUERY
+
+
+@pytest.fixture
+def proxy(qtbot):
+    songs = Songs()
+    data = SimpleNamespace(directory="/lib", config=SimpleNamespace(default_directory=""), selected_songs=[])
+    model = SongTableModel(songs, data)
+    batch = []
+    for name, artist in (("waterloo", "abba"), ("bohemian", "queen"), ("mamma mia", "abba"), ("yesterday", "beatles")):
+        song = Song(f"/lib/{artist}/{name}/{name}.txt")
+        song.title, song.artist = name, artist
+        batch.append(song)
+    songs.add_batch(batch)
+    proxy = CustomSortFilterProxyModel(data)
+    proxy.setSourceModel(model)
+    return songs, data, proxy
+
+
+def _shown(proxy):
+    return sorted(proxy.index(row, 0).data(Qt.ItemDataRole.UserRole).title for row in range(proxy.rowCount()))
+
+
+def test_proxy_filters_through_index(proxy):
+    songs, data, proxy = proxy
+
+    proxy.textFilter = "abb"
+    proxy.invalidate()
+    assert _shown(proxy) == ["mamma mia", "waterloo"]
+
+    proxy.selectedStatuses = [SongStatus.ERROR.name]
+    proxy.invalidate()
+    assert _shown(proxy) == []
+
+    # Selected songs stay visible, status changes reach the index through the updated signal
+    data.selected_songs = [songs.songs[1]]
+    songs.songs[0].set_error("broken")
+    songs.updated.emit(songs.songs[0])
+    proxy.invalidate()
+    assert _shown(proxy) == ["bohemian", "waterloo"]
+
+
+def test_proxy_sees_rows_added_and_removed_after_filtering(proxy):
+    songs, data, proxy = proxy
+    proxy.textFilter = "abba"
+    proxy.invalidate()
+
+    song = Song("/lib/abba/sos/sos.txt")
+    song.title, song.artist = "sos", "abba"
+    songs.add_batch([song])
+    songs.remove_batch([songs.songs[0]])
+    proxy.invalidate()
+
+    assert _shown(proxy) == ["mamma mia", "sos"]
+
+
+def test_proxy_filters_songs_sharing_a_folder_separately(proxy):
+    songs, data, proxy = proxy
+    alpha, beta = Song("/lib/duets/alpha.txt"), Song("/lib/duets/beta.txt")
+    alpha.title, beta.title = "alpha", "beta"
+    alpha.artist = beta.artist = "duo"
+    alpha.status, beta.status = SongStatus.MATCH, SongStatus.MISMATCH
+    songs.add_batch([alpha, beta])
+
+    for statuses, expected in (([SongStatus.MATCH.name], ["alpha"]), ([SongStatus.MISMATCH.name], ["beta"])):
+        proxy.selectedStatuses = statuses
+        proxy.invalidate()
+        assert _shown(proxy) == expected
+
+    songs.remove_batch([alpha])
+    beta.status = SongStatus.MATCH
+    songs.updated.emit(beta)
+    proxy.selectedStatuses = []
+    proxy.textFilter = "beta"
+    proxy.invalidate()
+    assert _shown(proxy) == ["beta"]
+
+    proxy.textFilter = ""
+    proxy.selectedStatuses = [SongStatus.MATCH.name]
+    proxy.invalidate()
+    assert _shown(proxy) == ["beta"]
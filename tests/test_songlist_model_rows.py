@@ -0,0 +1,89 @@
+"""Tests for the txt file -> row index and batched removals of SongTableModel."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from PySide6.QtCore import Qt
+
+from model.song import Song
+from model.songs import Songs
+from ui.songlist.songlist_model import SongTableModel
+
+
+@pytest.fixture
+def table(qtbot):
+    songs = Songs()
+    data = SimpleNamespace(directory="/lib", config=SimpleNamespace(default_directory=""), selected_songs=[])
+    model = SongTableModel(songs, data)
+    songs.add_batch([_song(name) for name in "abcdefgh"])
+    return songs, model
+
+
+def _song(name):
+    song = Song(f"/lib/{name}/{name}.txt")
+    song.title, song.artist = name, "Artist"
+    return song
+
+
+def _titles(model):
+    return "".join(song.title for song in model.songs)
+
+
+def test_rows_are_indexed_on_insert_and_sort(table):
+    songs, model = table
+
+    assert model._row_by_file == {song.txt_file: row for row, song in enumerate(songs.songs)}
+
+    model.sort(2, Qt.SortOrder.DescendingOrder)
+    assert _titles(model) == "hgfedcba"
+    assert model._row_of(songs.get_by_txt_file("/lib/h/h.txt")) == 0
+
+
+def test_update_marks_row_of_the_song(table):
+    songs, model = table
+
+    songs.updated.emit(songs.songs[5])
+    songs.updated.emit(_song("b"))  # e.g. a reloaded instance of a listed song
+    songs.updated.emit(_song("unknown"))
+
+    assert model._dirty_rows == {1, 5}
+
+
+def test_batch_removal_emits_contiguous_ranges(table):
+    songs, model = table
+    ranges = []
+    model.rowsAboutToBeRemoved.connect(lambda parent, first, last: ranges.append((first, last)))
+    model._dirty_rows.update({0, 2, 6, 7})
+
+    removed = songs.remove_batch([songs.songs[i] for i in (5, 1, 2, 3)])
+
+    assert [song.title for song in removed] == ["b", "c", "d", "f"]
+    assert ranges == [(5, 5), (1, 3)]
+    assert _titles(model) == "aegh"
+    assert model._row_by_file == {song.txt_file: row for row, song in enumerate(model.songs)}
+    # Pending updates follow their rows; updates of removed rows are dropped
+    assert model._dirty_rows == {0, 2, 3}
+
+
+def test_single_removal_keeps_index_in_sync(table):
+    songs, model = table
+
+    songs.remove(songs.songs[0])
+    songs.updated.emit(songs.songs[-1])
+
+    assert _titles(model) == "bcdefgh"
+    assert model._dirty_rows == {6}
+
+
+def test_remove_by_txt_files_skips_unknown_paths(table):
+    songs, model = table
+    deleted = Mock()
+    songs.deletedBatch.connect(deleted)
+
+    assert songs.remove_by_txt_files(["/lib/a/a.txt", "/lib/zz/zz.txt", "/lib/h/h.txt"]) == 2
+    assert songs.remove_by_txt_files(["/lib/zz/zz.txt"]) == 0
+
+    deleted.assert_called_once()
+    assert _titles(model) == "bcdefg"
+    assert songs.get_by_txt_file("/lib/a/a.txt") is None
@@ -0,0 +1,105 @@
+"""Tests for the persistent vocal stem cache."""
+
+import os
+
+import numpy as np
+
+from utils.providers.mdx.stem_cache import StemCache, audio_fingerprint, get_stem_cache
+
+
+def _write_audio(path, content=b"\x01" * 1000):
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_fingerprint_stable_and_content_sensitive(tmp_path):
+    audio = _write_audio(tmp_path / "song.mp3")
+    first = audio_fingerprint(audio)
+
+    assert first == audio_fingerprint(audio)
+
+    stat_result = os.stat(audio)
+    _write_audio(tmp_path / "song.mp3", b"\x02" * 1000)
+    os.utime(audio, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+    assert audio_fingerprint(audio) != first
+    assert audio_fingerprint(str(tmp_path / "missing.mp3")) is None
+
+
+def test_put_get_roundtrip_float16(tmp_path):
+    cache = StemCache(str(tmp_path / "stems"), max_bytes=10 * 1024 * 1024)
+    vocals = np.random.uniform(-1, 1, (2, 4410)).astype(np.float32)
+
+    cache.put("fp", "htdemucs", 44100, 0, 12000, vocals)
+    loaded = cache.get("fp", "htdemucs", 44100, 0, 12000)
+
+    assert loaded.dtype == np.float32
+    np.testing.assert_allclose(loaded, vocals, atol=1e-3)
+    assert cache.get("fp", "htdemucs", 32000, 0, 12000) is None
+    assert cache.get("fp", "htdemucs", 44100, 6000, 18000) is None
+
+
+def test_survives_new_instance(tmp_path):
+    root = str(tmp_path / "stems")
+    StemCache(root, max_bytes=1024 * 1024).put("fp", "htdemucs", 100, 0, 1000, np.ones((2, 100)))
+
+    assert StemCache(root, max_bytes=1024 * 1024).get("fp", "htdemucs", 100, 0, 1000) is not None
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    vocals = np.zeros((2, 1000), dtype=np.float32)  # ~4 KB as float16 .npy
+    cache = StemCache(str(tmp_path / "stems"), max_bytes=10 * 1024)
+
+    cache.put("fp", "htdemucs", 100, 0, 1000, vocals)
+    cache.put("fp", "htdemucs", 100, 1000, 2000, vocals)
+    # Make the first entry the most recently used
+    oldest = os.path.join(cache.root_dir, cache.make_key("fp", "htdemucs", 100, 1000, 2000) + ".npy")
+    os.utime(oldest, ns=(0, 0))
+    cache.get("fp", "htdemucs", 100, 0, 1000)
+    cache.put("fp", "htdemucs", 100, 2000, 3000, vocals)
+
+    assert cache.total_bytes() <= 10 * 1024
+    assert cache.get("fp", "htdemucs", 100, 0, 1000) is not None
+    assert cache.get("fp", "htdemucs", 100, 1000, 2000) is None
+    assert cache.get("fp", "htdemucs", 100, 2000, 3000) is not None
+
+
+def test_get_stem_cache_disabled_without_tmp_root_or_size(tmp_path):
+    class Cfg:
+        tmp_root = str(tmp_path)
+        mdx_stem_cache_mb = 0
+
+    assert get_stem_cache(Cfg()) is None
+    Cfg.mdx_stem_cache_mb = 16
+    assert get_stem_cache(Cfg()).root_dir == os.path.join(str(tmp_path), "stems")
+    Cfg.tmp_root = None
+    assert get_stem_cache(Cfg()) is None
+
+
+def test_onset_pipeline_skips_separation_on_stem_hit(tmp_path):
+    from unittest.mock import Mock, patch
+
+    import torch
+
+    from utils.providers.mdx.scanner.chunk_iterator import ChunkBoundaries
+    from utils.providers.mdx.scanner.onset_detector import OnsetDetectorPipeline
+
+    audio = _write_audio(tmp_path / "song.mp3")
+    cache = StemCache(str(tmp_path / "stems"), max_bytes=10 * 1024 * 1024)
+    info = Mock(sample_rate=100, num_frames=100 * 60)
+    config = Mock(resample_hz=0, use_fp16=False, batch_size=1)
+
+    with (
+        patch("utils.providers.mdx.scanner.onset_detector.get_audio_info_compat", return_value=info),
+        patch("utils.providers.mdx.scanner.onset_detector.OnsetDetectorPipeline._load_chunk") as mock_load,
+        patch("utils.providers.mdx.scanner.onset_detector.separate_vocals_chunk") as mock_separate,
+        patch("utils.providers.mdx.scanner.onset_detector.detect_onset_in_vocal_chunk", return_value=None),
+    ):
+        mock_load.return_value = torch.zeros(2, 1200)
+        mock_separate.return_value = np.ones((2, 1200), dtype=np.float32)
+
+        for _ in range(2):
+            pipeline = OnsetDetectorPipeline(audio, Mock(), "cpu", config, Mock(), stem_cache=cache)
+            pipeline.process_chunk(ChunkBoundaries(0, 12000))
+
+    assert mock_separate.call_count == 1
+    assert mock_load.call_count == 1
@@ -0,0 +1,82 @@
+"""Tests for overlap-add stitching of scanner chunk stems into the vocals track."""
+
+from unittest.mock import patch
+
+import numpy as np
+import torch
+
+from common.config import Config
+from utils.providers.mdx.stem_stitcher import StemCollector, stitch_segments, uncovered_ranges
+
+
+def _chunks(signal, chunk, hop):
+    return [(start, signal[:, start : start + chunk]) for start in range(0, signal.shape[1], hop)]
+
+
+def test_overlap_add_reconstructs_identical_chunks():
+    signal = np.random.uniform(-1, 1, (2, 1000)).astype(np.float32)
+
+    track, covered = stitch_segments(_chunks(signal, 200, 100), 1000, fade_samples=50)
+
+    assert covered.all()
+    np.testing.assert_allclose(track, signal, atol=1e-5)
+
+
+def test_overlap_add_crossfades_between_chunks():
+    first = (0, np.ones((2, 200), dtype=np.float32))
+    second = (100, np.zeros((2, 200), dtype=np.float32))
+
+    track, _ = stitch_segments([first, second], 300, fade_samples=100)
+
+    overlap = track[0, 100:200]
+    assert overlap[0] > 0.95 and overlap[-1] < 0.05
+    assert np.all(np.diff(overlap) <= 0)
+
+
+def test_uncovered_ranges_reports_gaps():
+    segments = [(100, np.ones((2, 100), dtype=np.float32)), (400, np.ones((2, 200), dtype=np.float32))]
+
+    _, covered = stitch_segments(segments, 700, fade_samples=10)
+
+    assert uncovered_ranges(covered) == [(0, 100), (200, 400), (600, 700)]
+    assert uncovered_ranges(np.ones(10, dtype=bool)) == []
+
+
+def test_collector_converts_chunk_times_to_sample_offsets():
+    collector = StemCollector()
+    vocals = np.zeros((2, 10), dtype=np.float32)
+    collector.add("song.mp3", 6000.0, 18000.0, 1000, vocals)
+    collector.add("song.mp3", 0.0, 12000.0, 1000, vocals)
+
+    segments, sample_rate = collector.segments("song.mp3")
+
+    assert sample_rate == 1000
+    assert [start for start, _ in segments] == [0, 6000]
+    assert collector.segments("other.mp3") == ([], None)
+    collector.clear()
+    assert collector.segments("song.mp3") == ([], None)
+
+
+def test_provider_only_separates_regions_scanner_missed():
+    from utils.providers.mdx_provider import MdxProvider
+
+    provider = MdxProvider(Config())
+    sample_rate = 1000
+    waveform = torch.zeros(2, 30 * sample_rate)
+    provider._stem_collector.add("song.mp3", 0.0, 12000.0, sample_rate, np.ones((2, 12000), dtype=np.float32))
+    provider._stem_collector.add("song.mp3", 6000.0, 18000.0, sample_rate, np.ones((2, 12000), dtype=np.float32))
+
+    separated_lengths = []
+
+    def fake_separation(chunk, rate, duration, track_duration_sec):
+        separated_lengths.append(chunk.shape[1])
+        return torch.ones(chunk.shape)
+
+    with patch.object(provider, "_run_demucs_separation", side_effect=fake_separation):
+        vocals, rate = provider._assemble_vocals("song.mp3", waveform, sample_rate, 30, 180.0)
+
+    fade = int(provider.mdx_config.chunk_overlap_ms / 2000.0 * sample_rate)
+    assert rate == sample_rate
+    assert separated_lengths == [12000 + fade]
+    assert vocals.shape == (2, 30000)
+    np.testing.assert_allclose(vocals.numpy(), 1.0, atol=1e-5)
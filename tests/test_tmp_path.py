@@ -0,0 +1,44 @@
+"""Tests for per-song temp path resolution."""
+
+import os
+
+from utils import files
+
+
+def test_same_basename_in_different_folders_does_not_collide(tmp_path):
+    first = files.get_tmp_path(str(tmp_path), os.path.join("songs", "A", "song.mp3"))
+    second = files.get_tmp_path(str(tmp_path), os.path.join("songs", "B", "song.mp3"))
+
+    assert first != second
+    assert os.path.basename(first).startswith("song_")
+
+
+def test_tmp_path_is_stable():
+    audio = os.path.join("songs", "A", "song.mp3")
+
+    assert files.get_tmp_path("/tmp", audio) == files.get_tmp_path("/tmp", audio)
+
+
+def test_legacy_tmp_folder_is_renamed_on_first_use(tmp_path):
+    audio = os.path.join("songs", "A", "song.mp3")
+    legacy = tmp_path / "song"
+    legacy.mkdir()
+    (legacy / "vocals.mp3").write_bytes(b"vocals")
+
+    migrated = files.get_tmp_path(str(tmp_path), audio)
+
+    assert not legacy.exists()
+    with open(files.get_vocals_path(migrated), "rb") as f:
+        assert f.read() == b"vocals"
+    # A second song with the same base name does not take over the migrated folder
+    assert not os.path.exists(files.get_tmp_path(str(tmp_path), os.path.join("songs", "B", "song.mp3")))
+
+
+def test_legacy_tmp_folder_is_left_when_hashed_folder_exists(tmp_path):
+    audio = os.path.join("songs", "A", "song.mp3")
+    current = files.get_tmp_path(str(tmp_path), audio)
+    os.makedirs(current)
+    (tmp_path / "song").mkdir()
+
+    assert files.get_tmp_path(str(tmp_path), audio) == current
+    assert (tmp_path / "song").is_dir()
@@ -0,0 +1,111 @@
+"""Tests for the single-read USDX loader and the shared first-character dispatch parser."""
+
+import asyncio
+import codecs
+
+import pytest
+
+from model.usdx_file import Tags, USDXFile, ValidationError
+from services.usdx.parsers import create_registry, get_registry
+from services.usdx_file_service import USDXFileService
+
+CONTENT = """#TITLE:Title: With Colon
+#ARTIST:Artist
+#MP3:song.mp3
+#BPM:300,5
+#GAP:1000
+#UNKNOWN:ignored
+: 0 4 5 Hel
+*  4 2 7   lo  there
+- 8
+R 10 3 2 world
+E
+: 20 4 5 after end
+"""
+
+
+def _load(tmp_path, data, headers_only=False):
+    path = tmp_path / "song.txt"
+    path.write_bytes(data)
+    usdx_file = USDXFile(str(path))
+    asyncio.run(USDXFileService.load(usdx_file, headers_only=headers_only))
+    return usdx_file
+
+
+def test_parse_dispatches_tags_and_stops_at_end_marker():
+    tags, notes = USDXFileService.parse(CONTENT)
+
+    assert (tags.TITLE, tags.ARTIST, tags.AUDIO, tags.BPM, tags.GAP) == ("Title", "Artist", "song.mp3", 300.5, 1000)
+    assert [(n.NoteType, n.StartBeat, n.Length, n.Pitch, n.Text) for n in notes] == [
+        (":", 0, 4, 5, "Hel"),
+        ("*", 4, 2, 7, "lo there"),
+        ("R", 10, 3, 2, "world"),
+    ]
+
+
+def test_parse_line_matches_parse_content():
+    registry = create_registry()
+    tags = Tags()
+    rows = []
+    for line in CONTENT.split("E\n")[0].splitlines():
+        registry.parse_line(line, tags, rows)
+
+    expected_tags, expected_rows = Tags(), []
+    registry.parse_content(CONTENT, expected_tags, expected_rows)
+
+    assert rows == expected_rows
+    assert vars(tags) == vars(expected_tags)
+
+
+def test_registry_is_built_once():
+    assert get_registry() is get_registry()
+
+
+def test_load_reads_utf8_crlf_files(tmp_path):
+    usdx_file = _load(tmp_path, CONTENT.replace("Artist", "Björk").replace("\n", "\r\n").encode("utf-8"))
+
+    assert usdx_file.encoding == "utf-8"
+    assert usdx_file.tags.ARTIST == "Björk"
+    assert "\r" not in usdx_file.content
+    assert len(usdx_file.notes) == 3
+    assert usdx_file.notes[0].start_ms == pytest.approx(1000.0)
+
+
+@pytest.mark.parametrize(
+    "bom, encoding, expected",
+    [
+        (codecs.BOM_UTF8, "utf-8", "utf-8-sig"),
+        (codecs.BOM_UTF16_LE, "utf-16-le", "utf-16"),
+        (codecs.BOM_UTF32_LE, "utf-32-le", "utf-32"),
+    ],
+)
+def test_byte_order_marks(tmp_path, bom, encoding, expected):
+    usdx_file = _load(tmp_path, bom + CONTENT.encode(encoding))
+
+    assert usdx_file.encoding == expected
+    assert usdx_file.tags.TITLE == "Title"
+    assert not usdx_file.content.startswith("\ufeff")
+
+
+def test_legacy_codepage_fallback(tmp_path):
+    usdx_file = _load(tmp_path, CONTENT.replace("Title", "Wäre").encode("cp1252"))
+
+    assert usdx_file.encoding == "cp1252"
+    assert usdx_file.tags.TITLE == "Wäre"
+
+
+def test_headers_only_skips_notes(tmp_path):
+    usdx_file = _load(tmp_path, CONTENT.encode("utf-8"), headers_only=True)
+
+    assert usdx_file.tags.TITLE == "Title"
+    assert usdx_file.notes is None
+
+
+def test_headers_only_still_requires_notes(tmp_path):
+    with pytest.raises(ValidationError):
+        _load(tmp_path, b"#TITLE:A\n#ARTIST:B\n#BPM:100\n#GAP:0\nE\n", headers_only=True)
+
+
+def test_files_without_title_are_rejected(tmp_path):
+    with pytest.raises(Exception, match="Failed to determine encoding"):
+        _load(tmp_path, b"#ARTIST:B\n: 0 1 2 la\n")
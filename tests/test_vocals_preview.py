@@ -0,0 +1,67 @@
+"""Tests for the in-memory vocals preview pipeline."""
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from utils.hpss import hpss_blend
+from utils.preview import apply_vad_gate, build_vocals_preview, decode_window, render_vocals_preview
+
+SAMPLE_RATE = 22050
+
+
+@pytest.fixture
+def song_wav(tmp_path):
+    """30 s stereo WAV: noise until 10 s, a 440 Hz tone afterwards."""
+    rng = np.random.default_rng(0)
+    t = np.arange(30 * SAMPLE_RATE) / SAMPLE_RATE
+    mono = np.where(t < 10, rng.normal(0, 0.01, t.size), 0.3 * np.sin(2 * np.pi * 440 * t))
+    path = tmp_path / "song" / "audio.wav"
+    path.parent.mkdir()
+    sf.write(path, np.stack([mono, mono], axis=1), SAMPLE_RATE)
+    return str(path)
+
+
+def test_decode_window_reads_only_the_window(song_wav):
+    samples, sample_rate = decode_window(song_wav, 9000, 12000)
+
+    assert sample_rate == SAMPLE_RATE
+    assert samples.dtype == np.float32 and len(samples) == 3 * SAMPLE_RATE
+    assert np.abs(samples[: SAMPLE_RATE // 2]).max() < 0.1
+    assert np.abs(samples[-SAMPLE_RATE:]).max() == pytest.approx(0.3, abs=0.01)
+
+
+def test_preview_writes_only_the_final_file(song_wav, tmp_path):
+    output_file = build_vocals_preview(song_wav, 10000, pre_ms=2000, post_ms=4000, vad_segments=[(10000, 30000)])
+
+    assert sorted(path.name for path in (tmp_path / "song").iterdir()) == ["audio.wav", "vocals_preview.wav"]
+    samples, sample_rate = sf.read(output_file)
+    assert sample_rate == SAMPLE_RATE and len(samples) == 6 * SAMPLE_RATE
+    assert np.abs(samples).max() == pytest.approx(10 ** (-2 / 20), abs=0.01)
+    # Noise before the gap is gated and stays well below the voice after it
+    assert np.abs(samples[:SAMPLE_RATE]).max() < 0.5 * np.abs(samples[-SAMPLE_RATE:]).max()
+
+
+def test_render_returns_the_buffer_and_honours_cancellation(song_wav):
+    samples, sample_rate = render_vocals_preview(song_wav, 20000, pre_ms=1000, post_ms=1000, use_hpss=False)
+    assert sample_rate == SAMPLE_RATE and len(samples) == 2 * SAMPLE_RATE
+
+    with pytest.raises(Exception, match="cancelled"):
+        render_vocals_preview(song_wav, 20000, check_cancellation=lambda: True)
+
+
+def test_vad_gate_attenuates_outside_segments():
+    gated = apply_vad_gate(np.ones(1000, dtype=np.float32), 1000, [(200, 400)], attenuation_db=-20.0)
+
+    assert gated[300] == 1.0
+    assert gated[100] == gated[700] == pytest.approx(0.1)
+
+
+def test_hpss_blend_with_full_weights_reconstructs_the_input():
+    rng = np.random.default_rng(1)
+    samples = rng.normal(0, 0.1, SAMPLE_RATE).astype(np.float32)
+
+    blended = hpss_blend(samples, harmonic_weight=1.0, percussive_weight=1.0)
+
+    assert len(blended) == len(samples)
+    assert np.allclose(blended, samples, atol=1e-3)
@@ -446,6 +446,32 @@ class TestGapDetectionScheduler:
             assert start_calls[0] is song
             assert lookup_calls["count"] >= 3
 
+    def test_deleted_directory_removes_songs_in_one_batch(self, qtbot):
+        """Test that deleting a folder emits one batched removal instead of one per song"""
+        from unittest.mock import patch
+        from services.cache_update_scheduler import CacheUpdateScheduler
+
+        scheduler = CacheUpdateScheduler(
+            worker_queue_add_task=Mock(),
+            songs_get_by_txt_file=Mock(return_value=None),
+            debounce_ms=50,
+        )
+        single, batches = [], []
+        scheduler.song_removed.connect(single.append)
+        scheduler.songs_removed.connect(batches.append)
+
+        root = os.path.join(tempfile.gettempdir(), "library", "Artist")
+        cached = [os.path.join(root, name, "song.txt") for name in ("a", "b")]
+        with (
+            patch("common.database.get_cache_file_stats", return_value=dict.fromkeys(cached)),
+            patch("services.cache_update_scheduler.remove_cache_entry") as remove_cache_entry,
+        ):
+            scheduler._handle_deleted(WatchEvent(event_type=WatchEventType.DELETED, path=root, is_directory=True))
+
+        assert single == []
+        assert batches == [cached]
+        assert remove_cache_entry.call_count == 2
+
 
 class TestWatchModeIntegration:
     """Integration tests for watch mode enablement logic"""
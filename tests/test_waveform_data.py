@@ -0,0 +1,90 @@
+"""Tests for the binary waveform data container and the JSON debug export."""
+
+import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from utils.waveform_data import FORMAT_VERSION, MAGIC, read_waveform_data, write_waveform_data
+from utils.waveform_json import export_waveform_json
+from utils.waveform_peaks import compute_peaks
+
+SAMPLE_RATE = 8000
+
+
+@pytest.fixture
+def peaks():
+    rng = np.random.default_rng(5)
+    return compute_peaks(rng.uniform(-0.8, 0.8, 60 * SAMPLE_RATE).astype(np.float32), SAMPLE_RATE, bin_size=64)
+
+
+@pytest.mark.parametrize("sample_format, tolerance", [("float16", 1e-3), ("int16", 1 / 32767)])
+def test_round_trip_keeps_all_levels(tmp_path, peaks, sample_format, tolerance):
+    path = str(tmp_path / "song.peaks")
+    write_waveform_data(path, peaks, sample_format)
+
+    loaded = read_waveform_data(path)
+
+    assert (loaded.sample_rate, loaded.bin_samples, loaded.num_samples) == (
+        SAMPLE_RATE,
+        64,
+        peaks.num_samples,
+    )
+    assert len(loaded.levels) == len(peaks.levels)
+    for stored, original in zip(loaded.levels, peaks.levels):
+        np.testing.assert_allclose(stored, original, atol=tolerance)
+    np.testing.assert_allclose(loaded.columns(500)[1], peaks.columns(500)[1], atol=tolerance)
+
+
+def test_float16_levels_are_memory_mapped(tmp_path, peaks):
+    path = str(tmp_path / "song.peaks")
+    write_waveform_data(path, peaks)
+
+    mapped = read_waveform_data(path)
+    copied = read_waveform_data(path, memory_map=False)
+
+    assert isinstance(mapped.levels[0], np.memmap)
+    assert mapped.levels[0].dtype == np.float16
+    np.testing.assert_array_equal(mapped.levels[-1], copied.levels[-1])
+
+
+def test_header_is_versioned_little_endian(tmp_path, peaks):
+    path = tmp_path / "song.peaks"
+    write_waveform_data(str(path), peaks)
+    data = path.read_bytes()
+
+    magic, version, sample_format, sample_rate, bin_size, num_samples, levels = struct.unpack_from("<4sHHIIQI", data)
+    assert (magic, version, sample_format) == (MAGIC, FORMAT_VERSION, 1)
+    assert (sample_rate, bin_size, num_samples, levels) == (SAMPLE_RATE, 64, peaks.num_samples, len(peaks.levels))
+    # Roughly 6 bytes per base bin plus a geometric series of coarser levels
+    assert len(data) < len(peaks.levels[0]) * 6 * 2 + 1024
+
+    path.write_bytes(data[:4] + struct.pack("<H", FORMAT_VERSION + 1) + data[6:])
+    assert read_waveform_data(str(path)) is None
+    path.write_bytes(data[: len(data) // 2])
+    assert read_waveform_data(str(path)) is None
+    assert read_waveform_data(str(tmp_path / "missing.peaks")) is None
+
+
+def test_concurrent_writers_use_their_own_temp_file(tmp_path, peaks):
+    path = str(tmp_path / "song.peaks")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for future in [executor.submit(write_waveform_data, path, peaks) for _ in range(16)]:
+            assert future.result() == path
+
+    assert os.listdir(tmp_path) == ["song.peaks"]
+    assert read_waveform_data(path).num_samples == peaks.num_samples
+
+
+def test_json_export_for_debugging(tmp_path, peaks):
+    path = export_waveform_json(peaks, str(tmp_path / "waveform.json"), bins=128)
+
+    with open(path) as f:
+        data = json.load(f)
+
+    assert data["bins"] == len(data["data"]) == 128
+    assert data["duration_seconds"] == pytest.approx(60.0)
+    assert all(-1.0 <= item["min"] <= item["max"] <= 1.0 for item in data["data"])
@@ -193,8 +193,6 @@ def test_waveform_manager_holds_standard_lane_during_waveform(qapp, app_data, tm
     paths = {
         "audio_file": audio_file,
         "vocals_file": audio_file,
-        "audio_waveform_file": str(tmp_path / "audio.png"),
-        "vocals_waveform_file": str(tmp_path / "vocals.png"),
     }
 
     monkeypatch.setattr(
@@ -203,8 +201,9 @@ def test_waveform_manager_holds_standard_lane_during_waveform(qapp, app_data, tm
         lambda s, tmp_root: paths,
     )
     monkeypatch.setattr(WaveformPathService, "waveforms_exists", lambda *args, **kwargs: False)
+    monkeypatch.setattr("services.waveform_manager.has_cached_peaks", lambda audio_path: False)
 
-    def fake_run_direct(self, job, current_song, audio_path, waveform_path, target_key):
+    def fake_run_direct(self, job, current_song, audio_path, target_key):
         job.pending_targets.add(target_key)
         self._handle_worker_finished(job.song_path, target_key, current_song)
 
@@ -0,0 +1,160 @@
+"""Tests for the waveform peaks pyramid and its cache."""
+
+import os
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+import common.database as db_module
+import utils.waveform_peaks as waveform_peaks
+from utils.waveform_peaks import bin_samples, compute_peaks, get_peaks, load_peaks, save_peaks
+
+SAMPLE_RATE = 8000
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_module, "_DB_PATH", str(tmp_path / "cache" / "cache.db"))
+    monkeypatch.setattr(waveform_peaks, "_memory_cache", waveform_peaks.OrderedDict())
+    monkeypatch.setattr(waveform_peaks, "_store", None)
+
+
+def _signal(seconds=30, seed=3):
+    rng = np.random.default_rng(seed)
+    envelope = np.linspace(0.0, 1.0, seconds * SAMPLE_RATE, dtype=np.float32)
+    return (rng.uniform(-1.0, 1.0, seconds * SAMPLE_RATE) * envelope).astype(np.float32)
+
+
+def test_bins_and_levels_match_direct_reduction():
+    samples = _signal()
+    peaks = compute_peaks(samples, SAMPLE_RATE, bin_size=64)
+
+    assert len(peaks.levels[0]) == -(-len(samples) // 64)
+    assert len(peaks.levels[-1]) <= waveform_peaks.MIN_LEVEL_BINS
+    for index, level in enumerate(peaks.levels[:4]):
+        direct = bin_samples(samples, 64 << index)
+        rows = len(samples) // (64 << index)  # full bins only; padded tails differ
+        np.testing.assert_array_equal(level[:rows, :2], direct[:rows, :2])
+        np.testing.assert_allclose(level[:rows, 2], direct[:rows, 2], rtol=1e-4)
+
+
+def test_columns_cover_any_range_and_width():
+    samples = _signal()
+    peaks = compute_peaks(samples, SAMPLE_RATE, bin_size=64)
+
+    minimum, maximum, rms = peaks.columns(300)
+    columns = samples[: len(samples) // 300 * 300].reshape(300, -1)
+    np.testing.assert_allclose(maximum, columns.max(axis=1), atol=0.05)
+    np.testing.assert_allclose(minimum, columns.min(axis=1), atol=0.05)
+    assert np.all(rms <= maximum + 1e-6)
+
+    # Zoomed past level 0 and partly beyond the end of the audio
+    minimum, maximum, _ = peaks.columns(1000, start_ms=29_900, end_ms=30_100)
+    assert maximum[:400].max() > 0.5
+    assert not maximum[600:].any() and not minimum[600:].any()
+
+
+def test_peaks_file_round_trip(tmp_path):
+    peaks = compute_peaks(_signal(), SAMPLE_RATE)
+    save_peaks(str(tmp_path / "song.peaks"), peaks)
+
+    loaded = load_peaks(str(tmp_path / "song.peaks"))
+
+    assert (loaded.sample_rate, loaded.bin_samples, loaded.num_samples) == (
+        SAMPLE_RATE,
+        peaks.bin_samples,
+        peaks.num_samples,
+    )
+    assert len(loaded.levels) == len(peaks.levels)
+    np.testing.assert_allclose(loaded.levels[0], peaks.levels[0], atol=1e-3)
+    assert load_peaks(str(tmp_path / "missing.peaks")) is None
+
+
+def test_get_peaks_decodes_once_and_persists(tmp_path, monkeypatch):
+    audio_file = tmp_path / "song.mp3"
+    audio_file.write_bytes(b"audio" * 100)
+    decodes = []
+
+    def fake_decode(path, check_cancellation=None):
+        decodes.append(path)
+        return compute_peaks(_signal(), SAMPLE_RATE)
+
+    monkeypatch.setattr(waveform_peaks, "decode_peaks", fake_decode)
+
+    first = get_peaks(str(audio_file))
+    assert get_peaks(str(audio_file)) is first
+    assert waveform_peaks.cached_peaks(str(audio_file)) is first
+    waveform_peaks._memory_cache.clear()
+    from_file = get_peaks(str(audio_file))
+
+    assert decodes == [str(audio_file)]
+    assert from_file.num_samples == first.num_samples
+
+
+def _audio_files(tmp_path, count):
+    paths = []
+    for index in range(count):
+        audio_file = tmp_path / f"song{index}.mp3"
+        audio_file.write_bytes(bytes([index]) * 500)
+        paths.append(str(audio_file))
+    return paths
+
+
+@pytest.fixture
+def fake_decode(monkeypatch):
+    monkeypatch.setattr(
+        waveform_peaks, "decode_peaks", lambda path, check_cancellation=None: compute_peaks(_signal(), SAMPLE_RATE)
+    )
+
+
+def test_peaks_folder_evicts_least_recently_shown(tmp_path, monkeypatch, fake_decode):
+    first, second, third = _audio_files(tmp_path, 3)
+    get_peaks(first)
+    file_size = os.path.getsize(waveform_peaks.peaks_cache_path(first))
+    monkeypatch.setattr(waveform_peaks, "PEAKS_CACHE_MAX_MB", 2.5 * file_size / (1024 * 1024))
+    monkeypatch.setattr(waveform_peaks, "_store", None)
+
+    get_peaks(second)
+    os.utime(waveform_peaks.peaks_cache_path(first), (1, 1))
+    os.utime(waveform_peaks.peaks_cache_path(second), (2, 2))
+    waveform_peaks._memory_cache.clear()
+    get_peaks(first)  # Read from the folder: becomes the most recently used
+    get_peaks(third)
+
+    kept = {path for path in (first, second, third) if os.path.exists(waveform_peaks.peaks_cache_path(path))}
+    assert kept == {first, third}
+
+
+def test_clearing_the_cache_removes_the_peaks_folder(tmp_path, fake_decode):
+    (audio_file,) = _audio_files(tmp_path, 1)
+    get_peaks(audio_file)
+    peaks_dir = os.path.dirname(waveform_peaks.peaks_cache_path(audio_file))
+    assert os.listdir(peaks_dir)
+
+    db_module._db_initialized = False
+    try:
+        db_module.clear_cache()
+    finally:
+        db_module.close_connections()
+        db_module._db_initialized = False
+
+    assert not os.path.exists(peaks_dir)
+    assert waveform_peaks.cached_peaks(audio_file) is None
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_decode_peaks_reads_audio_in_one_pass(tmp_path):
+    path = str(tmp_path / "tone.wav")
+    samples = (np.sin(np.linspace(0, 2000 * np.pi, 3 * 22050)) * 16000).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(22050)
+        f.writeframes(samples.tobytes())
+
+    peaks = waveform_peaks.decode_peaks(path)
+
+    assert peaks.duration_ms == pytest.approx(3000, abs=50)
+    assert peaks.levels[0][:, 1].max() == pytest.approx(16000 / 32768, abs=0.01)
@@ -0,0 +1,100 @@
+"""Tests for the peaks-painted waveform widget and the background peaks loader."""
+
+import threading
+
+import numpy as np
+import pytest
+from PySide6.QtGui import QColor
+
+import utils.waveform_peaks as waveform_peaks
+from model.usdx_file import Note
+from ui.mediaplayer.peaks_loader import PeaksLoader
+from ui.mediaplayer.waveform_widget import WaveformWidget
+from utils.waveform_peaks import compute_peaks
+
+SAMPLE_RATE = 8000
+
+
+@pytest.fixture
+def widget(qtbot):
+    widget = WaveformWidget()
+    qtbot.addWidget(widget)
+    widget.resize(200, 100)
+    widget.set_colors("#ff0000", (105, 105, 105, 128))
+    # Half silence, half constant amplitude 0.25
+    samples = np.concatenate([np.zeros(10 * SAMPLE_RATE), np.full(10 * SAMPLE_RATE, 0.25)]).astype(np.float32)
+    widget.set_peaks(compute_peaks(samples, SAMPLE_RATE))
+    return widget
+
+
+def test_paints_waveform_and_overlays_from_peaks(widget):
+    note = Note()
+    note.start_ms, note.end_ms, note.Pitch, note.Text = 12_000, 14_000, 5, "la"
+    widget.set_silence_periods([(0.0, 5000.0)])
+    widget.set_notes([note])
+    widget.set_markers_visible(False)
+
+    image = widget.grab().toImage()
+
+    # sqrt scale: amplitude 0.25 fills the middle half of the height
+    assert image.pixelColor(150, 26) == QColor("#ff0000")
+    assert image.pixelColor(150, 20) != QColor("#ff0000")
+    assert image.pixelColor(20, 80) != image.pixelColor(80, 80)  # silence shading
+    assert image.pixelColor(130, 50) == QColor("#ff0000")  # note bar
+    assert not widget.pixmap().isNull()
+
+
+def test_layers_are_invalidated_separately(widget, qtbot):
+    widget.grab()
+    base = widget._base_layer
+    assert base is not None and widget._overlay_layer is not None
+
+    widget.set_silence_periods([(1000.0, 2000.0)])
+    widget.set_gap_markers(original_gap_ms=1000, detected_gap_ms=1500)
+    widget.update_position(500, 20_000)
+    assert widget._overlay_layer is None
+    widget.grab()
+    assert widget._base_layer is base
+
+    # A resize keeps scaling the cached waveform until it settles, then renders it at the new size
+    widget.resize(300, 100)
+    widget.grab()
+    assert widget._base_layer is base
+    qtbot.waitUntil(lambda: widget._base_layer is None or widget._base_layer.width() == 300)
+    widget.grab()
+    assert widget._base_layer.width() == 300
+
+
+def test_loader_delivers_only_the_latest_request(qtbot, monkeypatch):
+    release = threading.Event()
+    cancelled = []
+
+    def fake_get_peaks(audio_file, check_cancellation=None):
+        if audio_file == "first.mp3":
+            release.wait(5)
+            cancelled.append(check_cancellation())
+            raise Exception("Operation cancelled")
+        return compute_peaks(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+
+    monkeypatch.setattr(waveform_peaks, "cached_peaks", lambda audio_file: None)
+    monkeypatch.setattr(waveform_peaks, "get_peaks", fake_get_peaks)
+    loader = PeaksLoader()
+    delivered = []
+    loader.peaksLoaded.connect(lambda audio_file, peaks: delivered.append(audio_file))
+
+    assert loader.request("first.mp3") is None
+    with qtbot.waitSignal(loader.peaksLoaded, timeout=5000):
+        loader.request("second.mp3")
+    release.set()
+    qtbot.waitUntil(lambda: cancelled == [True])
+    qtbot.wait(50)
+
+    assert delivered == ["second.mp3"]
+
+
+def test_loader_returns_peaks_in_memory_without_a_thread(monkeypatch):
+    peaks = compute_peaks(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+    monkeypatch.setattr(waveform_peaks, "cached_peaks", lambda audio_file: peaks)
+    monkeypatch.setattr(threading, "Thread", None)
+
+    assert PeaksLoader().request("song.mp3") is peaks
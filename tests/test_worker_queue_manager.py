@@ -151,6 +151,72 @@ class TestInstantLane:
         assert len(manager.queued_instant_tasks) == 1
 
 
+class TestPoolLane:
+    """Test named pool lanes with N concurrent slots"""
+
+    def _pool_worker(self, description):
+        worker = MockWorker(description, is_instant=True)
+        worker.pool_lane = "detection"
+        return worker
+
+    def test_pool_lane_runs_up_to_capacity(self):
+        """Verify pool lane starts tasks up to its capacity and queues the rest"""
+        manager = WorkerQueueManager()
+        manager.configure_pool_lane("detection", 2)
+
+        with patch("managers.worker_queue_manager.run_async") as mock_run_async:
+            workers = [self._pool_worker(f"Detect {i}") for i in range(3)]
+            for worker in workers:
+                manager.add_task(worker, start_now=False)
+
+            assert set(manager.running_pool_tasks["detection"]) == {workers[0].id, workers[1].id}
+            assert list(manager.queued_pool_tasks["detection"]) == [workers[2]]
+            assert manager.running_instant_task is None
+            assert mock_run_async.call_count == 2
+            for call in mock_run_async.call_args_list:
+                call.args[0].close()
+
+    def test_finalize_pool_task_starts_next_queued(self):
+        """Verify finishing a pool task frees its slot for the next queued task"""
+        manager = WorkerQueueManager()
+        manager.configure_pool_lane("detection", 1)
+
+        with patch("managers.worker_queue_manager.run_async") as mock_run_async:
+            first = self._pool_worker("First")
+            second = self._pool_worker("Second")
+            manager.add_task(first, start_now=False)
+            manager.add_task(second, start_now=False)
+
+            manager._finalize_task(first.id)
+
+            assert list(manager.running_pool_tasks["detection"]) == [second.id]
+            assert manager.get_worker(second.id) is second
+            for call in mock_run_async.call_args_list:
+                call.args[0].close()
+
+    def test_unconfigured_pool_lane_falls_back_to_instant_lane(self):
+        """Verify workers naming an unknown lane keep the regular routing"""
+        manager = WorkerQueueManager()
+        worker = self._pool_worker("Detect")
+
+        with patch.object(manager, "start_next_instant_task") as mock_start:
+            manager.add_task(worker, start_now=False)
+            mock_start.assert_called_once()
+
+    def test_cancel_queued_pool_task(self):
+        """Verify cancelling a queued pool task removes it from the lane queue"""
+        manager = WorkerQueueManager()
+        manager.configure_pool_lane("detection", 1)
+        manager.running_pool_tasks["detection"]["busy"] = self._pool_worker("Busy")
+
+        queued = self._pool_worker("Queued")
+        manager.add_task(queued, start_now=False)
+        manager.cancel_task(queued.id)
+
+        assert len(manager.queued_pool_tasks["detection"]) == 0
+        assert queued.is_cancelled()
+
+
 class TestCancellation:
     """Test task cancellation behavior"""
 